@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark mémoire GAME_CACHE - dicts bruts vs GameRecord
+
+Compare l'empreinte RAM de N jeux stockés :
+  - avant : dict normalisé complet (tags, stores, images, summary long)
+            + enveloppe {"data": ..., "hit_count": ...} de handle_game_command
+  - après : GameRecord (__slots__, champs affichés uniquement, summary
+            tronqué, noms internés)
+  - froid : GameRecord avec summary compressé (zlib, entrées non demandées)
+
+Usage:
+  python3 scripts/benchmark_game_cache_memory.py [--games N]
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.game_record import GameRecord
+
+PLATFORMS = ["PC", "PlayStation 5", "PlayStation 4", "Xbox Series S/X", "Xbox One", "Nintendo Switch"]
+GENRES = ["Action", "RPG", "Adventure", "Indie", "Roguelike"]
+
+
+def fake_rawg_game(i: int) -> dict:
+    """Dict normalisé tel que renvoyé par fetch_game_from_rawg (taille réaliste)."""
+    return {
+        "name": f"Game {i}",
+        "slug": f"game-{i}",
+        "summary": f"Description du jeu {i}. " + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20,
+        "release_date": "2020-09-17",
+        "release_year": "2020",
+        "released": "2020-09-17",
+        "platforms": list(PLATFORMS),
+        "developers": [f"Studio {i % 50}"],
+        "publishers": [f"Publisher {i % 20}"],
+        "genres": list(GENRES[: 2 + i % 3]),
+        "tags": [f"tag-{t}" for t in range(20)],
+        "stores": [{"store": {"id": s, "name": f"Store {s}", "slug": f"store-{s}"}} for s in range(5)],
+        "metacritic": 80 + i % 15,
+        "rating": 4.2,
+        "ratings_count": 1000 + i,
+        "background_image": f"https://media.rawg.io/media/games/{i:04d}/{i:032x}.jpg",
+        "id": 100000 + i,
+    }
+
+
+def measure(build) -> int:
+    """Octets alloués (et retenus) par ``build()``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mémoire GAME_CACHE")
+    parser.add_argument("--games", type=int, default=1000, help="Nombre de jeux en cache (default: 1000)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"🧠 BENCHMARK MÉMOIRE GAME_CACHE ({args.games} jeux)")
+    print("=" * 60)
+
+    legacy = measure(lambda: [{"data": fake_rawg_game(i), "hit_count": 1} for i in range(args.games)])
+    # Dict brut libéré après projection : seules les valeurs gardées restent comptées
+    records = measure(lambda: [GameRecord.from_dict(fake_rawg_game(i), hit_count=1) for i in range(args.games)])
+
+    def build_cold():
+        cold = [GameRecord.from_dict(fake_rawg_game(i), hit_count=1) for i in range(args.games)]
+        for record in cold:
+            record.compact()
+        return cold
+
+    compact = measure(build_cold)
+
+    print(f"  Dicts bruts    : {legacy / 1024:8.1f} Ko ({legacy / args.games:6.0f} o/jeu)")
+    print(f"  GameRecord     : {records / 1024:8.1f} Ko ({records / args.games:6.0f} o/jeu)")
+    print(f"  GameRecord zlib: {compact / 1024:8.1f} Ko ({compact / args.games:6.0f} o/jeu)")
+    print(f"  Gain           : {(1 - records / legacy) * 100:6.1f} % (froid : {(1 - compact / legacy) * 100:.1f} %)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark normalize_key - clés du cache de faits (!ask, !cacheadd)
+
+Compare le coût par question :
+  - avant  : un re.sub par préfixe conversationnel (18) + boucle articles
+  - compilé : regex ancrée unique (normalize_key sans mémo)
+  - mémo   : normalize_key (question déjà vue)
+
+Vérifie au passage que les trois donnent les mêmes clés.
+
+Usage:
+  python3 scripts/benchmark_normalize_key.py [--rounds N]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.utils.cache_manager import _CONVERSATIONAL_PATTERNS, normalize_key
+
+QUESTIONS = [
+    "C'est quoi Python ?",
+    "explique moi le panda roux",
+    "Tu connais la RTX 4090 ?",
+    "parle moi des axolotls",
+    "qui est Zinedine Zidane",
+    "qu'est-ce que l'intelligence artificielle ?",
+    "ryzen 9 9950x3d",
+    "définis photosynthèse",
+]
+
+
+def normalize_key_before(query: str) -> str:
+    """Ancienne version : re.sub successifs, articles en boucle."""
+    key = query.strip().lower().rstrip("?!. ").strip()
+    for pattern in _CONVERSATIONAL_PATTERNS:
+        key = re.sub("^" + pattern, "", key, flags=re.IGNORECASE).strip()
+    for article in ["le ", "la ", "les ", "un ", "une ", "des ", "l'"]:
+        if key.startswith(article):
+            key = key[len(article):].strip()
+            break
+    return key or query.strip().lower()
+
+
+def timed(fn, rounds: int) -> float:
+    """Microsecondes par question."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for question in QUESTIONS:
+            fn(question)
+    return (time.perf_counter() - start) / (rounds * len(QUESTIONS)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de normalize_key")
+    parser.add_argument("--rounds", type=int, default=5000, help="Répétitions (default: 5000)")
+    args = parser.parse_args()
+
+    for question in QUESTIONS:
+        assert normalize_key(question) == normalize_key_before(question), question
+
+    before = timed(normalize_key_before, args.rounds)
+    compiled = timed(normalize_key.__wrapped__, args.rounds)
+    memo = timed(normalize_key, args.rounds)
+
+    print("=" * 60)
+    print(f"🔑 {len(QUESTIONS)} questions x {args.rounds} tours")
+    print("=" * 60)
+    print(f"avant   (18 re.sub)     : {before:6.2f} µs/question")
+    print(f"compilé (regex unique)  : {compiled:6.2f} µs/question  (x{before / compiled:.0f})")
+    print(f"mémo    (déjà vue)      : {memo:6.2f} µs/question  (x{before / memo:.0f})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
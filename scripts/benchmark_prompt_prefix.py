@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Benchmark Prefix KV-cache - LLM stub local
+
+Mesure le temps de prefill économisé grâce au préfixe canonique figé
+(prompts.prompt_loader.PROMPT_PREFIXES) par rapport à l'ancien layout où
+try_endpoint et build_messages envoyaient des préfixes différents.
+
+Le stub simule un serveur llama.cpp/LM Studio à 1 slot :
+- il garde le prompt de la requête précédente (cache KV du slot)
+- seuls les tokens APRÈS le plus long préfixe commun sont "prefill"
+- coût simulé : --prefill-ms par token non caché (4 chars ≈ 1 token)
+
+Usage:
+  python3 scripts/benchmark_prompt_prefix.py [--requests 40] [--prefill-ms 0.4]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import httpx
+
+from prompts.prompt_loader import (
+    PROMPT_TEMPLATE_VERSION,
+    SYSTEM_CHILL_FINAL,
+    build_prefixed_messages,
+    get_prefix_fingerprint,
+)
+from utils.model_utils import estimate_tokens, try_endpoint
+
+USER_MESSAGES = [
+    "salut",
+    "lol",
+    "tu joues à quoi ?",
+    "t'es qui toi ?",
+    "gg",
+    "c'est quoi ton jeu préféré ?",
+    "raconte une blague",
+    "tu dors jamais ?",
+]
+
+# Ancien few-shot de build_messages (layout divergent avant le préfixe canonique)
+_LEGACY_FEW_SHOT = [
+    {"role": "user", "content": "lol"},
+    {"role": "assistant", "content": "Marrant."},
+    {"role": "user", "content": "t'es qui toi ?"},
+    {"role": "assistant", "content": "Le bot du stream."},
+    {"role": "user", "content": "raconte une anecdote"},
+    {"role": "assistant", "content": "Pas d'anecdotes perso 😉"},
+    {"role": "user", "content": "ton avis sur l'IA ?"},
+    {"role": "assistant", "content": "Prometteur, à encadrer."},
+]
+
+
+def _serialize(messages: list) -> str:
+    """Approximation du prompt "tokenisé" côté serveur."""
+    return json.dumps(messages, ensure_ascii=False, separators=(",", ":"))
+
+
+class _StubState:
+    """État partagé du stub (un seul slot KV, comme llama.cpp -np 1)."""
+
+    def __init__(self, prefill_ms_per_token: float):
+        self.prefill_ms_per_token = prefill_ms_per_token
+        self.lock = threading.Lock()
+        self.slot_prompt = ""
+        self.cached_tokens = 0
+        self.prefill_tokens = 0
+        self.prefill_seconds = 0.0
+
+    def reset(self):
+        with self.lock:
+            self.slot_prompt = ""
+            self.cached_tokens = 0
+            self.prefill_tokens = 0
+            self.prefill_seconds = 0.0
+
+
+def _make_handler(state: _StubState):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):  # noqa: A002 - silence
+            return
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            prompt = _serialize(payload.get("messages", []))
+
+            with state.lock:
+                common = 0
+                for a, b in zip(prompt, state.slot_prompt):
+                    if a != b:
+                        break
+                    common += 1
+                state.slot_prompt = prompt
+                cached = estimate_tokens(prompt[:common]) if common else 0
+                uncached = max(0, estimate_tokens(prompt) - cached)
+                prefill = uncached * state.prefill_ms_per_token / 1000
+                state.cached_tokens += cached
+                state.prefill_tokens += uncached
+                state.prefill_seconds += prefill
+
+            time.sleep(prefill)
+            body = json.dumps({
+                "choices": [{"message": {"content": "Yo !"}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": cached + uncached,
+                    "completion_tokens": 2,
+                    "total_tokens": cached + uncached + 2,
+                    "prompt_tokens_details": {"cached_tokens": cached},
+                },
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return StubHandler
+
+
+async def _run_legacy(url: str, n: int):
+    """Ancien comportement : préfixes alternés (try_endpoint vs build_messages)."""
+    async with httpx.AsyncClient() as client:
+        for i in range(n):
+            user = {"role": "user", "content": USER_MESSAGES[i % len(USER_MESSAGES)]}
+            system = {"role": "system", "content": SYSTEM_CHILL_FINAL}
+            if i % 2:
+                messages = [system, *_LEGACY_FEW_SHOT, user]
+            else:
+                messages = [system, user]
+            await client.post(url, json={"model": "stub", "messages": messages})
+
+
+async def _run_canonical(url: str, n: int):
+    """Nouveau comportement : try_endpoint avec le préfixe canonique figé."""
+    for i in range(n):
+        await try_endpoint(url, USER_MESSAGES[i % len(USER_MESSAGES)], "bench", 5, mode="chill", config={})
+
+
+def _report(label: str, state: _StubState, elapsed: float, n: int) -> float:
+    total = state.cached_tokens + state.prefill_tokens
+    hit_rate = state.cached_tokens / total * 100 if total else 0
+    print(f"{label:<22} {elapsed * 1000:>9.0f}ms {state.prefill_seconds * 1000:>10.0f}ms "
+          f"{state.prefill_tokens:>10} {hit_rate:>8.1f}%  ({n} requêtes)")
+    return state.prefill_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark préfixe KV-cache (LLM stub)")
+    parser.add_argument("--requests", type=int, default=40, help="Requêtes par scénario (default: 40)")
+    parser.add_argument("--prefill-ms", type=float, default=0.4,
+                        help="Coût simulé par token non caché en ms (default: 0.4)")
+    args = parser.parse_args()
+
+    state = _StubState(args.prefill_ms)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+    print(f"\n{'=' * 72}")
+    print("🧪 BENCHMARK PREFIX KV-CACHE (LLM stub)")
+    print(f"{'=' * 72}")
+    print(f"📌 Template: v{PROMPT_TEMPLATE_VERSION} | préfixe chill={get_prefix_fingerprint('chill')}")
+    print(f"📦 Préfixe canonique: ~{estimate_tokens(_serialize(build_prefixed_messages('chill', '')))} tokens")
+    print(f"{'=' * 72}")
+    print(f"{'Scénario':<22} {'Total':>11} {'Prefill':>12} {'Tokens PF':>10} {'KV hit':>9}")
+
+    state.reset()
+    start = time.perf_counter()
+    asyncio.run(_run_legacy(url, args.requests))
+    legacy = _report("Legacy (alterné)", state, time.perf_counter() - start, args.requests)
+
+    state.reset()
+    start = time.perf_counter()
+    # On coupe les logs de try_endpoint pour garder le tableau lisible
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(_run_canonical(url, args.requests))
+    canonical = _report("Préfixe canonique", state, time.perf_counter() - start, args.requests)
+
+    saved = legacy - canonical
+    print(f"{'=' * 72}")
+    print(f"⚡ Prefill économisé: {saved * 1000:.0f}ms "
+          f"({saved / legacy * 100 if legacy else 0:.1f}%) sur {args.requests} requêtes")
+    print(f"{'=' * 72}\n")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
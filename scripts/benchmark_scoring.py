@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark scoring des candidats RAWG
+
+Mesure le temps de scoring d'une recherche (20 candidats RAWG) :
+  - ratio   : difflib.SequenceMatcher vs ratio interne (mêmes valeurs)
+  - avant   : un candidat à la fois, requête ré-analysée, SequenceMatcher
+  - froid   : score_candidates, cache de similarité vidé à chaque recherche
+  - chaud   : score_candidates, mêmes noms déjà vus (cas des jeux populaires)
+
+Les candidats et requêtes viennent de tests/fixtures/scoring_golden.json.
+
+Usage:
+  python3 scripts/benchmark_scoring.py [--rounds N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.commands.api import scoring
+from core.commands.api.scoring import QueryFeatures, _matching_ratio, name_ratio, score_candidates
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "scoring_golden.json"
+
+
+def timed(run, rounds: int, searches: int) -> float:
+    """Microsecondes par recherche."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        run()
+    return (time.perf_counter() - start) / (rounds * searches) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du scoring des candidats RAWG")
+    parser.add_argument("--rounds", type=int, default=200, help="Répétitions (default: 200)")
+    args = parser.parse_args()
+
+    golden = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    candidates = golden["candidates"][:20]
+    cases = [(case["query"], case["user_year"]) for case in golden["cases"]]
+    pairs = [(query.lower(), c["name"].lower()) for query, _ in cases for c in candidates]
+
+    def sequence_matcher_ratio(query, name):
+        return SequenceMatcher(None, query, name).ratio()
+
+    def ratios(fn):
+        return lambda: [fn(query, name) for query, name in pairs]
+
+    def per_candidate():
+        # Ancien chemin : requête ré-analysée et similarité recalculée à chaque candidat
+        for query, user_year in cases:
+            for candidate in candidates:
+                score_candidates(QueryFeatures(query, user_year), [candidate])
+
+    def batch():
+        for query, user_year in cases:
+            score_candidates(QueryFeatures(query, user_year), candidates)
+
+    def batch_cold():
+        name_ratio.cache_clear()
+        batch()
+
+    searches = len(cases)
+    print("=" * 60)
+    print(f"🎯 {searches} requêtes x {len(candidates)} candidats, {args.rounds} tours")
+    print("=" * 60)
+
+    sm = timed(ratios(sequence_matcher_ratio), args.rounds, len(pairs))
+    fast = timed(ratios(_matching_ratio), args.rounds, len(pairs))
+    print(f"ratio   SequenceMatcher : {sm:8.2f} µs/paire")
+    print(f"ratio   interne         : {fast:8.2f} µs/paire  (x{sm / fast:.1f})")
+
+    scoring.name_ratio = sequence_matcher_ratio  # "avant" : sans ratio interne ni cache
+    before = timed(per_candidate, args.rounds, searches)
+    scoring.name_ratio = name_ratio
+    cold = timed(batch_cold, args.rounds, searches)
+    warm = timed(batch, args.rounds, searches)
+
+    print(f"avant   (par candidat)  : {before:8.1f} µs/recherche")
+    print(f"froid   (batch)         : {cold:8.1f} µs/recherche  (x{before / cold:.1f})")
+    print(f"chaud   (batch + cache) : {warm:8.1f} µs/recherche  (x{before / warm:.1f})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
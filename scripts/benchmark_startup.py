@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark Startup - Temps de boot du bot jusqu'à la connexion au chat
+
+Deux mesures, chacune dans un process Python neuf (cache d'import froid) :
+1. Import : `python -X importtime -c "import src.chat.twitch_bot"`
+   → temps cumulé + modules les plus lents + modules lourds chargés trop tôt
+2. Boot : import + TwitchBot(config) → moment où bot.start() peut ouvrir l'IRC
+   (config d'exemple, aucun appel réseau)
+
+Usage:
+  python3 scripts/benchmark_startup.py [--runs 5] [--top 15] [--history logs/startup_benchmark.jsonl]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Modules qui ne doivent PAS être importés avant la connexion au chat
+HEAVY_MODULES = ("openai", "ctransformers", "deep_translator", "howlongtobeatpy")
+
+_BOOT_SNIPPET = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import yaml
+from src.chat.twitch_bot import TwitchBot
+t_import = time.perf_counter()
+with open(sys.argv[1], encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+config["twitch"].pop("broadcaster_id", None)
+async def main():
+    TwitchBot(config)
+asyncio.run(main())
+t_ready = time.perf_counter()
+heavy = [m for m in sys.argv[2].split(",") if m in sys.modules]
+print(json.dumps({"import_ms": (t_import - t0) * 1000, "ready_ms": (t_ready - t0) * 1000, "heavy": heavy}))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(ROOT_DIR), str(ROOT_DIR / "src"), env.get("PYTHONPATH", "")])
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    env["LLM_MODE"] = "disabled"  # Pas de health monitor dans le benchmark
+    return env
+
+
+def measure_importtime(top: int) -> tuple[float, list[tuple[str, float]]]:
+    """Temps d'import cumulé (ms) + top modules par temps propre."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.chat.twitch_bot"],
+        cwd=ROOT_DIR, env=_env(), capture_output=True, text=True, check=False,
+    )
+    total_us = 0
+    modules: list[tuple[str, float]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            self_ms = int(self_us) / 1000
+        except ValueError:
+            continue
+        name = name.strip()
+        modules.append((name, self_ms))
+        if name == "src.chat.twitch_bot":
+            total_us = int(cumulative_us)
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        raise SystemExit("❌ Import de src.chat.twitch_bot échoué")
+    modules.sort(key=lambda item: item[1], reverse=True)
+    return total_us / 1000, modules[:top]
+
+
+def measure_boot(config_path: Path) -> dict:
+    """Import + construction du bot dans un process neuf (cwd temporaire)."""
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = subprocess.run(
+            [sys.executable, "-c", _BOOT_SNIPPET, str(config_path), ",".join(HEAVY_MODULES)],
+            cwd=workdir, env=_env(), capture_output=True, text=True, check=False,
+        )
+    if proc.returncode != 0:
+        print(proc.stdout[-2000:], proc.stderr[-2000:])
+        raise SystemExit("❌ Boot TwitchBot échoué")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup SerdaBot")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de boots mesurés (default: 5)")
+    parser.add_argument("--top", type=int, default=15, help="Modules les plus lents affichés (default: 15)")
+    parser.add_argument("--history", type=Path, default=None,
+                        help="Fichier JSONL où ajouter le résultat (suivi dans le temps)")
+    args = parser.parse_args()
+
+    config_path = ROOT_DIR / "src" / "config" / "config.example.yaml"
+
+    print(f"\n{'=' * 60}")
+    print("🚀 BENCHMARK STARTUP (boot → prêt à connecter l'IRC)")
+    print(f"{'=' * 60}")
+
+    import_ms, slowest = measure_importtime(args.top)
+    print(f"\n📦 python -X importtime : {import_ms:.0f}ms cumulés pour src.chat.twitch_bot")
+    print(f"{'Module':<45} {'Self':>10}")
+    for name, ms in slowest:
+        print(f"{name:<45} {ms:>8.1f}ms")
+
+    boots = [measure_boot(config_path) for _ in range(args.runs)]
+    import_median = statistics.median(b["import_ms"] for b in boots)
+    ready_median = statistics.median(b["ready_ms"] for b in boots)
+    heavy = sorted({m for b in boots for m in b["heavy"]})
+
+    print(f"\n⏱️  Boot ({args.runs} runs, médiane)")
+    print(f"   Import modules      : {import_median:.0f}ms")
+    print(f"   Prêt à connecter    : {ready_median:.0f}ms")
+    if heavy:
+        print(f"   ⚠️ Modules lourds chargés avant connexion : {', '.join(heavy)}")
+    else:
+        print(f"   ✅ Aucun module lourd chargé avant connexion ({', '.join(HEAVY_MODULES)})")
+    print(f"{'=' * 60}\n")
+
+    if args.history:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "importtime_ms": round(import_ms, 1),
+                "import_ms": round(import_median, 1),
+                "ready_ms": round(ready_median, 1),
+                "heavy_modules": heavy,
+            }) + "\n")
+        print(f"📝 Résultat ajouté à {args.history}")
+
+
+if __name__ == "__main__":
+    main()
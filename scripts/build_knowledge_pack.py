@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Build du pack de connaissances (jeux + faits) - étape hors ligne
+
+Compile en un seul fichier binaire en lecture seule, mappé en mémoire par
+le bot au boot (src/core/knowledge_pack.py) :
+  - les jeux du cache (cache/games.json en dev, ou le SQLite des workers)
+  - les faits Wikipedia (cache/dynamic_facts.json)
+  - les alias de faits (cache/fact_aliases.json)
+
+--translate traduit en français les summaries encore en anglais avant de
+les écrire (même logique que !gameinfo) : le bot n'a plus à le faire.
+
+Le pack est écrit dans un fichier temporaire puis remplacé atomiquement ;
+les bots en cours le remappent d'eux-mêmes (vérification toutes les 30s).
+
+Usage:
+  python3 scripts/build_knowledge_pack.py
+  python3 scripts/build_knowledge_pack.py --games-db cache/game_cache.sqlite3 --translate
+  python3 scripts/build_knowledge_pack.py --lookup "gamedata:hades"
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.cache import decode_value, get_ttl_for_game
+from core.game_record import GameRecord
+from core.knowledge_pack import KIND_JSON, KIND_TEXT, PACK_GAME_TTL, PACK_PATH_DEFAULT, KnowledgePack, write_pack
+
+
+def load_games(games_json: str, games_db: str) -> tuple:
+    """
+    ({clé gamedata: GameRecord}, nb d'entrées écartées) depuis le cache JSON
+    (dev) et/ou SQLite (workers).
+
+    Écartées : entrées expirées, et entrées mises en cache avec un TTL plus
+    court que celui de leur année (repli peu fiable, ex: scraping IGDB 30 min).
+    """
+    raw = {}
+    if games_json and Path(games_json).exists():
+        with open(games_json, "r", encoding="utf-8") as f:
+            raw.update({key: (entry["data"], entry["timestamp"], entry["ttl"]) for key, entry in json.load(f).items()})
+    if games_db and Path(games_db).exists():
+        with sqlite3.connect(games_db) as conn:
+            rows = conn.execute("SELECT key, data, timestamp, ttl FROM game_cache")
+            raw.update({key: (json.loads(data), timestamp, ttl) for key, data, timestamp, ttl in rows})
+    games, skipped = {}, 0
+    now = time.time()
+    for key, (data, timestamp, ttl) in raw.items():
+        if not key.startswith("gamedata:"):
+            continue
+        record = GameRecord.coerce(decode_value(data))
+        if record is None:
+            continue
+        if now - timestamp > ttl or ttl < get_ttl_for_game(record.release_year):
+            skipped += 1
+            continue
+        games[key] = record
+    return games, skipped
+
+
+def load_json(path: str) -> dict:
+    if not path or not Path(path).exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build du pack de connaissances mmap (jeux + faits)")
+    parser.add_argument("--games", default="cache/games.json", help="Cache jeux JSON (default: cache/games.json)")
+    parser.add_argument("--games-db", default="", help="Cache jeux SQLite des workers (optionnel)")
+    parser.add_argument("--facts", default="cache/dynamic_facts.json", help="Faits (default: cache/dynamic_facts.json)")
+    parser.add_argument("--aliases", default="cache/fact_aliases.json", help="Alias (default: cache/fact_aliases.json)")
+    parser.add_argument("--out", default=PACK_PATH_DEFAULT, help=f"Pack à écrire (default: {PACK_PATH_DEFAULT})")
+    parser.add_argument("--translate", action="store_true", help="Traduire les summaries anglais en français")
+    parser.add_argument(
+        "--game-ttl", type=int, default=PACK_GAME_TTL,
+        help=f"Validité des jeux du pack en secondes (default: {PACK_GAME_TTL})",
+    )
+    parser.add_argument("--lookup", help="Ne rien construire : lire une clé dans le pack existant")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    if args.lookup:
+        pack = KnowledgePack(args.out)
+        if not pack.open():
+            print(f"❌ Aucun pack lisible: {args.out}")
+        else:
+            value = pack.get(args.lookup)
+            print(f"🔍 {args.lookup} → {json.dumps(value, ensure_ascii=False)[:300] if value is not None else 'absent'}")
+        print("=" * 60)
+        return
+
+    start = time.perf_counter()
+    games, skipped = load_games(args.games, args.games_db)
+    facts = load_json(args.facts)
+    aliases = load_json(args.aliases).get("aliases", {})
+
+    translated = 0
+    if args.translate:
+        from core.commands.game_command import _ensure_french_summary
+        for record in games.values():
+            was_english = not record.summary_lang
+            if _ensure_french_summary(record, debug=False) and was_english:
+                translated += 1
+
+    entries = {}
+    expires_at = time.time() + args.game_ttl
+    for key, record in games.items():
+        state = dict(record.to_state(), expires_at=expires_at)
+        entries[key] = (KIND_JSON, json.dumps(state, ensure_ascii=False).encode("utf-8"))
+    for key, fact in facts.items():
+        entries[f"fact:{key}"] = (KIND_TEXT, fact.encode("utf-8"))
+    for alias, canonical in aliases.items():
+        if canonical in facts:
+            entries[f"alias:{alias}"] = (KIND_TEXT, canonical.encode("utf-8"))
+
+    count = write_pack(args.out, entries)
+    french = sum(1 for record in games.values() if record.summary_lang == "fr")
+    size_kb = Path(args.out).stat().st_size / 1024
+
+    print(f"🎮 {len(games)} jeux ({french} summaries FR{f', {translated} traduits' if args.translate else ''})")
+    if skipped:
+        print(f"⏭️  {skipped} jeux écartés (expirés ou repli à TTL court)")
+    print(f"📚 {len(facts)} faits, {len(entries) - len(games) - len(facts)} alias")
+    print(f"📦 {count} entrées → {args.out} ({size_kb:.1f} KB) en {(time.perf_counter() - start) * 1000:.0f} ms")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Catalogue Steam local - import / téléchargement / recherche
+
+Le bot rafraîchit lui-même le catalogue en tâche de fond (steam.*). Ce
+script sert au premier remplissage (ex: depuis un dump JSON hors ligne)
+et au diagnostic.
+
+Usage:
+  python3 scripts/steam_catalog.py import applist.json
+  python3 scripts/steam_catalog.py refresh
+  python3 scripts/steam_catalog.py lookup "Hollow Knight"
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.core.commands.api.steam_catalog import CATALOG_DB_DEFAULT, SteamCatalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalogue Steam local (nom → AppID)")
+    parser.add_argument("--db", default=CATALOG_DB_DEFAULT, help=f"Fichier SQLite (default: {CATALOG_DB_DEFAULT})")
+    parser.add_argument("--web-api-key", default="", help="Clé Steam Web API (refresh delta)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("import", help="Importer un dump GetAppList JSON").add_argument("file")
+    sub.add_parser("refresh", help="Télécharger la liste (delta si clé Web API)")
+    sub.add_parser("lookup", help="Résoudre un nom de jeu").add_argument("name")
+    args = parser.parse_args()
+
+    catalog = SteamCatalog(args.db)
+    catalog.web_api_key = args.web_api_key
+
+    print("=" * 60)
+    start = time.perf_counter()
+    if args.command == "import":
+        count = catalog.import_file(args.file)
+        print(f"📥 {count} apps importées depuis {args.file}")
+    elif args.command == "refresh":
+        count = asyncio.run(catalog.refresh())
+        print(f"🔄 {count} apps mises à jour")
+    else:
+        match = catalog.resolve(args.name)
+        print(f"🔍 {args.name} → {f'{match[1]} (AppID {match[0]})' if match else 'introuvable'}")
+    print(f"⏱️ {(time.perf_counter() - start) * 1000:.1f} ms - {catalog.count()} apps dans {args.db}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,10 @@ Script de remplissage du cache - Warmup 🔥
 
 Remplit le cache avec les jeux populaires pour éviter les appels API.
 À lancer avant les tests ou en maintenance.
+
+En production, le bot préchauffe lui-même le cache (core/warmup.py :
+catégorie du stream, jeux les plus demandés, mentions du chat). Ce script
+utilise le même service (concurrence bornée, quota RAWG).
 """
 import asyncio
 import os
@@ -16,7 +20,7 @@ os.environ["BOT_ENV"] = "dev"
 
 from config.config import load_config
 from core.cache import GAME_CACHE
-from core.commands.api import fetch_game_data
+from core.warmup import warmup_service
 
 # Liste de jeux populaires à mettre en cache
 POPULAR_GAMES = [
@@ -53,52 +57,30 @@ POPULAR_GAMES = [
 ]
 
 
-async def warmup_cache(games: list[str], delay: float = 0.5):
+async def warmup_cache(games: list[str], concurrency: int = 2):
     """
     Remplit le cache avec une liste de jeux.
     
     Args:
         games: Liste des noms de jeux
-        delay: Délai entre chaque requête (éviter rate limit)
+        concurrency: Requêtes simultanées max (quota RAWG respecté)
     """
     config = load_config()
+    config.setdefault("warmup", {})["concurrency"] = concurrency
+    warmup_service.configure(config)
     
     print("\n" + "="*60)
     print("🔥 WARMUP DU CACHE")
     print("="*60)
     print(f"📋 {len(games)} jeux à charger")
-    print(f"⏱️ Délai: {delay}s entre chaque requête")
+    print(f"⏱️ Concurrence: {concurrency} requêtes simultanées")
     
     # Stats avant
     stats_before = GAME_CACHE.stats()
     print(f"📦 Cache avant: {stats_before['valid_entries']} entrées\n")
     
-    results = {
-        'success': 0,
-        'failed': 0,
-        'cached': 0,
-    }
-    
-    for i, game in enumerate(games, 1):
-        print(f"[{i}/{len(games)}] {game:30s} ", end='', flush=True)
-        
-        try:
-            data = await fetch_game_data(game, config)
-            
-            if data:
-                results['success'] += 1
-                print(f"✅ {data['name']} ({data.get('release_year', '?')})")
-            else:
-                results['failed'] += 1
-                print("❌ Non trouvé")
-            
-            # Petit délai pour ne pas spam l'API
-            if i < len(games):
-                await asyncio.sleep(delay)
-                
-        except Exception as e:
-            results['failed'] += 1
-            print(f"❌ Erreur: {e}")
+    await warmup_service.warm(games, reason="script")
+    stats = warmup_service.stats
     
     # Stats finales
     print("\n" + "="*60)
@@ -107,8 +89,10 @@ async def warmup_cache(games: list[str], delay: float = 0.5):
     
     stats_after = GAME_CACHE.stats()
     
-    print(f"✅ Succès:        {results['success']}/{len(games)}")
-    print(f"❌ Échecs:        {results['failed']}/{len(games)}")
+    print(f"✅ Succès:        {stats['warmed']}/{len(games)}")
+    print(f"⚡ Déjà en cache: {stats['already_cached']}")
+    print(f"❌ Échecs:        {stats['not_found']}/{len(games)}")
+    print(f"⛔ Quota RAWG:    {stats['skipped_quota']} ignoré(s)")
     print(f"📦 Entrées cache: {stats_after['valid_entries']}")
     print(f"📈 Nouvelles:     {stats_after['valid_entries'] - stats_before['valid_entries']}")
     
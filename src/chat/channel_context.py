@@ -0,0 +1,186 @@
+"""Contexte par salon Twitch (multi-channel).
+
+Un process peut tourner sur plusieurs salons partenaires. Chaque salon a son
+propre état : config effective (overrides), cooldowns, conversations, file
+d'envoi et sender API (badge bot, lié au broadcaster_id du salon).
+
+Les caches (jeux, Wikipedia) restent globaux : une donnée récupérée pour un
+salon sert à tous les autres.
+
+Config:
+    bot:
+      channel: serda                # Salon principal
+      channels:                     # Salons supplémentaires (optionnel)
+        partner_one:
+          enabled_commands: [game, ask]
+          cooldown: 20
+          broadcaster_id: "123456"  # Sinon résolu automatiquement
+        partner_two: {}
+"""
+
+import asyncio
+import copy
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.utils.conversation_manager import ConversationManager
+
+# Intervalle min entre 2 messages d'un même salon (limite Twitch : 20 msg / 30s)
+SEND_INTERVAL_DEFAULT = 0.0
+
+
+def channel_names(config: dict) -> List[str]:
+    """Salon principal + salons supplémentaires (ordre stable, sans doublon)."""
+    bot_config = config.get("bot", {})
+    names = [bot_config["channel"].lower()]
+    extra = bot_config.get("channels") or {}
+    for name in (extra if isinstance(extra, (list, tuple)) else extra.keys()):
+        name = str(name).lower().lstrip("#")
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def channel_config(config: dict, channel: str) -> dict:
+    """Config effective d'un salon : config globale + overrides de ``bot.channels``.
+
+    Les overrides remplacent les clés de la section ``bot`` ; ``broadcaster_id``
+    va dans ``twitch``. Le salon principal garde le broadcaster_id global.
+    """
+    merged = copy.deepcopy(config)
+    bot_config = merged.setdefault("bot", {})
+    extra = bot_config.pop("channels", None) or {}
+    is_main = channel == str(bot_config.get("channel", "")).lower()
+
+    overrides = {}
+    if isinstance(extra, dict):
+        for name, values in extra.items():
+            if str(name).lower().lstrip("#") == channel:
+                overrides = dict(values or {})
+    broadcaster_id = overrides.pop("broadcaster_id", None)
+
+    bot_config.update(overrides)
+    bot_config["channel"] = channel
+    twitch_config = merged.setdefault("twitch", {})
+    if broadcaster_id:
+        twitch_config["broadcaster_id"] = str(broadcaster_id)
+    elif not is_main:
+        twitch_config.pop("broadcaster_id", None)
+    return merged
+
+
+def set_broadcaster_id(config: dict, channel: str, broadcaster_id: str) -> None:
+    """Inscrit un broadcaster_id résolu dans la config (là où channel_config le lit)."""
+    bot_config = config.setdefault("bot", {})
+    if channel == str(bot_config.get("channel", "")).lower():
+        config.setdefault("twitch", {})["broadcaster_id"] = broadcaster_id
+        return
+    extra = bot_config.get("channels") or {}
+    if isinstance(extra, (list, tuple)):
+        extra = {str(name).lower().lstrip("#"): {} for name in extra}
+    for name in list(extra):
+        if str(name).lower().lstrip("#") == channel:
+            extra[name] = dict(extra[name] or {}, broadcaster_id=broadcaster_id)
+            break
+    else:
+        extra[channel] = {"broadcaster_id": broadcaster_id}
+    bot_config["channels"] = extra
+
+
+class ChannelContext:
+    """État d'un salon : config, cooldowns, conversations, envoi."""
+
+    def __init__(self, name: str, config: dict):
+        self.name = name
+        self.cooldowns: Dict[str, datetime] = {}
+        self.api_sender = None
+        self.api_enabled = False
+        self.automod = None
+        self.automod_enabled = False
+        self.blocked_terms = None  # BlockedTermsMirror (si AutoMod activé)
+        self.moderation = None  # ModerationQueue (timeouts/bans via Helix)
+        self.joined_once = False
+        self.last_reconnect_announce = 0.0
+
+        rate_limiting = config.get("rate_limiting", {})
+        max_idle_time = rate_limiting.get("max_idle_time", 3600)
+        max_messages = rate_limiting.get("max_messages_per_user", 12)
+        self.conversation_manager = ConversationManager(ttl_seconds=max_idle_time, max_messages=max_messages)
+
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._sender_task: Optional[asyncio.Task] = None
+        self._last_send = 0.0
+        self.apply_config(config)
+
+    def apply_config(self, config: dict):
+        """Applique la config effective du salon (boot ou hot reload)."""
+        self.config = config
+        self.enabled = config["bot"].get("enabled_commands", [])
+        self.auto_translate = config["bot"].get("auto_translate", True)
+        self.cooldown = config["bot"].get("cooldown", 60)
+        self.send_interval = config["bot"].get("send_interval", SEND_INTERVAL_DEFAULT)
+
+    @property
+    def broadcaster_id(self) -> Optional[str]:
+        return self.config.get("twitch", {}).get("broadcaster_id")
+
+    # ----- Cooldowns -----
+
+    def cooldown_remaining(self, user: str, now: datetime) -> int:
+        """Secondes de cooldown restantes pour un user dans ce salon (0 = libre)."""
+        last = self.cooldowns.get(user)
+        if last is None or now - last >= timedelta(seconds=self.cooldown):
+            return 0
+        return max(1, int(self.cooldown - (now - last).total_seconds()))
+
+    def mark_cooldown(self, user: str):
+        self.cooldowns[user] = datetime.now()
+
+    # ----- Envoi (file ordonnée par salon) -----
+
+    async def send(self, content: str, deliver: Callable[[str], Awaitable[None]]):
+        """Met le message en file et attend son envoi.
+
+        Les messages d'un salon partent dans l'ordre, espacés d'au moins
+        ``send_interval`` ; les salons ne se bloquent pas entre eux.
+        """
+        if self._send_queue is None:
+            self._send_queue = asyncio.Queue()
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = asyncio.create_task(self._send_loop())
+        done = asyncio.get_running_loop().create_future()
+        await self._send_queue.put((content, deliver, done))
+        await done
+
+    async def _send_loop(self):
+        assert self._send_queue is not None
+        while True:
+            content, deliver, done = await self._send_queue.get()
+            try:
+                wait = self.send_interval - (time.monotonic() - self._last_send)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await deliver(content)
+                self._last_send = time.monotonic()
+                if not done.done():
+                    done.set_result(None)
+            except Exception as e:
+                if not done.done():
+                    done.set_exception(e)
+            finally:
+                self._send_queue.task_done()
+
+    async def close(self):
+        if self._sender_task is not None:
+            self._sender_task.cancel()
+            try:
+                await self._sender_task
+            except asyncio.CancelledError:
+                pass
+        if self.blocked_terms is not None:
+            self.blocked_terms.stop()
+        if self.moderation is not None:
+            await self.moderation.close()
+        if self.api_sender is not None:
+            await self.api_sender.close()
@@ -5,6 +5,7 @@ Ce module implémente les fonctionnalités principales du bot Twitch, notamment
 - La traduction automatique des messages
 - La détection et le timeout des bots spam
 - La gestion des cooldowns
+- Le multi-salon : un ChannelContext par salon (config, cooldowns, conversations, envoi)
 
 Le bot utilise TwitchIO comme base et ajoute des fonctionnalités personnalisées.
 """
@@ -13,11 +14,15 @@ import asyncio
 import re
 import sys
 import traceback
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from twitchio.ext import commands  # type: ignore
 
-from src.config.config import load_config
+from config.config import config_service, load_config, thaw  # Même singleton que igdb/llm
+from core.warmup import warmup_service  # Même singleton que game_command (core.cache)
+from src.chat.channel_context import ChannelContext, channel_config, channel_names
+from src.core.commands.api.cheapshark import price_service
+from src.core.commands.api.steam_catalog import steam_catalog
 from src.core.commands.ask_command import handle_ask_command
 from src.core.commands.cache_commands import (
     handle_cacheadd_command,
@@ -28,52 +33,22 @@ from src.core.commands.chill_command import handle_chill_command
 from src.core.commands.donation_command import handle_donation_command
 from src.core.commands.game_command import handle_game_command
 from src.utils.cache_manager import load_cache
-from src.utils.conversation_manager import ConversationManager
-from src.utils.llm_detector import check_llm_status, get_llm_mode
+from src.utils.helix_client import bot_helix, close_helix, moderator_helix
+from src.utils.llm_detector import get_llm_mode
+from src.utils.moderation_queue import BURST_DEFAULT, CONCURRENCY_DEFAULT, RATE_DEFAULT, ModerationQueue
 from src.utils.translator import Translator
 from src.utils.twitch_api_sender import TwitchAPISender
-from src.utils.twitch_automod import TwitchAutoMod
-
-CONFIG = load_config()
-
-
-def fetch_user_id_sync(username: str, client_id: str, access_token: str) -> str | None:
-    """Récupère l'User ID Twitch d'un username de manière synchrone.
-    
-    Args:
-        username: Le nom d'utilisateur Twitch
-        client_id: Client ID de l'application
-        access_token: Token d'accès (app ou user)
-    
-    Returns:
-        L'User ID ou None si erreur
-    """
-    import requests
-    
-    try:
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Client-Id": client_id
-        }
-        
-        response = requests.get(
-            f"https://api.twitch.tv/helix/users?login={username}",
-            headers=headers,
-            timeout=5
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("data"):
-                user_id = data["data"][0]["id"]
-                return user_id
-        
-        print(f"❌ Erreur API Twitch ({response.status_code}): {response.text}")
-        return None
-        
-    except Exception as e:
-        print(f"❌ Exception lors de la récupération de l'User ID: {e}")
-        return None
+from src.utils.twitch_automod import SYNC_INTERVAL_DEFAULT, BlockedTermsMirror, TwitchAutoMod
+from src.utils.user_id_resolver import user_id_resolver
+from src.utils.warm_state import (
+    SNAPSHOT_FILE_DEFAULT,
+    SNAPSHOT_INTERVAL_DEFAULT,
+    WarmStateSnapshotter,
+    capture,
+    load_snapshot,
+    restore,
+)
+from utils.llm_health import llm_health  # Même singleton que utils.model_utils
 
 
 # Gestionnaire global pour capturer les exceptions non gérées
@@ -105,82 +80,47 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
         
         self.config: dict = config
         
+        # Un contexte par salon (config effective, cooldowns, conversations, envoi)
+        # Les caches (jeux, wiki, traducteur) restent partagés entre salons
+        self.channels: dict[str, ChannelContext] = {
+            name: ChannelContext(name, channel_config(self.config, name))
+            for name in channel_names(self.config)
+        }
+        self.main_channel = next(iter(self.channels))
+
         # Initialize TwitchIO Bot parent class
         super().__init__(
             token=self.config["twitch"]["token"],
             prefix='!',
-            initial_channels=[self.config["bot"]["channel"]]
+            initial_channels=list(self.channels)
         )
         
-        # Initialise le cache (avec reset si mode expérimental)
-        reset_cache = self.config.get("bot", {}).get("reset_cache_on_boot", False)
-        load_cache(reset=reset_cache)
-        self.cooldowns = {}
+        # Cache des faits : chargé après connexion (event_ready), pas avant l'IRC
+        self._cache_loaded = False
         self.botname = self.config["bot"]["name"].lower()
-        self.enabled = self.config["bot"].get("enabled_commands", [])
 
         # Initialize translator
         self.translator = Translator()
-        self.auto_translate = self.config["bot"].get("auto_translate", True)
 
-        # Initialize conversation manager (contexte conversationnel)
         rate_limiting = self.config.get("rate_limiting", {})
-        max_idle_time = rate_limiting.get("max_idle_time", 3600)
-        max_messages = rate_limiting.get("max_messages_per_user", 12)
-        self.conversation_manager = ConversationManager(ttl_seconds=max_idle_time, max_messages=max_messages)
-        print(f"💬 ConversationManager activé (TTL: {max_idle_time}s, max: {max_messages} messages)")
-
-        # Initialize AutoMod (if credentials available)
-        try:
-            self.automod = TwitchAutoMod(
-                client_id=self.config["twitch"]["client_id"],
-                access_token=self.config["twitch"]["token"].replace("oauth:", ""),
-                broadcaster_id=self.config["twitch"].get("broadcaster_id", self.config["twitch"]["bot_id"]),
-                moderator_id=self.config["twitch"]["bot_id"]
-            )
-            self.automod_enabled = True
-        except (KeyError, TypeError) as e:
-            print(f"⚠️ AutoMod désactivé (config manquante): {e}")
-            self.automod_enabled = False
-
-        # Initialize API Sender (badge bot 🤖)
-        try:
-            # Récupération auto du broadcaster_id si manquant
-            broadcaster_id = self.config["twitch"].get("broadcaster_id")
-            if not broadcaster_id:
-                print("🔍 broadcaster_id manquant, récupération automatique...")
-                channel_name = self.config["bot"]["channel"]
-                # Utiliser le bot_client_id si disponible, sinon fallback sur client_id
-                api_client_id = self.config["twitch"].get("bot_client_id") or self.config["twitch"]["client_id"]
-                api_token = self.config["twitch"].get("bot_user_token") or self.config["twitch"]["app_access_token"]
-                
-                broadcaster_id = fetch_user_id_sync(
-                    channel_name,
-                    api_client_id,
-                    api_token
-                )
-                if broadcaster_id:
-                    print(f"✅ broadcaster_id récupéré: {broadcaster_id} pour {channel_name}")
-                    self.config["twitch"]["broadcaster_id"] = broadcaster_id
-                else:
-                    raise ValueError(f"Impossible de récupérer l'ID de {channel_name}")
-            
-            # Utiliser le User Access Token du bot (pas l'App Access Token !)
-            bot_user_token = self.config["twitch"].get("bot_user_token") or self.config["twitch"]["app_access_token"]
-            api_client_id = self.config["twitch"].get("bot_client_id") or self.config["twitch"]["client_id"]
-            
-            self.api_sender = TwitchAPISender(
-                client_id=api_client_id,  # Client ID du bot
-                app_access_token=self.config["twitch"]["app_access_token"],
-                bot_user_token=bot_user_token,  # User Token avec user:write:chat + user:bot
-                broadcaster_id=broadcaster_id,
-                sender_id=self.config["twitch"]["bot_id"]
-            )
-            self.api_enabled = True
-            print("🤖 API Send Chat Message activée (badge bot enabled)")
-        except (KeyError, TypeError, ValueError) as e:
-            print(f"⚠️ API Send Chat désactivée (config manquante): {e}")
-            self.api_enabled = False
+        print(
+            f"💬 ConversationManager activé par salon "
+            f"(TTL: {rate_limiting.get('max_idle_time', 3600)}s, "
+            f"max: {rate_limiting.get('max_messages_per_user', 12)} messages)"
+        )
+        print(f"📺 Salons: {', '.join(self.channels)}")
+
+        for ctx in self.channels.values():
+            # Salon principal : AutoMod sur le broadcaster_id global (ou le bot à défaut)
+            # Salons partenaires : AutoMod + API Sender dès que leur broadcaster_id est connu.
+            # S'il manque, il est résolu en async après connexion :
+            # en attendant, safe_send passe par l'IRC
+            if ctx.name == self.main_channel:
+                self._init_automod(ctx, ctx.broadcaster_id or ctx.config["twitch"].get("bot_id"))
+            elif ctx.broadcaster_id:
+                self._init_automod(ctx, ctx.broadcaster_id)
+            if ctx.broadcaster_id:
+                self._init_api_sender(ctx, ctx.broadcaster_id)
 
         # Track first connection for welcome message
         self._first_connect_done = False
@@ -198,16 +138,230 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
             self.llm_available = True
             print("🔊 LLM forcé activé (config ou LLM_MODE=enabled)")
         else:  # auto
-            self.llm_available, status_msg = check_llm_status(self.config)
-            print(status_msg)
-            if not self.llm_available:
-                print("🔄 Note: Le LLM sera revérifié à chaque appel (retry intelligent)")
-        self._channel_joined_once = False  # Track première connexion vs reconnexion
-        self._last_reconnect_announce = 0  # Timestamp pour cooldown anti-spam
+            # Pas de probe bloquant au boot : le health monitor (lancé dans
+            # event_ready) met à jour llm_available en direct via le breaker
+            self.llm_available = True
+            llm_health.configure(self.config)
+            llm_health.add_listener(self._on_llm_health_change)
+            print("🩺 LLM en auto-détection (health monitor async)")
+        self._llm_mode = llm_mode
+
+        # Snapshot de l'état chaud (cache jeux, conversations, cooldowns, circuits LLM)
+        self._snapshotter = WarmStateSnapshotter(
+            self.config["bot"].get("snapshot_file", SNAPSHOT_FILE_DEFAULT),
+            self.config["bot"].get("snapshot_interval", SNAPSHOT_INTERVAL_DEFAULT),
+            lambda: capture(self.channels),
+        )
+        self._snapshot_task = None
+
+        # Warmup du cache jeux (catégorie du stream, top demandés, mentions chat)
+        warmup_service.configure(self.config)
+        user_id_resolver.configure(self.config)
+        steam_catalog.configure(self.config)
+        price_service.configure(self.config)
+
+    def save_warm_state(self):
+        """Sauvegarde immédiate de l'état chaud (arrêt, avant redémarrage)."""
+        if self._snapshotter.interval:
+            self._snapshotter.save_now()
+
+    async def _restore_warm_state(self):
+        """Restaure le dernier snapshot : un redémarrage repart à chaud."""
+        if not self._snapshotter.interval:
+            return
+        state = await asyncio.to_thread(load_snapshot, self._snapshotter.path)
+        if not state:
+            return
+        counts = restore(state, self.channels)
+        age = datetime.now().timestamp() - state.get("saved_at", 0)
+        print(
+            f"[SNAPSHOT] ♻️ État restauré (snapshot de {age:.0f}s) : "
+            f"{counts['game_cache']} jeux, {counts['conversations']} conversations, "
+            f"{counts['cooldowns']} cooldowns, {counts['llm_health']} circuits"
+        )
+
+    def get_context(self, channel_name: str) -> ChannelContext:
+        """Contexte du salon (créé à la volée si le bot a été invité ailleurs)."""
+        name = channel_name.lower().lstrip("#")
+        ctx = self.channels.get(name)
+        if ctx is None:
+            ctx = ChannelContext(name, channel_config(self.config, name))
+            self.channels[name] = ctx
+        return ctx
+
+    def _init_automod(self, ctx: ChannelContext, broadcaster_id: str | None):
+        """Active l'API AutoMod (blocked terms, niveau) pour ce salon."""
+        try:
+            helix = moderator_helix(ctx.config["twitch"])
+            if helix is None:
+                raise KeyError("client_id/token")
+            ctx.automod = TwitchAutoMod(
+                helix=helix,
+                broadcaster_id=broadcaster_id,
+                moderator_id=ctx.config["twitch"]["bot_id"]
+            )
+            if ctx.blocked_terms is not None:
+                ctx.blocked_terms.stop()
+                ctx.blocked_terms = None
+            if ctx.moderation is not None:
+                ctx.moderation.stop()
+                ctx.moderation = None
+            # Miroir des mots bannis et file de modération : seulement sur le vrai
+            # salon, pas sur le repli bot_id (ils viseraient le salon du bot)
+            if broadcaster_id and broadcaster_id == ctx.broadcaster_id:
+                ctx.blocked_terms = BlockedTermsMirror(
+                    ctx.automod, ctx.config["bot"].get("blocked_terms_sync_interval", SYNC_INTERVAL_DEFAULT)
+                )
+                if self._loop_running():
+                    # Miroir créé après le boot (résolution tardive de l'ID) : synchro tout de suite
+                    ctx.blocked_terms.start()
+                moderation = ctx.config.get("moderation", {}) or {}
+                ctx.moderation = ModerationQueue(
+                    helix,
+                    broadcaster_id=broadcaster_id,
+                    moderator_id=ctx.config["twitch"]["bot_id"],
+                    resolve_id=user_id_resolver.resolve,
+                    concurrency=moderation.get("concurrency", CONCURRENCY_DEFAULT),
+                    rate=moderation.get("rate", RATE_DEFAULT),
+                    burst=moderation.get("burst", BURST_DEFAULT),
+                )
+            ctx.automod_enabled = True
+        except (KeyError, TypeError, AttributeError) as e:
+            print(f"⚠️ AutoMod désactivé sur #{ctx.name} (config manquante): {e}")
+            ctx.automod_enabled = False
+
+    @staticmethod
+    def _loop_running() -> bool:
+        """True si une boucle asyncio tourne (sinon la synchro part au _deferred_boot)."""
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    def _init_api_sender(self, ctx: ChannelContext, broadcaster_id: str):
+        """Active l'API Send Chat Message (badge bot 🤖) pour ce salon."""
+        try:
+            # User Access Token du bot (user:write:chat + user:bot), pas l'App Access Token
+            helix = bot_helix(ctx.config["twitch"])
+            if helix is None:
+                raise KeyError("bot_user_token/app_access_token")
+            ctx.api_sender = TwitchAPISender(
+                helix=helix,
+                broadcaster_id=broadcaster_id,
+                sender_id=ctx.config["twitch"]["bot_id"]
+            )
+            ctx.api_enabled = True
+            print(f"🤖 API Send Chat Message activée sur #{ctx.name} (badge bot enabled)")
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"⚠️ API Send Chat désactivée sur #{ctx.name} (config manquante): {e}")
+            ctx.api_enabled = False
+
+    async def _resolve_broadcaster_id(self, ctx: ChannelContext):
+        """Récupération auto du broadcaster_id manquant (après connexion IRC)."""
+        channel_name = ctx.name
+        if bot_helix(ctx.config.get("twitch", {})) is None:
+            print("⚠️ API Send Chat désactivée (config manquante): bot_user_token/app_access_token")
+            return
+        
+        # Salons résolus ensemble : un seul appel /users (resolver par lots, en cache)
+        print(f"🔍 broadcaster_id manquant pour #{channel_name}, récupération automatique...")
+        broadcaster_id = await user_id_resolver.resolve(channel_name)
+        if not broadcaster_id:
+            print(f"⚠️ API Send Chat désactivée: impossible de récupérer l'ID de {channel_name}")
+            return
+        print(f"✅ broadcaster_id récupéré: {broadcaster_id} pour {channel_name}")
+        ctx.config["twitch"]["broadcaster_id"] = broadcaster_id
+        if ctx.name == self.main_channel:
+            self.config["twitch"]["broadcaster_id"] = broadcaster_id
+        self._init_automod(ctx, broadcaster_id)
+        self._init_api_sender(ctx, broadcaster_id)
+
+    async def _deferred_boot(self):
+        """Travail de boot non critique, lancé une fois connecté au chat."""
+        if not self._cache_loaded:
+            self._cache_loaded = True
+            reset_cache = self.config.get("bot", {}).get("reset_cache_on_boot", False)
+            await asyncio.to_thread(load_cache, reset_cache)
+            await self._restore_warm_state()
+        missing = [ctx for ctx in self.channels.values() if ctx.api_sender is None and not ctx.broadcaster_id]
+        if missing:
+            await asyncio.gather(*(self._resolve_broadcaster_id(ctx) for ctx in missing))
+        # Après la résolution des broadcaster_id (suivi de catégorie via Helix)
+        self._start_blocked_terms()
+        self._start_warmup()
+
+    def _start_blocked_terms(self):
+        """Synchro des miroirs de mots bannis (pré-filtre local, !banwords)."""
+        for ctx in self.channels.values():
+            if ctx.blocked_terms is not None:
+                ctx.blocked_terms.start()
+
+    def _start_warmup(self):
+        """Warmup du cache jeux en tâche de fond (boot + changements de catégorie)
+        et rafraîchissement du catalogue Steam local et des prix populaires."""
+        warmup_service.start(lambda: [(ctx.name, ctx.broadcaster_id) for ctx in self.channels.values()])
+        steam_catalog.start()
+        price_service.start()
+
+    # Clés qui nécessitent un redémarrage (connexion IRC / identité du bot)
+    _RESTART_KEYS = (("twitch", "token"), ("bot", "channel"), ("bot", "name"))
+
+    def apply_config(self, new_config, old_config=None):
+        """Subscriber config_service : applique une nouvelle config à chaud.
+
+        La config complète est remplacée d'un bloc ; les valeurs lues à chaque
+        message (cooldowns, max_tokens, hedging...) suivent automatiquement.
+        """
+        config = thaw(new_config)
+        # Valeurs résolues au runtime, absentes du fichier
+        broadcaster_id = self.config.get("twitch", {}).get("broadcaster_id")
+        if broadcaster_id and not config.get("twitch", {}).get("broadcaster_id"):
+            config.setdefault("twitch", {})["broadcaster_id"] = broadcaster_id
+
+        for section, key in self._RESTART_KEYS:
+            if config.get(section, {}).get(key) != self.config.get(section, {}).get(key):
+                print(f"[CONFIG] ⚠️ {section}.{key} modifié : redémarrage nécessaire pour l'appliquer")
+        if channel_names(config) != channel_names(self.config):
+            print("[CONFIG] ⚠️ bot.channels modifié : redémarrage nécessaire pour rejoindre/quitter des salons")
+
+        self.config = config
+        for ctx in self.channels.values():
+            ctx_config = channel_config(config, ctx.name)
+            # broadcaster_id résolu au runtime pour ce salon
+            if ctx.broadcaster_id and not ctx_config["twitch"].get("broadcaster_id"):
+                ctx_config["twitch"]["broadcaster_id"] = ctx.broadcaster_id
+            ctx.apply_config(ctx_config)
+        llm_health.configure(config)
+        warmup_service.configure(config)
+        user_id_resolver.configure(config)
+        steam_catalog.configure(config)
+        price_service.configure(config)
+        enabled = self.channels[self.main_channel].enabled
+        print(f"[CONFIG] ✅ Config appliquée sur {len(self.channels)} salon(s) (commandes: {', '.join(enabled)})")
+
+    def _on_llm_health_change(self, endpoint: str, available: bool):
+        """Callback llm_health : bascule LLM ↔ mode fallback sans redémarrer."""
+        if endpoint != self._llm_endpoint() or available == self.llm_available:
+            return
+        self.llm_available = available
+        if available:
+            print(f"✅ LLM détecté : {endpoint}")
+        else:
+            print("⚠️  LLM non disponible → mode fallback activé")
+
+    def _llm_endpoint(self) -> str | None:
+        return self.config["bot"].get("model_endpoint") or self.config["bot"].get("api_url")
 
     async def event_ready(self):
         print(f'\n🤖 Connected to Twitch chat as {self.nick}')
         self._display_model_config()
+        if self._llm_mode == "auto":
+            llm_health.start([self._llm_endpoint()])
+        # Cache disque + IDs Helix : en tâche de fond, le chat est déjà connecté
+        self._boot_task = asyncio.create_task(self._deferred_boot())
+        if self._snapshotter.interval and self._snapshot_task is None:
+            self._snapshot_task = asyncio.create_task(self._snapshotter.run())
         print("☕️ Boot complete.")
         print("🤖 SerdaBot is online and ready.")
         self._booted = True
@@ -215,12 +369,15 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
         # Envoie le message de connexion uniquement à la première connexion
         if not self._first_connect_done:
             self._first_connect_done = True
-            connect_message = self.config["bot"].get("connect_message", "").strip()
-            if connect_message and self.connected_channels:
+            for channel in self.connected_channels:
+                ctx = self.get_context(channel.name)
+                connect_message = ctx.config["bot"].get("connect_message", "").strip()
+                if not connect_message:
+                    continue
                 try:
-                    await self.safe_send(self.connected_channels[0], connect_message)
+                    await self.safe_send(channel, connect_message)
                 except Exception as e:
-                    print(f"[ERROR] Impossible d'envoyer le message de connexion : {e}")
+                    print(f"[ERROR] Impossible d'envoyer le message de connexion sur #{ctx.name} : {e}")
 
     def _display_model_config(self):
         """Affiche la configuration du modèle au démarrage."""
@@ -286,8 +443,12 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
         
         return False
 
-    async def run_with_cooldown(self, user, action):
-        """Execute action with cooldown management and error handling."""
+    async def run_with_cooldown(self, ctx: ChannelContext, user, action):
+        """Execute action with cooldown management and error handling.
+
+        Le cooldown est propre au salon : un user en cooldown sur un salon
+        peut toujours utiliser le bot ailleurs.
+        """
         try:
             await action()
         except ValueError as e:
@@ -305,7 +466,7 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
             print("Détails de l'erreur:")
             print(traceback.format_exc())
         finally:
-            self.cooldowns[user] = datetime.now()
+            ctx.mark_cooldown(user)
             print(
                 f'[{datetime.now().strftime("%H:%M:%S")}] ✅ Prêt à écouter de nouvelles commandes.'
             )
@@ -327,7 +488,13 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
         content = str(message.content).strip()
         user = str(message.author.name or "user").lower()
         now = datetime.now()
-        cooldown = self.config["bot"].get("cooldown", 60)
+        ctx = self.get_context(message.channel.name)
+        config = ctx.config
+
+        # ID Helix de l'auteur (tag IRC) : évite un appel /users plus tard (modération)
+        user_id = (getattr(message, "tags", None) or {}).get("user-id")
+        if user_id:
+            user_id_resolver.remember(user, user_id)
         
         # Remove @mention from start for command parsing
         content_without_mention = re.sub(r"^@\w+\s+", "", content)
@@ -362,6 +529,11 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
             channel_owner = message.channel.name.lower()
             if self.translator.is_spam_bot(user, content, channel_owner):
                 print(f"🚫 Spam bot détecté: {user} - Message: {content[:50]}")
+                if ctx.moderation is not None:
+                    # File de modération Helix : dédupliquée, hors budget d'envoi du chat
+                    if ctx.moderation.submit(user, user_id, duration=60, reason="Spam bot"):
+                        print(f"✅ Timeout en file (Helix): {user} (60 sec)")
+                    return
                 try:
                     # Timeout le bot spam (60s = 1min) - Via commande chat
                     timeout_command = f"/timeout {user} 60"
@@ -378,8 +550,16 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
                 # Log pour debug (optionnel)
                 print(f"💬 Message de {user}: {content[:30]}... [OK]")
 
+        # === MOTS BANNIS AUTOMOD (miroir local, sans appel API) ===
+        # Après la détection de spam : un bot qui poste un mot banni est quand même sanctionné
+        if not is_mod and ctx.blocked_terms is not None:
+            term = ctx.blocked_terms.match(content)
+            if term:
+                print(f"🚫 Mot banni AutoMod '{term}' dans le message de {user}, ignoré")
+                return
+
         # === AUTO-TRADUCTION DEVS ===
-        if self.auto_translate and self.translator.should_translate(user, content):
+        if ctx.auto_translate and self.translator.should_translate(user, content):
             try:
                 translated = self.translator.translate(content, "en", "fr")
                 if translated and not translated.startswith("⚠️"):
@@ -396,10 +576,14 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
                     f"🌐 @{user}: {content}\n└─ ⚠️ Traduction indisponible"
                 )
 
-        # Check cooldown
-        if user in self.cooldowns and now - self.cooldowns[user] < timedelta(seconds=cooldown):
-            remaining = int(cooldown - (now - self.cooldowns[user]).total_seconds())
-            print(f"⏳ {user} en cooldown ({remaining}s restant)")
+        # Jeux cités dans le chat → warmup (même si l'auteur est en cooldown)
+        if cleaned.startswith("!gameinfo "):
+            warmup_service.note_request(content_without_mention[10:])
+
+        # Check cooldown (par salon)
+        remaining = ctx.cooldown_remaining(user, now)
+        if remaining:
+            print(f"⏳ {user} en cooldown sur #{ctx.name} ({remaining}s restant)")
             return
 
         # === COMMANDES TRADUCTION (MOD ONLY) ===
@@ -480,7 +664,8 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
 
         # === AUTOMOD TWITCH COMMANDS (API) ===
         elif cleaned.startswith("!addbanword") and is_mod:
-            if not self.automod_enabled:
+            # Pas de miroir tant que le broadcaster_id du salon est inconnu (repli bot_id)
+            if not ctx.automod_enabled or ctx.blocked_terms is None:
                 await self.safe_send(message.channel, "⚠️ AutoMod API désactivé (config/scopes manquants)")
                 return
             
@@ -488,7 +673,7 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
             if len(parts) > 1:
                 word = " ".join(parts[1:])  # Support phrases avec espaces
                 print(f"[AUTOMOD] 📞 Appel API add_blocked_term pour '{word}'...")
-                result = await self.automod.add_blocked_term(word)
+                result = await ctx.blocked_terms.add(word)
                 if result:
                     print(f"[AUTOMOD] ✅ Confirmation : mot '{word}' ajouté avec succès")
                     await self.safe_send(
@@ -504,35 +689,35 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
             return
 
         elif cleaned.startswith("!removebanword") and is_mod:
-            if not self.automod_enabled:
+            # Pas de miroir tant que le broadcaster_id du salon est inconnu (repli bot_id)
+            if not ctx.automod_enabled or ctx.blocked_terms is None:
                 await self.safe_send(message.channel, "⚠️ AutoMod API désactivé (config/scopes manquants)")
                 return
             
             parts = content.split()
             if len(parts) > 1:
                 word = " ".join(parts[1:])
-                # Trouver l'ID du term par son texte
-                term = await self.automod.find_blocked_term_by_text(word)
-                if term:
-                    success = await self.automod.remove_blocked_term(term["id"])
-                    if success:
-                        await self.safe_send(message.channel, f"✅ Mot '{word}' retiré de l'AutoMod.")
-                    else:
-                        await self.safe_send(message.channel, "❌ Erreur lors de la suppression.")
-                else:
+                # ID du term lu dans le miroir local
+                success = await ctx.blocked_terms.remove(word)
+                if success:
+                    await self.safe_send(message.channel, f"✅ Mot '{word}' retiré de l'AutoMod.")
+                elif success is None:
                     await self.safe_send(message.channel, f"ℹ️ '{word}' n'est pas dans la liste AutoMod.")
+                else:
+                    await self.safe_send(message.channel, "❌ Erreur lors de la suppression.")
             else:
                 await self.safe_send(message.channel, f"@{user} Usage: !removebanword <mot>")
             return
 
         elif cleaned.startswith("!banwords") and is_mod:
-            if not self.automod_enabled:
+            # Pas de miroir tant que le broadcaster_id du salon est inconnu (repli bot_id)
+            if not ctx.automod_enabled or ctx.blocked_terms is None:
                 await self.safe_send(message.channel, "⚠️ AutoMod API désactivé (config/scopes manquants)")
                 return
             
-            terms = await self.automod.get_blocked_terms()
-            if terms:
-                words = [t["text"] for t in terms]
+            await ctx.blocked_terms.ensure_synced()
+            words = ctx.blocked_terms.texts()
+            if words:
                 words_str = ", ".join(words)
                 await self.safe_send(
                     message.channel,
@@ -543,7 +728,7 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
             return
 
         elif cleaned.startswith("!automod") and is_mod:
-            if not self.automod_enabled:
+            if not ctx.automod_enabled:
                 await self.safe_send(message.channel, "⚠️ AutoMod API désactivé (config/scopes manquants)")
                 return
             
@@ -551,7 +736,7 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
             if len(parts) > 1 and parts[1].isdigit():
                 level = int(parts[1])
                 if 0 <= level <= 4:
-                    success = await self.automod.set_automod_level(level)
+                    success = await ctx.automod.set_automod_level(level)
                     if success:
                         levels_desc = ["Désactivé", "Faible", "Modéré", "Élevé", "Strict"]
                         await self.safe_send(
@@ -705,13 +890,13 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
                 await self.safe_send(message.channel,  f"@{user} Usage: !translate <texte>")
             return
 
-        if cleaned.startswith("!gameinfo ") and "game" in self.enabled:
+        if cleaned.startswith("!gameinfo ") and "game" in ctx.enabled:
             game_name = content_without_mention[10:].strip()
             await self.run_with_cooldown(
-                user, lambda: handle_game_command(message, self.config, game_name, now, bot=self)
+                ctx, user, lambda: handle_game_command(message, config, game_name, now, bot=self)
             )
 
-        elif cleaned.startswith("!ask") and "ask" in self.enabled:
+        elif cleaned.startswith("!ask") and "ask" in ctx.enabled:
             query = content_without_mention[4:].strip()
             if query == "":
                 await self.safe_send(
@@ -721,36 +906,38 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
                 )
                 return
             await self.run_with_cooldown(
-                user, lambda: handle_ask_command(message, self.config, query, now, llm_available=self.llm_available, bot=self)
+                ctx, user, lambda: handle_ask_command(message, config, query, now, llm_available=self.llm_available, bot=self)
             )
 
         elif cleaned.startswith("!cacheadd "):
             # Commande admin: ajouter un fait au cache
             args = content_without_mention[10:].strip()
-            await handle_cacheadd_command(message, self.config, args)
+            await handle_cacheadd_command(message, config, args)
 
         elif cleaned == "!cachestats":
             # Commande admin: statistiques du cache
-            await handle_cachestats_command(message, self.config)
+            await handle_cachestats_command(message, config)
 
         elif cleaned == "!cacheclear":
             # Commande admin: vider le cache (DANGER)
-            await handle_cacheclear_command(message, self.config)
+            await handle_cacheclear_command(message, config)
 
         elif cleaned.startswith("!donationserda") or cleaned.startswith("!serdakofi"):
             await self.run_with_cooldown(
-                user, lambda: handle_donation_command(message, self.config, now)
+                ctx, user, lambda: handle_donation_command(message, config, now)
             )
 
-        elif is_mentioned and "chill" in self.enabled:
+        elif is_mentioned and "chill" in ctx.enabled:
             await self.run_with_cooldown(
-                user, lambda: handle_chill_command(message, self.config, now, conversation_manager=self.conversation_manager, llm_available=self.llm_available, bot=self, translator=self.translator)
+                ctx, user, lambda: handle_chill_command(message, config, now, conversation_manager=ctx.conversation_manager, llm_available=self.llm_available, bot=self, translator=self.translator)
             )
 
     async def safe_send(self, channel, content):
         """Envoie un message de manière sécurisée avec gestion des erreurs.
 
-        Utilise l'API Send Chat Message (badge bot 🤖) avec fallback IRC.
+        Passe par la file d'envoi du salon (ordre garanti, un salon lent ne
+        bloque pas les autres), puis API Send Chat Message (badge bot 🤖)
+        avec fallback IRC.
 
         Args:
             channel: Le canal où envoyer le message
@@ -758,12 +945,16 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
         """
         if len(content) > 500:
             content = content[:497] + "..."
-        
+        ctx = self.get_context(channel.name)
+        await ctx.send(content, lambda text: self._deliver(ctx, channel, text))
+
+    async def _deliver(self, ctx: ChannelContext, channel, content):
+        """Envoi effectif d'un message (API du salon, sinon IRC)."""
         # Essayer l'API d'abord (badge bot 🤖)
-        if self.api_enabled:
+        if ctx.api_enabled:
             try:
                 print(f"[API] 📤 Tentative d'envoi via API: {content[:100]}...")
-                success = await self.api_sender.send_message(content, use_badge=True)
+                success = await ctx.api_sender.send_message(content, use_badge=True)
                 if success:
                     print("[API] ✅ Message envoyé avec badge bot!")
                     return
@@ -819,10 +1010,11 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
         C'est ici qu'on annonce le retour après une reconnexion.
         """
         print(f"[JOIN] ✅ Bot rejoint le salon: {channel.name}")
+        ctx = self.get_context(channel.name)
         
         # Si c'est la première fois qu'on joint, on marque juste
-        if not self._channel_joined_once:
-            self._channel_joined_once = True
+        if not ctx.joined_once:
+            ctx.joined_once = True
             print("[JOIN] 📍 Première connexion au salon")
             return
         
@@ -832,12 +1024,12 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
             
             # Cooldown anti-spam
             now = datetime.now().timestamp()
-            cooldown = self.config.get("reconnect_announce_cooldown", 10)
-            if now - self._last_reconnect_announce < cooldown:
+            cooldown = ctx.config.get("reconnect_announce_cooldown", 10)
+            if now - ctx.last_reconnect_announce < cooldown:
                 print(f"[RECONNECT] ⏳ Cooldown actif ({cooldown}s), message ignoré")
                 return
             
-            self._last_reconnect_announce = now
+            ctx.last_reconnect_announce = now
             try:
                 await channel.send("Me revoilà, petite coupure de connexion ! 🔌")
                 print("[RECONNECT] ✅ Message envoyé avec succès")
@@ -846,17 +1038,40 @@ class TwitchBot(commands.Bot):  # pyright: ignore[reportPrivateImportUsage]
     
 
 
-def run_bot(config):
-    """Lance le bot Twitch avec la configuration donnée."""
+def run_bot(config=None):
+    """Lance le bot Twitch.
+
+    Sans config explicite, utilise config_service : le fichier est surveillé
+    et les changements sont appliqués à chaud (pas de redémarrage).
+    Avec ``bot.workers`` > 0 : ingestion IRC + pool de workers multi-process.
+    """
+    workers = (config or config_service.snapshot)["bot"].get("workers", 0)
+    if workers:
+        from src.chat.worker_pool import run_pool
+        run_pool(config)
+        return
+
     async def main():
-        bot = TwitchBot(config)
-        await bot.start()
+        if config is not None:
+            bot = TwitchBot(config)
+        else:
+            bot = TwitchBot(thaw(config_service.snapshot))
+            config_service.subscribe(bot.apply_config)
+            interval = bot.config["bot"].get("config_reload_interval", 2)
+            if interval:
+                config_service.watch(interval)
+        try:
+            await bot.start()
+        finally:
+            bot.save_warm_state()
+            user_id_resolver.save()
+            await close_helix()
 
     asyncio.run(main())
 
 if __name__ == "__main__":
     try:
-        run_bot(CONFIG)
+        run_bot()
     except KeyboardInterrupt:
         print("\n👋 Arrêt du bot demandé (Ctrl+C)")
         print("✅ Bot arrêté proprement")
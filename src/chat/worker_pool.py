@@ -0,0 +1,338 @@
+"""Scale-out multi-process : un process d'ingestion IRC + N workers.
+
+Le process d'ingestion garde la connexion Twitch (lecture du chat, envoi
+des réponses) et ne fait rien de coûteux : chaque message est normalisé en
+ChatEvent (picklable) puis poussé dans la file d'un worker. Les workers
+exécutent le traitement complet (routing regex, scoring RAWG, traduction,
+LLM) et renvoient leurs messages via une file de sortie commune.
+
+- Shard par (salon, user) : un user tombe toujours sur le même worker,
+  donc ses cooldowns et son historique de conversation restent cohérents.
+- Caches partagés : GAME_CACHE passe sur SQLite (GAME_CACHE_DB), commun à
+  tous les workers.
+- Warmup : seul le worker 0 préchauffe le cache partagé ; les autres lui
+  transmettent les jeux demandés (popularité) via l'ingestion.
+- Warm restart : chaque worker sauvegarde et restaure l'état chaud de son
+  shard dans ``<snapshot_file>.w<index>``. Changer ``bot.workers`` redistribue
+  les users : l'état d'un user restauré sur un autre shard expire sans servir.
+- broadcaster_id manquants résolus par l'ingestion avant le lancement :
+  les workers reçoivent une config complète (AutoMod, modération, warmup
+  sur le bon salon) sans refaire la résolution chacun de leur côté.
+- Hot reload : la nouvelle config est diffusée à chaque worker, de même
+  que les listes du Translator (devs, sites bloqués, bots) modifiées par
+  une commande mod traitée sur un seul worker.
+
+Tout tourne sur une seule machine (multiprocessing, pas de broker).
+
+Config:
+    bot:
+      workers: 4                               # 0 = mono-process (défaut)
+      shared_cache_db: cache/game_cache.sqlite3
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config.config import config_service, thaw  # Même singleton que le bot
+from core.warmup import warmup_service  # Même singleton que twitch_bot
+from src.chat.channel_context import channel_config, channel_names, set_broadcaster_id
+from src.chat.twitch_bot import TwitchBot
+from src.core.commands.api.cheapshark import price_service  # Même singleton que twitch_bot
+from src.utils.cache_manager import load_cache
+from src.utils.helix_client import close_helix
+from src.utils.user_id_resolver import user_id_resolver
+from utils.llm_health import llm_health  # Même singleton que utils.model_utils
+
+SHARED_CACHE_DB_DEFAULT = "cache/game_cache.sqlite3"
+WORKER_JOIN_TIMEOUT = 5  # Secondes laissées à un worker pour finir à l'arrêt
+
+# Types des messages de sortie (worker → ingestion)
+SEND = "send"   # safe_send (file du salon, API badge → IRC)
+RAW = "raw"     # channel.send direct (ex: /timeout)
+RELOAD = "reload"  # Listes du Translator modifiées par un worker → rechargées partout
+POPULARITY = "popularity"  # Jeu demandé (!gameinfo) → compté par le worker 0, seul à faire le warmup
+
+
+@dataclass
+class ChatEvent:
+    """Message de chat normalisé, transmis de l'ingestion aux workers."""
+
+    channel: str
+    author: str
+    content: str
+    is_mod: bool = False
+    tags: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_message(cls, message) -> "ChatEvent":
+        return cls(
+            channel=message.channel.name.lower(),
+            author=str(message.author.name or "user"),
+            content=str(message.content),
+            is_mod=bool(getattr(message.author, "is_mod", False)),
+            tags=dict(getattr(message, "tags", None) or {}),
+        )
+
+    @property
+    def shard_key(self) -> str:
+        return f"{self.channel}:{self.author.lower()}"
+
+
+def shard_for(event: ChatEvent, workers: int) -> int:
+    """Index du worker pour cet événement (stable entre redémarrages)."""
+    return zlib.crc32(event.shard_key.encode("utf-8")) % workers
+
+
+class ProxyChannel:
+    """Salon vu depuis un worker : les envois repartent vers l'ingestion."""
+
+    def __init__(self, name: str, outbox):
+        self.name = name
+        self._outbox = outbox
+
+    async def send(self, content: str):
+        self._outbox.put((RAW, self.name, content))
+
+
+class ProxyAuthor:
+    def __init__(self, name: str, is_mod: bool, channel: str):
+        self.name = name
+        self.display_name = name
+        self.is_mod = is_mod
+        self.is_broadcaster = name.lower() == channel
+
+
+class ProxyMessage:
+    """Interface minimale de twitchio.Message utilisée par les handlers."""
+
+    echo = False
+
+    def __init__(self, event: ChatEvent, outbox):
+        self.content = event.content
+        self.tags = event.tags
+        self.channel = ProxyChannel(event.channel, outbox)
+        self.author = ProxyAuthor(event.author, event.is_mod, event.channel)
+
+
+class WorkerBot(TwitchBot):
+    """TwitchBot sans connexion IRC : traite les ChatEvent d'un shard."""
+
+    def __init__(self, config: dict, outbox):
+        super().__init__(config)
+        self._outbox = outbox
+
+    async def safe_send(self, channel, content):
+        if len(content) > 500:
+            content = content[:497] + "..."
+        self._outbox.put((SEND, channel.name, content))
+
+    async def event_message(self, message) -> None:
+        version = self.translator.version
+        await super().event_message(message)
+        # !adddev, !blocksite, !addwhitebot... : les autres workers rechargent les listes
+        if self.translator.version != version:
+            self._outbox.put((RELOAD, "", "translator"))
+
+
+async def _worker_loop(index: int, config: dict, inbox, outbox):
+    bot = WorkerBot(config, outbox)
+    # État chaud du shard (conversations, cooldowns, circuits LLM) : un fichier par worker
+    bot._snapshotter.path = f"{bot._snapshotter.path}.w{index}"
+    reset_cache = config.get("bot", {}).get("reset_cache_on_boot", False) and index == 0
+    await asyncio.to_thread(load_cache, reset_cache)
+    await bot._restore_warm_state()
+    snapshot_task = asyncio.create_task(bot._snapshotter.run()) if bot._snapshotter.interval else None
+    if bot._llm_mode == "auto":
+        llm_health.start([bot._llm_endpoint()])
+    bot._start_blocked_terms()
+    if index == 0:
+        # Un seul worker préchauffe le cache SQLite partagé (et le catalogue Steam)
+        bot._start_warmup()
+    else:
+        # Prix en mémoire, propres à chaque process : chaque worker rafraîchit les siens
+        price_service.start()
+        # Popularité (top-N du warmup) comptée une seule fois, dans le worker 0
+        warmup_service.forward = lambda name: outbox.put((POPULARITY, "", name))
+    print(f"[WORKER {index}] ✅ Prêt (pid {os.getpid()})")
+
+    tasks = set()
+    while True:
+        item = await asyncio.to_thread(inbox.get)
+        if item is None:
+            break
+        if isinstance(item, tuple) and item[0] == "config":
+            bot.apply_config(item[1])
+            continue
+        if isinstance(item, tuple) and item[0] == "translator":
+            bot.translator.reload()
+            continue
+        if isinstance(item, tuple) and item[0] == POPULARITY:
+            warmup_service.note_request(item[1])
+            continue
+        task = asyncio.create_task(bot.event_message(ProxyMessage(item, outbox)))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    warmup_service.forward = None
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    bot.save_warm_state()
+    await llm_health.stop()
+    user_id_resolver.save()
+    print(f"[WORKER {index}] 👋 Arrêté")
+
+
+def _worker_main(index: int, config: dict, inbox, outbox):
+    """Point d'entrée d'un process worker."""
+    try:
+        asyncio.run(_worker_loop(index, config, inbox, outbox))
+    except KeyboardInterrupt:
+        pass
+
+
+class IngestBot(TwitchBot):
+    """Process d'ingestion : lit le chat, dispatche, envoie les réponses."""
+
+    def __init__(self, config: dict, inboxes: List, outbox):
+        super().__init__(config)
+        self._inboxes = inboxes
+        self._outbox = outbox
+        self._outbox_task: Optional[asyncio.Task] = None
+        self.dispatched = [0] * len(inboxes)
+        # L'état chaud (conversations, cooldowns) vit dans les workers, qui ont
+        # chacun leur snapshot (<snapshot_file>.w<index>) : ici il serait vide
+        self._snapshotter.interval = 0
+
+    def _start_warmup(self):
+        # Le cache jeux de l'ingestion n'est pas utilisé : warmup fait par le worker 0
+        pass
+
+    async def _deferred_boot(self):
+        # Le cache des faits est chargé par les workers, ici seulement les IDs Helix
+        self._cache_loaded = True
+        await super()._deferred_boot()
+
+    async def event_ready(self):
+        await super().event_ready()
+        if self._outbox_task is None:
+            self._outbox_task = asyncio.create_task(self._drain_outbox())
+
+    async def event_message(self, message) -> None:
+        if message.echo:
+            return
+        event = ChatEvent.from_message(message)
+        index = shard_for(event, len(self._inboxes))
+        self._inboxes[index].put(event)
+        self.dispatched[index] += 1
+
+    def apply_config(self, new_config, old_config=None):
+        super().apply_config(new_config, old_config)
+        for inbox in self._inboxes:
+            inbox.put(("config", self.config))
+
+    async def _drain_outbox(self):
+        """Relaie les messages des workers vers Twitch (ordre conservé par salon)."""
+        while True:
+            try:
+                kind, channel_name, content = await asyncio.to_thread(self._outbox.get, True, 1)
+            except queue.Empty:
+                continue
+            if kind == RELOAD:
+                # Diffusé comme la config : chaque worker relit les fichiers modifiés
+                for inbox in self._inboxes:
+                    inbox.put((content, None))
+                continue
+            if kind == POPULARITY:
+                self._inboxes[0].put((POPULARITY, content))
+                continue
+            channel = self.get_channel(channel_name)
+            if channel is None:
+                print(f"[POOL] ⚠️ Salon #{channel_name} non connecté, message ignoré")
+                continue
+            # Tâches créées dans l'ordre → la file du salon garde l'ordre d'arrivée
+            if kind == SEND:
+                asyncio.create_task(self.safe_send(channel, content))
+            else:
+                asyncio.create_task(channel.send(content))
+
+
+async def resolve_channel_ids(config: dict) -> None:
+    """Résout les broadcaster_id manquants et les inscrit dans ``config``.
+
+    Appelé avant start_workers : les workers ne lancent pas _deferred_boot,
+    sans ID l'AutoMod viserait le salon du bot et le warmup sauterait le salon.
+    """
+    missing = [name for name in channel_names(config) if not channel_config(config, name)["twitch"].get("broadcaster_id")]
+    if not missing:
+        return
+    user_id_resolver.configure(config)
+    try:
+        ids = await user_id_resolver.resolve_many(missing)
+        await user_id_resolver.drain()  # Cache disque écrit avant le fork
+    finally:
+        await close_helix()  # Client lié à cette boucle, l'ingestion en recrée un
+    for name, broadcaster_id in ids.items():
+        if broadcaster_id:
+            set_broadcaster_id(config, name, broadcaster_id)
+            print(f"[POOL] ✅ broadcaster_id récupéré: {broadcaster_id} pour #{name}")
+        else:
+            print(f"[POOL] ⚠️ broadcaster_id introuvable pour #{name}")
+
+
+def start_workers(config: dict, workers: int):
+    """Lance N process workers. Retourne (process, inboxes, outbox)."""
+    mp = multiprocessing.get_context("spawn")
+    # Cache jeux partagé : lu par core.cache à l'import dans chaque worker
+    os.environ["GAME_CACHE_DB"] = os.path.abspath(
+        config["bot"].get("shared_cache_db", SHARED_CACHE_DB_DEFAULT)
+    )
+    outbox = mp.Queue()
+    inboxes = [mp.Queue() for _ in range(workers)]
+    processes = [
+        mp.Process(target=_worker_main, args=(i, config, inboxes[i], outbox), name=f"serdabot-worker-{i}", daemon=True)
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    print(f"[POOL] 🚀 {workers} worker(s) lancés (cache partagé : {os.environ['GAME_CACHE_DB']})")
+    return processes, inboxes, outbox
+
+
+def stop_workers(processes, inboxes):
+    for inbox in inboxes:
+        inbox.put(None)
+    for process in processes:
+        process.join(WORKER_JOIN_TIMEOUT)
+        if process.is_alive():
+            process.terminate()
+
+
+def run_pool(config: Optional[dict] = None):
+    """Lance l'ingestion IRC + le pool de workers (bot.workers)."""
+    watch = config is None
+    if config is None:
+        config = thaw(config_service.snapshot)
+    workers = int(config["bot"].get("workers", 0)) or os.cpu_count() or 1
+    asyncio.run(resolve_channel_ids(config))
+    processes, inboxes, outbox = start_workers(config, workers)
+
+    async def main():
+        bot = IngestBot(config, inboxes, outbox)
+        if watch:
+            config_service.subscribe(bot.apply_config)
+            interval = bot.config["bot"].get("config_reload_interval", 2)
+            if interval:
+                config_service.watch(interval)
+        await bot.start()
+
+    try:
+        asyncio.run(main())
+    finally:
+        stop_workers(processes, inboxes)
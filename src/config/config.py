@@ -1,12 +1,15 @@
+import asyncio
 import os
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, List, Mapping, Optional
 
 import yaml
 
 
-def load_config(path: str | None = None) -> dict:
+def resolve_config_path(path: str | None = None) -> Path:
     """
-    Charge le fichier de configuration YAML central du projet.
+    Trouve le fichier de configuration YAML central du projet.
     
     Ordre de priorité :
     1. Variable d'environnement SERDABOT_CONFIG (si définie)
@@ -20,38 +23,16 @@ def load_config(path: str | None = None) -> dict:
     - Avoir un fallback fonctionnel pour les forks/CI
     - Override via variable d'environnement si besoin
     """
-    # 1. Priorité à la variable d'environnement
-    env_config = os.getenv('SERDABOT_CONFIG')
-    if env_config:
-        config_path = Path(env_config)
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-    
-    # 2. Sinon, utiliser le paramètre fourni
-    if path:
-        config_path = Path(path)
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-    
-    # 3. Tenter la config locale (SerdaBot-local/)
-    local_config = Path('../SerdaBot-local/config/config.yaml')
-    if local_config.exists():
-        with open(local_config, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    
-    # 4. Tenter la config dans le repo
-    repo_config = Path('src/config/config.yaml')
-    if repo_config.exists():
-        with open(repo_config, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    
-    # 5. Fallback vers config.sample.yaml
-    sample_config = Path('src/config/config.sample.yaml')
-    if sample_config.exists():
-        with open(sample_config, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+    candidates = [
+        os.getenv('SERDABOT_CONFIG'),                 # 1. Variable d'environnement
+        path,                                         # 2. Paramètre fourni
+        '../SerdaBot-local/config/config.yaml',       # 3. Config locale (SerdaBot-local/)
+        'src/config/config.yaml',                     # 4. Config dans le repo
+        'src/config/config.sample.yaml',              # 5. Fallback
+    ]
+    for candidate in candidates:
+        if candidate and Path(candidate).exists():
+            return Path(candidate)
     
     raise FileNotFoundError(
         "❌ Aucune config trouvée ! Vérifie que tu as bien :\n"
@@ -59,3 +40,159 @@ def load_config(path: str | None = None) -> dict:
         "  2. Copié src/config/config.example.yaml → src/config/config.yaml\n"
         "  Voir README.md pour les instructions de setup."
     )
+
+
+def load_config(path: str | None = None) -> dict:
+    """
+    Charge le fichier de configuration YAML central du projet (dict mutable).
+    
+    Voir resolve_config_path() pour l'ordre de priorité. Pour le bot en
+    production, préférer ``config_service`` (parsé une fois, hot reload).
+    """
+    with open(resolve_config_path(path), 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def freeze(value: Any) -> Any:
+    """Copie profonde immuable : dict → MappingProxyType, list → tuple."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Copie profonde mutable d'un snapshot (pour le code qui modifie sa config)."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+ConfigListener = Callable[[Mapping, Mapping], None]
+
+
+class ConfigService:
+    """
+    Config partagée : YAML parsé une fois, snapshot immuable, hot reload.
+    
+    - ``snapshot`` : MappingProxyType figé, remplacé d'un bloc à chaque reload
+      (un lecteur ne voit jamais une config à moitié rechargée)
+    - ``subscribe(cb)`` : cb(nouveau, ancien) appelé après chaque changement
+    - ``watch()`` : tâche asyncio qui poll le mtime du fichier
+    
+    Usage:
+        config = config_service.snapshot
+        config_service.subscribe(lambda new, old: ...)
+        config_service.watch(interval=2.0)   # dans une boucle asyncio
+    """
+    
+    def __init__(self, path: str | None = None):
+        self._requested_path = path
+        self._path: Optional[Path] = None
+        self._mtime: Optional[float] = None
+        self._snapshot: Optional[Mapping] = None
+        self._listeners: List[ConfigListener] = []
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+    
+    @property
+    def snapshot(self) -> Mapping:
+        """Config courante (chargée au premier accès)."""
+        if self._snapshot is None:
+            self._path = resolve_config_path(self._requested_path)
+            self._mtime = self._path.stat().st_mtime
+            self._snapshot = freeze(self._read())
+        return self._snapshot
+    
+    def _read(self) -> dict:
+        assert self._path is not None
+        with open(self._path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    
+    def subscribe(self, listener: ConfigListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def unsubscribe(self, listener: ConfigListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def reload(self) -> bool:
+        """
+        Relit le fichier. Retourne True si la config a changé.
+        
+        YAML invalide → l'ancien snapshot reste actif (pas de bot cassé
+        par une faute de frappe pendant le live).
+        """
+        self.snapshot  # Charger si besoin (résout le chemin)
+        new = self._read_frozen()
+        return new is not None and self._apply(new)
+    
+    def _read_frozen(self) -> Optional[Mapping]:
+        """Lecture + parsing (bloquant, appelable depuis un thread)."""
+        assert self._path is not None
+        try:
+            self._mtime = self._path.stat().st_mtime
+            return freeze(self._read())
+        except Exception as e:
+            print(f"[CONFIG] ❌ Reload ignoré ({self._path}): {e}")
+            return None
+    
+    def _apply(self, new: Mapping) -> bool:
+        """Remplace le snapshot d'un bloc et notifie les subscribers."""
+        old = self._snapshot
+        if new == old:
+            return False
+        self._snapshot = new
+        print(f"[CONFIG] 🔄 Config rechargée: {self._path}")
+        for listener in list(self._listeners):
+            try:
+                listener(new, old)
+            except Exception as e:
+                print(f"[CONFIG] ⚠️ Subscriber en erreur: {e}")
+        return True
+    
+    def has_changed_on_disk(self) -> bool:
+        """mtime différent de celui du dernier chargement ?"""
+        if self._path is None:
+            return False
+        try:
+            return self._path.stat().st_mtime != self._mtime
+        except OSError:
+            return False
+    
+    def watch(self, interval: float = 2.0) -> asyncio.Task:
+        """Lance le polling mtime (idempotent). Requiert une boucle active."""
+        self.snapshot  # Charger avant de surveiller
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch_loop(interval))
+        return self._task
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _watch_loop(self, interval: float) -> None:
+        print(f"[CONFIG] 👀 Hot reload actif: {self._path} (toutes les {interval}s)")
+        while True:
+            await asyncio.sleep(interval)
+            if self.has_changed_on_disk():
+                # Parsing hors boucle, swap + notifications dans la boucle
+                new = await asyncio.to_thread(self._read_frozen)
+                if new is not None:
+                    self._apply(new)
+
+
+# Instance globale (singleton)
+config_service = ConfigService()
@@ -2,13 +2,34 @@
 Système de cache global pour les données de jeux.
 
 Utilise RAM en production, et JSON en dev pour persistance.
+En mode multi-process (workers), SQLite partagé entre les process.
 Économise les requêtes API (RAWG limité à 1000/jour).
 """
 import json
 import os
+import sqlite3
+import threading
 from pathlib import Path
 from time import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from core.game_record import GameRecord
+
+_RECORD_TAG = "__game_record__"
+
+
+def encode_value(data: Any) -> Any:
+    """Valeur de cache → forme JSON (GameRecord sérialisé, le reste tel quel)."""
+    if isinstance(data, GameRecord):
+        return {_RECORD_TAG: data.to_state()}
+    return data
+
+
+def decode_value(data: Any) -> Any:
+    """Inverse de encode_value."""
+    if isinstance(data, dict) and _RECORD_TAG in data:
+        return GameRecord.from_state(data[_RECORD_TAG])
+    return data
 
 
 class GlobalGameCache:
@@ -91,6 +112,56 @@ class GlobalGameCache:
             print(f"[CACHE] 🧹 Nettoyage: {len(expired_keys)} entrées expirées supprimées")
             self._save_to_file()
     
+    def compact_cold(self, idle_seconds: float) -> int:
+        """Compresse les GameRecord non demandés depuis ``idle_seconds``.
+
+        Returns:
+            Nombre d'entrées compressées
+        """
+        now = time()
+        compacted = 0
+        for entry in self._cache.values():
+            record = entry["data"]
+            if not isinstance(record, GameRecord) or record.is_compact:
+                continue
+            if now - max(record.last_hit, entry["timestamp"]) > idle_seconds and record.compact():
+                compacted += 1
+        if compacted:
+            print(f"[CACHE] 🗜️ {compacted} entrée(s) froide(s) compressée(s)")
+        return compacted
+
+    def iter_valid(self) -> Iterator[Tuple[str, Any]]:
+        """(clé, données) des entrées non expirées, sans les modifier."""
+        now = time()
+        for key, entry in list(self._cache.items()):
+            if now - entry["timestamp"] <= entry["ttl"]:
+                yield key, entry["data"]
+
+    def export_entries(self) -> Dict[str, dict]:
+        """Entrées encore valides, sérialisables (pour le snapshot warm restart)."""
+        now = time()
+        return {
+            key: {**entry, "data": encode_value(entry["data"])}
+            for key, entry in self._cache.items()
+            if now - entry["timestamp"] <= entry["ttl"]
+        }
+
+    def import_entries(self, entries: Dict[str, dict]) -> int:
+        """Restaure des entrées en gardant leur timestamp d'origine (TTL vérifié).
+
+        Une entrée déjà présente (plus récente) n'est pas écrasée.
+        """
+        now = time()
+        restored = 0
+        for key, entry in entries.items():
+            if key in self._cache or now - entry["timestamp"] > entry["ttl"]:
+                continue
+            self._cache[key] = {**entry, "data": decode_value(entry["data"])}
+            restored += 1
+        if restored:
+            self._save_to_file()
+        return restored
+
     def stats(self) -> dict:
         """Retourne des statistiques sur le cache."""
         now = time()
@@ -114,7 +185,10 @@ class GlobalGameCache:
         
         try:
             with open(self._cache_file, 'r', encoding='utf-8') as f:
-                self._cache = json.load(f)
+                self._cache = {
+                    key: {**entry, "data": decode_value(entry["data"])}
+                    for key, entry in json.load(f).items()
+                }
             print(f"[CACHE] 📂 Cache chargé depuis {self._cache_file} ({len(self._cache)} entrées)")
         except (json.JSONDecodeError, FileNotFoundError) as e:
             print(f"[CACHE] ⚠️ Impossible de charger le cache: {e}")
@@ -130,19 +204,114 @@ class GlobalGameCache:
             Path(self._cache_file).parent.mkdir(parents=True, exist_ok=True)
             
             with open(self._cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self._cache, f, indent=2, ensure_ascii=False)
+                json.dump(
+                    {key: {**entry, "data": encode_value(entry["data"])} for key, entry in self._cache.items()},
+                    f, indent=2, ensure_ascii=False,
+                )
         except Exception as e:
             print(f"[CACHE] ⚠️ Impossible de sauvegarder le cache: {e}")
 
 
+class SqliteGameCache:
+    """Cache de jeux sur disque (SQLite WAL), partagé entre plusieurs process.
+
+    Même interface que GlobalGameCache. Utilisé par les workers
+    (src/chat/worker_pool.py) : une réponse RAWG récupérée par un worker
+    profite à tous les autres.
+    """
+
+    def __init__(self, db_path: str, default_ttl: int = 3600):
+        self._db_path = db_path
+        self._ttl = default_ttl
+        self._local = threading.local()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS game_cache ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, timestamp REAL NOT NULL, ttl REAL NOT NULL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        """Une connexion par thread (sqlite3 n'aime pas le partage entre threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT data, timestamp, ttl FROM game_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        data, timestamp, ttl = row
+        if time() - timestamp > ttl:
+            self._conn().execute("DELETE FROM game_cache WHERE key = ?", (key,))
+            return None
+        return decode_value(json.loads(data))
+
+    def set(self, key: str, data: Any, ttl: Optional[int] = None):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO game_cache (key, data, timestamp, ttl) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(encode_value(data), ensure_ascii=False), time(), ttl or self._ttl),
+        )
+
+    def clear(self):
+        self._conn().execute("DELETE FROM game_cache")
+
+    def cleanup_expired(self):
+        cursor = self._conn().execute("DELETE FROM game_cache WHERE ? - timestamp > ttl", (time(),))
+        if cursor.rowcount:
+            print(f"[CACHE] 🧹 Nettoyage: {cursor.rowcount} entrées expirées supprimées")
+
+    def iter_valid(self) -> Iterator[Tuple[str, Any]]:
+        """(clé, données) des entrées non expirées (hit_count de tous les workers)."""
+        rows = self._conn().execute(
+            "SELECT key, data FROM game_cache WHERE ? - timestamp <= ttl", (time(),)
+        ).fetchall()
+        for key, data in rows:
+            yield key, decode_value(json.loads(data))
+
+    def compact_cold(self, idle_seconds: float) -> int:
+        """Rien à compresser : les entrées vivent sur disque, pas en RAM."""
+        return 0
+
+    def export_entries(self) -> Dict[str, dict]:
+        """Rien à exporter : le fichier SQLite survit déjà au redémarrage."""
+        return {}
+
+    def import_entries(self, entries: Dict[str, dict]) -> int:
+        """Rien à importer (voir export_entries)."""
+        return 0
+
+    def stats(self) -> dict:
+        total, expired = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(? - timestamp > ttl), 0) FROM game_cache", (time(),)
+        ).fetchone()
+        return {
+            "total_entries": total,
+            "valid_entries": total - expired,
+            "expired_entries": expired,
+            "cache_file": self._db_path,
+        }
+
+
 # Instance globale (singleton)
 # Production: RAM uniquement (cache_file=None)
 # Dev: Persistance JSON dans cache/games.json
+# Workers: SQLite partagé (GAME_CACHE_DB, posé par le process d'ingestion)
 _cache_file = "cache/games.json" if os.getenv("BOT_ENV") == "dev" else None
+_cache_db = os.getenv("GAME_CACHE_DB")
 
-GAME_CACHE = GlobalGameCache(
-    default_ttl=3600,  # 1h par défaut
-    cache_file=_cache_file
+GAME_CACHE = (
+    SqliteGameCache(_cache_db, default_ttl=3600) if _cache_db
+    else GlobalGameCache(
+        default_ttl=3600,  # 1h par défaut
+        cache_file=_cache_file
+    )
 )
 
 
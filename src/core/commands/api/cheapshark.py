@@ -3,22 +3,253 @@ CheapShark API - Prix des jeux PC en temps réel.
 
 API Documentation: https://apidocs.cheapshark.com/
 Rate limit: Aucune limite (API publique gratuite)
+
+PriceService garde en mémoire :
+- la table des stores (/stores), rechargée une fois par jour
+- titre → gameID CheapShark (stable, gardé 24h) ; les recherches
+  concurrentes d'un même titre partagent une requête (l'API n'accepte
+  qu'un titre par recherche, pas de lot possible)
+- les prix (TTL court)
+
+Les demandes de prix concurrentes arrivées dans la même fenêtre partent
+en une seule requête multi-jeux (/games?ids=, 25 max). Les jeux les plus
+demandés sont rafraîchis en tâche de fond : !prix répond depuis la mémoire.
+Le cache est en mémoire : en mode multi-process, chaque worker rafraîchit
+ses propres jeux populaires (ceux de son shard d'utilisateurs).
+
+Config:
+    prices:
+      ttl: 600               # Durée de vie d'un prix (secondes)
+      refresh_top_n: 20      # Jeux populaires rafraîchis en tâche de fond (0 = aucun)
 """
-from typing import Dict, Optional
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
+API_URL = 'https://www.cheapshark.com/api/1.0'
+STORES_TTL = 86400        # Table des stores : 1 fois par jour
+GAME_ID_TTL = 86400       # titre → gameID
+PRICE_TTL_DEFAULT = 600   # Prix : 10 min
+REFRESH_TOP_N_DEFAULT = 20
+BATCH_WINDOW = 0.05       # Secondes d'attente pour grouper les !prix concurrents
+BATCH_MAX = 25            # Limite CheapShark pour /games?ids=
+
+
+def _format_price(title: str, deal: dict, stores: Dict[str, str]) -> Dict:
+    """Deal CheapShark → format renvoyé par fetch_game_price."""
+    cheapest_price = float(deal.get('price', 0))
+    normal_price = float(deal.get('retailPrice', cheapest_price))
+
+    # Calculer la réduction si applicable
+    savings = None
+    if normal_price > cheapest_price and normal_price > 0:
+        savings_percent = ((normal_price - cheapest_price) / normal_price) * 100
+        savings = f"{int(savings_percent)}%"
+
+    # Formater le prix
+    price_str = "Gratuit" if cheapest_price == 0 else f"{cheapest_price:.2f}€"
+    normal_price_str = f"{normal_price:.2f}€" if normal_price > 0 else price_str
+
+    return {
+        'game_name': title,
+        'price': price_str,
+        'normal_price': normal_price_str,
+        'savings': savings,
+        'store': stores.get(str(deal.get('storeID')), "Store inconnu"),
+        'url': f"https://www.cheapshark.com/redirect?dealID={deal.get('dealID', '')}",
+    }
+
+
+class PriceService:
+    """Prix CheapShark : stores et prix en cache, lookups groupés, refresh de fond."""
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, window: float = BATCH_WINDOW):
+        self.price_ttl = PRICE_TTL_DEFAULT
+        self.refresh_top_n = REFRESH_TOP_N_DEFAULT
+        self.window = window
+        self.popularity: Counter = Counter()  # gameID → nombre de !prix
+        self.requests = 0
+        self._client = client
+        self._stores: Dict[str, str] = {}
+        self._stores_at = 0.0
+        self._stores_lock: Optional[asyncio.Lock] = None
+        self._game_ids: Dict[str, Tuple[float, Optional[str]]] = {}  # titre → (ts, gameID)
+        self._prices: Dict[str, Tuple[float, Optional[Dict]]] = {}   # gameID → (ts, prix)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._id_lookups: Dict[str, asyncio.Task] = {}  # titre → recherche en cours
+        self._flush_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def configure(self, config: dict) -> None:
+        """Lit ``prices.*`` (boot ou hot reload)."""
+        prices_config = config.get("prices", {}) or {}
+        self.price_ttl = prices_config.get("ttl", PRICE_TTL_DEFAULT)
+        self.refresh_top_n = prices_config.get("refresh_top_n", REFRESH_TOP_N_DEFAULT)
+
+    async def _get(self, path: str, params: Optional[dict] = None):
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        self.requests += 1
+        response = await self._client.get(f"{API_URL}{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    # ----- Stores -----
+
+    async def store_map(self) -> Dict[str, str]:
+        """{store_id: store_name}, rechargé au plus une fois par jour."""
+        if self._stores and time.time() - self._stores_at < STORES_TTL:
+            return self._stores
+        if self._stores_lock is None:
+            self._stores_lock = asyncio.Lock()
+        async with self._stores_lock:
+            if self._stores and time.time() - self._stores_at < STORES_TTL:
+                return self._stores
+            try:
+                stores = {
+                    str(store['storeID']): store['storeName']
+                    for store in await self._get('/stores')
+                    if store.get('storeID') and store.get('storeName')
+                }
+                self._stores, self._stores_at = stores, time.time()
+                print(f"[CHEAPSHARK] ✅ {len(stores)} stores chargés")
+            except Exception as e:
+                print(f"[CHEAPSHARK] ⚠️ Impossible de charger les stores: {e}")
+        return self._stores
+
+    # ----- titre → gameID -----
+
+    async def game_id(self, game_name: str) -> Optional[str]:
+        key = game_name.lower().strip()
+        cached = self._game_ids.get(key)
+        if cached and time.time() - cached[0] < GAME_ID_TTL:
+            return cached[1]
+        task = self._id_lookups.get(key)
+        if task is None:
+            task = asyncio.create_task(self._search_id(key, game_name))
+            self._id_lookups[key] = task
+            task.add_done_callback(lambda _: self._id_lookups.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _search_id(self, key: str, game_name: str) -> Optional[str]:
+        data = await self._get('/games', {'title': game_name, 'limit': 1})
+        game_id = str(data[0]['gameID']) if data else None
+        self._game_ids[key] = (time.time(), game_id)
+        return game_id
+
+    # ----- Prix (cache + lookups groupés) -----
+
+    def cached_price(self, game_id: str) -> Tuple[bool, Optional[Dict]]:
+        """(trouvé, prix) depuis la mémoire si encore frais."""
+        cached = self._prices.get(game_id)
+        if cached and time.time() - cached[0] < self.price_ttl:
+            return True, cached[1]
+        return False, None
+
+    def has_fresh_price(self, game_name: str) -> bool:
+        """True si !prix peut répondre depuis la mémoire (aucun appel réseau)."""
+        cached = self._game_ids.get(game_name.lower().strip())
+        if not cached or time.time() - cached[0] >= GAME_ID_TTL:
+            return False
+        return cached[1] is None or self.cached_price(cached[1])[0]
+
+    async def get_price(self, game_name: str) -> Optional[Dict]:
+        game_id = await self.game_id(game_name)
+        if game_id is None:
+            return None
+        self.popularity[game_id] += 1
+        found, price = self.cached_price(game_id)
+        if found:
+            return price
+        return await self._queue(game_id)
+
+    async def _queue(self, game_id: str) -> Optional[Dict]:
+        future = self._pending.get(game_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[game_id] = future
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_later())
+        return await asyncio.shield(future)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        try:
+            results = await self.fetch_prices(list(pending))
+            for game_id, future in pending.items():
+                if not future.done():
+                    future.set_result(results.get(game_id))
+        except Exception as e:
+            print(f"[CHEAPSHARK] ❌ Erreur prix ({len(pending)} jeux): {e}")
+        finally:
+            for future in pending.values():
+                if not future.done():
+                    future.set_result(None)
+
+    async def fetch_prices(self, game_ids: List[str]) -> Dict[str, Optional[Dict]]:
+        """Prix de plusieurs jeux (/games?ids=, par lots de 25). Met le cache à jour."""
+        stores = await self.store_map()
+        results: Dict[str, Optional[Dict]] = {}
+        for i in range(0, len(game_ids), BATCH_MAX):
+            chunk = game_ids[i:i + BATCH_MAX]
+            data = await self._get('/games', {'ids': ','.join(chunk)})
+            now = time.time()
+            for game_id in chunk:
+                game = data.get(game_id) or {}
+                deals = game.get('deals') or []
+                price = None
+                if deals:
+                    best = min(deals, key=lambda deal: float(deal.get('price', 0)))
+                    price = _format_price(game.get('info', {}).get('title', ''), best, stores)
+                results[game_id] = price
+                self._prices[game_id] = (now, price)
+        return results
+
+    # ----- Rafraîchissement de fond -----
+
+    async def refresh_popular(self) -> int:
+        """Rafraîchit les prix des jeux les plus demandés. Retourne le nombre de jeux."""
+        top = [game_id for game_id, _ in self.popularity.most_common(self.refresh_top_n)]
+        if top:
+            await self.fetch_prices(top)
+        return len(top)
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Refresh périodique des prix populaires (idempotent)."""
+        if not self.refresh_top_n:
+            return None
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._run())
+        return self._refresh_task
+
+    async def _run(self) -> None:
+        while True:
+            # Avant expiration : les jeux populaires ne repassent jamais par le réseau
+            await asyncio.sleep(max(1, self.price_ttl * 0.8))
+            try:
+                await self.refresh_popular()
+            except Exception as e:
+                print(f"[CHEAPSHARK] ⚠️ Rafraîchissement des prix impossible: {e}")
+
+
+# Instance globale (singleton)
+price_service = PriceService()
+
 
 async def fetch_game_price(game_name: str) -> Optional[Dict]:
     """
     Récupère le prix d'un jeu PC depuis CheapShark.
-    
+
     Args:
         game_name: Nom du jeu à rechercher
-    
+
     Returns:
         Dict avec les infos de prix, ou None si non trouvé.
-        
+
         Format retourné:
         {
             'game_name': str,
@@ -28,62 +259,20 @@ async def fetch_game_price(game_name: str) -> Optional[Dict]:
             'store': str,           # "Steam", "Epic Games", etc.
             'url': str,            # Lien d'achat direct
         }
-    
+
     Example:
         >>> data = await fetch_game_price("Hades")
         >>> print(f"{data['price']} sur {data['store']}")
         '20,99€ sur Steam'
     """
-    url = 'https://www.cheapshark.com/api/1.0/games'
-    
-    params = {
-        'title': game_name,
-        'limit': 1,
-    }
-    
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data:
-                print(f"[CHEAPSHARK] ❌ Aucun résultat pour '{game_name}'")
-                return None
-            
-            game = data[0]
-            
-            # Extraire le meilleur deal (cheapest)
-            cheapest_price = float(game.get('cheapest', 0))
-            normal_price = float(game.get('normal', cheapest_price))
-            
-            # Calculer la réduction si applicable
-            savings = None
-            if normal_price > cheapest_price and normal_price > 0:
-                savings_percent = ((normal_price - cheapest_price) / normal_price) * 100
-                savings = f"{int(savings_percent)}%"
-            
-            # Formater le prix
-            if cheapest_price == 0:
-                price_str = "Gratuit"
-            else:
-                price_str = f"{cheapest_price:.2f}€"
-            
-            normal_price_str = f"{normal_price:.2f}€" if normal_price > 0 else price_str
-            
-            result = {
-                'game_name': game.get('external', game_name),
-                'price': price_str,
-                'normal_price': normal_price_str,
-                'savings': savings,
-                'store': _get_store_name(game.get('cheapestDealID', '')),
-                'url': f"https://www.cheapshark.com/redirect?dealID={game.get('cheapestDealID', '')}",
-            }
-            
-            print(f"[CHEAPSHARK] ✅ Prix trouvé: {result['price']} sur {result['store']}")
-            return result
-            
+        result = await price_service.get_price(game_name)
+        if not result:
+            print(f"[CHEAPSHARK] ❌ Aucun résultat pour '{game_name}'")
+            return None
+        print(f"[CHEAPSHARK] ✅ Prix trouvé: {result['price']} sur {result['store']}")
+        return result
+
     except httpx.TimeoutException:
         print(f"[CHEAPSHARK] ⏱️ Timeout lors de la recherche de '{game_name}'")
         return None
@@ -95,50 +284,16 @@ async def fetch_game_price(game_name: str) -> Optional[Dict]:
         return None
 
 
-def _get_store_name(deal_id: str) -> str:
-    """
-    Récupère le nom du store depuis le dealID.
-    
-    Note: Version simplifiée. Pour une version complète,
-    il faudrait appeler l'API /stores pour mapper les IDs.
-    """
-    # TODO: Implémenter le mapping complet des stores
-    # Pour l'instant, on retourne un placeholder
-    return "Steam"  # Par défaut, la plupart des deals sont Steam
-
-
 async def fetch_stores() -> Dict[str, str]:
     """
-    Récupère la liste complète des stores CheapShark.
-    
+    Récupère la liste complète des stores CheapShark (cache 24h).
+
     Returns:
         Dict {store_id: store_name}
-        
+
     Example:
         >>> stores = await fetch_stores()
         >>> print(stores['1'])
         'Steam'
     """
-    url = 'https://www.cheapshark.com/api/1.0/stores'
-    
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            
-            stores_data = response.json()
-            
-            # Créer un mapping store_id -> store_name
-            stores = {}
-            for store in stores_data:
-                store_id = store.get('storeID')
-                store_name = store.get('storeName')
-                if store_id and store_name:
-                    stores[str(store_id)] = store_name
-            
-            print(f"[CHEAPSHARK] ✅ {len(stores)} stores chargés")
-            return stores
-            
-    except Exception as e:
-        print(f"[CHEAPSHARK] ⚠️ Impossible de charger les stores: {e}")
-        return {}
+    return await price_service.store_map()
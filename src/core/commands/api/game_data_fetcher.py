@@ -5,22 +5,25 @@ Ce module orchestre les différentes APIs pour récupérer les informations
 sur les jeux vidéo avec un système de priorité et fallback.
 
 Priorité des sources :
-    1. Cache (si disponible)
+    1. Cache (si disponible), puis pack de connaissances pré-construit
     2. RAWG (source principale - la plus complète et à jour)
     3. Steam (fallback pour jeux indie/récents absents de RAWG)
     4. IGDB API (fallback si RAWG et Steam échouent)
     5. IGDB Web scraping (dernier recours)
 """
-from typing import Dict, Optional
+from typing import Optional
 
 from core.cache import GAME_CACHE, get_cache_key, get_ttl_for_game
+from core.game_record import GameRecord
+from core.knowledge_pack import knowledge_pack
 
 from .igdb_api import get_igdb_token, query_game, search_igdb_web
 from .rawg_api import fetch_game_from_rawg
+from .scoring import QueryFeatures, score_result
 from .steam_api import fetch_game_from_steam
 
 
-async def fetch_game_data(game_name: str, config: dict, cache_only: bool = False) -> Optional[Dict]:
+async def fetch_game_data(game_name: str, config: dict, cache_only: bool = False) -> Optional[GameRecord]:
     """
     Point d'entrée UNIQUE pour récupérer des données de jeu.
     
@@ -38,17 +41,25 @@ async def fetch_game_data(game_name: str, config: dict, cache_only: bool = False
         cache_only: Si True, retourne uniquement depuis le cache (tests)
     
     Returns:
-        Dict avec les données du jeu (format normalisé), ou None si non trouvé.
+        GameRecord (lecture façon dict), ou None si non trouvé.
     """
     print(f"[GAME-DATA] 🔍 Recherche de '{game_name}'...")
     
     # 🔍 ÉTAPE 0 : Vérifier le cache
     cache_key = get_cache_key("gamedata", game_name)
-    cached_data = GAME_CACHE.get(cache_key)
+    cached = GameRecord.coerce(GAME_CACHE.get(cache_key))
     
-    if cached_data:
-        print(f"[GAME-DATA] ⚡ CACHE HIT: {cached_data['name']}")
-        return cached_data
+    if cached is not None:
+        print(f"[GAME-DATA] ⚡ CACHE HIT: {cached.name}")
+        return cached
+    
+    # 📦 ÉTAPE 0.1 : Pack de connaissances pré-construit (mmap, aucun appel API)
+    packed, remaining = knowledge_pack.game_entry(cache_key)
+    if packed is not None:
+        print(f"[GAME-DATA] 📦 PACK HIT: {packed.name}")
+        # Jamais au-delà de l'expiration du pack (pas de TTL neuf pour une entrée ancienne)
+        GAME_CACHE.set(cache_key, packed, ttl=max(1, int(min(get_ttl_for_game(packed.release_year), remaining))))
+        return packed
     
     # Mode cache only pour les tests (skip API)
     if cache_only:
@@ -86,14 +97,15 @@ async def fetch_game_data(game_name: str, config: dict, cache_only: bool = False
     
     # 📊 ÉTAPE 2 : Scoring des résultats
     candidates = []
+    features = QueryFeatures(game_name, user_year)
     
     if rawg_data and isinstance(rawg_data, dict):
-        score = _score_result(game_name, rawg_data, source="RAWG", user_year=user_year)
+        score = score_result(features, rawg_data, source="RAWG")
         candidates.append((score, rawg_data, "RAWG"))
         print(f"[GAME-DATA] 📊 RAWG: {rawg_data['name']} (score: {score:.1f})")
     
     if steam_data and isinstance(steam_data, dict):
-        score = _score_result(game_name, steam_data, source="Steam", user_year=user_year)
+        score = score_result(features, steam_data, source="Steam")
         candidates.append((score, steam_data, "Steam"))
         print(f"[GAME-DATA] 📊 Steam: {steam_data['name']} (score: {score:.1f})")
     
@@ -133,12 +145,13 @@ async def fetch_game_data(game_name: str, config: dict, cache_only: bool = False
                     best_data['summary'] = steam_summary
                     best_data['summary_source'] = 'Steam (EN)'
             
-            # Mettre en cache
-            ttl = get_ttl_for_game(best_data.get('release_year', '?'))
-            GAME_CACHE.set(cache_key, best_data, ttl=ttl)
+            # Mettre en cache (projection : seulement les champs affichés)
+            record = GameRecord.from_dict(best_data)
+            ttl = get_ttl_for_game(record.release_year)
+            GAME_CACHE.set(cache_key, record, ttl=ttl)
             print(f"[GAME-DATA] 💾 Mis en cache (TTL: {ttl}s)")
             
-            return best_data
+            return record
         else:
             print(f"[GAME-DATA] ⚠️ Meilleur score trop faible ({best_score:.1f}), tentative IGDB...")
     
@@ -155,11 +168,12 @@ async def fetch_game_data(game_name: str, config: dict, cache_only: bool = False
             print(f"[GAME-DATA] ✅ IGDB API réussi: {normalized['name']}")
             
             # Mettre en cache aussi
-            ttl = get_ttl_for_game(normalized.get('release_year', '?'))
-            GAME_CACHE.set(cache_key, normalized, ttl=ttl)
+            record = GameRecord.from_dict(normalized)
+            ttl = get_ttl_for_game(record.release_year)
+            GAME_CACHE.set(cache_key, record, ttl=ttl)
             print(f"[GAME-DATA] 💾 Mis en cache (TTL: {ttl}s)")
             
-            return normalized
+            return record
             
     except Exception as e:
         print(f"[GAME-DATA] ❌ IGDB API erreur: {e}")
@@ -176,10 +190,11 @@ async def fetch_game_data(game_name: str, config: dict, cache_only: bool = False
             print(f"[GAME-DATA] ✅ Web scraping réussi: {normalized['name']}")
             
             # Mettre en cache aussi (TTL plus court car moins fiable)
-            GAME_CACHE.set(cache_key, normalized, ttl=1800)  # 30min
+            record = GameRecord.from_dict(normalized)
+            GAME_CACHE.set(cache_key, record, ttl=1800)  # 30min
             print(f"[GAME-DATA] 💾 Mis en cache (TTL: 1800s)")
             
-            return normalized
+            return record
             
     except Exception as e:
         print(f"[GAME-DATA] ❌ Web scraping erreur: {e}")
@@ -252,97 +267,6 @@ def _extract_year_from_query(query: str) -> Optional[int]:
     return None
 
 
-def _score_result(query: str, game_data: dict, source: str, user_year: Optional[int] = None) -> float:
-    """
-    Score un résultat final (RAWG ou Steam) avec système unifié 0-100 pts.
-    
-    Note: RAWG a déjà scoré ses candidats en interne, donc ici on score
-    seulement le meilleur candidat retourné de chaque source pour comparaison.
-    
-    Scoring:
-        ✅ Similarité nom: 0-50 pts
-        ✅ Qualité rating: +15 pts
-        ✅ Metacritic: +10 pts
-        ✅ Popularité: +10 pts
-        ✅ Bonus Steam indie: +5 pts
-        ✅ Bonus année: +20 pts
-    
-    Args:
-        query: Requête de recherche originale
-        game_data: Données du jeu normalisées
-        source: Source du résultat ("RAWG" ou "Steam")
-        user_year: Année extraite de la requête (optionnel)
-    
-    Returns:
-        Score de pertinence (0-100)
-    """
-    from difflib import SequenceMatcher
-    
-    score = 0.0
-    game_name = game_data.get('name', '').lower()
-    query_lower = query.lower()
-    
-    # 1️⃣ Similarité du nom (50 pts max)
-    similarity = SequenceMatcher(None, query_lower, game_name).ratio()
-    score += similarity * 50
-    
-    # 2️⃣ Qualité rating (15 pts)
-    rating = game_data.get('rating', 0)
-    if rating and rating >= 4.0:
-        score += 15
-    elif rating and rating >= 3.5:
-        score += 8
-    elif rating and rating >= 3.0:
-        score += 3
-    
-    # 3️⃣ Metacritic (10 pts scaled)
-    metacritic = game_data.get('metacritic', 0)
-    if metacritic:
-        score += (metacritic / 100) * 10
-    
-    # 4️⃣ Popularité (10 pts)
-    ratings_count = game_data.get('ratings_count', 0)
-    if ratings_count and ratings_count >= 1000:
-        score += 10
-    elif ratings_count and ratings_count >= 500:
-        score += 5
-    elif ratings_count and ratings_count >= 100:
-        score += 2
-    
-    # 5️⃣ Bonus Steam indie (5 pts + devs)
-    if source == "Steam":
-        score += 5
-        if game_data.get('developers'):
-            score += 5
-    
-    # 6️⃣ Bonus année/suite (20 pts)
-    if user_year:
-        release_year = game_data.get('released')
-        if release_year:
-            # Extraire l'année du format "YYYY-MM-DD" ou année seule
-            import re
-            year_match = re.search(r'(\d{4})', str(release_year))
-            if year_match:
-                game_year = int(year_match.group(1))
-                
-                # Cas 1: Année complète (ex: "Cyberpunk 2077" → 2077)
-                if user_year >= 1990 and game_year == user_year:
-                    score += 20
-                
-                # Cas 2: Numéro de suite (ex: "Hades 2" → 2, "GTA V" → 5)
-                elif user_year < 1990:
-                    game_name_full = game_data.get('name', '')
-                    roman_map = {2: 'II', 3: 'III', 4: 'IV', 5: 'V', 6: 'VI', 7: 'VII', 8: 'VIII', 9: 'IX', 10: 'X'}
-                    
-                    has_number = f" {user_year}" in game_name_full or f":{user_year}" in game_name_full
-                    has_roman = roman_map.get(user_year) and f" {roman_map[user_year]}" in game_name_full
-                    
-                    if has_number or has_roman:
-                        score += 20
-    
-    return score
-
-
 def _normalize_igdb_data(igdb_data: dict) -> dict:
     """
     Normalise les données IGDB pour matcher le format RAWG.
@@ -3,16 +3,191 @@ HowLongToBeat API - Durée de jeu estimée.
 
 API: Non officielle, utilise la bibliothèque howlongtobeatpy
 Documentation: https://github.com/ScrappyCocco/HowLongToBeat-PythonAPI
+
+Les durées sont gardées dans un cache persistant (cache/hltb_playtimes.json,
+TTL long) avec les requêtes déjà résolues vers leur clé : un !temps déjà vu
+répond sans scraper HLTB, même après un redémarrage. Les entrées expirées sont
+purgées avant chaque sauvegarde et le cache est plafonné à MAX_ENTRIES.
 """
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
 from typing import Dict, Optional
 
+from .game_data_fetcher import fetch_game_data
+
+PLAYTIME_CACHE_FILE = "cache/hltb_playtimes.json"
+PLAYTIME_TTL = 30 * 86400        # Les durées HLTB ne bougent quasiment jamais
+NOT_FOUND_TTL = 86400            # Jeu absent de HLTB : nouvel essai le lendemain
+MAX_ENTRIES = 20_000             # Au-delà, les durées les plus anciennes sont oubliées
+
+
+class PlaytimeService:
+    """Durées HLTB : cache persistant, client unique, requêtes coalescées.
+
+    Clé = slug du jeu résolu par fetch_game_data (« hades », « Hades » et
+    « HADES » partagent la même entrée), sinon nom normalisé.
+    """
+
+    def __init__(self, cache_file: str = PLAYTIME_CACHE_FILE):
+        self.cache_file = cache_file
+        self.searches = 0
+        self._entries: Optional[Dict[str, dict]] = None  # Chargé au premier accès
+        self._aliases: Dict[str, str] = {}                # requête → clé canonique
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._hltb = None
+        self._version = 0  # Numéro de la dernière copie prise
+        self._written = 0  # Numéro de la copie sur disque
+        self._write_lock = threading.Lock()
+
+    # ----- Cache persistant -----
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+            except FileNotFoundError:
+                payload = {}
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"[HLTB] ⚠️ Cache illisible, ignoré: {e}")
+                payload = {}
+            if "entries" in payload:
+                self._entries = payload["entries"]
+                self._aliases = {**payload.get("aliases", {}), **self._aliases}
+            else:
+                self._entries = payload  # Ancien format : entrées seules
+        return self._entries
+
+    @staticmethod
+    def _expired(entry: dict, now: float) -> bool:
+        ttl = PLAYTIME_TTL if entry["data"] else NOT_FOUND_TTL
+        return now - entry["timestamp"] >= ttl
+
+    def _prune(self) -> None:
+        """Retire les entrées expirées, puis les plus anciennes au-delà de MAX_ENTRIES."""
+        now = time.time()
+        entries = {key: entry for key, entry in self._load().items() if not self._expired(entry, now)}
+        if len(entries) > MAX_ENTRIES:
+            # Marge de 10 % : pas de tri à chaque nouvelle durée une fois le plafond atteint
+            keep = int(MAX_ENTRIES * 0.9)
+            entries = dict(sorted(entries.items(), key=lambda item: item[1]["timestamp"])[-keep:])
+        self._entries = entries
+        # Requêtes vers une durée purgée : résolues à nouveau au prochain !temps
+        self._aliases = {query: key for query, key in self._aliases.items() if key in entries}
+
+    def _snapshot(self) -> tuple:
+        """Copie à écrire, prise dans la boucle (le thread n'itère pas le dict vivant)."""
+        self._prune()
+        self._version += 1
+        return self._version, {"entries": dict(self._entries), "aliases": dict(self._aliases)}
+
+    def _write(self, version: int, payload: dict) -> None:
+        path = Path(self.cache_file)
+        with self._write_lock:
+            if version < self._written:
+                return  # Une copie plus récente est déjà sur disque
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Fichier temporaire unique : deux sauvegardes ne se partagent pas le .tmp
+                fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(payload, f, ensure_ascii=False)
+                    os.replace(tmp, path)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+                self._written = version
+            except OSError as e:
+                print(f"[HLTB] ⚠️ Impossible de sauvegarder le cache: {e}")
+
+    def _save(self) -> None:
+        self._write(*self._snapshot())
+
+    def _cached(self, key: str) -> Optional[dict]:
+        """Entrée encore valide (``{"data": dict | None, "timestamp": float}``)."""
+        entry = self._load().get(key)
+        if entry is None or self._expired(entry, time.time()):
+            return None
+        return entry
+
+    def lookup_cached(self, game_name: str) -> Optional[dict]:
+        """Entrée en cache pour une requête déjà vue, sans réseau ni résolution."""
+        self._load()  # Requêtes persistées avec les entrées
+        key = self._aliases.get(game_name.lower().strip())
+        return self._cached(key) if key else None
+
+    # ----- Recherche -----
 
-async def fetch_game_playtime(game_name: str) -> Optional[Dict]:
+    async def get(self, game_name: str, config: Optional[dict] = None) -> Optional[Dict]:
+        query = game_name.lower().strip()
+        entry = self.lookup_cached(query)
+        if entry is not None:
+            return entry["data"]
+
+        # Nom canonique via fetch_game_data (GAME_CACHE partagé avec !gameinfo)
+        search_name, key = game_name, query
+        if config is not None:
+            record = await fetch_game_data(game_name, config)
+            if record:
+                search_name, key = record.name, record.slug or record.name.lower()
+        self._aliases[query] = key
+
+        entry = self._cached(key)
+        if entry is not None:
+            return entry["data"]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._search(key, search_name))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _search(self, key: str, search_name: str) -> Optional[Dict]:
+        if self._hltb is None:
+            # Import conditionnel pour éviter les erreurs si pas installé
+            from howlongtobeatpy import HowLongToBeat
+            self._hltb = HowLongToBeat()
+
+        print(f"[HLTB] 🔍 Recherche durée pour '{search_name}'...")
+        self.searches += 1
+        results = await self._hltb.async_search(search_name)
+
+        result = None
+        if results:
+            # Prendre le premier résultat (meilleur match)
+            game = results[0]
+            result = {
+                'game_name': game.game_name,
+                'main_story': _format_hours(game.main_story),
+                'main_extra': _format_hours(game.main_extra),
+                'completionist': _format_hours(game.completionist),
+                'all_styles': _format_hours(game.all_styles),
+            }
+
+        self._load()[key] = {"data": result, "timestamp": time.time()}
+        await asyncio.to_thread(self._write, *self._snapshot())
+        return result
+
+
+# Instance globale (singleton)
+playtime_service = PlaytimeService()
+
+
+async def fetch_game_playtime(game_name: str, config: Optional[dict] = None) -> Optional[Dict]:
     """
     Récupère la durée de jeu estimée depuis HowLongToBeat.
     
     Args:
         game_name: Nom du jeu à rechercher
+        config: Configuration du bot (résolution du nom canonique via
+            fetch_game_data). None = clé sur le nom normalisé.
     
     Returns:
         Dict avec les durées estimées, ou None si non trouvé.
@@ -31,33 +206,13 @@ async def fetch_game_playtime(game_name: str) -> Optional[Dict]:
         >>> print(f"Histoire: {data['main_story']}, 100%: {data['completionist']}")
         'Histoire: 22h, 100%: 95h'
     """
-    # TODO: Installer la bibliothèque howlongtobeatpy
-    # pip install howlongtobeatpy
-    
     try:
-        # Import conditionnel pour éviter les erreurs si pas installé
-        from howlongtobeatpy import HowLongToBeat
-        
-        print(f"[HLTB] 🔍 Recherche durée pour '{game_name}'...")
+        result = await playtime_service.get(game_name, config)
         
-        hltb = HowLongToBeat()
-        results = await hltb.async_search(game_name)
-        
-        if not results:
+        if not result:
             print(f"[HLTB] ❌ Aucun résultat pour '{game_name}'")
             return None
         
-        # Prendre le premier résultat (meilleur match)
-        game = results[0]
-        
-        result = {
-            'game_name': game.game_name,
-            'main_story': _format_hours(game.main_story),
-            'main_extra': _format_hours(game.main_extra),
-            'completionist': _format_hours(game.completionist),
-            'all_styles': _format_hours(game.all_styles),
-        }
-        
         print(f"[HLTB] ✅ Durée trouvée: {result['main_story']} (histoire)")
         return result
         
@@ -5,176 +5,11 @@ API Documentation: https://rawg.io/apidocs
 Rate limit: 1000 requêtes/jour (gratuit)
 """
 
-from difflib import SequenceMatcher
 from typing import Dict, List, Optional
 
 import httpx
 
-
-def _score_game_candidate(game: dict, query: str, user_year: Optional[int] = None) -> float:
-    """
-    Score un candidat de jeu selon plusieurs critères (système 0-100 pts).
-    
-    Args:
-        game: Données brutes RAWG du jeu candidat
-        query: Requête de l'utilisateur (ex: "cyberpunk", "hades 2")
-        user_year: Année/numéro extraite de la requête (optionnel)
-    
-    Returns:
-        Score total (0-100), plus élevé = meilleur match
-        
-    Scoring (partir de 0 et incrémenter):
-        ✅ Similarité nom: 0-40 pts (fuzzy match)
-        ✅ Bonus contextuel: +15 pts (cyberpunk→2077, gta→v)
-        ✅ Qualité rating: +15 pts (>= 4.0)
-        ✅ Popularité: +10 pts (>= 1000 avis)
-        ✅ Metacritic: +10 pts (scaled 0-10)
-        ✅ Plateformes: +5 pts (PC/consoles)
-        ✅ Bonus AAA: +5 pts (jeux populaires)
-        ✅ Bonus année: +20 pts (match année/suite)
-        ❌ Pénalités soustraites à la fin
-    """
-    score = 0.0
-    game_name = game.get('name', '').lower()
-    query_lower = query.lower()
-    
-    # 1️⃣ Similarité du nom (40 pts max)
-    similarity = SequenceMatcher(None, query_lower, game_name).ratio()
-    score += similarity * 40
-    
-    # 2️⃣ Bonus contextuel (15 pts)
-    contextual_keywords = {
-        'cyberpunk': ['2077', '2020'],
-        'gta': ['v', 'vice', 'san andreas', 'iv'],
-        'zelda': ['breath', 'tears', 'ocarina'],
-        'witcher': ['3', 'wild hunt'],
-        'assassin': ["creed", 'odyssey', 'valhalla'],
-        'red dead': ['redemption', '2'],
-        'elder scrolls': ['skyrim', 'oblivion', 'morrowind'],
-        'hades': ['ii', '2'],
-    }
-    
-    for key, keywords in contextual_keywords.items():
-        if key in query_lower:
-            for keyword in keywords:
-                if keyword in game_name:
-                    score += 15
-                    break
-    
-    # 3️⃣ Qualité rating (15 pts)
-    rating = game.get('rating', 0)
-    if rating >= 4.0:
-        score += 15
-    elif rating >= 3.5:
-        score += 8
-    elif rating >= 3.0:
-        score += 3
-    
-    # 4️⃣ Popularité (10 pts)
-    ratings_count = game.get('ratings_count', 0)
-    if ratings_count >= 1000:
-        score += 10
-    elif ratings_count >= 500:
-        score += 5
-    elif ratings_count >= 100:
-        score += 2
-    
-    # 5️⃣ Metacritic (10 pts max, scaled)
-    metacritic = game.get('metacritic')
-    if metacritic:
-        score += (metacritic / 100) * 10
-    
-    # 6️⃣ Plateformes (5 pts)
-    platforms = game.get('platforms', []) or []
-    platform_names = []
-    for p in platforms:
-        if p and isinstance(p, dict):
-            platform_data = p.get('platform', {})
-            if platform_data:
-                name = platform_data.get('name', '').lower()
-                if name:
-                    platform_names.append(name)
-    
-    if platform_names:
-        major_platforms = ['playstation', 'xbox', 'nintendo', 'pc']
-        if any(major in ' '.join(platform_names) for major in major_platforms):
-            score += 5
-    
-    # 7️⃣ Bonus AAA (5 pts)
-    aaa_keywords = [
-        'grand theft auto', 'gta v', 'gta 5',
-        'cyberpunk 2077',
-        'the legend of zelda', 'breath of the wild', 'tears of the kingdom',
-        'the witcher 3',
-        'red dead redemption',
-        'elden ring',
-        'god of war',
-        'hades',
-    ]
-    
-    if any(keyword in game_name for keyword in aaa_keywords):
-        score += 5
-    
-    # 8️⃣ Bonus année/suite (20 pts) - Si user cherche "Hades 2", "Cyberpunk 2077"
-    if user_year:
-        released = game.get('released', '')
-        if released:
-            try:
-                game_year = int(released.split('-')[0])
-                
-                # Cas 1: Année complète (ex: "Cyberpunk 2077" → 2077)
-                if user_year >= 1990 and game_year == user_year:
-                    score += 20
-                
-                # Cas 2: Numéro de suite (ex: "Hades 2" → cherche "II" ou "2")
-                elif user_year < 1990:
-                    roman_map = {2: 'II', 3: 'III', 4: 'IV', 5: 'V', 6: 'VI', 7: 'VII', 8: 'VIII', 9: 'IX', 10: 'X'}
-                    has_number = f" {user_year}" in game_name or f":{user_year}" in game_name
-                    roman_numeral = roman_map.get(user_year, '')
-                    has_roman = roman_numeral and f" {roman_numeral.lower()}" in game_name
-                    
-                    if has_number or has_roman:
-                        score += 20
-            except (ValueError, IndexError):
-                pass
-    
-    # ❌ PÉNALITÉS (soustraire à la fin)
-    penalties = 0
-    
-    # Pénalité 1: Web/Browser uniquement (-30 pts)
-    if platform_names:
-        if all('web' in name or 'browser' in name for name in platform_names):
-            penalties += 30
-    
-    # Pénalité 2: Faible crédibilité (-20 pts)
-    if ratings_count < 10:
-        penalties += 20
-    elif ratings_count < 50:
-        penalties += 10
-    
-    # Pénalité 3: Rating 0.0 suspect (-15 pts)
-    if rating == 0.0 and ratings_count < 5:
-        penalties += 15
-    
-    # Pénalité 4: Clones/fan games (-20 pts)
-    clone_keywords = ['fan', 'clone', 'demo', 'scratch', 'fan-made', 'fangame']
-    if any(keyword in game_name for keyword in clone_keywords):
-        penalties += 20
-    
-    # Pénalité 5: Jeux très anciens (-15 pts)
-    released = game.get('released', '')
-    if released:
-        try:
-            year = int(released.split('-')[0])
-            if year < 2000:
-                penalties += 15
-        except (ValueError, IndexError):
-            pass
-    
-    # Appliquer les pénalités
-    final_score = max(0, score - penalties)
-    
-    return final_score
+from .scoring import QueryFeatures, score_candidates
 
 
 async def fetch_game_from_rawg(game_name: str, config: dict, user_year: Optional[int] = None) -> Optional[Dict]:
@@ -244,17 +79,17 @@ async def fetch_game_from_rawg(game_name: str, config: dict, user_year: Optional
                 print(f"[RAWG-API] ❌ Aucun résultat pour '{game_name}'")
                 return None
             
-            # Scorer tous les candidats
-            scored_results = []
-            for game in results:
-                score = _score_game_candidate(game, game_name, user_year=user_year)
-                scored_results.append((score, game))
-                
+            # Scorer tous les candidats (une passe, requête analysée une fois)
+            scores = score_candidates(QueryFeatures(game_name, user_year), results)
+            scored_results = list(zip(scores, results))
+            
+            if config.get('bot', {}).get('debug', False):
                 # Debug: afficher le score de chaque candidat
-                game_display = f"{game.get('name', 'N/A')} ({_extract_year(game.get('released'))})"
-                platforms = game.get('platforms') or []
-                platforms_str = ', '.join([p.get('platform', {}).get('name', '') for p in platforms[:3] if p])
-                print(f"[RAWG-API] 📊 Score {score:.1f}: {game_display} - {platforms_str}")
+                for score, game in scored_results:
+                    game_display = f"{game.get('name', 'N/A')} ({_extract_year(game.get('released'))})"
+                    platforms = game.get('platforms') or []
+                    platforms_str = ', '.join([p.get('platform', {}).get('name', '') for p in platforms[:3] if p])
+                    print(f"[RAWG-API] 📊 Score {score:.1f}: {game_display} - {platforms_str}")
             
             # Filtrer les jeux crédibles (score >= 20)
             credible_results = [(sc, g) for sc, g in scored_results if sc >= 20]
@@ -468,3 +303,31 @@ async def fetch_game_details_from_rawg(game_id: int, config: dict) -> Optional[s
     
     details = await _fetch_game_details(game_id, api_key, user_agent)
     return details.get('description_raw', '') if details else None
+
+
+async def fetch_related_titles(slug: str, config: dict, limit: int = 5) -> List[str]:
+    """
+    Titres de la même série qu'un jeu (warmup du cache).
+    
+    Endpoint: /games/{slug}/game-series (1 requête RAWG).
+    
+    Returns:
+        Noms des jeux liés, les plus populaires d'abord ([] si erreur)
+    """
+    api_key = config.get('rawg', {}).get('api_key', '')
+    if not api_key or not slug:
+        return []
+    
+    url = f'https://api.rawg.io/api/games/{slug}/game-series'
+    params = {'key': api_key, 'page_size': limit, 'ordering': '-added'}
+    headers = {'User-Agent': config.get('bot', {}).get('user_agent', 'SerdaBot/1.0 (Twitch)')}
+    
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(url, params=params, headers=headers)
+            response.raise_for_status()
+            results = response.json().get('results', [])
+            return [g['name'] for g in results[:limit] if isinstance(g, dict) and g.get('name')]
+    except Exception as e:
+        print(f"[RAWG-API] ⚠️ Erreur récupération série de '{slug}': {e}")
+        return []
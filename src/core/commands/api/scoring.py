@@ -0,0 +1,295 @@
+"""
+Scoring des candidats RAWG/Steam - moteur partagé.
+
+Une recherche !gameinfo score jusqu'à 20 candidats RAWG puis le meilleur
+résultat de chaque source. Tout ce qui ne dépend que de la requête
+(minuscules, mots-clés contextuels applicables, marqueurs de suite) est
+calculé une seule fois dans ``QueryFeatures`` ; les listes de mots-clés
+sont compilées en une regex chacune au chargement du module.
+
+La similarité de nom reste celle de ``difflib.SequenceMatcher`` (mêmes
+blocs, même ratio) mais sans l'objet ni les namedtuples Match, environ 2x
+plus rapide, et mémoïsée : mêmes noms revus d'une recherche à l'autre, et
+entre le scoring RAWG et le scoring final. Les scores sont identiques à
+l'ancien calcul (golden test : tests/test_scoring.py).
+"""
+
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Requête contenant la clé → +15 si le nom contient un des mots-clés
+CONTEXTUAL_KEYWORDS = (
+    ('cyberpunk', ('2077', '2020')),
+    ('gta', ('v', 'vice', 'san andreas', 'iv')),
+    ('zelda', ('breath', 'tears', 'ocarina')),
+    ('witcher', ('3', 'wild hunt')),
+    ('assassin', ('creed', 'odyssey', 'valhalla')),
+    ('red dead', ('redemption', '2')),
+    ('elder scrolls', ('skyrim', 'oblivion', 'morrowind')),
+    ('hades', ('ii', '2')),
+)
+
+AAA_KEYWORDS = (
+    'grand theft auto', 'gta v', 'gta 5',
+    'cyberpunk 2077',
+    'the legend of zelda', 'breath of the wild', 'tears of the kingdom',
+    'the witcher 3',
+    'red dead redemption',
+    'elden ring',
+    'god of war',
+    'hades',
+)
+
+CLONE_KEYWORDS = ('fan', 'clone', 'demo', 'scratch', 'fan-made', 'fangame')
+MAJOR_PLATFORMS = ('playstation', 'xbox', 'nintendo', 'pc')
+WEB_PLATFORMS = ('web', 'browser')
+
+ROMAN_NUMERALS = {2: 'II', 3: 'III', 4: 'IV', 5: 'V', 6: 'VI', 7: 'VII', 8: 'VIII', 9: 'IX', 10: 'X'}
+
+AUTOJUNK_MIN_LEN = 200  # En dessous, SequenceMatcher n'écarte aucun caractère "populaire"
+
+
+def _any_of(words: Iterable[str]) -> "re.Pattern[str]":
+    """Regex équivalente à ``any(word in text for word in words)``."""
+    return re.compile('|'.join(re.escape(word) for word in words))
+
+
+_CONTEXTUAL_PATTERNS = tuple((key, _any_of(keywords)) for key, keywords in CONTEXTUAL_KEYWORDS)
+_AAA_PATTERN = _any_of(AAA_KEYWORDS)
+_CLONE_PATTERN = _any_of(CLONE_KEYWORDS)
+_MAJOR_PLATFORM_PATTERN = _any_of(MAJOR_PLATFORMS)
+_WEB_PLATFORM_PATTERN = _any_of(WEB_PLATFORMS)
+_YEAR_PATTERN = re.compile(r'(\d{4})')
+
+
+def _matching_ratio(a: str, b: str) -> float:
+    """
+    ``SequenceMatcher(None, a, b).ratio()`` sans l'objet ni les Match.
+
+    Même algorithme (Ratcliff/Obershelp, même ordre de recherche donc mêmes
+    blocs retenus) ; valable seulement sans junk, soit len(b) < 200.
+    """
+    la, lb = len(a), len(b)
+    if not la + lb:
+        return 1.0
+    b2j: Dict[str, List[int]] = {}
+    for j, char in enumerate(b):
+        b2j.setdefault(char, []).append(j)
+
+    matches = 0
+    queue = [(0, la, 0, lb)]
+    while queue:
+        alo, ahi, blo, bhi = queue.pop()
+        # Plus long bloc commun de a[alo:ahi] et b[blo:bhi]
+        besti, bestj, bestsize = alo, blo, 0
+        j2len: Dict[int, int] = {}
+        for i in range(alo, ahi):
+            newj2len = {}
+            for j in b2j.get(a[i], ()):
+                if j < blo:
+                    continue
+                if j >= bhi:
+                    break
+                k = newj2len[j] = j2len.get(j - 1, 0) + 1
+                if k > bestsize:
+                    besti, bestj, bestsize = i - k + 1, j - k + 1, k
+            j2len = newj2len
+        if bestsize:
+            matches += bestsize
+            if alo < besti and blo < bestj:
+                queue.append((alo, besti, blo, bestj))
+            if besti + bestsize < ahi and bestj + bestsize < bhi:
+                queue.append((besti + bestsize, ahi, bestj + bestsize, bhi))
+    return 2.0 * matches / (la + lb)
+
+
+@lru_cache(maxsize=4096)
+def name_ratio(query: str, name: str) -> float:
+    """Similarité SequenceMatcher (0-1) entre la requête et un nom, mémoïsée."""
+    if query == name:
+        return 1.0
+    if len(name) >= AUTOJUNK_MIN_LEN:
+        return SequenceMatcher(None, query, name).ratio()
+    return _matching_ratio(query, name)
+
+
+class QueryFeatures:
+    """Caractéristiques d'une requête, calculées une fois pour tous les candidats."""
+
+    __slots__ = ("query", "text", "user_year", "contextual", "sequel_markers", "roman")
+
+    def __init__(self, query: str, user_year: Optional[int] = None):
+        self.query = query
+        self.text = query.lower()
+        self.user_year = user_year
+        # Mots-clés contextuels dont la clé apparaît dans la requête
+        self.contextual = tuple(pattern for key, pattern in _CONTEXTUAL_PATTERNS if key in self.text)
+        # Numéro de suite (ex: "Hades 2" → " 2", ":2" ou " II")
+        if user_year and user_year < 1990:
+            self.sequel_markers = (f" {user_year}", f":{user_year}")
+            self.roman = ROMAN_NUMERALS.get(user_year, '')
+        else:
+            self.sequel_markers = ()
+            self.roman = ''
+
+    def has_sequel_marker(self, name: str, roman: str) -> bool:
+        return any(marker in name for marker in self.sequel_markers) or bool(roman and f" {roman}" in name)
+
+
+def _released_year(released) -> Optional[int]:
+    """Année d'une date RAWG "YYYY-MM-DD" (None si absente ou illisible)."""
+    if not released:
+        return None
+    try:
+        return int(released.split('-')[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def score_candidates(features: QueryFeatures, games: Iterable[dict]) -> List[float]:
+    """
+    Score des candidats RAWG bruts (système 0-100 pts), en une passe.
+
+    Scoring (partir de 0 et incrémenter):
+        ✅ Similarité nom: 0-40 pts (fuzzy match)
+        ✅ Bonus contextuel: +15 pts (cyberpunk→2077, gta→v)
+        ✅ Qualité rating: +15 pts (>= 4.0)
+        ✅ Popularité: +10 pts (>= 1000 avis)
+        ✅ Metacritic: +10 pts (scaled 0-10)
+        ✅ Plateformes: +5 pts (PC/consoles)
+        ✅ Bonus AAA: +5 pts (jeux populaires)
+        ✅ Bonus année: +20 pts (match année/suite)
+        ❌ Pénalités soustraites à la fin (web only, peu d'avis, clones, < 2000)
+
+    Returns:
+        Scores dans l'ordre des candidats, plus élevé = meilleur match
+    """
+    text = features.text
+    user_year = features.user_year
+    contextual = features.contextual
+    roman = features.roman.lower()
+    scores = []
+
+    for game in games:
+        game_name = game.get('name', '').lower()
+        score = name_ratio(text, game_name) * 40
+
+        for pattern in contextual:
+            if pattern.search(game_name):
+                score += 15
+
+        rating = game.get('rating') or 0
+        if rating >= 4.0:
+            score += 15
+        elif rating >= 3.5:
+            score += 8
+        elif rating >= 3.0:
+            score += 3
+
+        ratings_count = game.get('ratings_count') or 0
+        if ratings_count >= 1000:
+            score += 10
+        elif ratings_count >= 500:
+            score += 5
+        elif ratings_count >= 100:
+            score += 2
+
+        metacritic = game.get('metacritic')
+        if metacritic:
+            score += (metacritic / 100) * 10
+
+        platform_names = []
+        for p in game.get('platforms') or []:
+            if p and isinstance(p, dict):
+                platform_data = p.get('platform', {})
+                if platform_data:
+                    name = platform_data.get('name', '').lower()
+                    if name:
+                        platform_names.append(name)
+        if platform_names and _MAJOR_PLATFORM_PATTERN.search(' '.join(platform_names)):
+            score += 5
+
+        if _AAA_PATTERN.search(game_name):
+            score += 5
+
+        year = _released_year(game.get('released', ''))
+        if user_year and year is not None:
+            if user_year >= 1990 and year == user_year:
+                score += 20
+            elif user_year < 1990 and features.has_sequel_marker(game_name, roman):
+                score += 20
+
+        penalties = 0
+        if platform_names and all(_WEB_PLATFORM_PATTERN.search(name) for name in platform_names):
+            penalties += 30
+        if ratings_count < 10:
+            penalties += 20
+        elif ratings_count < 50:
+            penalties += 10
+        if rating == 0.0 and ratings_count < 5:
+            penalties += 15
+        if _CLONE_PATTERN.search(game_name):
+            penalties += 20
+        if year is not None and year < 2000:
+            penalties += 15
+
+        scores.append(max(0, score - penalties))
+
+    return scores
+
+
+def score_result(features: QueryFeatures, game_data: dict, source: str) -> float:
+    """
+    Score un résultat final normalisé (RAWG ou Steam), système unifié 0-100 pts.
+
+    Scoring:
+        ✅ Similarité nom: 0-50 pts
+        ✅ Qualité rating: +15 pts
+        ✅ Metacritic: +10 pts
+        ✅ Popularité: +10 pts
+        ✅ Bonus Steam indie: +5 pts (+5 si développeurs connus)
+        ✅ Bonus année: +20 pts
+    """
+    game_name_full = game_data.get('name', '')
+    score = name_ratio(features.text, game_name_full.lower()) * 50
+
+    rating = game_data.get('rating', 0)
+    if rating and rating >= 4.0:
+        score += 15
+    elif rating and rating >= 3.5:
+        score += 8
+    elif rating and rating >= 3.0:
+        score += 3
+
+    metacritic = game_data.get('metacritic', 0)
+    if metacritic:
+        score += (metacritic / 100) * 10
+
+    ratings_count = game_data.get('ratings_count', 0)
+    if ratings_count and ratings_count >= 1000:
+        score += 10
+    elif ratings_count and ratings_count >= 500:
+        score += 5
+    elif ratings_count and ratings_count >= 100:
+        score += 2
+
+    if source == "Steam":
+        score += 5
+        if game_data.get('developers'):
+            score += 5
+
+    user_year = features.user_year
+    released = game_data.get('released')
+    if user_year and released:
+        # Format "YYYY-MM-DD" ou année seule
+        year_match = _YEAR_PATTERN.search(str(released))
+        if year_match:
+            game_year = int(year_match.group(1))
+            if user_year >= 1990 and game_year == user_year:
+                score += 20
+            elif user_year < 1990 and features.has_sequel_marker(game_name_full, features.roman):
+                score += 20
+
+    return score
@@ -3,12 +3,17 @@ Steam Store API - Source complémentaire pour jeux indie/récents.
 
 API Documentation: https://steamapi.xpaw.me/
 Rate limit: Pas de limite officielle, mais respecter fair use
+
+Nom → AppID résolu localement (steam_catalog.py, storesearch en dernier
+recours), appdetails groupés.
 """
 
 from typing import Dict, List, Optional
 
 import httpx
 
+from .steam_catalog import appdetails_batcher, steam_catalog
+
 
 async def fetch_game_from_steam(game_name: str) -> Optional[Dict]:
     """
@@ -46,71 +51,49 @@ async def fetch_game_from_steam(game_name: str) -> Optional[Dict]:
         'Alabaster Dawn'
     """
     try:
-        # 1. Recherche Steam Store
-        search_url = 'https://store.steampowered.com/api/storesearch/'
-        search_params = {
-            'term': game_name,
-            'l': 'french',
-            'cc': 'FR',
+        # 1. Nom → AppID : index local (aucun appel réseau)
+        match = steam_catalog.resolve(game_name)
+        if match is not None:
+            app_id, steam_name = match
+            print(f"[STEAM-API] 🔍 Trouvé (catalogue local): {steam_name} (AppID: {app_id})")
+        else:
+            # Catalogue pas encore téléchargé ou nom introuvable localement
+            # (faute dans le 1er mot...) : recherche Steam Store
+            app_id = await _search_app_id(game_name)
+            if app_id is None:
+                return None
+        
+        # 2. Récupérer détails complets (batcher : requêtes concurrentes groupées)
+        game = await appdetails_batcher.get(app_id)
+        if not game:
+            print(f"[STEAM-API] ❌ Impossible de récupérer les détails pour AppID {app_id}")
+            return None
+        
+        # 3. Normalisation au format RAWG
+        normalized = {
+            'name': game.get('name', 'Inconnu'),
+            'slug': game.get('name', '').lower().replace(' ', '-'),
+            'summary': game.get('short_description', game.get('detailed_description', '')),
+            'release_date': _parse_release_date(game.get('release_date', {})),
+            'released': _parse_release_date(game.get('release_date', {})),  # Compatibilité RAWG
+            'release_year': _extract_year_from_steam(game.get('release_date', {})),
+            'platforms': _parse_steam_platforms(game.get('platforms', {})),
+            'developers': game.get('developers', []),
+            'publishers': game.get('publishers', []),
+            'metacritic': game.get('metacritic', {}).get('score'),
+            'rating': None,  # Steam n'a pas de rating 0-5, on pourrait calculer depuis reviews
+            'ratings_count': 0,  # Steam reviews nécessitent un autre endpoint
+            'genres': [g.get('description', '') for g in game.get('genres', [])],
+            'tags': [],  # Steam tags nécessitent parsing HTML
+            'stores': [{'name': 'Steam', 'slug': 'steam'}],
+            'background_image': game.get('header_image'),
+            'steam_appid': app_id,
         }
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            search_response = await client.get(search_url, params=search_params)
-            search_response.raise_for_status()
-            search_data = search_response.json()
-            
-            if not search_data.get('items'):
-                print(f"[STEAM-API] ❌ Aucun résultat pour '{game_name}'")
-                return None
-            
-            # Prendre le premier résultat (meilleur match Steam)
-            first_result = search_data['items'][0]
-            app_id = first_result['id']
-            
-            print(f"[STEAM-API] 🔍 Trouvé: {first_result['name']} (AppID: {app_id})")
-            
-            # 2. Récupérer détails complets
-            details_url = 'https://store.steampowered.com/api/appdetails'
-            details_params = {
-                'appids': app_id,
-                'l': 'french',
-            }
-            
-            details_response = await client.get(details_url, params=details_params)
-            details_response.raise_for_status()
-            details_data = details_response.json()
-            
-            if str(app_id) not in details_data or not details_data[str(app_id)]['success']:
-                print(f"[STEAM-API] ❌ Impossible de récupérer les détails pour AppID {app_id}")
-                return None
-            
-            game = details_data[str(app_id)]['data']
-            
-            # 3. Normalisation au format RAWG
-            normalized = {
-                'name': game.get('name', 'Inconnu'),
-                'slug': game.get('name', '').lower().replace(' ', '-'),
-                'summary': game.get('short_description', game.get('detailed_description', '')),
-                'release_date': _parse_release_date(game.get('release_date', {})),
-                'released': _parse_release_date(game.get('release_date', {})),  # Compatibilité RAWG
-                'release_year': _extract_year_from_steam(game.get('release_date', {})),
-                'platforms': _parse_steam_platforms(game.get('platforms', {})),
-                'developers': game.get('developers', []),
-                'publishers': game.get('publishers', []),
-                'metacritic': game.get('metacritic', {}).get('score'),
-                'rating': None,  # Steam n'a pas de rating 0-5, on pourrait calculer depuis reviews
-                'ratings_count': 0,  # Steam reviews nécessitent un autre endpoint
-                'genres': [g.get('description', '') for g in game.get('genres', [])],
-                'tags': [],  # Steam tags nécessitent parsing HTML
-                'stores': [{'name': 'Steam', 'slug': 'steam'}],
-                'background_image': game.get('header_image'),
-                'steam_appid': app_id,
-            }
-            
-            print(f"[STEAM-API] ✅ Jeu trouvé: {normalized['name']} ({normalized['release_year']})")
-            print(f"[STEAM-API] 📊 Développeur: {', '.join(normalized['developers'][:2])}")
-            
-            return normalized
+        print(f"[STEAM-API] ✅ Jeu trouvé: {normalized['name']} ({normalized['release_year']})")
+        print(f"[STEAM-API] 📊 Développeur: {', '.join(normalized['developers'][:2])}")
+        
+        return normalized
             
     except httpx.TimeoutException:
         print(f"[STEAM-API] ⏱️ Timeout lors de la recherche de '{game_name}'")
@@ -123,6 +106,30 @@ async def fetch_game_from_steam(game_name: str) -> Optional[Dict]:
         return None
 
 
+async def _search_app_id(game_name: str) -> Optional[int]:
+    """AppID via storesearch (catalogue local vide ou sans résultat)."""
+    search_url = 'https://store.steampowered.com/api/storesearch/'
+    search_params = {
+        'term': game_name,
+        'l': 'french',
+        'cc': 'FR',
+    }
+    
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        search_response = await client.get(search_url, params=search_params)
+        search_response.raise_for_status()
+        search_data = search_response.json()
+    
+    if not search_data.get('items'):
+        print(f"[STEAM-API] ❌ Aucun résultat pour '{game_name}'")
+        return None
+    
+    # Prendre le premier résultat (meilleur match Steam)
+    first_result = search_data['items'][0]
+    print(f"[STEAM-API] 🔍 Trouvé: {first_result['name']} (AppID: {first_result['id']})")
+    return first_result['id']
+
+
 def _parse_release_date(release_info: dict) -> str:
     """
     Parse la date de sortie Steam.
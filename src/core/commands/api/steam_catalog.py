@@ -0,0 +1,352 @@
+"""
+Steam Catalog - Miroir local de la liste des apps Steam + batcher appdetails.
+
+fetch_game_from_steam faisait 2 requêtes par recherche (storesearch puis
+appdetails). La liste des apps Steam (~200k entrées) est publique : on la
+garde dans un index SQLite local, rafraîchi en tâche de fond (delta via
+IStoreService si une clé Web API est configurée, sinon liste complète).
+La résolution nom → AppID ne fait plus aucun appel réseau (faute de frappe
+introuvable localement : storesearch en dernier recours, voir steam_api).
+
+Les appdetails concurrents passent par un batcher : un même AppID demandé
+par plusieurs recherches simultanées ne part qu'une fois, et les AppIDs
+arrivés dans la même fenêtre sont groupés. Steam n'accepte plusieurs
+AppIDs par requête qu'avec ``filters`` (ex: price_overview) : sans filtre,
+le lot part en requêtes individuelles parallèles sur un client partagé.
+
+Config:
+    steam:
+      catalog_db: cache/steam_catalog.sqlite3
+      catalog_refresh_interval: 86400   # Secondes (0 = jamais)
+      web_api_key: ""                   # Optionnel : refresh delta (IStoreService)
+"""
+
+import asyncio
+import difflib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+CATALOG_DB_DEFAULT = "cache/steam_catalog.sqlite3"
+REFRESH_INTERVAL_DEFAULT = 86400
+
+APP_LIST_URL = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
+STORE_APP_LIST_URL = "https://api.steampowered.com/IStoreService/GetAppList/v1/"
+APP_DETAILS_URL = "https://store.steampowered.com/api/appdetails"
+STORE_PAGE_SIZE = 50000
+
+BATCH_WINDOW = 0.02  # Secondes d'attente pour grouper les appdetails concurrents
+BATCH_MAX = 50       # AppIDs max par requête groupée (filters)
+
+FUZZY_MIN_PREFIX = 3      # Longueur min du 1er mot pour chercher une faute de frappe
+FUZZY_CANDIDATES = 500    # Noms comparés au plus (même 1er mot que la requête)
+FUZZY_CUTOFF = 0.85       # Similarité min (difflib) pour accepter un nom proche
+GAME_TYPE = "game"        # Type Steam des jeux (vs dlc, music, tool, demo...)
+
+_TRADEMARKS = re.compile(r"[™®©]")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    """Nom d'app normalisé pour l'index (minuscules, sans accents ni ponctuation)."""
+    text = unicodedata.normalize("NFKD", _TRADEMARKS.sub("", name or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+class SteamCatalog:
+    """Index local nom → AppID (SQLite), rafraîchi périodiquement."""
+
+    def __init__(self, db_path: str = CATALOG_DB_DEFAULT):
+        self.refresh_interval = REFRESH_INTERVAL_DEFAULT
+        self.web_api_key = ""
+        self._db_path = db_path
+        self._local = threading.local()
+        self._has_apps: Optional[bool] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, config: dict) -> None:
+        """Lit ``steam.*`` (boot ou hot reload)."""
+        steam_config = config.get("steam", {}) or {}
+        db_path = steam_config.get("catalog_db", CATALOG_DB_DEFAULT)
+        if db_path != self._db_path:
+            self._db_path = db_path
+            self._local = threading.local()
+            self._has_apps = None
+        self.refresh_interval = steam_config.get("catalog_refresh_interval", REFRESH_INTERVAL_DEFAULT)
+        self.web_api_key = steam_config.get("web_api_key", "") or ""
+
+    # ----- Stockage -----
+
+    def _conn(self) -> sqlite3.Connection:
+        """Une connexion par thread (lookups sur la boucle, imports en thread)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS apps ("
+                "appid INTEGER PRIMARY KEY, name TEXT NOT NULL, norm TEXT NOT NULL, last_modified INTEGER, type TEXT)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(apps)")}
+            if "type" not in columns:  # Index créé avant le filtrage par type
+                conn.execute("ALTER TABLE apps ADD COLUMN type TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS apps_norm ON apps (norm)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value) -> None:
+        self._conn().execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def available(self) -> bool:
+        """True si l'index contient des apps (ne crée pas le fichier)."""
+        if self._has_apps is None:
+            self._has_apps = Path(self._db_path).exists() and self.count() > 0
+        return self._has_apps
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+
+    def import_apps(self, apps: Iterable[dict], app_type: Optional[str] = None) -> int:
+        """Upsert d'apps ``{"appid", "name"[, "last_modified", "type"]}``. Retourne le nombre importé.
+
+        ``app_type`` : type commun à tout le lot (ex: pages IStoreService jeux
+        uniquement). Sans type connu (GetAppList v2), l'app reste résolvable.
+        """
+        rows = [
+            (
+                int(app["appid"]), app["name"], normalize_name(app["name"]), app.get("last_modified"),
+                (app.get("type") or app_type or "").lower() or None,
+            )
+            for app in apps
+            if app.get("name") and normalize_name(app["name"])
+        ]
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO apps (appid, name, norm, last_modified, type) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if rows:
+            self._has_apps = True
+        return len(rows)
+
+    def import_file(self, path: str) -> int:
+        """Importe un dump JSON (GetAppList v2 ou IStoreService/GetAppList)."""
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        count = self.import_apps(_apps_from_payload(payload))
+        self._set_meta("updated_at", int(time.time()))
+        return count
+
+    # ----- Résolution nom → AppID (locale) -----
+
+    def resolve(self, game_name: str) -> Optional[Tuple[int, str]]:
+        """(AppID, nom Steam) pour un nom de jeu, sans réseau. None si inconnu.
+
+        Nom exact normalisé d'abord, puis plus court nom commençant par la
+        requête (« hades » → « Hades II » seulement si « Hades » n'existe pas),
+        puis nom le plus proche parmi ceux qui partagent le 1er mot (faute de
+        frappe : « hollow knigt » → « Hollow Knight »). À nom égal, le plus
+        petit AppID (le jeu de base, pas une réédition). Les apps typées autre
+        chose qu'un jeu (DLC, bande-son, outil...) sont ignorées.
+        """
+        query = normalize_name(game_name)
+        if not query or not self.available:
+            return None
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT appid, name FROM apps WHERE norm = ? AND (type IS NULL OR type = ?) ORDER BY appid LIMIT 1",
+            (query, GAME_TYPE),
+        ).fetchone()
+        if row is None:
+            row = conn.execute(
+                "SELECT appid, name FROM apps WHERE norm > ? AND norm < ? AND (type IS NULL OR type = ?) "
+                "ORDER BY length(norm), appid LIMIT 1",
+                (query + " ", query + " \uffff", GAME_TYPE),
+            ).fetchone()
+        if row is None:
+            row = self._closest(conn, query)
+        return (row[0], row[1]) if row else None
+
+    def _closest(self, conn: sqlite3.Connection, query: str) -> Optional[Tuple[int, str]]:
+        """Nom le plus proche (difflib) parmi ceux qui commencent par le 1er mot de la requête.
+
+        Plage sur l'index ``norm`` : pas de scan des ~200k apps. Une faute dans
+        le 1er mot n'est pas rattrapée ici (storesearch côté steam_api).
+        """
+        first = query.split()[0]
+        if len(first) < FUZZY_MIN_PREFIX:
+            return None
+        rows = conn.execute(
+            "SELECT appid, name, norm FROM apps WHERE norm >= ? AND norm < ? AND (type IS NULL OR type = ?) "
+            "ORDER BY appid LIMIT ?",
+            (first, first + "\uffff", GAME_TYPE, FUZZY_CANDIDATES),
+        ).fetchall()
+        best, best_ratio = None, FUZZY_CUTOFF
+        for appid, name, norm in rows:
+            ratio = difflib.SequenceMatcher(None, query, norm).ratio()
+            if ratio > best_ratio:
+                best, best_ratio = (appid, name), ratio
+        return best
+
+    # ----- Rafraîchissement -----
+
+    async def refresh(self, client: Optional[httpx.AsyncClient] = None) -> int:
+        """Met l'index à jour. Delta (IStoreService) si clé Web API, sinon liste complète."""
+        owns_client = client is None
+        client = client or httpx.AsyncClient(timeout=60.0)
+        try:
+            if self.web_api_key:
+                since = await asyncio.to_thread(self._meta, "updated_at")
+                count = await self._refresh_store(client, int(since or 0))
+            else:
+                response = await client.get(APP_LIST_URL)
+                response.raise_for_status()
+                # ~200k apps : décodage JSON hors de la boucle, comme l'import
+                count = await asyncio.to_thread(
+                    lambda: self.import_apps(_apps_from_payload(json.loads(response.content)))
+                )
+            await asyncio.to_thread(self._set_meta, "updated_at", int(time.time()))
+            return count
+        finally:
+            if owns_client:
+                await client.aclose()
+
+    async def _refresh_store(self, client: httpx.AsyncClient, since: int) -> int:
+        """Pages IStoreService modifiées depuis ``since`` (jeux uniquement)."""
+        count, last_appid = 0, 0
+        while True:
+            params = {
+                "key": self.web_api_key,
+                "if_modified_since": since,
+                "last_appid": last_appid,
+                "max_results": STORE_PAGE_SIZE,
+                "include_games": "true",
+            }
+            response = await client.get(STORE_APP_LIST_URL, params=params)
+            response.raise_for_status()
+            page = response.json().get("response", {})
+            apps = page.get("apps", [])
+            count += await asyncio.to_thread(self.import_apps, apps, GAME_TYPE)  # include_games seul
+            if not page.get("have_more_results") or not apps:
+                return count
+            last_appid = page.get("last_appid", apps[-1]["appid"])
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Rafraîchissement périodique en tâche de fond (idempotent)."""
+        if not self.refresh_interval:
+            return None
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        while True:
+            updated_at = await asyncio.to_thread(self._meta, "updated_at")
+            age = time.time() - int(updated_at or 0)
+            if age < self.refresh_interval:
+                await asyncio.sleep(self.refresh_interval - age)
+                continue
+            try:
+                count = await self.refresh()
+                print(f"[STEAM-CATALOG] 🔄 {count} apps mises à jour ({await asyncio.to_thread(self.count)} au total)")
+            except Exception as e:
+                print(f"[STEAM-CATALOG] ⚠️ Rafraîchissement impossible: {e}")
+                await asyncio.sleep(min(self.refresh_interval, 3600))
+
+
+def _apps_from_payload(payload: dict) -> List[dict]:
+    """Liste d'apps depuis un dump GetAppList v2 ou IStoreService/GetAppList."""
+    if "applist" in payload:
+        return payload["applist"].get("apps", [])
+    return payload.get("response", {}).get("apps", [])
+
+
+FetchDetails = Callable[[List[int], Optional[str]], Awaitable[Dict[str, dict]]]
+
+
+class AppDetailsBatcher:
+    """Regroupe les appdetails concurrents (dédup par AppID + fenêtre de batch)."""
+
+    def __init__(self, filters: Optional[str] = None, fetch: Optional[FetchDetails] = None, window: float = BATCH_WINDOW):
+        self.filters = filters
+        self.window = window
+        self._fetch = fetch or self._http_fetch
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+
+    async def get(self, appid: int) -> Optional[dict]:
+        """``data`` de l'appdetails d'un AppID (None si échec)."""
+        future = self._pending.get(appid)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[appid] = future
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_later())
+        return await asyncio.shield(future)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        appids = list(pending)
+        # Plusieurs AppIDs par requête seulement avec filters (limite Steam)
+        size = BATCH_MAX if self.filters else 1
+        chunks = [appids[i:i + size] for i in range(0, len(appids), size)]
+        try:
+            results = await asyncio.gather(*(self._fetch(chunk, self.filters) for chunk in chunks), return_exceptions=True)
+            for chunk, result in zip(chunks, results):
+                if isinstance(result, Exception):
+                    print(f"[STEAM-API] ❌ appdetails {chunk[:5]}: {result}")
+                    result = {}
+                for appid in chunk:
+                    entry = result.get(str(appid)) or {}
+                    if not pending[appid].done():
+                        pending[appid].set_result(entry.get("data") if entry.get("success") else None)
+        finally:
+            # Jamais d'attente infinie côté appelants (annulation, réponse inattendue)
+            for future in pending.values():
+                if not future.done():
+                    future.set_result(None)
+
+    async def _http_fetch(self, appids: List[int], filters: Optional[str]) -> Dict[str, dict]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        params = {"appids": ",".join(map(str, appids)), "l": "french", "cc": "FR"}
+        if filters:
+            params["filters"] = filters
+        self.requests += 1
+        response = await self._client.get(APP_DETAILS_URL, params=params)
+        response.raise_for_status()
+        return response.json() or {}
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Instances globales (singletons)
+steam_catalog = SteamCatalog()
+appdetails_batcher = AppDetailsBatcher()
@@ -2,7 +2,7 @@
 
 from twitchio import Message  # pyright: ignore[reportPrivateImportUsage]
 
-from utils.cache_manager import add_to_cache, clear_cache, get_cache_stats
+from src.utils.cache_manager import add_to_cache, clear_cache, get_cache_stats  # Même module que ask_command
 
 
 async def handle_cacheadd_command(message: Message, config: dict, args: str):
@@ -6,16 +6,21 @@ Architecture propre avec séparation des responsabilités.
 """
 
 import json
-import re
+from typing import Optional, Tuple
 
 from twitchio import Message  # pyright: ignore[reportPrivateImportUsage]
 
 from core.cache import GAME_CACHE, get_cache_key, get_ttl_for_game
+from core.game_record import GameRecord, truncate_summary
 from utils.game_utils import compress_platforms, normalize_platforms
 from utils.translator import Translator
 
 from .api import fetch_game_data  # Nouveau module API centralisé
 
+# Version du format des lignes !gameinfo : à incrémenter quand le rendu
+# change, les lignes pré-rendues des records en cache sont alors refaites
+FORMAT_VERSION = 1
+
 
 async def handle_game_command(message: Message, config: dict, game_name: str, now, bot=None):  # pylint: disable=unused-argument
     """
@@ -45,23 +50,18 @@ async def handle_game_command(message: Message, config: dict, game_name: str, no
             print(f"[GAME] ⚠️ Requête vide ignorée de @{user}")
         return
 
-    # 🔍 VÉRIFICATION DU CACHE (données traduites + compteur de hits)
+    # 🔍 VÉRIFICATION DU CACHE (GameRecord : données + compteur de hits)
     cache_key = get_cache_key("gamedata", game_name)
-    cached_entry = GAME_CACHE.get(cache_key)
-    
-    hit_count = 1  # Première recherche par défaut
+    record = GameRecord.coerce(GAME_CACHE.get(cache_key))
     
-    if cached_entry:
+    if record is not None:
         if debug:
             print(f"[GAME] ⚡ Cache HIT pour '{game_name}'")
-        data = cached_entry["data"]
-        hit_count = cached_entry.get("hit_count", 1) + 1
+        hit_count = record.record_hit()
         
         # Mettre à jour le compteur dans le cache
-        cached_entry["hit_count"] = hit_count
-        release_year = data.get("release_year", "9999")
-        ttl = get_ttl_for_game(release_year)
-        GAME_CACHE.set(cache_key, cached_entry, ttl=ttl)
+        ttl = get_ttl_for_game(record.release_year)
+        GAME_CACHE.set(cache_key, record, ttl=ttl)
         
         if debug:
             print(f"[GAME] 📊 Popularité: {hit_count}× demandé")
@@ -73,9 +73,9 @@ async def handle_game_command(message: Message, config: dict, game_name: str, no
         
         try:
             # 🔥 RÉCUPÉRATION via le nouveau module API (RAWG prioritaire)
-            data = await fetch_game_data(game_name, config)
+            record = await fetch_game_data(game_name, config)
 
-            if not data:
+            if not record:
                 if bot:
                     await bot.safe_send(message.channel, f"@{user} 🤔 Aucun jeu trouvé pour '{game_name}'. T'es sûr du nom ?")
                 else:
@@ -85,20 +85,16 @@ async def handle_game_command(message: Message, config: dict, game_name: str, no
                 return
 
             if debug:
-                debug_data = {k: v for k, v in data.items() if k not in ["summary", "background_image"]}
+                debug_data = {k: v for k, v in record.to_dict().items() if k != "summary"}
                 print(
-                    "[GAME] 🔎 Données brutes API (hors summary) :\n"
+                    "[GAME] 🔎 Données API (hors summary) :\n"
                     + json.dumps(debug_data, indent=2, ensure_ascii=False)
                 )
 
-            # 💾 MISE EN CACHE des données + compteur (pas de traduction summary)
-            cache_entry = {
-                "data": data,
-                "hit_count": 1
-            }
-            release_year = data.get("release_year", "9999")
-            ttl = get_ttl_for_game(release_year)
-            GAME_CACHE.set(cache_key, cache_entry, ttl=ttl)
+            # 💾 MISE EN CACHE du record + compteur (pas de traduction summary)
+            hit_count = record.record_hit()
+            ttl = get_ttl_for_game(record.release_year)
+            GAME_CACHE.set(cache_key, record, ttl=ttl)
             
             if debug:
                 print(f"[GAME] 💾 Mis en cache '{game_name}' (TTL: {ttl}s)")
@@ -111,36 +107,20 @@ async def handle_game_command(message: Message, config: dict, game_name: str, no
             print(f"❌ [GAME] Exception API : {e}")
             return
     
-    # 🌍 TRADUCTION du summary si nécessaire (après cache, avant formatage)
-    summary = data.get('summary', '')
-    if summary:
-        # Détecter si c'est de l'anglais (heuristique simple)
-        is_english = _detect_english(summary)
-        
-        if is_english:
-            if debug:
-                print(f"[GAME] 🌍 Summary détecté en anglais, traduction...")
-            
-            try:
-                translator = Translator()
-                translated = translator.translate(summary, source='en', target='fr')
-                
-                if translated and not translated.startswith('⚠️'):
-                    data['summary'] = translated
-                    if debug:
-                        print(f"[GAME] ✅ Summary traduit: {translated[:80]}...")
-                else:
-                    if debug:
-                        print(f"[GAME] ⚠️ Traduction échouée, garde l'anglais")
-            except Exception as e:
-                print(f"[GAME] ❌ Erreur traduction: {e}")
-        else:
-            if debug:
-                print(f"[GAME] ✅ Summary déjà en français")
-    
-    # 📊 FORMATAGE du message (toujours refait pour avoir le bon @user)
+    # 📊 FORMATAGE : lignes pré-rendues par (jeu, langue, version du format),
+    # seuls @user et le suffixe popularité/cooldown changent d'une demande à l'autre
     try:
-        result = await _format_game_message(data, user, config, debug, cooldown, hit_count)
+        language = config["bot"].get("language", "fr")
+        lines = record.rendered(language, FORMAT_VERSION)
+        if lines is None:
+            # 🌍 TRADUCTION du summary (une seule fois par jeu : gardée dans le record)
+            _ensure_french_summary(record, debug)
+            lines = _render_game_lines(record.to_dict(), debug)
+            record.set_rendered(language, FORMAT_VERSION, lines)
+            GAME_CACHE.set(cache_key, record, ttl=get_ttl_for_game(record.release_year))
+        elif debug:
+            print("[GAME] ⚡ Lignes pré-rendues réutilisées")
+        result = _fill_game_lines(lines, user, cooldown, hit_count)
         
         if debug:
             print(f"[GAME] 📝 Message formaté: {result['main'][:100]}...")
@@ -173,16 +153,9 @@ async def handle_game_command(message: Message, config: dict, game_name: str, no
         print(f"❌ [GAME] Exception formatage : {e}")
 
 
-async def _format_game_message(
-    data: dict, 
-    user: str, 
-    config: dict, 
-    debug: bool,
-    cooldown: int,
-    hit_count: int = 1
-) -> dict:
+def _render_game_lines(data: dict, debug: bool) -> Tuple[str, Optional[str]]:
     """
-    Formate les données du jeu en message Twitch optimisé.
+    Rend les lignes !gameinfo d'un jeu, indépendantes de l'utilisateur.
     
     IMPORTANT: Le summary est déjà traduit dans data["summary"] avant l'appel !
     
@@ -192,20 +165,19 @@ async def _format_game_message(
     - Troncature intelligente de la description
     - Construction du message principal
     
+    Résultat gardé dans le GameRecord (cf. FORMAT_VERSION) : @user et le
+    suffixe popularité/cooldown sont ajoutés à l'envoi par _fill_game_lines.
+    
     Args:
         data: Données normalisées ET TRADUITES du jeu (depuis RAWG ou IGDB)
-        user: Nom de l'utilisateur Twitch
-        config: Configuration du bot (unused mais gardé pour compatibilité)
         debug: Mode debug activé
-        cooldown: Cooldown en secondes
     
     Returns:
-        Dict avec {"main": str, "description": str | None}
+        (ligne principale sans @user ni suffixe, description ou None)
     """
     # Extraction des données (summary est déjà traduit !)
     name = data.get("name", "Inconnu")
     summary = data.get("summary", "")  # Déjà traduit et nettoyé
-    slug = data.get("slug", "")
     release_year = data.get("release_year", "?")
     
     # Notes et ratings (seulement si RAWG)
@@ -218,8 +190,8 @@ async def _format_game_message(
     publishers = data.get("publishers", [])
     
     # 📝 CONSTRUCTION DU MESSAGE
-    # Ligne 1: @user 🎮 NomDuJeu (année), plateformes
-    base = f"@{user} 🎮 {name}"
+    # Ligne 1: 🎮 NomDuJeu (année), plateformes
+    base = f"🎮 {name}"
     base += f" ({release_year})" if release_year != "?" else " (date inconnue)"
     
     # Plateformes
@@ -269,50 +241,82 @@ async def _format_game_message(
     if rating_line:
         message_main += f" | {rating_line}"
     
+    # Message de description (séparé, max 400 chars) : déjà tronqué à la
+    # mise en cache, sauf anciennes entrées
+    summary = truncate_summary(summary)
+    
+    if debug:
+        print(f"[GAME] ✅ Jeu: {name} ({release_year})")
+        print(f"[GAME] Plateformes: {platforms}")
+        if metacritic:
+            print(f"[GAME] Metacritic: {metacritic}/100")
+        if rating:
+            print(f"[GAME] Rating: {rating}/5 ({ratings_count} avis)")
+    
+    return message_main, f"📝 {summary}" if summary else None
+
+
+def _fill_game_lines(lines: Tuple[str, Optional[str]], user: str, cooldown: int, hit_count: int = 1) -> dict:
+    """
+    Complète les lignes pré-rendues pour une demande (@user + suffixe).
+    
+    Returns:
+        Dict avec {"main": str, "description": str | None}
+    """
+    body, description = lines
     # Suffix avec cooldown et popularité
     if hit_count > 1:
-        message_main += f" ({hit_count}× demandé, {cooldown}s)"
+        main = f"@{user} {body} ({hit_count}× demandé, {cooldown}s)"
     else:
-        message_main += f" ({cooldown}s)"
-    
-    # Nettoyer le summary des artefacts de traduction
-    # Supprimer les marqueurs de section (###, ##, etc.)
-    summary = re.sub(r'#{1,6}\s*\w+', '', summary)
-    summary = summary.strip()
-    
-    # Message de description (séparé, max 400 chars)
-    max_summary_chars = 400
-    if len(summary) > max_summary_chars:
-        cut_dot = summary[:max_summary_chars].rfind(". ")
-        cut_comma = summary[:max_summary_chars].rfind(", ")
-        
-        if cut_dot > 100:
-            summary = summary[:cut_dot + 1].strip()
-        elif cut_comma > 100:
-            summary = summary[:cut_comma + 1].strip()
-        else:
-            summary = summary[:max_summary_chars].strip() + "…"
-    
-    # Retourner dict avec 2 messages au lieu d'un seul
-    result = {
-        "main": message_main,
-        "description": f"📝 {summary}" if summary else None
-    }
+        main = f"@{user} {body} ({cooldown}s)"
     
     # Métriques
-    total_len = len(message_main) + (len(summary) if summary else 0)
+    total_len = len(main) + (len(description) if description else 0)
     total_tokens = total_len // 4
     print(f"[METRICS-GAME] 📤 Message total: {total_len} chars (~{total_tokens} tokens)")
     
+    return {"main": main, "description": description}
+
+
+def _ensure_french_summary(record: GameRecord, debug: bool) -> bool:
+    """
+    Traduit le summary du record en français s'il est en anglais.
+    
+    Le résultat est gardé dans le record (summary_lang) : les demandes
+    suivantes du même jeu ne repassent plus par le traducteur.
+    
+    Returns:
+        True si le record a changé (à remettre en cache)
+    """
+    if record.summary_lang or not record.summary:
+        return False
+    
+    if not _detect_english(record.summary):
+        if debug:
+            print("[GAME] ✅ Summary déjà en français")
+        record.summary_lang = "fr"
+        return True
+    
     if debug:
-        print(f"[GAME] ✅ Jeu: {name} ({release_year})")
-        print(f"[GAME] Plateformes: {platforms}")
-        if metacritic:
-            print(f"[GAME] Metacritic: {metacritic}/100")
-        if rating:
-            print(f"[GAME] Rating: {rating}/5 ({ratings_count} avis)")
+        print("[GAME] 🌍 Summary détecté en anglais, traduction...")
+    try:
+        translator = Translator()
+        translated = translator.translate(record.summary, source='en', target='fr')
+    except Exception as e:
+        print(f"[GAME] ❌ Erreur traduction: {e}")
+        return False
+    
+    if not translated or translated.startswith('⚠️'):
+        # Pas de summary_lang : nouvel essai à la prochaine demande
+        if debug:
+            print("[GAME] ⚠️ Traduction échouée, garde l'anglais")
+        return False
     
-    return result
+    record.summary = truncate_summary(translated)
+    record.summary_lang = "fr"
+    if debug:
+        print(f"[GAME] ✅ Summary traduit: {translated[:80]}...")
+    return True
 
 
 def _detect_english(text: str) -> bool:
@@ -6,6 +6,7 @@ Commande simple et rapide pour obtenir le prix d'un jeu PC.
 from twitchio import Message  # pyright: ignore[reportPrivateImportUsage]
 
 from .api import fetch_game_price
+from .api.cheapshark import price_service
 
 
 async def handle_prix_command(
@@ -42,7 +43,9 @@ async def handle_prix_command(
             print(f"[PRIX] ⚠️ Requête vide ignorée de @{user}")
         return
     
-    await message.channel.send("💰 Recherche du prix...")
+    # Prix en mémoire (jeux populaires rafraîchis en fond) : réponse directe
+    if not price_service.has_fresh_price(game_name):
+        await message.channel.send("💰 Recherche du prix...")
     
     try:
         # Récupération du prix
@@ -6,6 +6,7 @@ Commande simple et rapide pour obtenir la durée de jeu estimée.
 from twitchio import Message  # pyright: ignore[reportPrivateImportUsage]
 
 from .api import fetch_game_playtime, format_playtime_message
+from .api.hltb import playtime_service
 
 
 async def handle_temps_command(
@@ -42,11 +43,13 @@ async def handle_temps_command(
             print(f"[TEMPS] ⚠️ Requête vide ignorée de @{user}")
         return
     
-    await message.channel.send("⏱️ Recherche de la durée...")
+    # Durée déjà en cache : réponse directe
+    if playtime_service.lookup_cached(game_name) is None:
+        await message.channel.send("⏱️ Recherche de la durée...")
     
     try:
         # Récupération de la durée
-        data = await fetch_game_playtime(game_name)
+        data = await fetch_game_playtime(game_name, config)
         
         if not data:
             await message.channel.send(
@@ -0,0 +1,223 @@
+"""
+GameRecord : format unique des jeux stockés dans GAME_CACHE.
+
+Avant, deux formats cohabitaient sous la même clé ``gamedata:<nom>`` :
+- fetch_game_data stockait le dict brut normalisé (tags, stores, images...)
+- handle_game_command stockait ``{"data": ..., "hit_count": ...}``
+et le premier qui lisait l'entrée de l'autre plantait (KeyError → refetch).
+
+GameRecord garde uniquement les champs utilisés par les formatters
+(!gameinfo, !ask), en ``__slots__`` (pas de __dict__ par instance), avec
+les compteurs de popularité séparés du payload. Lecture façon dict
+(``record.get("name")``, ``record["platforms"]``) pour les formatters.
+
+Projection compacte :
+- summary tronqué à SUMMARY_MAX_CHARS dès la mise en cache (description_raw
+  RAWG fait souvent plusieurs Ko), puis traduit une seule fois (summary_lang)
+- noms de plateformes/genres/studios internés (partagés entre les jeux)
+- summary compressé (zlib) pour les entrées froides, décompressé à l'accès
+
+Les lignes !gameinfo déjà rendues sont gardées avec le record, par
+(langue, version du format) : un cache hit n'est plus que du formatage
+de chaîne (cf. game_command).
+"""
+import re
+import sys
+import time
+import zlib
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Champs du payload (ordre = format de sérialisation)
+FIELDS: Tuple[str, ...] = (
+    "name",
+    "slug",
+    "summary",
+    "summary_source",
+    "release_date",
+    "release_year",
+    "platforms",
+    "developers",
+    "publishers",
+    "genres",
+    "metacritic",
+    "rating",
+    "ratings_count",
+    "steam_appid",
+    "summary_lang",
+)
+_LIST_FIELDS = frozenset({"platforms", "developers", "publishers", "genres"})
+_DEFAULTS: Dict[str, Any] = {
+    "name": "Inconnu",
+    "slug": "",
+    "summary": "",
+    "summary_source": None,
+    "summary_lang": None,
+    "release_date": "",
+    "release_year": "?",
+    "ratings_count": 0,
+}
+_INTERNED_FIELDS = frozenset({"release_year", "summary_source", "summary_lang"})
+
+SUMMARY_MAX_CHARS = 400  # Limite de la ligne description de !gameinfo
+COMPRESS_MIN_CHARS = 200  # En dessous, zlib ne gagne rien
+
+
+def truncate_summary(summary: str, max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """Nettoie et coupe un summary (fin de phrase, sinon virgule, sinon "…")."""
+    # Supprimer les marqueurs de section (###, ##, etc.)
+    summary = re.sub(r'#{1,6}\s*\w+', '', summary or "").strip()
+    if len(summary) <= max_chars:
+        return summary
+    cut_dot = summary[:max_chars].rfind(". ")
+    cut_comma = summary[:max_chars].rfind(", ")
+    if cut_dot > 100:
+        return summary[:cut_dot + 1].strip()
+    if cut_comma > 100:
+        return summary[:cut_comma + 1].strip()
+    return summary[:max_chars].strip() + "…"
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class GameRecord:
+    """Données d'un jeu + compteurs de popularité (hors payload)."""
+
+    # summary : str, ou bytes zlib quand l'entrée est froide (cf. compact)
+    __slots__ = tuple(f for f in FIELDS if f != "summary") + ("_summary", "_rendered", "hit_count", "last_hit")
+
+    def __init__(self, hit_count: int = 0, last_hit: float = 0.0, **payload):
+        self._rendered: Optional[Dict[str, list]] = None
+        for field in FIELDS:
+            value = payload.get(field, _DEFAULTS.get(field))
+            if field in _LIST_FIELDS:
+                value = tuple(_intern(v) for v in value or ())
+            elif field in _INTERNED_FIELDS:
+                value = _intern(value)
+            setattr(self, field, value)
+        self.hit_count = hit_count
+        self.last_hit = last_hit
+
+    @classmethod
+    def from_dict(cls, data: dict, hit_count: int = 0) -> "GameRecord":
+        """Projette un dict normalisé (RAWG/Steam/IGDB) : champs inutiles ignorés,
+        summary tronqué."""
+        payload = {k: data[k] for k in FIELDS if k in data}
+        if "summary" in payload:
+            payload["summary"] = truncate_summary(payload["summary"])
+        return cls(hit_count=hit_count, **payload)
+
+    @property
+    def summary(self) -> str:
+        value = self._summary
+        return zlib.decompress(value).decode("utf-8") if isinstance(value, bytes) else value
+
+    @summary.setter
+    def summary(self, value: str):
+        self._summary = value
+        self._rendered = None  # Lignes rendues avec l'ancien summary
+
+    # ----- Lignes !gameinfo pré-rendues -----
+
+    def rendered(self, lang: str, version: int) -> Optional[Tuple[str, Optional[str]]]:
+        """Lignes (principale sans @user ni suffixe, description) déjà rendues."""
+        lines = (self._rendered or {}).get(f"{lang}:{version}")
+        return (lines[0], lines[1]) if lines else None
+
+    def set_rendered(self, lang: str, version: int, lines: Tuple[str, Optional[str]]) -> None:
+        if self._rendered is None:
+            self._rendered = {}
+        self._rendered[f"{lang}:{version}"] = list(lines)
+
+    # ----- Compression des entrées froides -----
+
+    @property
+    def is_compact(self) -> bool:
+        return isinstance(self._summary, bytes)
+
+    def compact(self) -> bool:
+        """Compresse le summary (entrée froide). True si compressé."""
+        value = self._summary
+        if not isinstance(value, str) or len(value) < COMPRESS_MIN_CHARS:
+            return False
+        self._summary = zlib.compress(value.encode("utf-8"), 9)
+        self._rendered = None  # Re-rendu (une fois) si le jeu redevient demandé
+        return True
+
+    def thaw(self) -> None:
+        """Décompresse le summary (entrée redevenue chaude)."""
+        if self.is_compact:
+            self._summary = self.summary
+
+    @classmethod
+    def coerce(cls, value: Any) -> Optional["GameRecord"]:
+        """GameRecord depuis une entrée de cache, y compris les anciens formats."""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            if isinstance(value.get("data"), dict):  # Ancien format handle_game_command
+                return cls.from_dict(value["data"], hit_count=value.get("hit_count", 0))
+            if "name" in value:  # Ancien format fetch_game_data (dict brut)
+                return cls.from_dict(value)
+        return None
+
+    # ----- Popularité -----
+
+    def record_hit(self) -> int:
+        """Compte une demande (!gameinfo). Retourne le nouveau total."""
+        self.thaw()
+        self.hit_count += 1
+        self.last_hit = time.time()
+        return self.hit_count
+
+    # ----- Lecture façon dict (formatters) -----
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in FIELDS
+
+    def keys(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((field, getattr(self, field)) for field in FIELDS)
+
+    def to_dict(self) -> dict:
+        """Payload en dict (copie modifiable, listes)."""
+        return {
+            field: list(value) if field in _LIST_FIELDS else value
+            for field, value in self.items()
+        }
+
+    # ----- Sérialisation (cache JSON/SQLite, snapshot) -----
+
+    def to_state(self) -> dict:
+        state = {"payload": self.to_dict(), "hit_count": self.hit_count, "last_hit": self.last_hit}
+        if self._rendered:
+            state["rendered"] = self._rendered
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict) -> "GameRecord":
+        record = cls(hit_count=state.get("hit_count", 0), last_hit=state.get("last_hit", 0.0), **state["payload"])
+        record._rendered = state.get("rendered")
+        return record
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return self.to_state() == other.to_state()
+
+    def __repr__(self) -> str:
+        return f"GameRecord({self.name!r}, {self.release_year}, hits={self.hit_count})"
@@ -4,15 +4,15 @@ from datetime import datetime
 
 import httpx
 
-from config.config import load_config
+from config.config import config_service
 
 TOKEN_URL = 'https://id.twitch.tv/oauth2/token'
 API_URL = 'https://api.igdb.com/v4/games'
 
 
 def _get_config():
-    """Charge la config de manière lazy (à la demande)."""
-    return load_config()
+    """Snapshot de la config partagée (parsée une fois, hot reload)."""
+    return config_service.snapshot
 
 
 def get_igdb_token():
@@ -0,0 +1,220 @@
+"""
+Pack de connaissances - jeux et faits pré-construits, mappés en mémoire.
+
+Construit hors ligne par scripts/build_knowledge_pack.py à partir de
+cache/games.json (ou du cache SQLite des workers), cache/dynamic_facts.json
+et cache/fact_aliases.json. Au boot, le bot fait un simple mmap du fichier :
+aucun parsing, et les workers (process séparés) partagent les mêmes pages
+via le cache disque de l'OS. Seules les entrées demandées sont décodées.
+
+Format (little endian) :
+    en-tête   HEADER (magic, version, nb d'entrées, offsets, date de build)
+    valeurs   blobs UTF-8 (texte brut ou JSON) bout à bout
+    index     ENTRY x N, triées par clé (octets UTF-8) → recherche dichotomique
+    clés      clés UTF-8 bout à bout
+
+Clés : "gamedata:<jeu>" (même clé que GAME_CACHE, valeur = état GameRecord
++ ``expires_at`` : un jeu du pack n'est plus servi après PACK_GAME_TTL),
+"fact:<clé normalisée>" (texte), "alias:<clé>" (texte : clé canonique).
+
+Mise à jour : le builder écrit un fichier temporaire puis os.replace().
+Les lecteurs vérifient périodiquement l'inode et remappent le nouveau
+fichier ; l'ancien mapping reste valide jusqu'à sa fermeture.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from core.game_record import GameRecord
+
+PACK_PATH_DEFAULT = "cache/knowledge.pack"
+RELOAD_CHECK_INTERVAL = 30.0  # Secondes entre deux vérifications du fichier
+PACK_GAME_TTL = 7 * 86400  # Durée de validité d'un jeu après le build (secondes)
+
+MAGIC = b"SBKP"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxIQQd")  # magic, version, count, index_offset, keys_offset, built_at
+ENTRY = struct.Struct("<IHBxQI")      # key_offset, key_len, kind, value_offset, value_len
+
+KIND_TEXT = 0
+KIND_JSON = 1
+
+
+def write_pack(path: str, entries: Dict[str, Tuple[int, bytes]]) -> int:
+    """
+    Écrit un pack (fichier temporaire puis remplacement atomique).
+
+    Args:
+        path: Fichier de destination
+        entries: {clé: (KIND_TEXT | KIND_JSON, valeur encodée)}
+
+    Returns:
+        Nombre d'entrées écrites
+    """
+    items = sorted((key.encode("utf-8"), kind, value) for key, (kind, value) in entries.items())
+    values_size = sum(len(value) for _, _, value in items)
+    index_offset = HEADER.size + values_size
+    keys_offset = index_offset + ENTRY.size * len(items)
+
+    tmp_path = f"{path}.tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(items), index_offset, keys_offset, time.time()))
+        for _, _, value in items:
+            f.write(value)
+        value_offset, key_offset = HEADER.size, 0
+        for key, kind, value in items:
+            f.write(ENTRY.pack(key_offset, len(key), kind, value_offset, len(value)))
+            value_offset += len(value)
+            key_offset += len(key)
+        for key, _, _ in items:
+            f.write(key)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(items)
+
+
+class KnowledgePack:
+    """Lecture seule d'un pack mappé en mémoire (thread-safe, remappage à chaud)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("KNOWLEDGE_PACK", PACK_PATH_DEFAULT)
+        self.count = 0
+        self.built_at = 0.0
+        self._mm: Optional[mmap.mmap] = None
+        self._identity: Optional[Tuple[int, int]] = None  # (inode, mtime) du fichier mappé
+        self._index_offset = 0
+        self._keys_offset = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # ----- Montage -----
+
+    def open(self) -> bool:
+        """Mappe le pack (ou le nouveau fichier s'il a été remplacé). True si disponible."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                self._close_locked()
+                return False
+            identity = (stat.st_ino, stat.st_mtime_ns)
+            if identity == self._identity:
+                return True
+            try:
+                with open(self.path, "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, count, index_offset, keys_offset, built_at = HEADER.unpack_from(mm, 0)
+                if magic != MAGIC or version != VERSION:
+                    mm.close()
+                    raise ValueError(f"format inconnu ({magic!r} v{version})")
+            except (OSError, ValueError, struct.error) as e:
+                print(f"[PACK] ⚠️ Pack illisible {self.path}: {e}")
+                return self._mm is not None
+            old = self._mm
+            self._mm, self._identity = mm, identity
+            self.count, self.built_at = count, built_at
+            self._index_offset, self._keys_offset = index_offset, keys_offset
+            if old is not None:
+                old.close()
+            print(f"[PACK] 🗺️ {count} entrées mappées depuis {self.path}")
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._mm, self._identity, self.count = None, None, 0
+
+    @property
+    def available(self) -> bool:
+        self._maybe_reload()
+        return self._mm is not None
+
+    def _maybe_reload(self) -> None:
+        if time.monotonic() - self._checked_at >= RELOAD_CHECK_INTERVAL:
+            self.open()
+
+    # ----- Lecture -----
+
+    def _lookup(self, key: str) -> Optional[Tuple[int, bytes]]:
+        """(kind, valeur) par recherche dichotomique dans l'index trié."""
+        self._maybe_reload()
+        target = key.encode("utf-8")
+        with self._lock:
+            mm = self._mm
+            if mm is None:
+                return None
+            lo, hi = 0, self.count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                key_offset, key_len, kind, value_offset, value_len = ENTRY.unpack_from(
+                    mm, self._index_offset + mid * ENTRY.size
+                )
+                start = self._keys_offset + key_offset
+                current = mm[start:start + key_len]
+                if current < target:
+                    lo = mid + 1
+                elif current > target:
+                    hi = mid
+                else:
+                    return kind, mm[value_offset:value_offset + value_len]
+        return None
+
+    def get(self, key: str):
+        """Valeur décodée (str ou objet JSON), None si absente."""
+        found = self._lookup(key)
+        if found is None:
+            return None
+        kind, value = found
+        return json.loads(value) if kind == KIND_JSON else value.decode("utf-8")
+
+    def game(self, cache_key: str) -> Optional[GameRecord]:
+        """GameRecord pour une clé GAME_CACHE ("gamedata:hades")."""
+        return self.game_entry(cache_key)[0]
+
+    def game_entry(self, cache_key: str) -> Tuple[Optional[GameRecord], float]:
+        """(GameRecord, secondes de validité restantes) ; (None, 0) si absent ou expiré."""
+        state = self.get(cache_key)
+        if not state:
+            return None, 0.0
+        remaining = state.get("expires_at", float("inf")) - time.time()
+        if remaining <= 0:
+            return None, 0.0  # Pack trop ancien : les sources en ligne reprennent la main
+        return GameRecord.from_state(state), remaining
+
+    def fact(self, key: str) -> Optional[str]:
+        """Fait pour une clé normalisée, en suivant les alias."""
+        fact = self.get(f"fact:{key}")
+        if fact is None:
+            canonical = self.get(f"alias:{key}")
+            if canonical:
+                fact = self.get(f"fact:{canonical}")
+        return fact
+
+    def keys(self) -> Iterable[str]:
+        """Toutes les clés, dans l'ordre de l'index (diagnostic)."""
+        with self._lock:
+            mm = self._mm
+            if mm is None:
+                return []
+            keys = []
+            for i in range(self.count):
+                key_offset, key_len = ENTRY.unpack_from(mm, self._index_offset + i * ENTRY.size)[:2]
+                start = self._keys_offset + key_offset
+                keys.append(mm[start:start + key_len].decode("utf-8"))
+            return keys
+
+
+# Instance globale (singleton) - montée au boot (load_cache), sinon au premier accès
+knowledge_pack = KnowledgePack()
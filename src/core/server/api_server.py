@@ -1,65 +1,169 @@
+"""API HTTP SerdaBot : le "cerveau" du bot pour overlays et outils externes.
+
+Entièrement async, sur le même transport LLM que le bot (utils.model_utils) :
+- POST /chat         → réponse complète (cascade LM Studio → OpenAI)
+- POST /chat/stream  → Server-Sent Events, token par token
+- POST /chat/batch   → plusieurs prompts, concurrence bornée
+Chaque réponse porte X-Response-Time et Server-Timing.
+"""
+
+import asyncio
+import json
 import os
 import sys
+import time
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-
-from config.config import load_config
-from src.utils.llm import query_model
-from src.utils.log import log_response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 # === Détection ROOT_DIR dynamique ===
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 while not os.path.exists(os.path.join(ROOT_DIR, 'pyproject.toml')) and ROOT_DIR != '/':
     ROOT_DIR = os.path.dirname(ROOT_DIR)
 sys.path.insert(0, ROOT_DIR)
-print('📁 ROOT_DIR =', ROOT_DIR)
 
 # === Imports projet ===
+from config.config import config_service, thaw  # noqa: E402
+from src.utils.log import log_response  # noqa: E402
+from utils.model_utils import call_model, stream_model  # noqa: E402
 
-
-# === Chargement config ===
-CONFIG = load_config()
-print('✅ config.yaml chargé :', CONFIG)
-
-# === Initialisation FastAPI ===
-app = FastAPI()
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=['*'],
-    allow_methods=['*'],
-    allow_headers=['*'],
-)
+BATCH_CONCURRENCY_DEFAULT = 4   # Requêtes LLM simultanées max pour /chat/batch
+BATCH_MAX_PROMPTS = 32          # Taille max d'un batch
 
 
 # === Classes ===
 class ChatRequest(BaseModel):
     prompt: str
     user: str = 'user'
+    mode: Literal['ask', 'chill'] = 'chill'
 
 
 class ChatResponse(BaseModel):
-    response: str
-
-
-# === Endpoints ===
-@app.post('/chat', response_model=ChatResponse)
-async def chat(req: ChatRequest):
-    response = await query_model(req.prompt, config=CONFIG)
-    log_response(req.prompt, response, user=req.user)
-    return {'response': response}
-
+    response: Optional[str]
+    available: bool = True      # False → aucun LLM disponible (le client gère son fallback)
+    duration_ms: float = 0.0
+
+
+class BatchRequest(BaseModel):
+    prompts: List[ChatRequest] = Field(..., max_length=BATCH_MAX_PROMPTS)
+    concurrency: Optional[int] = Field(None, ge=1)
+
+
+class BatchResponse(BaseModel):
+    results: List[ChatResponse]
+    duration_ms: float
+
+
+def create_app(config: Optional[dict] = None) -> FastAPI:
+    """Construit l'app FastAPI. Config chargée au démarrage si non fournie."""
+
+    def _on_config_reload(new, old):
+        app.state.config = thaw(new)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if app.state.config is None:
+            # Config partagée : parsée une fois, rechargée à chaud si le fichier change
+            app.state.config = thaw(config_service.snapshot)
+            print(f'✅ Config chargée : {config_service.path}')
+            config_service.subscribe(_on_config_reload)
+            interval = app.state.config.get('bot', {}).get('config_reload_interval', 2)
+            if interval:
+                config_service.watch(interval)
+        yield
+        config_service.unsubscribe(_on_config_reload)
+
+    app = FastAPI(title='SerdaBot API', lifespan=lifespan)
+    app.state.config = config
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=['*'],
+        allow_methods=['*'],
+        allow_headers=['*'],
+        expose_headers=['X-Response-Time', 'Server-Timing'],
+    )
 
-@app.get('/')
-async def root():
-    return {'message': '🧠 SerdaBot API ready.'}
+    @app.middleware('http')
+    async def timing_headers(request: Request, call_next):
+        # Pour /chat/stream : temps jusqu'aux headers (le corps continue après)
+        start = time.perf_counter()
+        request.state.llm_ms = None
+        response = await call_next(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        timings = [f'app;dur={total_ms:.1f}']
+        if request.state.llm_ms is not None:
+            timings.append(f'llm;dur={request.state.llm_ms:.1f}')
+        response.headers['X-Response-Time'] = f'{total_ms:.1f}ms'
+        response.headers['Server-Timing'] = ', '.join(timings)
+        return response
+
+    async def _answer(req: ChatRequest) -> ChatResponse:
+        start = time.perf_counter()
+        response = await call_model(req.prompt, app.state.config, user=req.user, mode=req.mode)
+        duration_ms = (time.perf_counter() - start) * 1000
+        if response is not None:
+            # Écriture fichier hors de la boucle
+            await asyncio.to_thread(log_response, req.prompt, response, user=req.user)
+        return ChatResponse(response=response, available=response is not None, duration_ms=round(duration_ms, 1))
+
+    # === Endpoints ===
+    @app.post('/chat', response_model=ChatResponse)
+    async def chat(req: ChatRequest, request: Request):
+        result = await _answer(req)
+        request.state.llm_ms = result.duration_ms
+        return result
+
+    @app.post('/chat/stream')
+    async def chat_stream(req: ChatRequest):
+        async def events():
+            parts = []
+            async for delta in stream_model(req.prompt, app.state.config, user=req.user, mode=req.mode):
+                parts.append(delta)
+                yield f'data: {json.dumps({"delta": delta}, ensure_ascii=False)}\n\n'
+            if parts:
+                await asyncio.to_thread(log_response, req.prompt, ''.join(parts), user=req.user)
+            else:
+                yield f'data: {json.dumps({"available": False})}\n\n'
+            yield 'data: [DONE]\n\n'
+
+        return StreamingResponse(
+            events(),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
+
+    @app.post('/chat/batch', response_model=BatchResponse)
+    async def chat_batch(req: BatchRequest, request: Request):
+        limit = app.state.config.get('api', {}).get('batch_concurrency', BATCH_CONCURRENCY_DEFAULT)
+        semaphore = asyncio.Semaphore(min(req.concurrency or limit, limit))
+
+        async def bounded(item: ChatRequest) -> ChatResponse:
+            async with semaphore:
+                return await _answer(item)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(bounded(item) for item in req.prompts))
+        duration_ms = (time.perf_counter() - start) * 1000
+        request.state.llm_ms = duration_ms
+        return BatchResponse(results=list(results), duration_ms=round(duration_ms, 1))
+
+    @app.get('/')
+    async def root():
+        return {'message': '🧠 SerdaBot API ready.'}
+
+    return app
+
+
+app = create_app()
 
 
 # === Lancement manuel ===
 if __name__ == '__main__':
-    print('🧠 Modèle exécuté sur :', 'GPU' if CONFIG['bot'].get('use_gpu') else 'CPU')
     print('🚀 Serveur API actif sur http://127.0.0.1:8000')
     uvicorn.run(
         'src.core.server.api_server:app', host='127.0.0.1', port=8000, reload=False
@@ -0,0 +1,301 @@
+"""
+Warmup du cache de jeux piloté par le contexte du stream.
+
+Remplace la liste figée de scripts/warmup_cache.py par un service intégré
+au bot, lancé en tâche de fond au boot puis à chaque changement de
+catégorie du stream. Jeux préchargés, par priorité :
+    1. Catégorie actuelle du stream (Helix /channels) + titres de la même série
+    2. Top-N des jeux les plus demandés (historique hit_count, persisté)
+    3. Noms de jeux vus récemment dans le chat (!gameinfo, même en cooldown)
+
+Concurrence bornée et budget RAWG dédié : le warmup ne consomme jamais plus
+que ``warmup.rawg_daily_budget`` requêtes/jour sur les 1000 du plan gratuit.
+
+Config:
+    warmup:
+      enabled: true
+      concurrency: 2
+      rawg_daily_budget: 200
+      top_n: 20
+      related_limit: 5
+      category_poll_interval: 120
+      compress_cold_after: 1800   # Compresse le summary des jeux non demandés (0 = jamais)
+"""
+import asyncio
+import json
+from collections import Counter, deque
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.cache import GAME_CACHE, get_cache_key
+from core.game_record import GameRecord
+from src.core.commands.api import fetch_game_data
+from src.core.commands.api.rawg_api import fetch_related_titles
+from src.utils.helix_client import HelixClient, bot_helix
+
+# Defaults (config: warmup.*)
+CONCURRENCY_DEFAULT = 2
+RAWG_DAILY_BUDGET_DEFAULT = 200
+TOP_N_DEFAULT = 20
+RELATED_LIMIT_DEFAULT = 5
+CATEGORY_POLL_INTERVAL_DEFAULT = 120
+COMPRESS_COLD_AFTER_DEFAULT = 1800
+RECENT_MENTIONS_MAX = 50
+POPULARITY_FILE_DEFAULT = "cache/game_popularity.json"
+
+RAWG_CALLS_PER_FETCH = 2  # /games?search + /games/{id}
+RAWG_CALLS_PER_SERIES = 1  # /games/{slug}/game-series
+
+# Catégories Twitch qui ne sont pas des jeux
+NON_GAME_CATEGORIES = {
+    "just chatting", "music", "art", "irl", "talk shows & podcasts",
+    "science & technology", "software and game development", "asmr",
+    "makers & crafting", "special events", "sports", "travel & outdoors",
+}
+
+
+class RawgQuota:
+    """Budget journalier de requêtes RAWG réservé au warmup."""
+
+    def __init__(self, daily_budget: int = RAWG_DAILY_BUDGET_DEFAULT):
+        self.daily_budget = daily_budget
+        self._day = date.today()
+        self.used = 0
+
+    def _roll(self, today: Optional[date] = None):
+        today = today or date.today()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+
+    def remaining(self, today: Optional[date] = None) -> int:
+        self._roll(today)
+        return max(0, self.daily_budget - self.used)
+
+    def try_acquire(self, calls: int, today: Optional[date] = None) -> bool:
+        """Réserve ``calls`` requêtes si le budget du jour le permet."""
+        if self.remaining(today) < calls:
+            return False
+        self.used += calls
+        return True
+
+
+async def fetch_channel_game(helix: HelixClient, broadcaster_id: str) -> Optional[str]:
+    """Catégorie actuelle d'une chaîne (Helix GET /channels), None si erreur."""
+    response = await helix.request("GET", "/channels", params={"broadcaster_id": broadcaster_id})
+    if response is None:
+        print("[WARMUP] ⚠️ Catégorie du stream indisponible (Helix injoignable)")
+        return None
+    if response.status_code != 200:
+        print(f"[WARMUP] ⚠️ Helix /channels ({response.status_code})")
+        return None
+    data = response.json().get("data") or []
+    if not data:
+        return None
+    return data[0].get("game_name") or None
+
+
+class WarmupService:
+    """Précharge GAME_CACHE en tâche de fond (concurrence bornée, quota RAWG)."""
+
+    def __init__(self):
+        self.config: dict = {}
+        self.settings: dict = {}
+        self.quota = RawgQuota()
+        self.popularity: Counter = Counter()
+        self.recent_mentions: deque = deque(maxlen=RECENT_MENTIONS_MAX)
+        self.current_games: Dict[str, str] = {}  # salon → catégorie actuelle
+        self.stats = {"warmed": 0, "already_cached": 0, "not_found": 0, "skipped_quota": 0}
+        self._popularity_loaded = False
+        # Pool de workers : seul le worker 0 lance le warmup, les autres lui transmettent les demandes
+        self.forward: Optional[Callable[[str], None]] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._warm_tasks: set = set()
+        self.configure({})
+
+    def configure(self, config: dict) -> None:
+        """Lit ``warmup.*`` (boot ou hot reload)."""
+        self.config = config
+        warmup_config = config.get("warmup", {}) or {}
+        self.settings = {
+            "enabled": warmup_config.get("enabled", True),
+            "concurrency": max(1, int(warmup_config.get("concurrency", CONCURRENCY_DEFAULT))),
+            "top_n": warmup_config.get("top_n", TOP_N_DEFAULT),
+            "related_limit": warmup_config.get("related_limit", RELATED_LIMIT_DEFAULT),
+            "poll_interval": warmup_config.get("category_poll_interval", CATEGORY_POLL_INTERVAL_DEFAULT),
+            "popularity_file": warmup_config.get("popularity_file", POPULARITY_FILE_DEFAULT),
+            "compress_cold_after": warmup_config.get("compress_cold_after", COMPRESS_COLD_AFTER_DEFAULT),
+        }
+        self.quota.daily_budget = warmup_config.get("rawg_daily_budget", RAWG_DAILY_BUDGET_DEFAULT)
+
+    # ----- Signaux du chat -----
+
+    def note_request(self, game_name: str) -> None:
+        """Nom de jeu vu dans le chat (!gameinfo) : popularité + mentions récentes."""
+        name = game_name.strip()
+        if not name:
+            return
+        if self.forward is not None:
+            self.forward(name)
+            return
+        self.popularity[name.lower()] += 1
+        if name.lower() not in (m.lower() for m in self.recent_mentions):
+            self.recent_mentions.append(name)
+
+    def top_games(self, n: Optional[int] = None) -> List[str]:
+        """Jeux les plus demandés (compteur persisté + hit_count du cache)."""
+        counts = Counter(self.popularity)
+        for key, value in GAME_CACHE.iter_valid():
+            record = GameRecord.coerce(value) if key.startswith("gamedata:") else None
+            if record is not None and record.hit_count:
+                name = key.split(":", 1)[1]
+                counts[name] = max(counts[name], record.hit_count)
+        return [name for name, _ in counts.most_common(n or self.settings["top_n"])]
+
+    # ----- Persistance de la popularité -----
+
+    def load_popularity(self) -> None:
+        path = Path(self.settings["popularity_file"])
+        self._popularity_loaded = True
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.popularity.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            print(f"[WARMUP] ⚠️ Historique de popularité illisible: {e}")
+
+    def save_popularity(self) -> None:
+        path = Path(self.settings["popularity_file"])
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(dict(self.popularity.most_common(500)), f, ensure_ascii=False)
+        except OSError as e:
+            print(f"[WARMUP] ⚠️ Impossible de sauvegarder la popularité: {e}")
+
+    # ----- Warmup -----
+
+    async def warm(self, names: Iterable[str], reason: str = "") -> dict:
+        """Précharge une liste de jeux (dédupliquée, déjà en cache ignorés)."""
+        seen, todo = set(), []
+        for name in names:
+            key = get_cache_key("gamedata", name)
+            if not name or key in seen:
+                continue
+            seen.add(key)
+            if GAME_CACHE.get(key) is not None:
+                self.stats["already_cached"] += 1
+                continue
+            todo.append(name)
+        if not todo:
+            return {"warmed": 0, "queued": 0}
+
+        print(f"[WARMUP] 🔥 {len(todo)} jeu(x) à précharger ({reason}) - quota RAWG restant: {self.quota.remaining()}")
+        semaphore = asyncio.Semaphore(self.settings["concurrency"])
+        warmed = 0
+
+        async def one(name: str):
+            nonlocal warmed
+            async with semaphore:
+                if not self.quota.try_acquire(RAWG_CALLS_PER_FETCH):
+                    self.stats["skipped_quota"] += 1
+                    return
+                try:
+                    data = await fetch_game_data(name, self.config)
+                except Exception as e:
+                    print(f"[WARMUP] ❌ {name}: {e}")
+                    data = None
+                if data:
+                    warmed += 1
+                    self.stats["warmed"] += 1
+                else:
+                    self.stats["not_found"] += 1
+
+        await asyncio.gather(*(one(name) for name in todo))
+        print(f"[WARMUP] ✅ {warmed}/{len(todo)} jeu(x) préchargé(s) ({reason})")
+        return {"warmed": warmed, "queued": len(todo)}
+
+    async def warm_stream_game(self, game_name: str) -> dict:
+        """Catégorie du stream + titres de la même série."""
+        if game_name.lower() in NON_GAME_CATEGORIES:
+            return {"warmed": 0, "queued": 0}
+        result = await self.warm([game_name], reason=f"stream: {game_name}")
+        limit = self.settings["related_limit"]
+        if not limit:
+            return result
+        data = await fetch_game_data(game_name, self.config, cache_only=True)
+        slug = (data or {}).get("slug")
+        if slug and self.quota.try_acquire(RAWG_CALLS_PER_SERIES):
+            related = await fetch_related_titles(slug, self.config, limit=limit)
+            if related:
+                await self.warm(related, reason=f"série de {game_name}")
+        return result
+
+    async def warm_startup(self) -> None:
+        """Warmup de démarrage : top-N demandés + mentions récentes (snapshot)."""
+        if not self._popularity_loaded:
+            await asyncio.to_thread(self.load_popularity)
+        await self.warm(list(self.recent_mentions) + self.top_games(), reason="popularité")
+
+    # ----- Boucle de fond -----
+
+    def start(self, targets: Callable[[], List[Tuple[str, Optional[str]]]]) -> Optional[asyncio.Task]:
+        """Lance warmup de boot + suivi de catégorie (idempotent).
+
+        Args:
+            targets: Retourne [(salon, broadcaster_id)] (IDs résolus au runtime)
+        """
+        if not self.settings["enabled"]:
+            return None
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._run(targets))
+        return self._poll_task
+
+    async def stop(self) -> None:
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self.save_popularity)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._warm_tasks.add(task)
+        task.add_done_callback(self._warm_tasks.discard)
+
+    async def _run(self, targets) -> None:
+        self._spawn(self.warm_startup())
+        while True:
+            await self.poll_categories(targets())
+            self.maintain_cache()
+            await asyncio.to_thread(self.save_popularity)
+            await asyncio.sleep(self.settings["poll_interval"])
+
+    def maintain_cache(self) -> None:
+        """Entretien de GAME_CACHE : purge des expirés + compression des entrées froides."""
+        GAME_CACHE.cleanup_expired()
+        idle = self.settings["compress_cold_after"]
+        if idle:
+            GAME_CACHE.compact_cold(idle)
+
+    async def poll_categories(self, targets: List[Tuple[str, Optional[str]]]) -> None:
+        """Détecte les changements de catégorie et lance le warmup associé."""
+        helix = bot_helix(self.config.get("twitch", {}))
+        if helix is None:
+            return
+        for channel, broadcaster_id in targets:
+            if not broadcaster_id:
+                continue
+            game = await fetch_channel_game(helix, broadcaster_id)
+            if game and game != self.current_games.get(channel):
+                print(f"[WARMUP] 🎮 Catégorie de #{channel}: {game}")
+                self.current_games[channel] = game
+                self._spawn(self.warm_stream_game(game))
+
+
+# Instance globale (singleton)
+warmup_service = WarmupService()
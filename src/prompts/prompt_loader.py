@@ -1,7 +1,10 @@
 """Prompt loading and building utilities for SerdaBot."""
 
+import hashlib
+import json
 import re
-from typing import Any, Dict, List, Optional, Sequence
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 # === SYSTEM PROMPT - Production optimisée ===
 
@@ -53,6 +56,81 @@ Maintenant, réponds à l'utilisateur avec ce style. Réponds de manière compl
 """
 
 
+# === PRÉFIXES CANONIQUES (KV-cache friendly) ===
+# LM Studio / llama.cpp réutilisent l'état KV du prompt tant que le début de la
+# requête est identique octet pour octet. On précalcule donc UN préfixe figé par
+# mode (system + éventuels tours fixes) : seul le dernier tour "user" varie.
+# ⚠️ Incrémenter la version à chaque modification d'un prompt système ci-dessus.
+PROMPT_TEMPLATE_VERSION = "2025.10-1"
+
+# Renforcement JSON (extract_metadata=True) : fait partie du préfixe, pas du tour user
+_JSON_ONLY_SUFFIX = (
+    '\n\n⚠️ IMPORTANT: Réponds UNIQUEMENT en JSON valide. Format strict: '
+    '{"m":"ton message en français","t":"tone","c":0.9}. Aucun texte avant ou après le JSON.'
+)
+
+_PREFIX_SYSTEMS = {
+    "ask": SYSTEM_ASK_FINAL,
+    "chill": SYSTEM_CHILL_FINAL,
+}
+
+PrefixMessages = Tuple[Mapping[str, str], ...]
+
+
+def _freeze_prefix(system: str) -> PrefixMessages:
+    """Construit un préfixe immuable (tuple de mappings en lecture seule)."""
+    return (MappingProxyType({"role": "system", "content": system}),)
+
+
+# Clé: (mode, extract_metadata) → préfixe figé, calculé une seule fois à l'import
+PROMPT_PREFIXES: Mapping[Tuple[str, bool], PrefixMessages] = MappingProxyType({
+    (mode, json_only): _freeze_prefix(system + (_JSON_ONLY_SUFFIX if json_only else ""))
+    for mode, system in _PREFIX_SYSTEMS.items()
+    for json_only in (False, True)
+})
+
+
+def _prefix_mode(mode: str | None) -> str:
+    """Ramène n'importe quel mode vers un préfixe connu (ask, sinon chill)."""
+    return "ask" if (mode or "chill").lower() == "ask" else "chill"
+
+
+def get_prompt_prefix(mode: str = "chill", extract_metadata: bool = False) -> PrefixMessages:
+    """
+    Retourne le préfixe canonique (figé) pour un mode.
+
+    Le même objet est retourné à chaque appel : aucune reconstruction par requête.
+    """
+    return PROMPT_PREFIXES[(_prefix_mode(mode), extract_metadata)]
+
+
+def build_prefixed_messages(
+    mode: str, user_text: str, extract_metadata: bool = False
+) -> List[Dict[str, str]]:
+    """
+    Construit la liste de messages OpenAI/LM Studio : préfixe canonique + tour user.
+
+    Les dicts du préfixe sont copiés (sérialisables en JSON) mais leur contenu
+    est strictement identique d'une requête à l'autre.
+    """
+    messages = [dict(m) for m in get_prompt_prefix(mode, extract_metadata)]
+    messages.append({"role": "user", "content": user_text})
+    return messages
+
+
+def _fingerprint(prefix: PrefixMessages) -> str:
+    raw = json.dumps([dict(m) for m in prefix], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(f"{PROMPT_TEMPLATE_VERSION}|{raw}".encode("utf-8")).hexdigest()[:12]
+
+
+_PREFIX_FINGERPRINTS = {key: _fingerprint(prefix) for key, prefix in PROMPT_PREFIXES.items()}
+
+
+def get_prefix_fingerprint(mode: str = "chill", extract_metadata: bool = False) -> str:
+    """Empreinte courte (version + contenu) du préfixe, pratique pour les logs/benchmarks."""
+    return _PREFIX_FINGERPRINTS[(_prefix_mode(mode), extract_metadata)]
+
+
 # ===== USER SANITIZATION =====
 
 _DIR_PREFIXES = [
@@ -115,16 +193,6 @@ def build_messages(mode: str, content: str, lang: str | None = None, extract_met
     """
     mode_norm = (mode or "chill").lower()
     
-    # Choisir le bon prompt selon le mode
-    if mode_norm == "ask":
-        system = SYSTEM_ASK_FINAL
-    else:
-        system = SYSTEM_CHILL_FINAL
-    
-    # Renforcement JSON si metadata activée
-    if extract_metadata:
-        system += '\n\n⚠️ IMPORTANT: Réponds UNIQUEMENT en JSON valide. Format strict: {"m":"ton message en français","t":"tone","c":0.9}. Aucun texte avant ou après le JSON.'
-    
     # Mode ask : reformule en question pour clarifier l'intention
     # Mode chill : texte brut (juste nettoyage directives)
     if mode_norm == "ask":
@@ -132,25 +200,10 @@ def build_messages(mode: str, content: str, lang: str | None = None, extract_met
     else:
         user_text = strip_directives(content)
 
-    # Few-shot enrichi pour mode chill (inclut réactions + questions + anti-anecdotes)
-    if mode_norm == "chill" and not extract_metadata:
-        messages = [
-            {"role": "system", "content": system},
-            {"role": "user", "content": "lol"},
-            {"role": "assistant", "content": "Marrant."},
-            {"role": "user", "content": "t'es qui toi ?"},
-            {"role": "assistant", "content": "Le bot du stream."},
-            {"role": "user", "content": "raconte une anecdote"},
-            {"role": "assistant", "content": "Pas d'anecdotes perso 😉"},
-            {"role": "user", "content": "ton avis sur l'IA ?"},
-            {"role": "assistant", "content": "Prometteur, à encadrer."},
-            {"role": "user", "content": user_text},
-        ]
-    else:
-        messages = [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user_text},
-        ]
+    # Préfixe canonique (system + renforcement JSON éventuel) : identique à
+    # celui envoyé par model_utils, seul le tour user varie → KV-cache réutilisé
+    messages = build_prefixed_messages(mode_norm, user_text, extract_metadata=extract_metadata)
+    system = messages[0]["content"]
     
     # Température réduite pour JSON (plus stable)
     if extract_metadata:
@@ -1,27 +1,48 @@
 """
 Fact Cache Manager - Wikipedia Integration
 Gère le cache des faits encyclopédiques pour réduire les hallucinations
+
+Wikipedia : FR et EN sont interrogés en parallèle (FR gagne si les deux
+trouvent), via un client httpx partagé (keep-alive entre recherche et
+résumé) et un token bucket par host (1 req/s, rafale de 2 : recherche +
+résumé d'une question partent sans attendre).
+
+Alias : une formulation qui aboutit à un article déjà en cache (même titre
+Wikipedia) ou proche d'une clé connue réutilise l'entrée existante
+(voir utils/fact_aliases.py).
 """
 import asyncio
 import json
 import os
-import time
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import httpx
 
+from core.knowledge_pack import knowledge_pack  # Même singleton (et mmap) que game_data_fetcher
+from src.utils.fact_aliases import FactAliasIndex
+from src.utils.rate_limiter import AsyncTokenBucket
 from src.utils.translator import Translator
 
 # Chemin du cache persistant
 CACHE_DIR = Path("cache")
 CACHE_FILE = CACHE_DIR / "dynamic_facts.json"
+ALIASES_FILE = CACHE_DIR / "fact_aliases.json"
+PACK_CLEARED_FILE = CACHE_DIR / "knowledge_pack.cleared"  # Build du pack vidé par !cacheclear
 CACHE_DIR.mkdir(exist_ok=True)
 
 # Variables globales
 _fact_cache: Dict[str, str] = {}
-_last_wiki_call = 0
-_WIKI_RATE_LIMIT = 1.0  # 1 requête/sec
+_cache_loaded = False  # Chargé à la demande (pas à l'import)
+_use_pack = True  # Faits du pack de connaissances (désactivé par reset)
+_pack_cleared_build: Optional[float] = None  # built_at du pack ignoré jusqu'au prochain build
+_aliases = FactAliasIndex(str(ALIASES_FILE))
+_WIKI_RATE_LIMIT = 1.0  # 1 requête/sec par host
+_WIKI_BURST = 2  # Recherche + résumé d'une même question sans attente
+_wiki_buckets: Dict[str, AsyncTokenBucket] = {}  # host → bucket
+_wiki_client: Optional[httpx.AsyncClient] = None  # Client partagé (créé à la demande)
 _translator = None  # Initialisé à la demande
 
 
@@ -32,6 +53,19 @@ def _get_translator():
         _translator = Translator()
     return _translator
 
+async def _wiki_get(lang: str, path: str, params: Optional[dict] = None) -> httpx.Response:
+    """GET sur {lang}.wikipedia.org : token bucket du host puis client partagé."""
+    global _wiki_client
+    host = f"{lang}.wikipedia.org"
+    bucket = _wiki_buckets.get(host)
+    if bucket is None:
+        bucket = _wiki_buckets[host] = AsyncTokenBucket(_WIKI_RATE_LIMIT, capacity=_WIKI_BURST)
+    await bucket.acquire()
+    
+    if _wiki_client is None:
+        _wiki_client = httpx.AsyncClient(timeout=5.0)
+    return await _wiki_client.get(f"https://{host}{path}", params=params)
+
 # Redirections pour termes ambigus (Wikipedia)
 _WIKI_REDIRECTS = {
     "python": "Python_(langage)",
@@ -73,18 +107,54 @@ _WIKI_REDIRECTS = {
 def load_cache(reset: bool = False):
     """Charge le cache depuis le fichier JSON au démarrage.
     
+    Si un pack de connaissances est présent (scripts/build_knowledge_pack.py),
+    il est simplement mappé : les faits qu'il contient sont servis sans
+    parsing, le JSON (faits ajoutés depuis le build) n'est lu qu'au premier
+    fait absent du pack.
+    
     Args:
         reset: Si True, vide le cache existant (mode expérimental)
     """
-    global _fact_cache
+    global _fact_cache, _cache_loaded, _use_pack
     
     if reset:
+        _cache_loaded = True
+        _use_pack = False  # Mode expérimental : aucun fait pré-existant
         _fact_cache = {}
         if CACHE_FILE.exists():
             CACHE_FILE.unlink()
+        _aliases.clear()
         print("[CACHE] 🔄 Cache réinitialisé (mode expérimental)")
         return
     
+    _load_pack_cleared()
+    if not _cache_loaded and knowledge_pack.open():
+        if knowledge_pack.built_at == _pack_cleared_build:
+            print("[CACHE] 📦 Pack ignoré (vidé par !cacheclear) jusqu'au prochain build")
+        else:
+            print(f"[CACHE] 📦 Faits servis par le pack ({knowledge_pack.count} entrées), {CACHE_FILE} lu à la demande")
+            return
+    
+    _load_fact_file()
+
+
+def _load_pack_cleared():
+    """Relit le marqueur !cacheclear : le vidage survit au redémarrage."""
+    global _pack_cleared_build
+    try:
+        _pack_cleared_build = json.loads(PACK_CLEARED_FILE.read_text(encoding="utf-8"))["built_at"]
+    except FileNotFoundError:
+        _pack_cleared_build = None
+    except Exception as e:
+        print(f"[CACHE] ⚠️ Marqueur {PACK_CLEARED_FILE} illisible: {e}")
+        _pack_cleared_build = None
+
+
+def _load_fact_file():
+    """Parse cache/dynamic_facts.json et l'index d'alias."""
+    global _fact_cache, _cache_loaded
+    _cache_loaded = True
+    
     if CACHE_FILE.exists():
         try:
             with open(CACHE_FILE, "r", encoding="utf-8") as f:
@@ -96,6 +166,16 @@ def load_cache(reset: bool = False):
     else:
         _fact_cache = {}
         print("[CACHE] 📦 Nouveau cache initialisé")
+    
+    _aliases.load(_fact_cache)
+    if _aliases.aliases:
+        print(f"[CACHE] 🔗 {len(_aliases.aliases)} alias chargés")
+
+
+def _ensure_cache_loaded():
+    """Charge le cache disque au premier accès."""
+    if not _cache_loaded:
+        _load_fact_file()
 
 
 def save_cache():
@@ -111,45 +191,64 @@ def save_cache():
         print(f"[CACHE] ❌ Erreur sauvegarde: {e}")
 
 
+# Préfixes conversationnels, appliqués dans cet ordre (un même préfixe au plus
+# une fois, un préfixe ne peut plus s'appliquer après un préfixe suivant).
+# Pattern: "explique (moi|nous|leur) X" → "X"
+_CONVERSATIONAL_PATTERNS = (
+    r"c'est quoi\s+",
+    r"c quoi\s+",
+    r"c'est qui\s+",
+    r"c qui\s+",
+    r"tu connais\s+(?:le|la|les|l')?\s*",  # "tu connais le/la/les X"
+    r"connais tu\s+(?:le|la|les|l')?\s*",
+    r"connais-tu\s+(?:le|la|les|l')?\s*",
+    r"explique\s+(?:moi|nous|leur|lui)\s+",  # "explique moi X" (obligatoire)
+    r"explique\s+",  # "explique X" (sans pronom)
+    r"parle\s+(?:moi|nous)\s+(?:de|des|du)\s+",  # "parle moi de X" (obligatoire)
+    r"parle\s+(?:de|des|du)\s+",  # "parle de X" (sans pronom)
+    r"qu'est-ce que\s+(?:le|la|les|l')?\s*",
+    r"quest-ce que\s+(?:le|la|les|l')?\s*",
+    r"qu'est ce que\s+(?:le|la|les|l')?\s*",
+    r"qui est\s+",
+    r"qui sont\s+",
+    r"défini\s+",
+    r"définis\s+",
+)
+
+
+def _compile_prefixes(patterns) -> "re.Pattern[str]":
+    """Une seule regex ancrée ; l'alternative qui matche est lue dans ``lastindex``."""
+    return re.compile("^(?:" + "|".join(f"({pattern})" for pattern in patterns) + ")", re.IGNORECASE)
+
+
+# _PREFIX_FROM[i] ne teste que les préfixes i.. : même résultat que les re.sub successifs
+_PREFIX_FROM = tuple(_compile_prefixes(_CONVERSATIONAL_PATTERNS[i:]) for i in range(len(_CONVERSATIONAL_PATTERNS)))
+
+# Articles ("le", "la", "les", "un", "une", "des") au début, un seul max
+_ARTICLE_PATTERN = re.compile(r"^(?:le |la |les |un |une |des |l')")
+
+# Small talk à exclure (CHILL mode)
+_SOCIAL_PATTERN = re.compile("salut|hello|hi|yo|gg|lol|mdr|xd|comment ça va|comment vas")
+
+
+@lru_cache(maxsize=4096)
 def normalize_key(query: str) -> str:
-    """Normalise la question pour la recherche (minuscule, sans directives)."""
-    import re
-    
+    """Normalise la question pour la recherche (minuscule, sans directives). Mémoïsé."""
     key = query.strip().lower()
     key = key.rstrip("?!. ").strip()
     
-    # Enlever les préfixes courants avec regex pour gérer "moi", "nous", etc.
-    # Pattern: "explique (moi|nous|leur) X" → "X"
-    conversational_patterns = [
-        r"^c'est quoi\s+",
-        r"^c quoi\s+",
-        r"^c'est qui\s+",
-        r"^c qui\s+",
-        r"^tu connais\s+(le|la|les|l')?\s*",  # "tu connais le/la/les X"
-        r"^connais tu\s+(le|la|les|l')?\s*",
-        r"^connais-tu\s+(le|la|les|l')?\s*",
-        r"^explique\s+(moi|nous|leur|lui)\s+",  # "explique moi X" (obligatoire)
-        r"^explique\s+",  # "explique X" (sans pronom)
-        r"^parle\s+(moi|nous)\s+(de|des|du)\s+",  # "parle moi de X" (obligatoire)
-        r"^parle\s+(de|des|du)\s+",  # "parle de X" (sans pronom)
-        r"^qu'est-ce que\s+(le|la|les|l')?\s*",
-        r"^quest-ce que\s+(le|la|les|l')?\s*",
-        r"^qu'est ce que\s+(le|la|les|l')?\s*",
-        r"^qui est\s+",
-        r"^qui sont\s+",
-        r"^défini\s+",
-        r"^définis\s+",
-    ]
-    
-    for pattern in conversational_patterns:
-        key = re.sub(pattern, "", key, flags=re.IGNORECASE).strip()
-    
-    # Enlever articles ("le", "la", "les", "un", "une", "des") au début
-    articles = ["le ", "la ", "les ", "un ", "une ", "des ", "l'"]
-    for article in articles:
-        if key.startswith(article):
-            key = key[len(article):].strip()
-            break  # Un seul article max
+    # Enlever les préfixes courants ("c'est quoi", "explique moi"...), dans l'ordre
+    start = 0
+    while start < len(_PREFIX_FROM):
+        match = _PREFIX_FROM[start].match(key)
+        if not match:
+            break
+        key = key[match.end():].strip()
+        start += match.lastindex
+    
+    match = _ARTICLE_PATTERN.match(key)
+    if match:
+        key = key[match.end():].strip()
     
     return key or query.strip().lower()
 
@@ -158,36 +257,17 @@ def is_factual_question(query: str) -> bool:
     """Détecte si la question mérite une recherche encyclopédique."""
     q = query.lower().strip()
     
-    # Patterns sociaux à exclure (CHILL mode)
-    social_patterns = ["salut", "hello", "hi", "yo", "gg", "lol", "mdr", "xd", "comment ça va", "comment vas"]
-    if any(pattern in q for pattern in social_patterns):
+    if _SOCIAL_PATTERN.search(q):
         return False
     
-    # Patterns factuels à inclure
-    factual_patterns = [
-        "quoi", "qu'est", "quest", "explique", "parle", "défini", "signifie", 
-        "c'est", "c est", "comment", "pourquoi",
-        "définition", "origine", "qui est", "qui sont"
-    ]
-    
-    # Si au moins un pattern factuel ET plus de 1 mot → factuel
-    has_factual = any(pattern in q for pattern in factual_patterns)
-    has_length = len(q.split()) >= 1  # Au moins 1 mot après normalisation
-    
-    return has_factual or has_length  # Ou juste un mot (ex: "python", "axolotl")
+    # Question ("quoi", "explique", "pourquoi"...) ou simple sujet ("python", "axolotl") :
+    # tout texte non vide hors small talk part en recherche
+    return bool(q)
 
 
 async def search_wikipedia(query: str, lang: str = "fr") -> Optional[str]:
     """Cherche le bon titre d'article via l'API de recherche Wikipedia."""
-    global _last_wiki_call
-    
-    # Respecter le rate limit
-    now = time.time()
-    if now - _last_wiki_call < _WIKI_RATE_LIMIT:
-        await asyncio.sleep(_WIKI_RATE_LIMIT - (now - _last_wiki_call))
-    
     try:
-        search_url = f"https://{lang}.wikipedia.org/w/api.php"
         params = {
             "action": "opensearch",
             "search": query,
@@ -196,17 +276,15 @@ async def search_wikipedia(query: str, lang: str = "fr") -> Optional[str]:
             "format": "json"
         }
         
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(search_url, params=params)
-            _last_wiki_call = time.time()
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                # Format: [query, [titles], [descriptions], [urls]]
-                if len(data) >= 2 and len(data[1]) > 0:
-                    best_title = data[1][0]  # Premier résultat
-                    print(f"[WIKI] 🔍 Trouvé: {query} → {best_title}")
-                    return best_title
+        resp = await _wiki_get(lang, "/w/api.php", params)
+        
+        if resp.status_code == 200:
+            data = resp.json()
+            # Format: [query, [titles], [descriptions], [urls]]
+            if len(data) >= 2 and len(data[1]) > 0:
+                best_title = data[1][0]  # Premier résultat
+                print(f"[WIKI] 🔍 Trouvé: {query} → {best_title}")
+                return best_title
                     
     except Exception as e:
         print(f"[WIKI] ⚠️ Erreur recherche pour '{query}': {e}")
@@ -216,8 +294,12 @@ async def search_wikipedia(query: str, lang: str = "fr") -> Optional[str]:
 
 async def fetch_wiki_summary(topic: str, lang: str = "fr") -> Optional[str]:
     """Récupère un résumé Wikipedia court et propre (async)."""
-    global _last_wiki_call
-    
+    page = await fetch_wiki_page(topic, lang)
+    return page[1] if page else None
+
+
+async def fetch_wiki_page(topic: str, lang: str = "fr") -> Optional[Tuple[str, str]]:
+    """Comme fetch_wiki_summary, mais retourne (titre résolu de l'article, résumé)."""
     if not topic.strip():
         return None
     
@@ -231,33 +313,27 @@ async def fetch_wiki_summary(topic: str, lang: str = "fr") -> Optional[str]:
         if searched_title:
             clean_topic = searched_title
     
-    # 3. Respecter le rate limit
-    now = time.time()
-    if now - _last_wiki_call < _WIKI_RATE_LIMIT:
-        await asyncio.sleep(_WIKI_RATE_LIMIT - (now - _last_wiki_call))
-    
+    # 3. Résumé (même client, rate limit par host dans _wiki_get)
     try:
         clean_topic = clean_topic.strip().replace(" ", "_")
-        url = f"https://{lang}.wikipedia.org/api/rest_v1/page/summary/{clean_topic}"
+        resp = await _wiki_get(lang, f"/api/rest_v1/page/summary/{clean_topic}")
         
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(url)
-            _last_wiki_call = time.time()
+        if resp.status_code == 200:
+            data = resp.json()
+            extract = data.get("extract", "")
             
-            if resp.status_code == 200:
-                data = resp.json()
-                extract = data.get("extract", "")
+            if extract and len(extract) > 20:  # Éviter les stubs
+                # Nettoyer et tronquer à 230 caractères max
+                clean = " ".join(extract.replace("\n", " ").split())
                 
-                if extract and len(extract) > 20:  # Éviter les stubs
-                    # Nettoyer et tronquer à 230 caractères max
-                    clean = " ".join(extract.replace("\n", " ").split())
-                    
-                    if len(clean) > 230:
-                        # Couper à la dernière ponctuation avant 230
-                        end = max(clean.rfind(p, 0, 230) for p in ".!?;")
-                        clean = clean[:end + 1] if end != -1 else clean[:227] + "…"
-                    
-                    return clean
+                if len(clean) > 230:
+                    # Couper à la dernière ponctuation avant 230
+                    end = max(clean.rfind(p, 0, 230) for p in ".!?;")
+                    clean = clean[:end + 1] if end != -1 else clean[:227] + "…"
+                
+                # Titre canonique (redirections Wikipedia suivies)
+                title = (data.get("titles") or {}).get("canonical") or data.get("title") or clean_topic
+                return title.replace(" ", "_"), clean
                     
     except Exception as e:
         print(f"[WIKI] ⚠️ Erreur pour '{topic}': {e}")
@@ -265,29 +341,107 @@ async def fetch_wiki_summary(topic: str, lang: str = "fr") -> Optional[str]:
     return None
 
 
+async def fetch_wiki_summary_fr_en(topic: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Résumé Wikipedia FR et EN en parallèle, FR prioritaire.
+    
+    Returns:
+        (résumé, "fr" | "en", titre de l'article), ou (None, None, None) si
+        aucune des deux langues ne trouve
+    """
+    fr_task = asyncio.create_task(fetch_wiki_page(topic, lang="fr"))
+    en_task = asyncio.create_task(fetch_wiki_page(topic, lang="en"))
+    try:
+        fr_page = await fr_task
+        if fr_page:
+            return fr_page[1], "fr", fr_page[0]
+        en_page = await en_task
+        if en_page:
+            print("[WIKI] 🔄 Trouvé en EN uniquement")
+            return en_page[1], "en", en_page[0]
+        return None, None, None
+    finally:
+        # FR trouvé (ou annulation) : inutile de finir la recherche EN
+        fr_task.cancel()
+        en_task.cancel()
+
+
+def _find_fact_key(normalized: str) -> Optional[str]:
+    """Clé du fait à servir : clé exacte, alias connu, puis clé proche (sans réseau)."""
+    if normalized in _fact_cache:
+        return normalized
+    
+    canonical = _aliases.resolve(normalized)
+    if canonical in _fact_cache:
+        return canonical
+    
+    # Clé proche : servie, mais pas mémorisée comme alias (un faux positif
+    # deviendrait permanent) ; seuls les alias sûrs (même article) sont gardés
+    canonical = _aliases.fuzzy_match(normalized)
+    if canonical in _fact_cache:
+        return canonical
+    
+    return None
+
+
+def _lookup_fact(normalized: str) -> Optional[str]:
+    """Fait connu sans réseau : pack mmap et/ou cache JSON."""
+    if not _cache_loaded:
+        # JSON pas encore lu : le pack répond sans aucun parsing
+        packed = _pack_fact(normalized)
+        if packed is not None:
+            return packed
+        _ensure_cache_loaded()
+        return _cached_fact(normalized)
+    # JSON chargé : prioritaire (!cacheadd peut corriger un fait du pack)
+    cached = _cached_fact(normalized)
+    return cached if cached is not None else _pack_fact(normalized)
+
+
+def _cached_fact(normalized: str) -> Optional[str]:
+    fact_key = _find_fact_key(normalized)
+    if fact_key is None:
+        return None
+    print(f"[CACHE] 💡 Hit: {normalized}" + (f" → {fact_key}" if fact_key != normalized else ""))
+    return _fact_cache[fact_key]
+
+
+def _pack_fact(normalized: str) -> Optional[str]:
+    if not _use_pack:
+        return None
+    packed = knowledge_pack.fact(normalized)
+    if packed is not None and knowledge_pack.built_at == _pack_cleared_build:
+        return None  # Pack vidé par !cacheclear (un nouveau build le réactive)
+    if packed is not None:
+        print(f"[CACHE] 📦 Pack hit: {normalized}")
+    return packed
+
+
 async def get_cached_or_fetch(query: str) -> Optional[str]:
     """Point d'entrée principal: cherche dans le cache ou Wikipedia."""
     normalized = normalize_key(query)
     
-    # 1. Chercher dans le cache
-    if normalized in _fact_cache:
-        print(f"[CACHE] 💡 Hit: {normalized}")
-        return _fact_cache[normalized]
+    # 1. Chercher dans le pack et le cache (clé exacte, alias ou clé proche)
+    answer = _lookup_fact(normalized)
+    if answer is not None:
+        return answer
     
     # 2. Vérifier si c'est une question factuelle (sinon → CHILL mode au modèle)
     if not is_factual_question(normalized):
         return None  # Question sociale, pas de cache
     
-    # 3. Chercher sur Wikipedia FR
-    print(f"[WIKI] 🔍 Recherche: {normalized}")
-    wiki_answer = await fetch_wiki_summary(normalized, lang="fr")
-    wiki_lang = "fr"
+    # 3-4. Wikipedia FR + EN en parallèle (EN utile pour hardware, tech, etc.)
+    print(f"[WIKI] 🔍 Recherche FR+EN: {normalized}")
+    wiki_answer, wiki_lang, wiki_title = await fetch_wiki_summary_fr_en(normalized)
     
-    # 4. Fallback Wikipedia EN si FR échoue (pour hardware, tech, etc.)
-    if not wiki_answer:
-        print("[WIKI] 🔄 Fallback EN...")
-        wiki_answer = await fetch_wiki_summary(normalized, lang="en")
-        wiki_lang = "en"
+    # 4.5 Article déjà en cache sous une autre formulation → alias, pas de doublon
+    if wiki_answer:
+        known_key = _aliases.for_title(wiki_lang, wiki_title)
+        if known_key in _fact_cache:
+            _aliases.add_alias(normalized, known_key)
+            _aliases.save()
+            print(f"[WIKI] 🔗 Même article que '{known_key}' ({wiki_title}), alias ajouté")
+            return _fact_cache[known_key]
     
     # 5. Si trouvé en anglais, traduire en français
     if wiki_answer and wiki_lang == "en":
@@ -309,6 +463,9 @@ async def get_cached_or_fetch(query: str) -> Optional[str]:
     if wiki_answer:
         _fact_cache[normalized] = wiki_answer
         save_cache()
+        _aliases.record_title(wiki_lang, wiki_title, normalized)
+        _aliases.index_key(normalized)
+        _aliases.save()
         print(f"[WIKI] ✅ Ajouté au cache: {normalized}")
         return wiki_answer
     
@@ -321,11 +478,13 @@ async def get_cached_or_fetch(query: str) -> Optional[str]:
 def add_to_cache(query: str, answer: str):
     """Ajoute manuellement une paire question/réponse au cache (commande admin)."""
     key = normalize_key(query)
+    _ensure_cache_loaded()
     
     # Validation minimale
     if len(answer) > 30 and "Je ne sais pas" not in answer:
         _fact_cache[key] = answer
         save_cache()
+        _aliases.index_key(key)
         print(f"[CACHE] ➕ Ajout manuel: {key}")
         return True
     return False
@@ -333,8 +492,11 @@ def add_to_cache(query: str, answer: str):
 
 def get_cache_stats() -> Dict[str, str | int | bool]:
     """Retourne les statistiques du cache."""
+    _ensure_cache_loaded()
     return {
         "total_entries": len(_fact_cache),
+        "aliases": len(_aliases.aliases),
+        "pack_entries": knowledge_pack.count,
         "cache_file": str(CACHE_FILE),
         "file_exists": CACHE_FILE.exists()
     }
@@ -342,11 +504,19 @@ def get_cache_stats() -> Dict[str, str | int | bool]:
 
 def clear_cache():
     """Vide le cache (commande admin)."""
-    global _fact_cache
+    global _fact_cache, _cache_loaded, _pack_cleared_build
     _fact_cache = {}
+    _cache_loaded = True
+    # Les faits du pack ne sont plus servis non plus, même après redémarrage,
+    # jusqu'à ce que scripts/build_knowledge_pack.py produise un nouveau pack
+    if knowledge_pack.open():
+        _pack_cleared_build = knowledge_pack.built_at
+        try:
+            PACK_CLEARED_FILE.write_text(json.dumps({"built_at": _pack_cleared_build}), encoding="utf-8")
+        except OSError as e:
+            print(f"[CACHE] ⚠️ Marqueur {PACK_CLEARED_FILE} non écrit: {e}")
     save_cache()
+    _aliases.clear()
     print("[CACHE] 🗑️ Cache vidé")
 
 
-# Charger le cache au démarrage du module
-load_cache()
@@ -84,6 +84,42 @@ class ConversationManager:
                 with self._states[uid].lock:
                     del self._states[uid]
 
+    # --- Persistance (warm restart) ---
+    def export_states(self) -> Dict[str, dict]:
+        """Historiques sérialisables, horodatés en temps mur (time.time)."""
+        offset = time.time() - time.monotonic()
+        with self._global_lock:
+            items = list(self._states.items())
+        exported = {}
+        for uid, state in items:
+            exported[uid] = {
+                "messages": [
+                    {"role": m["role"], "content": m["content"], "ts": m["timestamp_monotonic"] + offset}
+                    for m in state.messages
+                ],
+                "last_activity": state.last_activity_monotonic + offset,
+            }
+        return exported
+
+    def import_states(self, states: Dict[str, dict]) -> int:
+        """Restaure les conversations encore dans le TTL. Retourne le nombre restauré."""
+        now = time.time()
+        offset = now - time.monotonic()
+        restored = 0
+        with self._global_lock:
+            for uid, data in states.items():
+                if now - data["last_activity"] > self._ttl_seconds:
+                    continue
+                self._states[uid] = ConversationState(
+                    messages=[
+                        {"role": m["role"], "content": m["content"], "timestamp_monotonic": m["ts"] - offset}
+                        for m in data["messages"][-self._max_messages:]
+                    ],
+                    last_activity_monotonic=data["last_activity"] - offset,
+                )
+                restored += 1
+        return restored
+
     # --- Cache L1 (mémoire, 60s TTL) ---
     def cache_get(self, key: Tuple[str, int]) -> Optional[Any]:
         with self._cache_lock:
@@ -0,0 +1,194 @@
+"""
+Fact Aliases - Index d'alias du cache de faits (cache/dynamic_facts.json).
+
+"rtx 4090", "geforce rtx 4090" ou "nvidia 4090" désignent le même article :
+sans index, chaque formulation repart sur Wikipedia et crée sa propre entrée.
+
+L'index garde :
+- alias → clé canonique (clé de dynamic_facts.json qui porte le fait)
+- titre Wikipedia résolu ("fr:GeForce_40") → clé canonique, pour qu'une
+  nouvelle formulation qui aboutit au même article réutilise l'entrée
+- un index par préfixe de token, pour retrouver les clés proches (fautes de
+  frappe, pluriels, ordre des mots) sans parcourir tout le cache
+
+Persistance : cache/fact_aliases.json (écriture atomique). Plusieurs workers
+(src/chat/worker_pool.py) partagent le fichier : chaque sauvegarde relit la
+copie disque et n'y ajoute que ses propres alias/titres, sans écraser ceux
+des autres process.
+"""
+
+import json
+import os
+import re
+import tempfile
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+FUZZY_THRESHOLD = 0.8  # Similarité token-set minimale (Dice, 0-1)
+TOKEN_RATIO = 0.85     # Deux tokens "égaux" malgré une faute (geforse ~ geforce)
+FUZZY_MIN_LEN = 7      # En dessous : égalité stricte ou pluriel (linus ≠ linux)
+PREFIX_LEN = 4         # Clé de l'index : 4 premiers caractères du token
+
+# Mots vides ignorés dans la comparaison
+STOPWORDS = frozenset({"de", "du", "des", "d", "la", "le", "les", "l", "un", "une", "et", "en", "the", "of"})
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(key: str) -> List[str]:
+    """Tokens significatifs d'une clé normalisée (sans mots vides)."""
+    return [token for token in _TOKEN_PATTERN.findall(key.lower()) if token not in STOPWORDS]
+
+
+def _tokens_match(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    # Numéros de modèle / versions : égalité stricte (4080 ≠ 4090)
+    if any(c.isdigit() for c in a) or any(c.isdigit() for c in b):
+        return False
+    # Pluriel : pandas ~ panda, jeux ~ jeu
+    short, long = sorted((a, b), key=len)
+    if long[:-1] == short and long[-1] in "sx":
+        return True
+    # Mots courts : une lettre change le sens (mario/maria, francs/france)
+    if len(short) < FUZZY_MIN_LEN:
+        return False
+    return SequenceMatcher(None, a, b).ratio() >= TOKEN_RATIO
+
+
+def token_set_similarity(a: List[str], b: List[str]) -> float:
+    """
+    Similarité token-set (Dice) : 2 x tokens appariés / (|a| + |b|).
+
+    Un token contenant un chiffre doit être apparié exactement, sinon 0.
+    """
+    if not a or not b:
+        return 0.0
+    remaining = list(b)
+    matched = 0
+    for token in a:
+        for i, other in enumerate(remaining):
+            if _tokens_match(token, other):
+                matched += 1
+                del remaining[i]
+                break
+        else:
+            if any(c.isdigit() for c in token):
+                return 0.0
+    if any(any(c.isdigit() for c in token) for token in remaining):
+        return 0.0
+    return 2 * matched / (len(a) + len(b))
+
+
+class FactAliasIndex:
+    """Alias, titres Wikipedia et recherche approchée des clés du cache de faits."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.aliases: Dict[str, str] = {}  # alias → clé canonique
+        self.titles: Dict[str, str] = {}   # "lang:Titre" → clé canonique
+        self._prefixes: Dict[str, Set[str]] = {}  # préfixe de token → clés
+        self._tokens: Dict[str, List[str]] = {}
+        # Ajouts depuis la dernière sauvegarde, fusionnés dans la copie disque
+        self._new_aliases: Dict[str, str] = {}
+        self._new_titles: Dict[str, str] = {}
+
+    # ----- Persistance -----
+
+    def _read(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """(alias, titres) du fichier, vides s'il est absent ou illisible."""
+        if not self.path.exists():
+            return {}, {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            return data.get("aliases", {}), data.get("titles", {})
+        except Exception as e:
+            print(f"[CACHE] ⚠️ Erreur chargement alias: {e}")
+            return {}, {}
+
+    def load(self, fact_keys: Iterable[str] = ()) -> None:
+        """Charge le fichier et indexe les clés du cache + les alias."""
+        self.aliases, self.titles = self._read()
+        self._new_aliases, self._new_titles = {}, {}
+        self._prefixes, self._tokens = {}, {}
+        for key in list(fact_keys) + list(self.aliases):
+            self.index_key(key)
+
+    def save(self) -> None:
+        """Fusionne les ajouts de ce process dans la copie disque puis l'écrit."""
+        aliases, titles = self._read()
+        aliases.update(self._new_aliases)
+        titles.update(self._new_titles)
+        if self._write(aliases, titles):
+            self._new_aliases, self._new_titles = {}, {}
+        # Alias ajoutés par les autres workers : servis ici aussi
+        self.aliases, self.titles = {**aliases, **self._new_aliases}, {**titles, **self._new_titles}
+        for alias in self.aliases:
+            self.index_key(alias)
+
+    def _write(self, aliases: Dict[str, str], titles: Dict[str, str]) -> bool:
+        """Écriture atomique via un fichier temporaire propre à l'appel."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_file = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"aliases": aliases, "titles": titles}, f, ensure_ascii=False, indent=2)
+                os.replace(temp_file, str(self.path))
+            except BaseException:
+                os.unlink(temp_file)
+                raise
+            return True
+        except Exception as e:
+            print(f"[CACHE] ❌ Erreur sauvegarde alias: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Vide l'index et le fichier (alias des autres workers compris)."""
+        self.aliases, self.titles, self._prefixes, self._tokens = {}, {}, {}, {}
+        self._new_aliases, self._new_titles = {}, {}
+        self._write({}, {})
+
+    # ----- Index -----
+
+    def index_key(self, key: str) -> None:
+        """Rend une clé (fait ou alias) trouvable par fuzzy_match."""
+        if key in self._tokens:
+            return
+        tokens = tokenize(key)
+        self._tokens[key] = tokens
+        for token in tokens:
+            self._prefixes.setdefault(token[:PREFIX_LEN], set()).add(key)
+
+    def add_alias(self, alias: str, canonical: str) -> None:
+        if alias != canonical:
+            self.aliases[alias] = self._new_aliases[alias] = canonical
+            self.index_key(alias)
+
+    def record_title(self, lang: str, title: str, canonical: str) -> None:
+        title_key = f"{lang}:{title.replace(' ', '_')}"
+        self.titles[title_key] = self._new_titles[title_key] = canonical
+
+    # ----- Recherche -----
+
+    def resolve(self, key: str) -> str:
+        """Clé canonique d'un alias (la clé elle-même si inconnue)."""
+        return self.aliases.get(key, key)
+
+    def for_title(self, lang: str, title: str) -> Optional[str]:
+        """Clé canonique déjà associée à cet article Wikipedia."""
+        return self.titles.get(f"{lang}:{title.replace(' ', '_')}")
+
+    def fuzzy_match(self, key: str) -> Optional[str]:
+        """Clé canonique la plus proche (>= FUZZY_THRESHOLD), sans réseau."""
+        tokens = tokenize(key)
+        candidates: Set[str] = set()
+        for token in tokens:
+            candidates |= self._prefixes.get(token[:PREFIX_LEN], set())
+        best, best_score = None, FUZZY_THRESHOLD
+        for candidate in sorted(candidates):
+            score = token_set_similarity(tokens, self._tokens[candidate])
+            if score > best_score or (best is None and score == best_score):
+                best, best_score = candidate, score
+        return self.resolve(best) if best is not None else None
@@ -0,0 +1,242 @@
+"""
+Helix Client - Client async unique pour l'API Twitch Helix.
+
+Tous les appels Helix du bot (envoi de messages, AutoMod, résolution
+d'IDs, catégorie du stream) passent par ici :
+- un seul httpx.AsyncClient partagé (keep-alive : pas de nouvelle
+  connexion TLS par appel)
+- un HelixClient par couple (client_id, token) : Twitch compte le budget
+  de requêtes par token, on suit donc ``Ratelimit-Remaining`` /
+  ``Ratelimit-Reset`` par instance et on attend le reset quand il est épuisé
+- 401 → rafraîchissement du token (si un refresh_token est configuré),
+  une seule fois même si plusieurs requêtes échouent en même temps
+- 429 / 5xx / erreur réseau → nouvel essai avec backoff exponentiel + jitter ;
+  pour un POST/PATCH (non idempotent), seulement si la requête n'est pas
+  partie (connexion impossible) ou sur 429 : un timeout de lecture ou un
+  5xx ne dit pas si Twitch l'a exécutée (message envoyé deux fois)
+
+Config (section twitch, optionnel) :
+    refresh_token: "..."        # Rafraîchit ``token`` (AutoMod, modération)
+    bot_refresh_token: "..."    # Rafraîchit ``bot_user_token`` (envoi API)
+    bot_client_secret: "..."    # Si bot_client_id diffère de client_id
+"""
+
+import asyncio
+import random
+import time
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+HELIX_URL = "https://api.twitch.tv/helix"
+TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # Secondes, doublé à chaque essai (full jitter)
+RESET_JITTER = 0.25  # Étalement du réveil après un reset de budget
+TIMEOUT = 5.0
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Requête jamais partie : sans risque de doublon, quelle que soit la méthode
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+_http: Optional[httpx.AsyncClient] = None  # Client partagé (créé à la demande)
+_clients: Dict[Tuple[str, str], "HelixClient"] = {}
+
+
+def _shared_http() -> httpx.AsyncClient:
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+        )
+    return _http
+
+
+class HelixClient:
+    """Appels Helix pour un couple (client_id, token) : budget, refresh, retries."""
+
+    def __init__(
+        self,
+        client_id: str,
+        token: str,
+        refresh_token: Optional[str] = None,
+        client_secret: Optional[str] = None,
+    ):
+        self.client_id = client_id
+        self.token = token.replace("oauth:", "")
+        self.refresh_token = refresh_token
+        self.client_secret = client_secret
+        self.remaining: Optional[int] = None  # Ratelimit-Remaining (None = inconnu)
+        self.reset_at = 0.0  # Ratelimit-Reset (epoch)
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "refreshes": 0}
+        self._refresh_lock: Optional[asyncio.Lock] = None  # Créé dans la boucle qui l'utilise
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}", "Client-Id": self.client_id}
+
+    # ----- Budget -----
+
+    def _update_budget(self, response: httpx.Response) -> None:
+        remaining = response.headers.get("Ratelimit-Remaining")
+        reset = response.headers.get("Ratelimit-Reset")
+        if remaining is not None and remaining.isdigit():
+            self.remaining = int(remaining)
+        if reset is not None and reset.isdigit():
+            self.reset_at = float(reset)
+
+    async def _wait_for_budget(self) -> None:
+        """Attend le reset si le budget connu est épuisé."""
+        if self.remaining is None or self.remaining > 0:
+            if self.remaining is not None:
+                self.remaining -= 1  # Réservation optimiste (requêtes concurrentes)
+            return
+        wait = self.reset_at - time.time()
+        if wait > 0:
+            self.stats["throttled"] += 1
+            print(f"[HELIX] ⏳ Budget épuisé, attente du reset ({wait:.1f}s)")
+            await asyncio.sleep(wait + random.uniform(0, RESET_JITTER))
+        self.remaining = None  # Relu sur la prochaine réponse
+
+    # ----- Token -----
+
+    async def _refresh(self, failed_token: str) -> bool:
+        """Rafraîchit le token (une seule fois pour des 401 concurrents)."""
+        if not self.refresh_token or not self.client_secret:
+            return False
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if self.token != failed_token:
+                return True  # Déjà rafraîchi par une autre requête
+            try:
+                response = await _shared_http().post(TOKEN_URL, data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": self.refresh_token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                })
+            except httpx.HTTPError as e:
+                print(f"[HELIX] ❌ Rafraîchissement du token impossible: {e}")
+                return False
+            if response.status_code != 200:
+                print(f"[HELIX] ❌ Rafraîchissement du token refusé ({response.status_code})")
+                return False
+            data = response.json()
+            self.token = data["access_token"]
+            self.refresh_token = data.get("refresh_token", self.refresh_token)
+            self.stats["refreshes"] += 1
+            print("[HELIX] 🔄 Token rafraîchi")
+            return True
+
+    # ----- Requêtes -----
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params=None,
+        json: Optional[dict] = None,
+        retry: Optional[bool] = None,
+    ) -> Optional[httpx.Response]:
+        """
+        Requête Helix (``path`` relatif, ex: "/users").
+
+        Args:
+            retry: Nouvel essai sur 5xx / timeout de lecture. Par défaut
+                seulement pour les méthodes idempotentes ; True pour un
+                POST sans effet s'il est rejoué (ex: ban déjà appliqué)
+
+        Returns:
+            La réponse finale (à tester par l'appelant), None si le réseau
+            a échoué à chaque essai
+        """
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        refreshed = False
+        attempt = 0
+        while True:
+            await self._wait_for_budget()
+            token = self.token
+            self.stats["requests"] += 1
+            try:
+                response = await _shared_http().request(
+                    method, f"{HELIX_URL}{path}", params=params, json=json, headers=self.headers
+                )
+            except httpx.HTTPError as e:
+                response = None
+                error = f"{type(e).__name__}: {e}"
+                if not retry and not isinstance(e, NOT_SENT_ERRORS):
+                    print(f"[HELIX] ❌ {method} {path} échoué ({error}), pas de nouvel essai (non idempotent)")
+                    return None
+            else:
+                self._update_budget(response)
+                if response.status_code == 401 and not refreshed and await self._refresh(token):
+                    refreshed = True
+                    continue
+                if response.status_code != 429 and (response.status_code < 500 or not retry):
+                    return response
+                error = f"HTTP {response.status_code}"
+
+            if attempt >= MAX_RETRIES:
+                print(f"[HELIX] ❌ {method} {path} abandonné après {attempt + 1} essais ({error})")
+                return response
+            if response is not None and response.status_code == 429 and self.reset_at > time.time():
+                self.remaining = 0  # Attente du reset au prochain tour
+                delay = 0.0
+            else:
+                delay = random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+            attempt += 1
+            self.stats["retries"] += 1
+            print(f"[HELIX] 🔁 {method} {path} ({error}), nouvel essai {attempt}/{MAX_RETRIES}")
+            if delay:
+                await asyncio.sleep(delay)
+
+
+def get_helix_client(
+    client_id: str,
+    token: str,
+    refresh_token: Optional[str] = None,
+    client_secret: Optional[str] = None,
+) -> HelixClient:
+    """HelixClient partagé pour ce couple (client_id, token)."""
+    key = (client_id, token.replace("oauth:", ""))
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = HelixClient(client_id, token, refresh_token, client_secret)
+    else:
+        client.refresh_token = client.refresh_token or refresh_token
+        client.client_secret = client.client_secret or client_secret
+    return client
+
+
+def bot_helix(twitch_config: dict) -> Optional[HelixClient]:
+    """Client du compte bot (bot_user_token : envoi API, lectures Helix)."""
+    client_id = twitch_config.get("bot_client_id") or twitch_config.get("client_id")
+    token = twitch_config.get("bot_user_token") or twitch_config.get("app_access_token")
+    if not client_id or not token:
+        return None
+    secret = twitch_config.get("bot_client_secret")
+    if not secret and client_id == twitch_config.get("client_id"):
+        secret = twitch_config.get("client_secret")
+    return get_helix_client(client_id, token, twitch_config.get("bot_refresh_token"), secret)
+
+
+def moderator_helix(twitch_config: dict) -> Optional[HelixClient]:
+    """Client du token IRC (scopes de modération : AutoMod, timeouts)."""
+    client_id = twitch_config.get("client_id")
+    token = twitch_config.get("token")
+    if not client_id or not token:
+        return None
+    return get_helix_client(
+        client_id, token, twitch_config.get("refresh_token"), twitch_config.get("client_secret")
+    )
+
+
+async def close_helix() -> None:
+    """Ferme le client HTTP partagé (arrêt du bot)."""
+    global _http
+    if _http is not None and not _http.is_closed:
+        await _http.aclose()
+    _http = None
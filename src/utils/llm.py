@@ -2,42 +2,34 @@ import os
 import time
 from typing import Optional
 
-# Import ctransformers avec gestion d'erreur (optionnel pour GGUF local)
-try:
-    from ctransformers import AutoModelForCausalLM
-    CTRANSFORMERS_AVAILABLE = True
-except ImportError:
-    CTRANSFORMERS_AVAILABLE = False
-    AutoModelForCausalLM = None
-    print("⚠️ Module 'ctransformers' non installé. Installation avec: pip install ctransformers")
-
-from config.config import load_config
-from prompts.prompt_loader import load_system_prompt
+from config.config import config_service
+from prompts.prompt_loader import build_prefixed_messages
 from utils.clean import clean_response
+from utils.llm_health import llm_health
 
-# Import OpenAI avec gestion d'erreur
-try:
-    from openai import AsyncOpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    print("⚠️ Module 'openai' non installé. Installation avec: pip install openai")
-
+# openai / ctransformers : importés au premier usage (lourds, et optionnels)
 MODEL = None
 OPENAI_CLIENT = None
-CONFIG = load_config()
+
+
+def _get_config():
+    """Config par défaut : snapshot partagé (parsé une fois, hot reload)."""
+    return config_service.snapshot
 
 
 # === Fonction : Chargement du modèle ===
 def load_model(config: Optional[dict] = None):
     global MODEL
 
-    if not CTRANSFORMERS_AVAILABLE:
+    try:
+        from ctransformers import AutoModelForCausalLM
+    except ImportError:
+        print("⚠️ Module 'ctransformers' non installé. Installation avec: pip install ctransformers")
         print("❌ ctransformers non disponible. Impossible de charger un modèle GGUF local.")
         return
 
     if config is None:
-        config = CONFIG
+        config = _get_config()
 
     try:
         model_path = config['bot']['model_path']
@@ -56,7 +48,7 @@ def load_model(config: Optional[dict] = None):
 
     try:
         print(f'📥 Chargement modèle depuis : {full_path}')
-        MODEL = AutoModelForCausalLM.from_pretrained(  # type: ignore
+        MODEL = AutoModelForCausalLM.from_pretrained(
             full_path,
             model_type=config['bot'].get('model_type', 'mistral'),
             gpu_layers=gpu_layers if use_gpu else 0,
@@ -74,48 +66,41 @@ async def query_model(
     global MODEL, OPENAI_CLIENT
 
     if config is None:
-        config = CONFIG
+        config = _get_config()
 
-    # === PRIORITÉ 1: Tester endpoint externe (LM Studio) ===
+    # === PRIORITÉ 1: Endpoint externe (LM Studio) ===
+    # Pas de requête "test" préalable : l'état vient du circuit breaker llm_health
     external_endpoint = config['bot'].get('model_endpoint') or config['bot'].get('api_url')
-    if external_endpoint:
+    if external_endpoint and llm_health.allow_request(external_endpoint):
         try:
             import httpx
 
-            # Test rapide LM Studio
-            test_payload = {"model": "test", "messages": [{"role": "user", "content": "test"}], "max_tokens": 1}
-
-            with httpx.Client(timeout=3) as client:
-                response = client.post(external_endpoint, json=test_payload)
-
-                if response.status_code in [200, 400]:  # 400 = pas de modèle mais endpoint ok
-                    print("🔗 [LM STUDIO] Endpoint actif")
-
-                    # Charger le system prompt universel
-                    system_prompt = load_system_prompt()
-
-                    # Vraie requête vers LM Studio (optimisé pour Twitch one-liners)
-                    real_payload = {
-                        "model": "local-model",
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "max_tokens": 60,
-                        "temperature": 0.7,
-                        "top_k": 40,
-                        "top_p": 0.9,
-                        "min_p": 0.05,
-                        "repeat_penalty": 1.10,
-                        "stop": ["\n", "User:", "Assistant:", "@"]
-                    }
-
-                    real_response = client.post(external_endpoint, json=real_payload)
-                    if real_response.status_code == 200:
-                        result = real_response.json()
-                        return result['choices'][0]['message']['content'].strip()
+            # Vraie requête vers LM Studio (optimisé pour Twitch one-liners)
+            # Préfixe canonique figé → KV-cache réutilisé d'une requête à l'autre
+            real_payload = {
+                "model": "local-model",
+                "messages": build_prefixed_messages("chill", prompt),
+                "max_tokens": 60,
+                "temperature": 0.7,
+                "top_k": 40,
+                "top_p": 0.9,
+                "min_p": 0.05,
+                "repeat_penalty": 1.10,
+                "stop": ["\n", "User:", "Assistant:", "@"],
+                "cache_prompt": True,
+            }
+
+            async with httpx.AsyncClient(timeout=config['bot'].get('model_timeout', 10)) as client:
+                real_response = await client.post(external_endpoint, json=real_payload)
+            if real_response.status_code == 200:
+                result = real_response.json()
+                llm_health.record_success(external_endpoint)
+                print("🔗 [LM STUDIO] Réponse reçue")
+                return result['choices'][0]['message']['content'].strip()
+            llm_health.record_failure(external_endpoint)
 
         except Exception:
+            llm_health.record_failure(external_endpoint)
             print("⚠️ [FALLBACK] LM Studio indisponible")
 
     print("🌐 [FALLBACK] Utilisation d'OpenAI...")
@@ -123,7 +108,10 @@ async def query_model(
 
     # === Utilisation d'OpenAI ===
     if model_type == 'openai':
-        if not OPENAI_AVAILABLE:
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            print("⚠️ Module 'openai' non installé. Installation avec: pip install openai")
             return '❌ OpenAI non disponible. Installez avec: pip install openai'
 
         if OPENAI_CLIENT is None:
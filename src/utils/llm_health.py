@@ -0,0 +1,324 @@
+"""Santé des endpoints LLM : circuit breaker + monitor async.
+
+Un seul mécanisme de backoff pour tout le bot :
+- ``EndpointBreaker`` : état par endpoint (closed → open → half_open)
+- ``LLMHealthMonitor`` : tâche asyncio qui ping ``/v1/models`` toutes les
+  ``rate_limiting.health_check_interval`` secondes et notifie les abonnés
+  (ex: ``TwitchBot.llm_available``) quand la disponibilité change.
+
+Les chemins de requête (``call_model``) ne font jamais de probe : ils lisent
+l'état du breaker et lui remontent leurs succès/échecs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+# États du circuit breaker
+CLOSED = "closed"        # Endpoint sain, requêtes autorisées
+OPEN = "open"            # Endpoint down, requêtes court-circuitées jusqu'au retry
+HALF_OPEN = "half_open"  # Retry autorisé, le prochain résultat tranche
+
+# Defaults (config: rate_limiting.*)
+HEALTH_CHECK_INTERVAL_DEFAULT = 30
+HEALTH_CHECK_TIMEOUT_DEFAULT = 2
+FAILURES_THRESHOLD_DEFAULT = 3
+RETRY_DELAY_DEFAULT = 5
+BACKOFF_MULTIPLIER_DEFAULT = 2
+BACKOFF_MAX_DEFAULT = 300
+
+
+def models_url(endpoint: str) -> str:
+    """Convertit l'endpoint chat en endpoint models (probe léger, pas d'inférence)."""
+    if "/chat/completions" in endpoint:
+        return endpoint.replace("/chat/completions", "/models")
+    return endpoint
+
+
+class EndpointBreaker:
+    """Circuit breaker d'un endpoint LLM.
+
+    - ``failures_threshold`` échecs consécutifs → OPEN
+    - OPEN pendant ``retry_delay * multiplier^(n-1)`` (max ``backoff_max``)
+    - puis HALF_OPEN : un succès referme, un échec rouvre avec backoff accru
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failures_threshold: int = FAILURES_THRESHOLD_DEFAULT,
+        retry_delay: float = RETRY_DELAY_DEFAULT,
+        backoff_multiplier: float = BACKOFF_MULTIPLIER_DEFAULT,
+        backoff_max: float = BACKOFF_MAX_DEFAULT,
+    ):
+        self.endpoint = endpoint
+        self.failures_threshold = max(1, int(failures_threshold))
+        self.retry_delay = retry_delay
+        self.backoff_multiplier = backoff_multiplier
+        self.backoff_max = backoff_max
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0          # Ouvertures successives (pour le backoff)
+        self.retry_at = 0.0          # time.monotonic() à partir duquel on retente
+        self.last_latency: Optional[float] = None
+
+    @property
+    def available(self) -> bool:
+        """True si l'endpoint est considéré utilisable (pas OPEN)."""
+        return self.state != OPEN
+
+    def allow_request(self, now: Optional[float] = None) -> bool:
+        """Autorise une requête ? Passe en HALF_OPEN quand le backoff expire."""
+        if self.state != OPEN:
+            return True
+        if (now if now is not None else time.monotonic()) >= self.retry_at:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def retry_in(self, now: Optional[float] = None) -> float:
+        """Secondes avant le prochain retry (0 si pas OPEN)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.retry_at - (now if now is not None else time.monotonic()))
+
+    def record_success(self, latency: Optional[float] = None) -> bool:
+        """Enregistre un succès. Retourne True si l'endpoint vient de récupérer."""
+        recovered = self.state != CLOSED
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0
+        if latency is not None:
+            self.last_latency = latency
+        return recovered
+
+    def record_failure(self, now: Optional[float] = None) -> bool:
+        """Enregistre un échec. Retourne True si le circuit vient de s'ouvrir."""
+        self.consecutive_failures += 1
+        if self.state == OPEN:
+            return False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failures_threshold:
+            self.open_count += 1
+            backoff = min(
+                self.backoff_max,
+                self.retry_delay * (self.backoff_multiplier ** (self.open_count - 1)),
+            )
+            self.state = OPEN
+            self.retry_at = (now if now is not None else time.monotonic()) + backoff
+            return True
+        return False
+
+    def snapshot(self) -> dict:
+        """État lisible (debug/monitoring)."""
+        return {
+            "endpoint": self.endpoint,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in": round(self.retry_in(), 1),
+            "last_latency": self.last_latency,
+        }
+
+
+AvailabilityListener = Callable[[str, bool], None]
+
+
+class LLMHealthMonitor:
+    """Registre des breakers + tâche de health check périodique.
+
+    Usage:
+        llm_health.configure(config)
+        llm_health.add_listener(lambda endpoint, ok: ...)
+        llm_health.start(config)            # dans une boucle asyncio
+        if llm_health.allow_request(url): ...
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, EndpointBreaker] = {}
+        self._listeners: List[AvailabilityListener] = []
+        self._task: Optional[asyncio.Task] = None
+        self._settings: dict = {}
+        self.configure({})
+
+    # ----- Configuration -----
+
+    def configure(self, config: dict) -> None:
+        """Lit ``rate_limiting.*`` (interval, timeout, seuil, backoff)."""
+        rate_config = config.get("rate_limiting", {}) or {}
+        self._settings = {
+            "enabled": rate_config.get("health_check_enabled", True),
+            "interval": rate_config.get("health_check_interval", HEALTH_CHECK_INTERVAL_DEFAULT),
+            "timeout": rate_config.get("health_check_timeout", HEALTH_CHECK_TIMEOUT_DEFAULT),
+            "failures_threshold": rate_config.get("health_check_failures_threshold", FAILURES_THRESHOLD_DEFAULT),
+            "retry_delay": rate_config.get("llm_retry_delay", RETRY_DELAY_DEFAULT),
+            "backoff_multiplier": rate_config.get("llm_backoff_multiplier", BACKOFF_MULTIPLIER_DEFAULT),
+            "backoff_max": rate_config.get("llm_backoff_max", BACKOFF_MAX_DEFAULT),
+        }
+        for breaker in self._breakers.values():
+            breaker.failures_threshold = max(1, int(self._settings["failures_threshold"]))
+            breaker.retry_delay = self._settings["retry_delay"]
+            breaker.backoff_multiplier = self._settings["backoff_multiplier"]
+            breaker.backoff_max = self._settings["backoff_max"]
+
+    def breaker(self, endpoint: str) -> EndpointBreaker:
+        """Retourne (ou crée) le breaker d'un endpoint."""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = EndpointBreaker(
+                endpoint,
+                failures_threshold=self._settings["failures_threshold"],
+                retry_delay=self._settings["retry_delay"],
+                backoff_multiplier=self._settings["backoff_multiplier"],
+                backoff_max=self._settings["backoff_max"],
+            )
+        return breaker
+
+    # ----- Chemins de requête (aucun I/O) -----
+
+    def allow_request(self, endpoint: str) -> bool:
+        """True si une requête peut partir vers cet endpoint."""
+        return self.breaker(endpoint).allow_request()
+
+    def is_available(self, endpoint: str) -> bool:
+        """Disponibilité connue de l'endpoint (sans changer l'état)."""
+        return self.breaker(endpoint).available
+
+    def record_success(self, endpoint: str, latency: Optional[float] = None) -> None:
+        if self.breaker(endpoint).record_success(latency):
+            print(f"[HEALTH] 📈 Endpoint récupéré: {endpoint}")
+            self._notify(endpoint, True)
+
+    def record_failure(self, endpoint: str) -> None:
+        breaker = self.breaker(endpoint)
+        if breaker.record_failure():
+            print(f"[HEALTH] 📉 Circuit ouvert ({breaker.consecutive_failures} échec(s), retry dans {breaker.retry_in():.0f}s): {endpoint}")
+            self._notify(endpoint, False)
+
+    def reset(self) -> None:
+        """Oublie tous les états (debug/tests)."""
+        self._breakers.clear()
+
+    def stats(self) -> List[dict]:
+        return [breaker.snapshot() for breaker in self._breakers.values()]
+
+    # ----- Persistance (warm restart) -----
+
+    def export_state(self) -> List[dict]:
+        """Breakers non sains, horodatés en temps mur (time.time)."""
+        offset = time.time() - time.monotonic()
+        return [
+            {
+                "endpoint": b.endpoint,
+                "state": b.state,
+                "consecutive_failures": b.consecutive_failures,
+                "open_count": b.open_count,
+                "retry_at": b.retry_at + offset,
+            }
+            for b in self._breakers.values()
+            if b.state != CLOSED
+        ]
+
+    def import_state(self, states: List[dict]) -> int:
+        """Restaure les circuits encore ouverts. Retourne le nombre restauré.
+
+        Un backoff déjà expiré n'est pas restauré (l'endpoint repart CLOSED) ;
+        sinon le circuit reste ouvert jusqu'au retry prévu avant l'arrêt.
+        """
+        now = time.time()
+        offset = now - time.monotonic()
+        restored = 0
+        for state in states:
+            if state.get("retry_at", 0) <= now:
+                continue
+            breaker = self.breaker(state["endpoint"])
+            breaker.state = OPEN
+            breaker.consecutive_failures = state.get("consecutive_failures", 0)
+            breaker.open_count = state.get("open_count", 1)
+            breaker.retry_at = state["retry_at"] - offset
+            restored += 1
+        return restored
+
+    # ----- Abonnés -----
+
+    def add_listener(self, listener: AvailabilityListener) -> None:
+        """Appelé avec (endpoint, disponible) à chaque changement d'état."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: AvailabilityListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, endpoint: str, available: bool) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(endpoint, available)
+            except Exception as e:
+                print(f"[HEALTH] ⚠️ Listener en erreur: {e}")
+
+    # ----- Probe & monitor -----
+
+    async def probe(self, endpoint: str, client: Optional[httpx.AsyncClient] = None) -> bool:
+        """Ping ``/v1/models`` et met à jour le breaker. Retourne True si sain."""
+        start = time.monotonic()
+        try:
+            if client is None:
+                async with httpx.AsyncClient() as own_client:
+                    response = await own_client.get(models_url(endpoint), timeout=self._settings["timeout"])
+            else:
+                response = await client.get(models_url(endpoint), timeout=self._settings["timeout"])
+            healthy = response.status_code == 200
+        except Exception:
+            healthy = False
+
+        if healthy:
+            self.record_success(endpoint, time.monotonic() - start)
+        else:
+            self.record_failure(endpoint)
+        return healthy
+
+    def start(self, endpoints: List[str]) -> Optional[asyncio.Task]:
+        """Lance la tâche de monitoring (idempotent). Requiert une boucle active.
+
+        Si ``health_check_enabled`` est false, un seul probe initial est fait :
+        ensuite l'état n'évolue qu'avec les résultats des vraies requêtes.
+        """
+        endpoints = [e for e in endpoints if e]
+        if not endpoints:
+            return None
+        if os.getenv("CI") == "true" or os.getenv("GITHUB_ACTIONS") == "true":
+            for endpoint in endpoints:
+                self.breaker(endpoint)
+            return None
+        if self._task is not None and not self._task.done():
+            return self._task
+        self._task = asyncio.create_task(self._run(endpoints))
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, endpoints: List[str]) -> None:
+        interval = max(1, self._settings["interval"])
+        print(f"[HEALTH] 🩺 Monitor LLM actif ({', '.join(endpoints)}, toutes les {interval}s)")
+        async with httpx.AsyncClient() as client:
+            while True:
+                await asyncio.gather(*(self.probe(endpoint, client) for endpoint in endpoints))
+                if not self._settings["enabled"]:
+                    return
+                await asyncio.sleep(interval)
+
+
+# Instance globale (singleton)
+llm_health = LLMHealthMonitor()
@@ -6,16 +6,23 @@ This module implements a small priority/fallback strategy:
 
 The implementation intentionally keeps behavior simple and robust:
 - No DeadBot or other secondary local endpoints are contacted.
-- Endpoints that fail are cached for a short duration to avoid retry storms.
+- Endpoint health (circuit breaker + backoff) lives in utils.llm_health;
+  request paths only read it and report results, they never probe.
+- Hedging: if the local endpoint has not streamed a first token within an
+  adaptive budget (p95 of its recent time-to-first-token), the OpenAI fallback
+  is launched in parallel; the first good answer wins, the loser is cancelled.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import sys
 import time
-from datetime import datetime, timedelta
-from typing import Optional
+import weakref
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Optional
 
 import httpx
 
@@ -23,7 +30,8 @@ import httpx
 if os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')) not in sys.path:
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from prompts.prompt_loader import load_system_prompt
+from prompts.prompt_loader import build_prefixed_messages, get_prefix_fingerprint
+from utils.llm_health import llm_health
 
 # Token and temperature defaults (fallback si config absent)
 MAX_TOKENS_ASK_DEFAULT = 120
@@ -39,9 +47,93 @@ def estimate_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
-# Simple in-memory cache of failed endpoints to avoid immediate retries
-_failed_endpoints: dict[str, datetime] = {}
-_CACHE_DURATION = timedelta(minutes=2)
+# Hedging defaults (config: bot.llm.hedging)
+HEDGE_FIRST_TOKEN_BUDGET_DEFAULT = 2.5   # Délai max avant de lancer le fallback (s)
+HEDGE_MIN_DELAY_DEFAULT = 0.5            # Délai min (évite de doubler chaque requête)
+HEDGE_MIN_SAMPLES_DEFAULT = 20           # Échantillons avant de faire confiance au p95
+OPENAI_ENDPOINT_KEY = "openai"
+
+
+class LatencyHistogram:
+    """Fenêtre glissante de latences (secondes) pour un endpoint.
+
+    Garde les N derniers échantillons : assez pour un p95 stable, et la fenêtre
+    suit les changements de charge (modèle rechargé, GPU partagé...).
+    """
+
+    def __init__(self, max_samples: int = 200):
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+
+    def record(self, seconds: float) -> None:
+        if seconds >= 0:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Percentile (nearest-rank), None si aucun échantillon."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[rank]
+
+
+# Latence par endpoint : TTFT pour le local (streaming), réponse complète pour OpenAI
+_latency_histograms: Dict[str, LatencyHistogram] = {}
+
+
+def get_latency_histogram(endpoint: str) -> LatencyHistogram:
+    """Retourne (ou crée) l'histogramme de latence d'un endpoint."""
+    histogram = _latency_histograms.get(endpoint)
+    if histogram is None:
+        histogram = _latency_histograms[endpoint] = LatencyHistogram()
+    return histogram
+
+
+# Client HTTP partagé (keep-alive vers LM Studio), un par boucle asyncio :
+# une connexion httpx ne peut pas être réutilisée d'une boucle à l'autre
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Client httpx async poolé pour la boucle courante."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _http_clients[loop] = httpx.AsyncClient(limits=_HTTP_LIMITS)
+    return client
+
+
+def _hedging_config(config: dict) -> dict:
+    llm_config = config.get("bot", {}).get("llm", {})
+    hedging = llm_config.get("hedging", {}) if isinstance(llm_config, dict) else {}
+    return hedging if isinstance(hedging, dict) else {}
+
+
+def get_hedge_delay(endpoint: str, config: dict) -> float:
+    """Délai avant de lancer la requête de secours pour cet endpoint.
+
+    p95 du time-to-first-token observé, borné par [min_delay, first_token_budget].
+    Tant qu'il n'y a pas assez d'échantillons, on utilise le budget configuré.
+    """
+    hedging = _hedging_config(config)
+    budget = float(hedging.get("first_token_budget", HEDGE_FIRST_TOKEN_BUDGET_DEFAULT))
+    min_delay = float(hedging.get("min_delay", HEDGE_MIN_DELAY_DEFAULT))
+    min_samples = int(hedging.get("min_samples", HEDGE_MIN_SAMPLES_DEFAULT))
+
+    histogram = get_latency_histogram(endpoint)
+    p95 = histogram.percentile(95) if len(histogram) >= min_samples else None
+    if p95 is None:
+        return budget
+    return max(min_delay, min(budget, p95))
+
+
+def _openai_configured(config: dict) -> bool:
+    api_key = config.get("openai", {}).get("api_key")
+    return bool(api_key and api_key.startswith("sk-"))
 
 
 async def call_model(
@@ -68,28 +160,203 @@ async def call_model(
     effective_timeout = timeout if timeout is not None else config.get("bot", {}).get("model_timeout", 10)
     print(f"[MODEL] ⏱️ Timeout configuré: {effective_timeout}s")
 
-    # Expire old failed endpoints
-    now = datetime.now()
-    expired = [k for k, v in _failed_endpoints.items() if now - v > _CACHE_DURATION]
-    for k in expired:
-        del _failed_endpoints[k]
-        print(f"[MODEL] 🔄 Réactivation de {k}")
-
     api_url = config.get("bot", {}).get("model_endpoint") or config.get("bot", {}).get("api_url")
 
-    # Try LM Studio-like endpoint if configured and not recently marked failed
-    if api_url and api_url not in _failed_endpoints:
+    # Try LM Studio-like endpoint if configured and its circuit is not open
+    if api_url and llm_health.allow_request(api_url):
+        if _hedging_config(config).get("enabled", True) and _openai_configured(config):
+            return await _call_hedged(api_url, prompt, config, user, effective_timeout, mode)
+
         print("[MODEL] 🔗 Tentative LM Studio...")
         result = await try_endpoint(api_url, prompt, user, effective_timeout, endpoint_type="lm_studio", mode=mode, config=config)
         if result:
+            llm_health.record_success(api_url)
             return result
-        _failed_endpoints[api_url] = now
+        llm_health.record_failure(api_url)
         print("[MODEL] ⚠️ Endpoint local indisponible, passer au fallback")
+    elif api_url:
+        print(f"[MODEL] ⏭️ Circuit ouvert, retry LM Studio dans {llm_health.breaker(api_url).retry_in():.0f}s")
 
     print("[MODEL] 🌐 Utilisation du fallback OpenAI (si configuré)")
     return await try_openai_fallback(prompt, config, user, mode)
 
 
+async def _call_hedged(
+    api_url: str,
+    prompt: str,
+    config: dict,
+    user: Optional[str],
+    timeout: int,
+    mode: str,
+) -> Optional[str]:
+    """LM Studio en streaming, OpenAI lancé en parallèle si le 1er token tarde.
+
+    - 1er token reçu avant le délai → on laisse le local finir (pas de hedge)
+    - délai dépassé → OpenAI part en parallèle, la 1ère réponse non vide gagne
+    - le perdant est annulé (connexion HTTP fermée)
+    """
+    delay = get_hedge_delay(api_url, config)
+    first_token = asyncio.Event()
+    start_time = time.time()
+    print(f"[MODEL] 🔗 Tentative LM Studio (hedge après {delay:.2f}s sans 1er token)...")
+
+    local = asyncio.create_task(
+        try_endpoint(api_url, prompt, user, timeout, endpoint_type="lm_studio", mode=mode, config=config, first_token=first_token)
+    )
+    token_wait = asyncio.create_task(first_token.wait())
+    fallback: Optional[asyncio.Task] = None
+    # try/finally sur tout le corps : un appelant annulé (timeout du handler,
+    # arrêt du bot) ne laisse aucune requête tourner en tâche orpheline
+    try:
+        await asyncio.wait({local, token_wait}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        token_wait.cancel()
+
+        if local.done() or first_token.is_set():
+            result = await local
+            if result:
+                llm_health.record_success(api_url)
+                return result
+            llm_health.record_failure(api_url)
+            print("[MODEL] ⚠️ Endpoint local indisponible, passer au fallback")
+            return await try_openai_fallback(prompt, config, user, mode)
+
+        print(f"[MODEL] 🏁 Pas de 1er token après {delay:.2f}s → hedge OpenAI en parallèle")
+        fallback = asyncio.create_task(try_openai_fallback(prompt, config, user, mode))
+        names = {local: "LM Studio", fallback: "OpenAI"}
+        pending = {local, fallback}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if task is local:
+                    if result:
+                        llm_health.record_success(api_url)
+                    else:
+                        llm_health.record_failure(api_url)
+                if result:
+                    print(f"[MODEL] 🏆 Hedge gagné par {names[task]}")
+                    return result
+        return None
+    finally:
+        for task in (local, token_wait, fallback):
+            if task is not None and not task.done():
+                task.cancel()
+        if not first_token.is_set():
+            # Local annulé ou en échec sans token : son TTFT aurait été au moins
+            # ce temps (jamais moins que le délai). Sans cet échantillon, seuls les
+            # locaux rapides sont mesurés et le p95 glisse jusqu'à min_delay.
+            get_latency_histogram(api_url).record(max(time.time() - start_time, delay))
+
+
+async def _iter_stream(response: httpx.Response) -> AsyncIterator[tuple[str, Optional[str]]]:
+    """Itère une réponse SSE OpenAI-compatible (LM Studio/llama.cpp).
+
+    Yields (contenu, finish_reason) pour chaque chunk ; contenu peut être vide.
+    """
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        choices = chunk.get("choices") or []
+        if not choices:
+            continue
+        delta = choices[0].get("delta") or {}
+        yield delta.get("content") or "", choices[0].get("finish_reason")
+
+
+async def _read_stream(response: httpx.Response, first_token: asyncio.Event, start_time: float, api_url: str) -> tuple[str, Optional[str]]:
+    """Lit une réponse SSE complète.
+
+    Signale le 1er token via l'event et enregistre le TTFT de l'endpoint.
+    """
+    parts: list[str] = []
+    finish_reason = None
+    async for content, chunk_finish in _iter_stream(response):
+        if content:
+            if not first_token.is_set():
+                ttft = time.time() - start_time
+                get_latency_histogram(api_url).record(ttft)
+                first_token.set()
+                print(f"[METRICS] ⏱️ TTFT: {ttft:.2f}s")
+            parts.append(content)
+        finish_reason = chunk_finish or finish_reason
+    return "".join(parts), finish_reason
+
+
+def _build_payload(prompt: str, mode: str, config: Optional[dict]) -> dict:
+    """Payload chat/completions local (max_tokens/temperature selon le mode)."""
+    # Lire depuis config.yaml (avec fallback sur defaults)
+    bot_config = config.get("bot", {}) if config else {}
+    if mode == "ask":
+        max_tokens = bot_config.get("max_tokens_ask", MAX_TOKENS_ASK_DEFAULT)
+        temperature = bot_config.get("temperature_ask", TEMP_ASK_DEFAULT)
+    else:
+        max_tokens = bot_config.get("max_tokens_chill", MAX_TOKENS_CHILL_DEFAULT)
+        temperature = bot_config.get("temperature_chill", TEMP_CHILL_DEFAULT)
+
+    return {
+        "model": bot_config.get("model_name", "local-model"),
+        # Préfixe canonique figé (KV-cache LM Studio/llama.cpp) : seul le tour user varie
+        "messages": build_prefixed_messages(mode, prompt),
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "repeat_penalty": 1.05,  # Légère pénalité pour éviter répétitions bizarres
+        "top_p": 0.9,  # Nucleus sampling pour cohérence
+        "cache_prompt": True,  # llama.cpp: réutiliser le KV du préfixe commun (ignoré par LM Studio)
+    }
+
+
+async def stream_model(
+    prompt: str,
+    config: dict,
+    user: Optional[str] = None,
+    mode: str = "chill",
+) -> AsyncIterator[str]:
+    """Stream la réponse token par token (même cascade que call_model).
+
+    - LM Studio en streaming si son circuit est fermé
+    - sinon (ou échec avant le 1er token) : réponse OpenAI en un seul morceau
+    - rien n'est yieldé si aucun LLM n'est disponible
+    """
+    api_url = config.get("bot", {}).get("model_endpoint") or config.get("bot", {}).get("api_url")
+    timeout = config.get("bot", {}).get("model_timeout", 10)
+
+    if api_url and llm_health.allow_request(api_url):
+        payload = _build_payload(prompt, mode, config)
+        payload["stream"] = True
+        streamed = False
+        start_time = time.time()
+        try:
+            async with get_http_client().stream("POST", api_url, json=payload, timeout=timeout) as response:
+                if response.status_code == 200:
+                    async for content, _ in _iter_stream(response):
+                        if content:
+                            if not streamed:
+                                get_latency_histogram(api_url).record(time.time() - start_time)
+                            streamed = True
+                            yield content
+                else:
+                    print(f"[MODEL] ❌ LM_STUDIO stream error: {response.status_code}")
+        except Exception as e:
+            print(f"[MODEL] ❌ LM_STUDIO stream failed: {e}")
+            if streamed:
+                return  # Réponse partielle déjà envoyée, pas de mélange avec OpenAI
+        if streamed:
+            llm_health.record_success(api_url)
+            return
+        llm_health.record_failure(api_url)
+
+    result = await try_openai_fallback(prompt, config, user, mode)
+    if result:
+        yield result
+
+
 async def try_endpoint(
     api_url: str,
     prompt: str,
@@ -98,10 +365,13 @@ async def try_endpoint(
     endpoint_type: str = "lm_studio",
     mode: str = "chill",
     config: Optional[dict] = None,
+    first_token: Optional[asyncio.Event] = None,
 ) -> str:
     """Attempt to call a single HTTP endpoint and return the text result.
 
     The function is tolerant: any networking or parsing error returns an empty string.
+    If ``first_token`` is given, the request is streamed and the event is set as
+    soon as the first content token arrives (used by the hedging policy).
     """
 
     try:
@@ -110,52 +380,35 @@ async def try_endpoint(
         print(f"[METRICS] 📥 INPUT: {input_chars} chars, ~{input_tokens} tokens")
         print(f"[DEBUG] 📄 USER Prompt: {prompt}")
 
-        system_prompt = load_system_prompt(mode=mode)
-        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}]
+        payload = _build_payload(prompt, mode, config)
 
-        # Lire depuis config.yaml (avec fallback sur defaults)
-        bot_config = config.get("bot", {}) if config else {}
-        if mode == "ask":
-            max_tokens = bot_config.get("max_tokens_ask", MAX_TOKENS_ASK_DEFAULT)
-            temperature = bot_config.get("temperature_ask", TEMP_ASK_DEFAULT)
-        else:
-            max_tokens = bot_config.get("max_tokens_chill", MAX_TOKENS_CHILL_DEFAULT)
-            temperature = bot_config.get("temperature_chill", TEMP_CHILL_DEFAULT)
-        
-        repeat_penalty = 1.05  # Légère pénalité pour éviter répétitions bizarres
-        model_name = bot_config.get("model_name", "local-model")
-
-        payload = {
-            "model": model_name,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "repeat_penalty": repeat_penalty,
-            "top_p": 0.9,  # Nucleus sampling pour cohérence
-        }
-        
         # DEBUG: Logger le payload complet
-        print(f"[PAYLOAD] 📦 Envoi à LM Studio: max_tokens={max_tokens}, temp={temperature}, model={model_name}")
+        print(f"[PAYLOAD] 📦 Envoi à LM Studio: max_tokens={payload['max_tokens']}, temp={payload['temperature']}, model={payload['model']}, prefix={get_prefix_fingerprint(mode)}")
 
         start_time = time.time()
-        async with httpx.AsyncClient() as client:
+        client = get_http_client()
+        usage: dict = {}
+        finish_reason = None
+        result = ""
+
+        if first_token is not None:
+            payload["stream"] = True
+            async with client.stream("POST", api_url, json=payload, timeout=timeout) as response:
+                if response.status_code != 200:
+                    print(f"[MODEL] ❌ {endpoint_type.upper()} error: {response.status_code}")
+                    return ""
+                result, finish_reason = await _read_stream(response, first_token, start_time, api_url)
+        else:
             response = await client.post(api_url, json=payload, timeout=timeout)
             if response.status_code != 200:
                 print(f"[MODEL] ❌ {endpoint_type.upper()} error: {response.status_code}")
                 return ""
-
-            duration = time.time() - start_time
             data = response.json()
 
             # Extraire les vraies métriques usage si disponibles
-            usage = data.get("usage", {})
-            prompt_tokens = usage.get("prompt_tokens", 0)
-            completion_tokens = usage.get("completion_tokens", 0)
-            total_tokens = usage.get("total_tokens", 0)
-            finish_reason = None
+            usage = data.get("usage", {}) if isinstance(data, dict) else {}
 
             # Compatible avec format OpenAI-like ou LM Studio
-            result = ""
             if isinstance(data, dict):
                 if "choices" in data and data["choices"]:
                     # OpenAI-like
@@ -168,22 +421,27 @@ async def try_endpoint(
                     # LM Studio sometimes returns {'response': '...'}
                     result = data.get("response", "") or data.get("text", "")
 
-            result = (result or "").strip()
-            if not result:
-                print("[MODEL] ⚠️ Réponse vide reçue de l'endpoint")
-                return ""
+        duration = time.time() - start_time
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        total_tokens = usage.get("total_tokens", 0)
 
-            output_chars = len(result)
-            output_tokens = completion_tokens if completion_tokens > 0 else estimate_tokens(result)
-            tokens_per_sec = output_tokens / duration if duration > 0 else 0
+        result = (result or "").strip()
+        if not result:
+            print("[MODEL] ⚠️ Réponse vide reçue de l'endpoint")
+            return ""
 
-            print(f"[METRICS] 📤 OUTPUT: {output_chars} chars, {output_tokens} tokens (real)")
-            print(f"[METRICS] 📊 USAGE: prompt={prompt_tokens}, completion={completion_tokens}, total={total_tokens}")
-            print(f"[METRICS] 🏁 FINISH: {finish_reason or 'unknown'}")
-            print(f"[METRICS] ⚡ Durée: {duration:.2f}s, {tokens_per_sec:.1f} tok/s")
-            print(f"[MODEL] ✅ {endpoint_type.upper()} réponse complète")
-            print(f"[DEBUG] 💬 OUTPUT: {result}")
-            return result
+        output_chars = len(result)
+        output_tokens = completion_tokens if completion_tokens > 0 else estimate_tokens(result)
+        tokens_per_sec = output_tokens / duration if duration > 0 else 0
+
+        print(f"[METRICS] 📤 OUTPUT: {output_chars} chars, {output_tokens} tokens (real)")
+        print(f"[METRICS] 📊 USAGE: prompt={prompt_tokens}, completion={completion_tokens}, total={total_tokens}")
+        print(f"[METRICS] 🏁 FINISH: {finish_reason or 'unknown'}")
+        print(f"[METRICS] ⚡ Durée: {duration:.2f}s, {tokens_per_sec:.1f} tok/s")
+        print(f"[MODEL] ✅ {endpoint_type.upper()} réponse complète")
+        print(f"[DEBUG] 💬 OUTPUT: {result}")
+        return result
 
     except Exception as e:  # network/parsing errors
         print(f"[MODEL] ❌ {endpoint_type.upper()} failed: {e}")
@@ -215,7 +473,6 @@ async def try_openai_fallback(prompt: str, config: dict, user: Optional[str], mo
         bot_config = config.get("bot", {}) if config else {}
         model = bot_config.get("openai_model", "gpt-4o-mini")
 
-        system_prompt = load_system_prompt(mode=mode)
         start_time = time.time()
 
         # Lire depuis config.yaml (avec fallback)
@@ -228,12 +485,13 @@ async def try_openai_fallback(prompt: str, config: dict, user: Optional[str], mo
 
         response = await client.chat.completions.create(
             model=model,
-            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
+            messages=build_prefixed_messages(mode, prompt),  # type: ignore
             max_tokens=max_tokens,
             temperature=temperature,
         )
 
         duration = time.time() - start_time
+        get_latency_histogram(OPENAI_ENDPOINT_KEY).record(duration)
         result = ""
         try:
             result = getattr(response.choices[0].message, "content", "") or str(response)
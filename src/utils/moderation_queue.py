@@ -0,0 +1,209 @@
+"""
+Moderation Queue - Timeouts et bans en file, via Helix (POST /moderation/bans).
+
+Pendant un raid de bots, chaque spammer déclenchait un "/timeout user 60"
+envoyé comme message de chat : 50 comptes = 50 messages qui consomment le
+budget d'envoi du salon et passent avant les vraies réponses.
+
+La file :
+- déduplique les cibles (une action par user en attente ; un ban remplace
+  un timeout, un timeout plus long remplace un plus court) et ignore un
+  user en cours de sanction ou sanctionné récemment (ses messages suivants
+  arrivent encore), sauf pour une sanction plus forte
+- envoie les actions par l'API de modération avec son propre budget
+  (token bucket) et ``concurrency`` requêtes en parallèle au plus
+- mesure le débit : durée et actions/s de chaque vague, jusqu'à la file vide
+
+Nécessite le scope OAuth moderator:manage:banned_users.
+
+Config:
+    moderation:
+      concurrency: 4        # Requêtes Helix simultanées
+      rate: 10              # Actions/seconde (budget propre à la modération)
+      burst: 20             # Rafale autorisée
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from src.utils.helix_client import HelixClient
+from src.utils.rate_limiter import AsyncTokenBucket
+
+CONCURRENCY_DEFAULT = 4
+RATE_DEFAULT = 10.0
+BURST_DEFAULT = 20
+RECENT_TTL = 60.0  # Secondes pendant lesquelles une cible traitée est ignorée
+
+
+class ModerationAction:
+    """Timeout (``duration`` en secondes) ou ban (``duration`` None) d'un user."""
+
+    __slots__ = ("login", "user_id", "duration", "reason")
+
+    def __init__(self, login: str, user_id: Optional[str], duration: Optional[int], reason: str):
+        self.login = login
+        self.user_id = user_id
+        self.duration = duration
+        self.reason = reason
+
+    def stronger_than(self, other: "ModerationAction") -> bool:
+        if self.duration is None:
+            return other.duration is not None
+        return other.duration is not None and self.duration > other.duration
+
+
+class ModerationQueue:
+    """File d'actions de modération d'un salon (dédupliquée, parallèle, budgétée)."""
+
+    def __init__(
+        self,
+        helix: HelixClient,
+        broadcaster_id: str,
+        moderator_id: str,
+        resolve_id: Callable[[str], Awaitable[Optional[str]]],
+        concurrency: int = CONCURRENCY_DEFAULT,
+        rate: float = RATE_DEFAULT,
+        burst: float = BURST_DEFAULT,
+    ):
+        self.helix = helix
+        self.broadcaster_id = broadcaster_id
+        self.moderator_id = moderator_id
+        self.resolve_id = resolve_id
+        self.concurrency = max(1, concurrency)
+        self.bucket = AsyncTokenBucket(rate, capacity=burst)
+        self.stats = {"submitted": 0, "deduplicated": 0, "done": 0, "failed": 0}
+        self.last_wave: Dict[str, float] = {}  # {"actions", "seconds", "per_second"}
+        self._pending: Dict[str, ModerationAction] = {}  # login → action en attente
+        self._inflight: Dict[str, ModerationAction] = {}  # login → action en cours d'envoi
+        self._recent: Dict[str, Tuple[float, ModerationAction]] = {}  # login → (fin d'ignorance, action faite)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list = []
+        self._outstanding = 0  # Actions en file ou en cours (0 = fin de vague)
+        self._wave_start = 0.0
+        self._wave_done = 0
+
+    # ----- Soumission -----
+
+    def submit(self, login: str, user_id: Optional[str] = None, duration: Optional[int] = 60, reason: str = "") -> bool:
+        """
+        Ajoute un timeout (ou un ban si ``duration`` est None).
+
+        Returns:
+            True si une nouvelle action part en file, False si dédupliquée
+        """
+        login = login.lower()
+        action = ModerationAction(login, user_id, duration, reason)
+        self.stats["submitted"] += 1
+        pending = self._pending.get(login)
+        if pending is not None:
+            # Toujours en file : on garde la sanction la plus forte
+            if action.stronger_than(pending):
+                pending.duration = action.duration
+                pending.reason = action.reason or pending.reason
+            pending.user_id = pending.user_id or user_id
+            self.stats["deduplicated"] += 1
+            return False
+        # En cours d'envoi ou sanctionné récemment : seule une sanction plus forte repart
+        previous = self._inflight.get(login)
+        if previous is None:
+            until, done = self._recent.get(login, (0.0, None))
+            previous = done if until > time.monotonic() else None
+        if previous is not None and not action.stronger_than(previous):
+            self.stats["deduplicated"] += 1
+            return False
+
+        self._ensure_workers()
+        if not self._outstanding:
+            self._wave_start, self._wave_done = time.monotonic(), 0
+        self._outstanding += 1
+        self._pending[login] = action
+        self._queue.put_nowait(login)
+        return True
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def join(self) -> None:
+        """Attend que la file soit vide (fin de vague)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def stop(self) -> None:
+        """Annule les workers sans attendre (remplacement de la file)."""
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+
+    async def close(self) -> None:
+        workers = self._workers
+        self.stop()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    # ----- Exécution -----
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            login = await self._queue.get()
+            try:
+                await self.bucket.acquire()
+                # Retirée de _pending seulement au départ : les doublons arrivés
+                # pendant l'attente du budget ont été fusionnés dans l'action
+                action = self._pending.pop(login)
+                self._inflight[login] = action
+                ok = await self._execute(action)
+                self.stats["done" if ok else "failed"] += 1
+                if ok:
+                    self._recent[login] = (time.monotonic() + min(action.duration or RECENT_TTL, RECENT_TTL), action)
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"[MODO] ❌ Exception action sur {login}: {e}")
+            finally:
+                self._inflight.pop(login, None)
+                self._wave_done += 1
+                self._outstanding -= 1
+                self._queue.task_done()
+                if not self._outstanding:
+                    self._end_wave()
+
+    async def _execute(self, action: ModerationAction) -> bool:
+        user_id = action.user_id or await self.resolve_id(action.login)
+        if not user_id:
+            print(f"[MODO] ⚠️ ID introuvable pour {action.login}, action ignorée")
+            return False
+        data: Dict = {"user_id": user_id}
+        if action.duration is not None:
+            data["duration"] = action.duration
+        if action.reason:
+            data["reason"] = action.reason[:500]
+        resp = await self.helix.request(
+            "POST",
+            "/moderation/bans",
+            params={"broadcaster_id": self.broadcaster_id, "moderator_id": self.moderator_id},
+            json={"data": data},
+            retry=True,  # Rejouer un ban est sans effet ("already banned")
+        )
+        if resp is None:
+            return False
+        if resp.status_code == 200:
+            return True
+        if resp.status_code == 400 and "already banned" in resp.text:
+            return True  # Déjà sanctionné (autre mod, AutoMod)
+        print(f"[MODO] ❌ Erreur API bans ({resp.status_code}) pour {action.login}: {resp.text[:200]}")
+        return False
+
+    def _end_wave(self) -> None:
+        seconds = max(time.monotonic() - self._wave_start, 1e-6)
+        self.last_wave = {"actions": self._wave_done, "seconds": seconds, "per_second": self._wave_done / seconds}
+        print(
+            f"[MODO] 🧹 Vague traitée : {self._wave_done} action(s) en {seconds:.1f}s "
+            f"({self.last_wave['per_second']:.1f}/s, {self.stats['deduplicated']} doublon(s) ignoré(s) au total)"
+        )
+        self._wave_done = 0
+        now = time.monotonic()
+        self._recent = {login: recent for login, recent in self._recent.items() if recent[0] > now}
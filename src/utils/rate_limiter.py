@@ -4,16 +4,21 @@ Rate Limiter - Gestionnaire centralisé des cooldowns et rate limits.
 Ce module centralise TOUS les rate limits du bot :
 - Cooldowns globaux par user (commands)
 - Rate limit LLM par user (anti-spam)
-- Health check endpoints (backoff exponentiel)
+- Health check endpoints (délégué au circuit breaker utils.llm_health)
 - Rate limit Wikipedia (1 req/sec)
+- Token bucket async (AsyncTokenBucket) pour les APIs externes appelées
+  depuis des tâches concurrentes (ex: un bucket par host Wikipedia)
 
 RAM optimisée : LRU cache avec limite configurable (default 1000 users = ~50KB)
 """
+import asyncio
 import time
 from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 
+from utils.llm_health import llm_health
+
 
 class RateLimiter:
     """
@@ -21,7 +26,7 @@ class RateLimiter:
     
     Features:
     - LRU cache pour limiter RAM (FIFO quand max_users atteint)
-    - Backoff exponentiel pour endpoints échoués
+    - Santé des endpoints via utils.llm_health (backoff partagé)
     - Rate limit Wikipedia 1 req/sec
     - Cooldown global par user (commands)
     - Rate limit LLM par user (anti-spam)
@@ -43,10 +48,6 @@ class RateLimiter:
         self._user_cooldowns: OrderedDict[str, datetime] = OrderedDict()
         self._user_llm_calls: OrderedDict[str, datetime] = OrderedDict()
         
-        # Endpoint failures (pas de limite, généralement <10 endpoints)
-        # Format: {endpoint: (fail_time, fail_count)}
-        self._endpoint_failures: dict[str, tuple[datetime, int]] = {}
-        
         # Wikipedia rate limit (global, pas par user)
         self._last_wiki_call: float = 0
         
@@ -120,14 +121,10 @@ class RateLimiter:
     
     def check_endpoint_health(self, endpoint: str) -> tuple[bool, Optional[str]]:
         """
-        Vérifie la santé d'un endpoint avec backoff exponentiel.
+        Vérifie la santé d'un endpoint (délègue au circuit breaker llm_health).
         
-        Backoff:
-        - 1er échec: 30s cooldown
-        - 2e échec: 1min cooldown
-        - 3e échec: 2min cooldown
-        - 4e échec: 4min cooldown
-        - Max: 5min cooldown
+        Un seul mécanisme de backoff pour tout le bot : les échecs remontés ici,
+        par call_model et par le health monitor partagent le même état.
         
         Args:
             endpoint: URL de l'endpoint (ex: "http://localhost:1234/v1/chat/completions")
@@ -135,7 +132,7 @@ class RateLimiter:
         Returns:
             (is_healthy, reason)
             - is_healthy: True si endpoint est dispo (ou jamais échoué)
-            - reason: Message d'erreur si en cooldown (ex: "Endpoint en cooldown (45s, échec #2)")
+            - reason: Message d'erreur si circuit ouvert (ex: "Endpoint en cooldown (45s, échec #3)")
         
         Usage:
             healthy, reason = rate_limiter.check_endpoint_health(api_url)
@@ -143,61 +140,28 @@ class RateLimiter:
                 print(f"[MODEL] ⚠️ {reason}, fallback direct")
                 return await try_openai_fallback(...)
         """
-        if endpoint not in self._endpoint_failures:
+        breaker = llm_health.breaker(endpoint)
+        if breaker.allow_request():
             return True, None
-        
-        fail_time, fail_count = self._endpoint_failures[endpoint]
-        
-        # Backoff exponentiel: 30s * 2^fail_count, max 5min
-        backoff = min(300, 30 * (2 ** fail_count))
-        elapsed = (datetime.now() - fail_time).total_seconds()
-        
-        if elapsed < backoff:
-            remaining = int(backoff - elapsed)
-            return False, f"Endpoint en cooldown ({remaining}s, échec #{fail_count})"
-        
-        # Backoff expiré, réinitialiser (prochain appel va retry)
-        del self._endpoint_failures[endpoint]
-        return True, None
+        return False, f"Endpoint en cooldown ({int(breaker.retry_in())}s, échec #{breaker.consecutive_failures})"
     
     def mark_endpoint_failure(self, endpoint: str):
         """
-        Enregistre un échec d'endpoint (incrémente compteur pour backoff).
+        Enregistre un échec d'endpoint (délègue au circuit breaker llm_health).
         
         Args:
             endpoint: URL de l'endpoint qui a échoué
-        
-        Usage:
-            try:
-                result = await try_endpoint(api_url, ...)
-                rate_limiter.mark_endpoint_success(api_url)
-            except Exception:
-                rate_limiter.mark_endpoint_failure(api_url)
         """
-        if endpoint in self._endpoint_failures:
-            _, count = self._endpoint_failures[endpoint]
-            self._endpoint_failures[endpoint] = (datetime.now(), count + 1)
-            print(f"[RATE_LIMIT] 📉 Endpoint échec #{count + 1}: {endpoint}")
-        else:
-            self._endpoint_failures[endpoint] = (datetime.now(), 1)
-            print(f"[RATE_LIMIT] 📉 Endpoint échec #1: {endpoint}")
+        llm_health.record_failure(endpoint)
     
     def mark_endpoint_success(self, endpoint: str):
         """
-        Réinitialise le compteur d'échecs d'un endpoint (sur succès).
+        Referme le circuit d'un endpoint (délègue au circuit breaker llm_health).
         
         Args:
             endpoint: URL de l'endpoint qui a réussi
-        
-        Usage:
-            result = await try_endpoint(api_url, ...)
-            if result:
-                rate_limiter.mark_endpoint_success(api_url)
         """
-        if endpoint in self._endpoint_failures:
-            _, count = self._endpoint_failures[endpoint]
-            del self._endpoint_failures[endpoint]
-            print(f"[RATE_LIMIT] 📈 Endpoint récupéré après {count} échec(s): {endpoint}")
+        llm_health.record_success(endpoint)
     
     def check_wiki_rate_limit(self) -> tuple[bool, float]:
         """
@@ -241,11 +205,10 @@ class RateLimiter:
         return {
             "user_cooldowns_count": len(self._user_cooldowns),
             "user_llm_calls_count": len(self._user_llm_calls),
-            "endpoint_failures_count": len(self._endpoint_failures),
+            "endpoint_failures_count": sum(1 for b in llm_health.stats() if b["consecutive_failures"]),
             "estimated_bytes": (
                 sys.getsizeof(self._user_cooldowns) +
-                sys.getsizeof(self._user_llm_calls) +
-                sys.getsizeof(self._endpoint_failures)
+                sys.getsizeof(self._user_llm_calls)
             )
         }
     
@@ -257,9 +220,45 @@ class RateLimiter:
     
     def reset_endpoint_failures(self):
         """Réinitialise tous les échecs endpoints (debug/tests)."""
-        self._endpoint_failures.clear()
+        llm_health.reset()
         print("[RATE_LIMIT] 🔄 Reset tous les échecs endpoints")
 
 
+class AsyncTokenBucket:
+    """
+    Token bucket async : ``rate`` jetons/seconde, ``capacity`` jetons max (rafale).
+
+    acquire() est sérialisé par un verrou : les tâches concurrentes passent
+    chacune à leur tour au lieu de lire toutes le même "dernier appel" puis
+    de repartir ensemble après le même sleep.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None  # Créé dans la boucle qui l'utilise
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Prend un jeton, en attendant si le bucket est vide. Retourne l'attente (s)."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self._tokens < 1:
+                waited = (1 - self._tokens) / self.rate
+                await asyncio.sleep(waited)
+                self._refill()
+            self._tokens -= 1
+            return waited
+
+
 # Instance globale (singleton)
 rate_limiter = RateLimiter(max_users=1000)
@@ -9,8 +9,6 @@ Pas de over-engineering, juste ce qu'il faut.
 import json
 from pathlib import Path
 
-from deep_translator import GoogleTranslator
-
 
 class Translator:
     """Traducteur simple avec whitelist devs"""
@@ -18,19 +16,34 @@ class Translator:
     def __init__(self, devs_file='data/devs.json', blocked_file='data/blocked_sites.json',
                  bot_whitelist_file='data/bot_whitelist.json',
                  bot_blacklist_file='data/bot_blacklist.json'):
-        self.translator_en_fr = GoogleTranslator(source='en', target='fr')
-        self.translator_fr_en = GoogleTranslator(source='fr', target='en')
+        # Traducteurs Google créés au premier usage (deep_translator est lourd à importer)
+        self._google_translators = {}
 
         self.devs_file = Path(devs_file)
         self.blocked_file = Path(blocked_file)
         self.bot_whitelist_file = Path(bot_whitelist_file)
         self.bot_blacklist_file = Path(bot_blacklist_file)
 
+        # Incrémenté à chaque sauvegarde (multi-process : signal de rechargement)
+        self.version = 0
+        self.reload()
+
+    def reload(self):
+        """(Re)lit les listes depuis data/*.json (modifiées par un autre process)."""
         self.devs = self._load_json(self.devs_file, set())
         self.blocked_sites = self._load_json(self.blocked_file, set())
         self.bot_whitelist = self._load_json(self.bot_whitelist_file, set())
         self.bot_blacklist = self._load_json(self.bot_blacklist_file, set())
 
+    def _google(self, source, target):
+        """GoogleTranslator pour une paire de langues (lazy, réutilisé)."""
+        translator = self._google_translators.get((source, target))
+        if translator is None:
+            from deep_translator import GoogleTranslator
+            translator = GoogleTranslator(source=source, target=target)
+            self._google_translators[(source, target)] = translator
+        return translator
+
     def _load_json(self, filepath, default):
         """Charge un fichier JSON ou retourne default"""
         if not filepath.exists():
@@ -50,6 +63,7 @@ class Translator:
         """Sauvegarde dans un fichier JSON"""
         with open(filepath, 'w') as f:
             json.dump(sorted(list(data)) if isinstance(data, set) else data, f, indent=2)
+        self.version += 1
 
     # === DEVS WHITELIST ===
 
@@ -213,9 +227,9 @@ class Translator:
         """
         try:
             if source == 'en' and target == 'fr':
-                return self.translator_en_fr.translate(text)
+                return self._google('en', 'fr').translate(text)
             elif source == 'fr' and target == 'en':
-                return self.translator_fr_en.translate(text)
+                return self._google('fr', 'en').translate(text)
             return None
         except Exception as e:
             error_str = str(e).lower()
@@ -251,8 +265,7 @@ class Translator:
             Traduction française ou texte original si erreur
         """
         try:
-            translator_zh = GoogleTranslator(source='zh-CN', target='fr')
-            return translator_zh.translate(text)
+            return self._google('zh-CN', 'fr').translate(text)
         except Exception as e:
             print(f"🚨 [TRANSLATOR] Erreur traduction chinois: {e}")
             # Retourne le texte original si la traduction échoue
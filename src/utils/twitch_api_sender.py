@@ -11,9 +11,8 @@ Avantages:
 """
 
 import logging
-from typing import Optional
 
-import aiohttp
+from src.utils.helix_client import HelixClient
 
 logger = logging.getLogger(__name__)
 
@@ -21,99 +20,49 @@ logger = logging.getLogger(__name__)
 class TwitchAPISender:
     """Gestionnaire d'envoi de messages via l'API Twitch."""
 
-    def __init__(
-        self,
-        client_id: str,
-        app_access_token: str,
-        bot_user_token: str,
-        broadcaster_id: str,
-        sender_id: str
-    ):
+    def __init__(self, helix: HelixClient, broadcaster_id: str, sender_id: str):
         """Initialize le sender API.
 
         Args:
-            client_id: Client ID de l'application Twitch
-            app_access_token: App Access Token (pour le badge bot)
-            bot_user_token: User Access Token du bot (user:write:chat)
+            helix: Client Helix du bot (User Access Token user:write:chat + user:bot)
             broadcaster_id: ID du broadcaster (channel)
             sender_id: ID du bot (sender)
         """
-        self.client_id = client_id
-        self.app_access_token = app_access_token
-        self.bot_user_token = bot_user_token
+        self.helix = helix
         self.broadcaster_id = broadcaster_id
         self.sender_id = sender_id
-        self.api_url = "https://api.twitch.tv/helix/chat/messages"
-        self._session: Optional[aiohttp.ClientSession] = None
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Récupère ou crée la session aiohttp."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
 
     async def send_message(self, message: str, use_badge: bool = True) -> bool:
         """Envoie un message dans le chat Twitch via l'API.
 
         Args:
             message: Le message à envoyer
-            use_badge: Si True, utilise User Access Token du bot (badge bot)
-                      Si False, utilise User Access Token (pas de badge)
+            use_badge: Conservé pour compatibilité (le token du bot donne toujours le badge)
 
         Returns:
             bool: True si le message a été envoyé avec succès
         """
-        try:
-            # TOUJOURS utiliser le bot_user_token (User Token avec user:write:chat + user:bot)
-            token = self.bot_user_token
-
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Client-Id": self.client_id,
-                "Content-Type": "application/json"
-            }
-
-            payload = {
-                "broadcaster_id": self.broadcaster_id,
-                "sender_id": self.sender_id,
-                "message": message
-            }
-
-            # DEBUG: Log complet de la requête
-            print(f"[API_DEBUG] 🔍 Payload: broadcaster_id={self.broadcaster_id}, sender_id={self.sender_id}")
-            print(f"[API_DEBUG] 🔍 Token (first 20 chars): {token[:20]}...")
-            print(f"[API_DEBUG] 🔍 Client-Id (first 10 chars): {self.client_id[:10]}...")
-
-            session = await self._get_session()
-            async with session.post(self.api_url, headers=headers, json=payload) as response:
-                print(f"[API_DEBUG] 📡 Status: {response.status}")
-                
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"[API_DEBUG] 📦 Response data: {data}")
-                    
-                    if data.get("data", [{}])[0].get("is_sent"):
-                        logger.debug(f"✅ Message envoyé via API: {message[:50]}...")
-                        print(f"[API_DEBUG] ✅ is_sent=True dans la réponse")
-                        return True
-                    else:
-                        drop_reason = data.get("data", [{}])[0].get("drop_reason")
-                        logger.warning(f"❌ Message droppé: {drop_reason}")
-                        print(f"[API_DEBUG] ❌ is_sent=False, drop_reason: {drop_reason}")
-                        return False
-                else:
-                    error_text = await response.text()
-                    logger.error(f"❌ Erreur API ({response.status}): {error_text}")
-                    print(f"[API_DEBUG] ❌ Erreur HTTP {response.status}: {error_text}")
-                    return False
-
-        except Exception as e:
-            logger.error(f"❌ Exception lors de l'envoi API: {e}")
-            print(f"[API_DEBUG] 💥 Exception: {type(e).__name__}: {e}")
+        payload = {
+            "broadcaster_id": self.broadcaster_id,
+            "sender_id": self.sender_id,
+            "message": message
+        }
+        response = await self.helix.request("POST", "/chat/messages", json=payload)
+        if response is None:
             return False
+        if response.status_code != 200:
+            logger.error(f"❌ Erreur API ({response.status_code}): {response.text}")
+            print(f"[API] ❌ Erreur HTTP {response.status_code}: {response.text[:200]}")
+            return False
+
+        result = (response.json().get("data") or [{}])[0]
+        if result.get("is_sent"):
+            logger.debug(f"✅ Message envoyé via API: {message[:50]}...")
+            return True
+        drop_reason = result.get("drop_reason")
+        logger.warning(f"❌ Message droppé: {drop_reason}")
+        print(f"[API] ❌ Message droppé: {drop_reason}")
+        return False
 
     async def close(self):
-        """Ferme proprement la session aiohttp."""
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
+        """Rien à fermer : la connexion HTTP est partagée (helix_client.close_helix)."""
@@ -3,11 +3,21 @@ Module de gestion de l'AutoMod Twitch natif.
 
 Permet de gérer les blocked_terms (mots bannis) et les paramètres AutoMod
 directement via l'API Twitch, sans passer par le dashboard.
+
+BlockedTermsMirror garde une copie locale de la liste (synchronisée en
+tâche de fond, mise à jour à chaque ajout/retrait) : !banwords et
+!removebanword ne rappellent plus l'API, et le bot filtre localement les
+messages qui contiennent un mot banni.
 """
 
-from typing import Dict, List, Optional
+import asyncio
+import re
+import time
+from typing import Dict, List, Optional, Pattern
+
+from src.utils.helix_client import HelixClient
 
-import aiohttp
+SYNC_INTERVAL_DEFAULT = 600  # Secondes entre deux synchronisations complètes
 
 
 class TwitchAutoMod:
@@ -19,26 +29,22 @@ class TwitchAutoMod:
     - moderator:manage:automod_settings (optionnel)
     """
 
-    def __init__(self, client_id: str, access_token: str, broadcaster_id: str, moderator_id: str):
+    def __init__(self, helix: HelixClient, broadcaster_id: str, moderator_id: str):
         """
         Initialise le gestionnaire AutoMod.
         
         Args:
-            client_id: Client ID de l'application Twitch
-            access_token: Token OAuth avec les scopes nécessaires
+            helix: Client Helix du token avec les scopes nécessaires
             broadcaster_id: ID numérique du broadcaster (propriétaire du canal)
             moderator_id: ID numérique du bot/modérateur (généralement = bot_id)
         """
-        self.client_id = client_id
-        self.access_token = access_token
+        self.helix = helix
         self.broadcaster_id = broadcaster_id
         self.moderator_id = moderator_id
-        self.base_url = "https://api.twitch.tv/helix"
-        self.headers = {
-            "Client-ID": client_id,
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
+
+    def _params(self, **extra) -> Dict:
+        """Paramètres de requête communs (broadcaster + modérateur)."""
+        return {"broadcaster_id": self.broadcaster_id, "moderator_id": self.moderator_id, **extra}
 
     async def add_blocked_term(self, text: str) -> Optional[Dict]:
         """
@@ -50,28 +56,18 @@ class TwitchAutoMod:
         Returns:
             Dict avec les infos du term ajouté, ou None si erreur
         """
-        url = f"{self.base_url}/moderation/blocked_terms"
-        data = {
-            "broadcaster_id": self.broadcaster_id,
-            "moderator_id": self.moderator_id,
-            "text": text
-        }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=self.headers, json=data) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        term_data = result.get("data", [{}])[0]
-                        print(f"[AUTOMOD] ✅ Mot '{text}' ajouté avec succès (ID: {term_data.get('id', 'N/A')})")
-                        return term_data
-                    else:
-                        error_text = await resp.text()
-                        print(f"[AUTOMOD] ❌ Erreur API add_blocked_term ({resp.status}): {error_text}")
-                        return None
-        except Exception as e:
-            print(f"[AUTOMOD] ❌ Exception add_blocked_term: {e}")
+        resp = await self.helix.request(
+            "POST", "/moderation/blocked_terms", params=self._params(), json={"text": text}
+        )
+        if resp is None:
+            print("[AUTOMOD] ❌ Exception add_blocked_term: API injoignable")
             return None
+        if resp.status_code == 200:
+            term_data = (resp.json().get("data") or [{}])[0]
+            print(f"[AUTOMOD] ✅ Mot '{text}' ajouté avec succès (ID: {term_data.get('id', 'N/A')})")
+            return term_data
+        print(f"[AUTOMOD] ❌ Erreur API add_blocked_term ({resp.status_code}): {resp.text}")
+        return None
 
     async def remove_blocked_term(self, term_id: str) -> bool:
         """
@@ -83,73 +79,47 @@ class TwitchAutoMod:
         Returns:
             True si succès, False sinon
         """
-        url = f"{self.base_url}/moderation/blocked_terms"
-        params = {
-            "broadcaster_id": self.broadcaster_id,
-            "moderator_id": self.moderator_id,
-            "id": term_id
-        }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.delete(url, headers=self.headers, params=params) as resp:
-                    if resp.status == 204:
-                        print(f"[AUTOMOD] ✅ Mot retiré avec succès (ID: {term_id})")
-                        return True
-                    else:
-                        error_text = await resp.text()
-                        print(f"[AUTOMOD] ❌ Erreur API remove_blocked_term ({resp.status}): {error_text}")
-                        return False
-        except Exception as e:
-            print(f"[AUTOMOD] ❌ Exception remove_blocked_term: {e}")
+        resp = await self.helix.request("DELETE", "/moderation/blocked_terms", params=self._params(id=term_id))
+        if resp is None:
+            print("[AUTOMOD] ❌ Exception remove_blocked_term: API injoignable")
             return False
+        if resp.status_code == 204:
+            print(f"[AUTOMOD] ✅ Mot retiré avec succès (ID: {term_id})")
+            return True
+        print(f"[AUTOMOD] ❌ Erreur API remove_blocked_term ({resp.status_code}): {resp.text}")
+        return False
 
     async def get_blocked_terms(self) -> List[Dict]:
         """
-        Récupère tous les mots bannis.
+        Récupère tous les mots bannis (toutes les pages).
         
         Returns:
             Liste de dict avec {id, text, created_at, updated_at, expires_at}
         """
-        url = f"{self.base_url}/moderation/blocked_terms"
-        params = {
-            "broadcaster_id": self.broadcaster_id,
-            "moderator_id": self.moderator_id,
-            "first": 100  # Max 100 par page
-        }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, params=params) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        terms = result.get("data", [])
-                        print(f"[AUTOMOD] ✅ Récupéré {len(terms)} mot(s) banni(s)")
-                        return terms
-                    else:
-                        error_text = await resp.text()
-                        print(f"[AUTOMOD] ❌ Erreur API get_blocked_terms ({resp.status}): {error_text}")
-                        return []
-        except Exception as e:
-            print(f"[AUTOMOD] ❌ Exception get_blocked_terms: {e}")
-            return []
-
-    async def find_blocked_term_by_text(self, text: str) -> Optional[Dict]:
-        """
-        Trouve un blocked_term par son texte.
-        
-        Args:
-            text: Le texte à rechercher
-            
-        Returns:
-            Le dict du term trouvé, ou None
-        """
-        terms = await self.get_blocked_terms()
-        text_lower = text.lower()
-        for term in terms:
-            if term.get("text", "").lower() == text_lower:
-                return term
-        return None
+        return await self.fetch_blocked_terms() or []
+
+    async def fetch_blocked_terms(self) -> Optional[List[Dict]]:
+        """Comme get_blocked_terms, mais None si une page a échoué (liste incomplète)."""
+        terms: List[Dict] = []
+        cursor = None
+        while True:
+            params = self._params(first=100)  # Max 100 par page
+            if cursor:
+                params["after"] = cursor
+            resp = await self.helix.request("GET", "/moderation/blocked_terms", params=params)
+            if resp is None:
+                print("[AUTOMOD] ❌ Exception get_blocked_terms: API injoignable")
+                return None
+            if resp.status_code != 200:
+                print(f"[AUTOMOD] ❌ Erreur API get_blocked_terms ({resp.status_code}): {resp.text}")
+                return None
+            result = resp.json()
+            terms.extend(result.get("data", []))
+            cursor = (result.get("pagination") or {}).get("cursor")
+            if not cursor:
+                break
+        print(f"[AUTOMOD] ✅ Récupéré {len(terms)} mot(s) banni(s)")
+        return terms
 
     async def set_automod_level(self, level: int) -> bool:
         """
@@ -165,23 +135,135 @@ class TwitchAutoMod:
             print(f"[AUTOMOD] ❌ Niveau invalide: {level} (doit être 0-4)")
             return False
 
-        url = f"{self.base_url}/moderation/automod_settings"
-        data = {
-            "broadcaster_id": self.broadcaster_id,
-            "moderator_id": self.moderator_id,
-            "overall_level": level
-        }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.put(url, headers=self.headers, json=data) as resp:
-                    if resp.status == 200:
-                        print(f"[AUTOMOD] ✅ Niveau AutoMod configuré: {level}")
-                        return True
-                    else:
-                        error_text = await resp.text()
-                        print(f"[AUTOMOD] ❌ Erreur API set_automod_level ({resp.status}): {error_text}")
-                        return False
-        except Exception as e:
-            print(f"[AUTOMOD] ❌ Exception set_automod_level: {e}")
+        resp = await self.helix.request(
+            "PUT", "/moderation/automod_settings", params=self._params(), json={"overall_level": level}
+        )
+        if resp is None:
+            print("[AUTOMOD] ❌ Exception set_automod_level: API injoignable")
             return False
+        if resp.status_code == 200:
+            print(f"[AUTOMOD] ✅ Niveau AutoMod configuré: {level}")
+            return True
+        print(f"[AUTOMOD] ❌ Erreur API set_automod_level ({resp.status_code}): {resp.text}")
+        return False
+
+
+class BlockedTermsMirror:
+    """Copie locale des blocked_terms d'un salon : index par texte + pré-filtre."""
+
+    def __init__(self, automod: TwitchAutoMod, sync_interval: float = SYNC_INTERVAL_DEFAULT):
+        self.automod = automod
+        self.sync_interval = sync_interval
+        self.by_text: Dict[str, Dict] = {}  # texte en minuscules → term
+        self.synced_at = 0.0
+        self._pattern: Optional[Pattern] = None  # Regex du pré-filtre (reconstruite à la demande)
+        self._changes: Optional[List] = None  # Ajouts/retraits pendant une synchro en cours
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ----- Synchronisation -----
+
+    async def sync(self) -> bool:
+        """Recharge toute la liste (paginée). Garde l'ancienne copie si l'API échoue."""
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        async with self._sync_lock:
+            self._changes = []
+            try:
+                terms = await self.automod.fetch_blocked_terms()
+                if terms is None:
+                    return False
+                by_text = {term.get("text", "").lower(): term for term in terms}
+                # Ajouts/retraits faits pendant le téléchargement des pages
+                for text, term in self._changes:
+                    if term is None:
+                        by_text.pop(text, None)
+                    else:
+                        by_text[text] = term
+                self.by_text = by_text
+                self._pattern = None
+                self.synced_at = time.time()
+                return True
+            finally:
+                self._changes = None
+
+    async def ensure_synced(self) -> None:
+        """Première synchro à la demande (commande avant la fin du boot)."""
+        if not self.synced_at:
+            await self.sync()
+
+    def start(self) -> None:
+        """Synchro au boot puis toutes les ``sync_interval`` secondes."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def _sync_loop(self) -> None:
+        while True:
+            if await self.sync():
+                print(f"[AUTOMOD] 🔄 Miroir des mots bannis: {len(self.by_text)} terme(s)")
+            if not self.sync_interval:
+                return
+            await asyncio.sleep(self.sync_interval)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ----- Modifications (API puis miroir) -----
+
+    def _apply(self, text: str, term: Optional[Dict]) -> None:
+        if term is None:
+            self.by_text.pop(text, None)
+        else:
+            self.by_text[text] = term
+        if self._changes is not None:
+            self._changes.append((text, term))
+        self._pattern = None
+
+    async def add(self, text: str) -> Optional[Dict]:
+        """Ajoute le mot sur Twitch et dans le miroir. None si l'API refuse."""
+        term = await self.automod.add_blocked_term(text)
+        if term:
+            self._apply(term.get("text", text).lower(), term)
+        return term
+
+    async def remove(self, text: str) -> Optional[bool]:
+        """Retire le mot (ID lu dans le miroir). None si le mot n'est pas banni."""
+        await self.ensure_synced()
+        term = self.find(text)
+        if term is None:
+            return None
+        removed = await self.automod.remove_blocked_term(term["id"])
+        if removed:
+            self._apply(text.lower(), None)
+        return removed
+
+    # ----- Lecture -----
+
+    def find(self, text: str) -> Optional[Dict]:
+        """Term banni par son texte (insensible à la casse), sans appel API."""
+        return self.by_text.get(text.lower())
+
+    def texts(self) -> List[str]:
+        return [term.get("text", text) for text, term in self.by_text.items()]
+
+    def _compiled(self) -> Optional[Pattern]:
+        """Une seule regex pour tous les termes (``*`` = joker en début/fin de mot)."""
+        if self._pattern is None and self.by_text:
+            alternatives = [
+                re.escape(text).replace(r"\*", r"\w*")
+                for text in sorted(self.by_text, key=len, reverse=True)
+                if text.strip("*")
+            ]
+            if alternatives:
+                self._pattern = re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)", re.IGNORECASE)
+        return self._pattern
+
+    def match(self, message: str) -> Optional[str]:
+        """Premier mot banni trouvé dans le message (pré-filtre local), None sinon."""
+        pattern = self._compiled()
+        if pattern is None:
+            return None
+        found = pattern.search(message)
+        return found.group(0) if found else None
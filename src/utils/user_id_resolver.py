@@ -0,0 +1,212 @@
+"""
+User ID Resolver - login Twitch → User ID, en cache et par lots.
+
+Multi-salon (broadcaster_id), modération par ID Helix, whitelist : le bot
+a besoin de beaucoup de résolutions login → ID. Une requête /users par
+login coûte un aller-retour et une part du budget Helix à chaque fois.
+
+Le resolver :
+- garde un cache persistant (cache/twitch_user_ids.json, écriture
+  atomique, fichier temporaire propre à chaque écriture : les workers
+  partagent le fichier) ; les IDs ne changent pas, une entrée vit
+  USER_ID_TTL (un login peut être libéré puis repris) ; les entrées
+  expirées sont purgées et le cache est plafonné à MAX_ENTRIES
+- regroupe les logins demandés pendant ``batch_window`` secondes en une
+  requête ``/users?login=a&login=b...`` (100 logins max par requête)
+- fusionne les demandes concurrentes d'un même login (un seul futur)
+- apprend les IDs vus dans le chat (tag IRC user-id) sans appel API
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.helix_client import HelixClient, bot_helix, moderator_helix
+
+USER_IDS_FILE = "cache/twitch_user_ids.json"
+USER_ID_TTL = 30 * 86400  # Secondes (30 jours)
+BATCH_MAX = 100  # Limite Helix de logins par requête /users
+BATCH_WINDOW = 0.05  # Secondes d'attente pour regrouper les demandes
+MAX_ENTRIES = 50_000  # Au-delà, les IDs les plus anciens sont oubliés
+
+
+class UserIdResolver:
+    """Résolution login → User ID : cache persistant, lots de 100, coalescence."""
+
+    def __init__(self, path: str = USER_IDS_FILE, batch_window: float = BATCH_WINDOW, max_entries: int = MAX_ENTRIES):
+        self.path = Path(path)
+        self.batch_window = batch_window
+        self.max_entries = max_entries
+        self.helix: Optional[HelixClient] = None
+        self.stats = {"hits": 0, "requests": 0, "resolved": 0, "unknown": 0}
+        self._ids: Dict[str, Tuple[str, float]] = {}  # login → (id, date de résolution)
+        self._loaded = False
+        self._dirty = False
+        self._waiting: Dict[str, asyncio.Future] = {}  # login → futur partagé
+        self._batch: List[str] = []  # Logins pas encore envoyés
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self._version = 0  # Numéro de la dernière copie prise
+        self._written = 0  # Numéro de la copie sur disque
+        self._write_lock = threading.Lock()
+
+    def configure(self, config: dict) -> None:
+        """Client Helix du bot (boot ou hot reload)."""
+        twitch = config.get("twitch", {}) or {}
+        self.helix = bot_helix(twitch) or moderator_helix(twitch)
+
+    # ----- Cache persistant -----
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._ids = {login: (entry[0], entry[1]) for login, entry in data.items()}
+        except Exception as e:
+            print(f"[USERS] ⚠️ Erreur chargement cache IDs: {e}")
+
+    def _prune(self) -> None:
+        """Retire les entrées expirées, puis les plus anciennes au-delà de max_entries."""
+        cutoff = time.time() - USER_ID_TTL
+        ids = {login: entry for login, entry in self._ids.items() if entry[1] >= cutoff}
+        if len(ids) > self.max_entries:
+            # Marge de 10 % : pas de tri à chaque nouveau login une fois le plafond atteint
+            keep = max(1, int(self.max_entries * 0.9))
+            ids = dict(sorted(ids.items(), key=lambda item: item[1][1])[-keep:])
+        if len(ids) != len(self._ids):
+            self._ids = ids
+            self._dirty = True
+
+    def _snapshot(self) -> Optional[Tuple[int, dict]]:
+        """Copie à écrire (None si rien n'a changé) ; prise dans la boucle, pas dans le thread."""
+        self._prune()
+        if not self._dirty:
+            return None
+        self._dirty = False
+        self._version += 1
+        return self._version, {login: list(entry) for login, entry in self._ids.items()}
+
+    def _write(self, version: int, data: dict) -> None:
+        with self._write_lock:
+            if version < self._written:
+                return  # Une copie plus récente est déjà sur disque
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Temporaire unique : les workers (et les écritures concurrentes) ne se marchent pas dessus
+                fd, temp_file = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(data, f)
+                    os.replace(temp_file, str(self.path))
+                except BaseException:
+                    os.unlink(temp_file)
+                    raise
+                self._written = version
+            except Exception as e:
+                print(f"[USERS] ❌ Erreur sauvegarde cache IDs: {e}")
+
+    def save(self) -> None:
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            self._write(*snapshot)
+
+    def cached(self, login: str) -> Optional[str]:
+        """ID en cache (None si absent ou expiré), sans appel API."""
+        if not self._loaded:
+            self._load()
+        entry = self._ids.get(login.lower().lstrip("@"))
+        if entry is None or time.time() - entry[1] > USER_ID_TTL:
+            return None
+        return entry[0]
+
+    def remember(self, login: str, user_id: str) -> None:
+        """Enregistre un ID connu (ex: tag IRC user-id d'un message)."""
+        login = login.lower()
+        if self.cached(login) != user_id:
+            self._ids[login] = (user_id, time.time())
+            self._dirty = True
+            if len(self._ids) > self.max_entries:
+                self._prune()
+
+    # ----- Résolution -----
+
+    async def resolve(self, login: str) -> Optional[str]:
+        """User ID d'un login, None si inconnu de Twitch (ou API indisponible)."""
+        login = login.lower().lstrip("@")
+        user_id = self.cached(login)
+        if user_id is not None:
+            self.stats["hits"] += 1
+            return user_id
+        future = self._waiting.get(login)
+        if future is None:
+            future = self._waiting[login] = asyncio.get_running_loop().create_future()
+            self._batch.append(login)
+            self._schedule_flush()
+        return await asyncio.shield(future)
+
+    async def resolve_many(self, logins: Iterable[str]) -> Dict[str, Optional[str]]:
+        """{login: ID} pour plusieurs logins (regroupés dans les mêmes requêtes)."""
+        logins = list(dict.fromkeys(login.lower().lstrip("@") for login in logins))
+        ids = await asyncio.gather(*(self.resolve(login) for login in logins))
+        return dict(zip(logins, ids))
+
+    async def drain(self) -> None:
+        """Envoie le lot en attente puis attend les requêtes et l'écriture du cache disque."""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _schedule_flush(self) -> None:
+        if len(self._batch) >= BATCH_MAX:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+
+    def _flush(self) -> None:
+        """Envoie les logins en attente par lots de BATCH_MAX."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._batch:
+            batch, self._batch = self._batch[:BATCH_MAX], self._batch[BATCH_MAX:]
+            task = asyncio.create_task(self._fetch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, logins: List[str]) -> None:
+        found: Dict[str, str] = {}
+        try:
+            if self.helix is None:
+                print("[USERS] ⚠️ Pas de client Helix configuré (twitch.bot_user_token/token)")
+            else:
+                self.stats["requests"] += 1
+                response = await self.helix.request("GET", "/users", params=[("login", login) for login in logins])
+                if response is not None and response.status_code == 200:
+                    now = time.time()
+                    for user in response.json().get("data", []):
+                        found[user["login"].lower()] = user["id"]
+                        self._ids[user["login"].lower()] = (user["id"], now)
+                    self._dirty = bool(found) or self._dirty
+                elif response is not None:
+                    print(f"[USERS] ❌ Erreur API /users ({response.status_code}): {response.text[:200]}")
+        finally:
+            for login in logins:
+                future = self._waiting.pop(login, None)
+                if future is not None and not future.done():
+                    future.set_result(found.get(login))
+            self.stats["resolved"] += len(found)
+            self.stats["unknown"] += len(logins) - len(found)
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            await asyncio.to_thread(self._write, *snapshot)
+
+
+# Instance globale (singleton)
+user_id_resolver = UserIdResolver()
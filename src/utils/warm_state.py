@@ -0,0 +1,173 @@
+"""Snapshot de l'état chaud du bot (warm restart).
+
+Chaque redémarrage (auto-restart après crash/déconnexion) perdait tout ce
+qui vit en RAM : GAME_CACHE (RAM-only en prod), historiques de conversation,
+cooldowns et état des circuits LLM. Les premières minutes étaient lentes et
+consommaient du quota RAWG pour rien.
+
+Ce module sérialise ces structures dans un fichier binaire compact
+(en-tête + JSON compressé zlib), périodiquement et à l'arrêt, puis les
+restaure au boot. Chaque entrée est revalidée à la restauration :
+- cache jeux : TTL d'origine (timestamp conservé)
+- conversations : TTL d'inactivité du ConversationManager
+- cooldowns : seulement ceux encore actifs
+- circuits LLM : seulement si le backoff n'est pas expiré
+
+Config:
+    bot:
+      snapshot_file: cache/warm_state.bin
+      snapshot_interval: 60     # Secondes entre 2 snapshots (0 = désactivé)
+"""
+
+import asyncio
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from core.cache import GAME_CACHE  # Même singleton que game_command
+from utils.llm_health import llm_health  # Même singleton que utils.model_utils
+
+MAGIC = b"SBWS"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(">4sB")
+
+SNAPSHOT_FILE_DEFAULT = "cache/warm_state.bin"
+SNAPSHOT_INTERVAL_DEFAULT = 60
+
+
+def capture(channels: Dict[str, object], game_cache=GAME_CACHE, health=llm_health) -> dict:
+    """Capture l'état chaud (à appeler depuis la boucle : lecture des dicts en RAM)."""
+    now = datetime.now()
+    state = {
+        "saved_at": time.time(),
+        # SqliteGameCache est déjà persistant : export vide
+        "game_cache": game_cache.export_entries(),
+        "llm_health": health.export_state(),
+        "channels": {},
+    }
+    for name, ctx in channels.items():
+        state["channels"][name] = {
+            "cooldowns": {
+                user: last.timestamp()
+                for user, last in ctx.cooldowns.items()
+                if (now - last).total_seconds() < ctx.cooldown
+            },
+            "conversations": ctx.conversation_manager.export_states(),
+        }
+    return state
+
+
+def restore(state: dict, channels: Dict[str, object], game_cache=GAME_CACHE, health=llm_health) -> dict:
+    """Réinjecte un snapshot (entrées expirées ignorées). Retourne les compteurs."""
+    now = time.time()
+    counts = {"game_cache": 0, "conversations": 0, "cooldowns": 0, "llm_health": 0}
+    counts["game_cache"] = game_cache.import_entries(state.get("game_cache", {}))
+    counts["llm_health"] = health.import_state(state.get("llm_health", []))
+
+    for name, data in state.get("channels", {}).items():
+        ctx = channels.get(name)
+        if ctx is None:  # Salon retiré de la config depuis
+            continue
+        for user, last in data.get("cooldowns", {}).items():
+            if now - last < ctx.cooldown and user not in ctx.cooldowns:
+                ctx.cooldowns[user] = datetime.fromtimestamp(last)
+                counts["cooldowns"] += 1
+        counts["conversations"] += ctx.conversation_manager.import_states(data.get("conversations", {}))
+    return counts
+
+
+def encode(state: dict) -> bytes:
+    payload = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(payload, 6)
+
+
+def decode(blob: bytes) -> Optional[dict]:
+    """Décode un snapshot. None si le fichier est corrompu ou d'un autre format."""
+    if len(blob) < _HEADER.size:
+        return None
+    magic, version = _HEADER.unpack_from(blob)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    try:
+        return json.loads(zlib.decompress(blob[_HEADER.size:]))
+    except (zlib.error, ValueError):
+        return None
+
+
+def save_snapshot(path: str, state: dict) -> int:
+    """Écriture atomique (fichier temporaire + os.replace). Retourne la taille."""
+    blob = encode(state)
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Temporaire unique : snapshot périodique et save_now peuvent écrire en même temps
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(blob)
+
+
+def load_snapshot(path: str) -> Optional[dict]:
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except FileNotFoundError:
+        return None
+    state = decode(blob)
+    if state is None:
+        print(f"[SNAPSHOT] ⚠️ Snapshot illisible ignoré: {path}")
+    return state
+
+
+class WarmStateSnapshotter:
+    """Snapshot périodique : capture sur la boucle, compression/écriture en thread."""
+
+    def __init__(self, path: str, interval: float, capture_fn: Callable[[], dict]):
+        self.path = path
+        self.interval = interval
+        self._capture = capture_fn
+        self._version = 0  # Numéro de la dernière capture
+        self._written = 0  # Numéro de la capture sur disque
+        self._write_lock = threading.Lock()
+
+    def _take(self) -> tuple:
+        """Capture numérotée (sur la boucle)."""
+        self._version += 1
+        return self._version, self._capture()
+
+    def _write(self, version: int, state: dict) -> Optional[int]:
+        """Écrit la capture, sauf si une plus récente est déjà sur disque."""
+        with self._write_lock:
+            if version < self._written:
+                return None
+            size = save_snapshot(self.path, state)
+            self._written = version
+            return size
+
+    def save_now(self) -> None:
+        """Snapshot synchrone (arrêt / avant redémarrage)."""
+        try:
+            size = self._write(*self._take())
+            if size is not None:
+                print(f"[SNAPSHOT] 💾 État sauvegardé ({size / 1024:.1f} Ko)")
+        except Exception as e:
+            print(f"[SNAPSHOT] ❌ Sauvegarde impossible: {e}")
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self._write, *self._take())
+            except Exception as e:
+                print(f"[SNAPSHOT] ❌ Sauvegarde impossible: {e}")
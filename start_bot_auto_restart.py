@@ -14,7 +14,7 @@ from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.config.config import load_config
+from config.config import config_service, thaw  # Même singleton que le bot
 from src.chat.twitch_bot import TwitchBot
 
 
@@ -34,6 +34,7 @@ class AutoRestartBot:
     
     async def run(self):
         """Lance le bot avec redémarrage automatique."""
+        bot = None
         while True:
             try:
                 if self.max_restarts and self.restart_count >= self.max_restarts:
@@ -45,14 +46,26 @@ class AutoRestartBot:
                     print(f"⏳ Attente de {self.restart_delay} secondes...\n")
                     await asyncio.sleep(self.restart_delay)
                 
-                # Charge la config à chaque redémarrage (au cas où elle change)
-                config = load_config()
-                bot = TwitchBot(config)
+                # Config partagée : relue à chaque redémarrage, puis hot reload
+                # pendant la session (plus besoin de redémarrer pour la changer)
+                if self.restart_count > 0:
+                    config_service.reload()
+                if bot is not None:
+                    config_service.unsubscribe(bot.apply_config)
+                bot = TwitchBot(thaw(config_service.snapshot))
+                config_service.subscribe(bot.apply_config)
+                interval = bot.config["bot"].get("config_reload_interval", 2)
+                if interval:
+                    config_service.watch(interval)
                 
                 print(f"\n🚀 Démarrage du bot (tentative #{self.restart_count + 1})...")
                 print(f"⏰ Heure: {datetime.now().strftime('%H:%M:%S')}\n")
                 
-                await bot.start()
+                try:
+                    await bot.start()
+                finally:
+                    # Restart à chaud : le prochain bot restaure cet état au boot
+                    bot.save_warm_state()
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Arrêt manuel détecté")
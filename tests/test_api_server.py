@@ -0,0 +1,73 @@
+"""Tests de l'API HTTP (FastAPI) sans LLM réel."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.server import api_server
+
+CONFIG = {"bot": {"model_endpoint": "http://localhost:9999/v1/chat/completions"}, "openai": {}, "api": {"batch_concurrency": 2}}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """App branchée sur un faux transport LLM."""
+    state = {"active": 0, "peak": 0}
+
+    async def fake_call_model(prompt, config, user=None, timeout=None, mode="chill"):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return None if prompt == "down" else f"{mode}:{prompt}"
+
+    async def fake_stream_model(prompt, config, user=None, mode="chill"):
+        for token in ("Yo", " la", " team"):
+            yield token
+
+    monkeypatch.setattr(api_server, "call_model", fake_call_model)
+    monkeypatch.setattr(api_server, "stream_model", fake_stream_model)
+    monkeypatch.setattr(api_server, "log_response", lambda *args, **kwargs: None)
+    with TestClient(api_server.create_app(CONFIG)) as test_client:
+        test_client.state = state
+        yield test_client
+
+
+def test_chat_returns_response_and_timing_headers(client):
+    """/chat répond et expose les headers de timing."""
+    response = client.post("/chat", json={"prompt": "salut", "mode": "ask"})
+    assert response.status_code == 200
+    assert response.json()["response"] == "ask:salut"
+    assert response.json()["available"] is True
+    assert response.headers["X-Response-Time"].endswith("ms")
+    assert "app;dur=" in response.headers["Server-Timing"]
+    assert "llm;dur=" in response.headers["Server-Timing"]
+
+
+def test_chat_llm_unavailable(client):
+    """Aucun LLM → available=False, pas d'erreur HTTP."""
+    response = client.post("/chat", json={"prompt": "down"})
+    assert response.status_code == 200
+    assert response.json()["response"] is None
+    assert response.json()["available"] is False
+
+
+def test_chat_stream_sse(client):
+    """/chat/stream envoie les tokens en SSE puis [DONE]."""
+    with client.stream("POST", "/chat/stream", json={"prompt": "salut"}) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+    assert body.count("data: ") == 4
+    assert '"delta": " team"' in body
+    assert body.endswith("data: [DONE]\n\n")
+
+
+def test_chat_batch_bounded_concurrency(client):
+    """/chat/batch garde l'ordre et ne dépasse pas la concurrence configurée."""
+    prompts = [{"prompt": f"p{i}"} for i in range(6)]
+    response = client.post("/chat/batch", json={"prompts": prompts, "concurrency": 10})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["response"] for r in results] == [f"chill:p{i}" for i in range(6)]
+    assert client.state["peak"] <= 2
@@ -0,0 +1,179 @@
+"""Tests du miroir local des blocked_terms AutoMod (hors ligne)."""
+
+import asyncio
+import queue
+
+import httpx
+import pytest
+
+import src.utils.helix_client as helix_client
+from src.chat.worker_pool import ChatEvent, ProxyMessage, WorkerBot
+from src.utils.helix_client import HelixClient
+from src.utils.twitch_automod import BlockedTermsMirror, TwitchAutoMod
+
+
+class FakeAutoMod(TwitchAutoMod):
+    """API AutoMod simulée : liste paginée par 2, compteurs d'appels."""
+
+    def __init__(self, texts=()):
+        self.terms = [{"id": f"id-{text}", "text": text} for text in texts]
+        self.pages = 0
+        self.fail = False
+        self.page_delay = 0.0
+
+    async def fetch_blocked_terms(self):
+        if self.fail:
+            return None
+        terms = []
+        for start in range(0, len(self.terms), 2):
+            self.pages += 1
+            await asyncio.sleep(self.page_delay)
+            terms.extend(self.terms[start:start + 2])
+        return terms
+
+    async def add_blocked_term(self, text):
+        term = {"id": f"id-{text}", "text": text}
+        self.terms.append(term)
+        return term
+
+    async def remove_blocked_term(self, term_id):
+        self.terms = [term for term in self.terms if term["id"] != term_id]
+        return True
+
+
+@pytest.mark.asyncio
+async def test_sync_loads_every_page():
+    automod = FakeAutoMod(["spam", "scam", "arnaque", "Free Followers", "bit.ly"])
+    mirror = BlockedTermsMirror(automod)
+
+    assert await mirror.sync()
+
+    assert automod.pages == 3
+    assert len(mirror.texts()) == 5
+    assert mirror.find("free followers")["id"] == "id-Free Followers"
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_keeps_previous_copy():
+    automod = FakeAutoMod(["spam"])
+    mirror = BlockedTermsMirror(automod)
+    await mirror.sync()
+
+    automod.fail = True
+    assert not await mirror.sync()
+    assert mirror.find("spam") is not None
+
+
+@pytest.mark.asyncio
+async def test_add_and_remove_update_mirror_without_resync():
+    automod = FakeAutoMod(["spam"])
+    mirror = BlockedTermsMirror(automod)
+    await mirror.sync()
+    pages = automod.pages
+
+    await mirror.add("arnaque")
+    assert mirror.match("grosse ARNAQUE ici") == "ARNAQUE"
+    assert await mirror.remove("Spam") is True
+    assert await mirror.remove("inconnu") is None
+
+    assert mirror.match("du spam") is None
+    assert automod.pages == pages
+    assert [term["text"] for term in automod.terms] == ["arnaque"]
+
+
+@pytest.mark.asyncio
+async def test_add_during_sync_not_lost():
+    automod = FakeAutoMod(["a1", "a2", "a3", "a4"])
+    automod.page_delay = 0.02
+    mirror = BlockedTermsMirror(automod)
+
+    sync = asyncio.create_task(mirror.sync())
+    await asyncio.sleep(0.01)  # Première page en cours
+    automod.terms = automod.terms[:1]  # La synchro a déjà "vu" la liste complète
+    await mirror.add("nouveau")
+    await sync
+
+    assert mirror.find("nouveau") is not None
+
+
+@pytest.mark.asyncio
+async def test_remove_syncs_first_when_never_synced():
+    automod = FakeAutoMod(["spam"])
+    mirror = BlockedTermsMirror(automod)
+    assert await mirror.remove("spam") is True
+    assert automod.terms == []
+
+
+def test_prefilter_whole_words_and_wildcards():
+    mirror = BlockedTermsMirror(FakeAutoMod())
+    mirror.by_text = {text: {"id": text, "text": text} for text in ["spam", "free follow*", "*coin"]}
+
+    assert mirror.match("achetez du spam !") == "spam"
+    assert mirror.match("spammer") is None
+    assert mirror.match("FREE FOLLOWERS ici") == "FREE FOLLOWERS"
+    assert mirror.match("investis dans le shibacoin") == "shibacoin"
+    assert mirror.match("bonjour à tous") is None
+
+
+def test_prefilter_empty_mirror():
+    assert BlockedTermsMirror(FakeAutoMod()).match("spam") is None
+
+
+@pytest.mark.asyncio
+async def test_get_blocked_terms_follows_cursor(monkeypatch):
+    pages = {None: (["a", "b"], "c1"), "c1": (["c", "d"], "c2"), "c2": (["e"], None)}
+    seen = []
+
+    def handler(request):
+        cursor = request.url.params.get("after")
+        seen.append(cursor)
+        texts, next_cursor = pages[cursor]
+        pagination = {"cursor": next_cursor} if next_cursor else {}
+        return httpx.Response(200, json={"data": [{"id": t, "text": t} for t in texts], "pagination": pagination})
+
+    monkeypatch.setattr(helix_client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    automod = TwitchAutoMod(HelixClient("cid", "tok"), broadcaster_id="42", moderator_id="7")
+
+    terms = await automod.get_blocked_terms()
+
+    assert [term["text"] for term in terms] == ["a", "b", "c", "d", "e"]
+    assert seen == [None, "c1", "c2"]
+
+
+
+@pytest.fixture
+def offline_bot(sample_config, monkeypatch, tmp_path):
+    """Fabrique un bot sans IRC (worker) ; broadcaster_id absent → AutoMod sur le repli bot_id."""
+    monkeypatch.chdir(tmp_path)  # Fichiers data/ du Translator
+    monkeypatch.setenv("LLM_MODE", "disabled")
+    monkeypatch.setattr(
+        helix_client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, json={"data": []})))
+    )
+    outbox = queue.Queue()
+    return lambda: (WorkerBot(sample_config, outbox), outbox)  # Construit dans la boucle du test
+
+
+@pytest.mark.asyncio
+async def test_banword_commands_without_mirror_reply_disabled(offline_bot):
+    worker, outbox = offline_bot()
+    ctx = worker.get_context("test_channel")
+    assert ctx.automod_enabled and ctx.blocked_terms is None
+
+    for command in ("!banwords", "!addbanword spam", "!removebanword spam"):
+        await worker.event_message(ProxyMessage(ChatEvent("test_channel", "test_channel", command, True), outbox))
+
+    replies = [outbox.get_nowait()[2] for _ in range(outbox.qsize())]
+    assert len(replies) == 3 and all("désactivé" in reply for reply in replies)
+
+
+@pytest.mark.asyncio
+async def test_mirror_created_after_boot_is_started(offline_bot):
+    worker, _ = offline_bot()
+    ctx = worker.get_context("test_channel")
+    ctx.config["twitch"]["broadcaster_id"] = "42"  # Résolu plus tard
+
+    worker._init_automod(ctx, "42")
+
+    assert ctx.blocked_terms is not None and ctx.blocked_terms._task is not None
+    ctx.blocked_terms.stop()
+    ctx.moderation.stop()
@@ -0,0 +1,103 @@
+"""Tests du contexte par salon (multi-channel)."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.chat.channel_context import ChannelContext, channel_config, channel_names
+
+CONFIG = {
+    "bot": {
+        "channel": "Serda",
+        "cooldown": 60,
+        "enabled_commands": ["game", "ask", "chill"],
+        "channels": {
+            "partner": {"cooldown": 5, "enabled_commands": ["game"], "broadcaster_id": 42},
+            "#other": {},
+        },
+    },
+    "twitch": {"broadcaster_id": "1"},
+}
+
+
+class TestChannelConfig:
+    """Tests de la config effective par salon."""
+
+    def test_channel_names(self):
+        """Salon principal en premier, noms normalisés."""
+        assert channel_names(CONFIG) == ["serda", "partner", "other"]
+
+    def test_channel_names_list(self):
+        """bot.channels accepte aussi une simple liste."""
+        config = {"bot": {"channel": "serda", "channels": ["a", "serda"]}}
+        assert channel_names(config) == ["serda", "a"]
+
+    def test_overrides_applied(self):
+        """Les overrides remplacent la section bot pour ce salon seulement."""
+        partner = channel_config(CONFIG, "partner")
+        assert partner["bot"]["cooldown"] == 5
+        assert partner["bot"]["enabled_commands"] == ["game"]
+        assert partner["bot"]["channel"] == "partner"
+        assert partner["twitch"]["broadcaster_id"] == "42"
+        assert "channels" not in partner["bot"]
+        assert CONFIG["bot"]["cooldown"] == 60  # Config globale intacte
+
+    def test_broadcaster_id_not_inherited(self):
+        """Un salon partenaire n'hérite pas du broadcaster_id principal."""
+        assert "broadcaster_id" not in channel_config(CONFIG, "other")["twitch"]
+        assert channel_config(CONFIG, "serda")["twitch"]["broadcaster_id"] == "1"
+
+
+class TestChannelContext:
+    """Tests de l'isolation d'état entre salons."""
+
+    def test_cooldowns_isolated(self):
+        """Un cooldown sur un salon ne bloque pas l'autre."""
+        main = ChannelContext("serda", channel_config(CONFIG, "serda"))
+        partner = ChannelContext("partner", channel_config(CONFIG, "partner"))
+        main.mark_cooldown("alice")
+        now = datetime.now()
+        assert main.cooldown_remaining("alice", now) > 0
+        assert partner.cooldown_remaining("alice", now) == 0
+        assert main.cooldown_remaining("alice", now + timedelta(seconds=61)) == 0
+
+    def test_apply_config(self):
+        """Le hot reload met à jour les valeurs lues par message."""
+        ctx = ChannelContext("partner", channel_config(CONFIG, "partner"))
+        ctx.apply_config({"bot": {"cooldown": 1, "enabled_commands": ["ask"]}, "twitch": {}})
+        assert ctx.cooldown == 1
+        assert ctx.enabled == ["ask"]
+
+    @pytest.mark.asyncio
+    async def test_send_queue_keeps_order(self):
+        """Les messages d'un salon partent dans l'ordre d'arrivée."""
+        ctx = ChannelContext("serda", channel_config(CONFIG, "serda"))
+        sent = []
+
+        async def deliver(text):
+            await asyncio.sleep(0.01 if text == "a" else 0)
+            sent.append(text)
+
+        await asyncio.gather(*(ctx.send(text, deliver) for text in ("a", "b", "c")))
+        assert sent == ["a", "b", "c"]
+        await ctx.close()
+
+    @pytest.mark.asyncio
+    async def test_send_error_propagates(self):
+        """Une erreur d'envoi remonte à l'appelant sans tuer la file."""
+        ctx = ChannelContext("serda", channel_config(CONFIG, "serda"))
+
+        async def broken(text):
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            await ctx.send("x", broken)
+        sent = []
+
+        async def deliver(text):
+            sent.append(text)
+
+        await ctx.send("y", deliver)
+        assert sent == ["y"]
+        await ctx.close()
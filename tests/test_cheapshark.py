@@ -0,0 +1,103 @@
+"""Tests du service de prix CheapShark (hors ligne, httpx.MockTransport)."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.commands.api.cheapshark import PriceService
+
+STORES = [{"storeID": "1", "storeName": "Steam"}, {"storeID": "25", "storeName": "Epic Games Store"}]
+GAME_IDS = {"hades": "101", "celeste": "102", "hollow knight": "103"}
+
+
+def _deals(game_id):
+    return {
+        "info": {"title": {v: k.title() for k, v in GAME_IDS.items()}[game_id]},
+        "deals": [
+            {"storeID": "1", "dealID": f"steam-{game_id}", "price": "19.99", "retailPrice": "24.99"},
+            {"storeID": "25", "dealID": f"epic-{game_id}", "price": "14.99", "retailPrice": "24.99"},
+        ],
+    }
+
+
+@pytest.fixture
+def api():
+    calls = []
+
+    def handler(request):
+        params = dict(request.url.params)
+        calls.append((request.url.path.rsplit("/", 1)[-1], params))
+        if request.url.path.endswith("/stores"):
+            return httpx.Response(200, json=STORES)
+        if "title" in params:
+            game_id = GAME_IDS.get(params["title"].lower())
+            return httpx.Response(200, json=[{"gameID": game_id}] if game_id else [])
+        return httpx.Response(200, json={gid: _deals(gid) for gid in params["ids"].split(",")})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return PriceService(client=client, window=0.01), calls
+
+
+def _title_lookups(calls):
+    return [params["title"] for path, params in calls if "title" in params]
+
+
+def _id_batches(calls):
+    return [params["ids"] for path, params in calls if "ids" in params]
+
+
+@pytest.mark.asyncio
+async def test_cheapest_deal_with_real_store_name(api):
+    service, calls = api
+    price = await service.get_price("Hades")
+    assert price["store"] == "Epic Games Store"
+    assert price["price"] == "14.99€" and price["savings"] == "40%"
+    assert price["url"].endswith("dealID=epic-101")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_coalesced(api):
+    service, calls = api
+    results = await asyncio.gather(*(service.get_price(name) for name in ("Hades", "Celeste", "Hollow Knight", "Hades")))
+    assert [r["game_name"] for r in results] == ["Hades", "Celeste", "Hollow Knight", "Hades"]
+    assert len(_id_batches(calls)) == 1
+    assert sorted(_id_batches(calls)[0].split(",")) == ["101", "102", "103"]
+
+
+@pytest.mark.asyncio
+async def test_stores_and_prices_cached(api):
+    service, calls = api
+    await service.get_price("Hades")
+    assert service.has_fresh_price("hades")
+    requests = service.requests
+    await service.get_price("Hades")
+    assert service.requests == requests
+    assert sum(1 for path, _ in calls if path == "stores") == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_game(api):
+    service, _ = api
+    assert await service.get_price("Minecraft") is None
+    assert service.has_fresh_price("minecraft")  # Absence aussi mémorisée
+
+
+@pytest.mark.asyncio
+async def test_popular_games_refreshed(api):
+    service, calls = api
+    for name in ("Hades", "Hades", "Celeste"):
+        await service.get_price(name)
+    service._prices.clear()
+    service.refresh_top_n = 1
+    assert await service.refresh_popular() == 1
+    assert _id_batches(calls)[-1] == "101"
+    assert service.has_fresh_price("hades") and not service.has_fresh_price("celeste")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_title_lookups_coalesced(api):
+    service, calls = api
+    ids = await asyncio.gather(*(service.game_id(name) for name in ("Hades", "hades ", "HADES", "Celeste")))
+    assert ids == ["101", "101", "101", "102"]
+    assert sorted(_title_lookups(calls)) == ["Celeste", "Hades"]
@@ -0,0 +1,86 @@
+"""Tests du ConfigService (snapshot immuable + hot reload)."""
+
+import asyncio
+import os
+
+import pytest
+
+from config.config import ConfigService, freeze, thaw
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("bot:\n  channel: serda\n  enabled_commands: [game, ask]\n", encoding="utf-8")
+    return path
+
+
+def _rewrite(path, content):
+    """Réécrit le fichier avec un mtime garanti différent."""
+    path.write_text(content, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+class TestFreeze:
+    """Tests de freeze/thaw."""
+
+    def test_freeze_is_deep_and_immutable(self):
+        frozen = freeze({"bot": {"cmds": ["a", "b"]}})
+        assert frozen["bot"]["cmds"] == ("a", "b")
+        with pytest.raises(TypeError):
+            frozen["bot"]["x"] = 1  # type: ignore[index]
+
+    def test_thaw_roundtrip(self):
+        data = {"bot": {"cmds": ["a"], "n": 1}}
+        assert thaw(freeze(data)) == data
+
+
+class TestConfigService:
+    """Tests du service de config."""
+
+    def test_parsed_once(self, config_file):
+        """Le snapshot est parsé une fois et partagé."""
+        service = ConfigService(str(config_file))
+        assert service.snapshot is service.snapshot
+        assert service.snapshot["bot"]["enabled_commands"] == ("game", "ask")
+
+    def test_reload_notifies_subscribers(self, config_file):
+        """Un changement remplace le snapshot et notifie (nouveau, ancien)."""
+        service = ConfigService(str(config_file))
+        old = service.snapshot
+        events = []
+        service.subscribe(lambda new, previous: events.append((new, previous)))
+
+        _rewrite(config_file, "bot:\n  channel: serda\n  enabled_commands: [game]\n")
+        assert service.reload() is True
+        assert events == [(service.snapshot, old)]
+        assert service.snapshot["bot"]["enabled_commands"] == ("game",)
+        assert old["bot"]["enabled_commands"] == ("game", "ask")  # Ancien snapshot intact
+
+    def test_unchanged_content_is_not_a_reload(self, config_file):
+        service = ConfigService(str(config_file))
+        service.snapshot
+        assert service.reload() is False
+
+    def test_invalid_yaml_keeps_previous_snapshot(self, config_file):
+        """Une faute de frappe ne casse pas la config active."""
+        service = ConfigService(str(config_file))
+        old = service.snapshot
+        _rewrite(config_file, "bot: [unclosed\n")
+        assert service.reload() is False
+        assert service.snapshot is old
+
+    @pytest.mark.asyncio
+    async def test_watch_detects_mtime_change(self, config_file):
+        """Le polling mtime applique la nouvelle config."""
+        service = ConfigService(str(config_file))
+        changed = asyncio.Event()
+        service.subscribe(lambda new, old: changed.set())
+        service.watch(interval=0.01)
+        try:
+            _rewrite(config_file, "bot:\n  channel: other\n")
+            await asyncio.wait_for(changed.wait(), timeout=2)
+            assert service.snapshot["bot"]["channel"] == "other"
+        finally:
+            await service.stop()
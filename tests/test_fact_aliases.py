@@ -0,0 +1,123 @@
+"""Tests de l'index d'alias du cache de faits."""
+
+import pytest
+
+import src.utils.cache_manager as cache_manager
+from src.utils.fact_aliases import FactAliasIndex, token_set_similarity, tokenize
+
+GPU_FACT = "La GeForce 40 est une série de processeurs graphiques développée par Nvidia."
+
+
+class TestTokenSetSimilarity:
+    def test_word_order_and_plural(self):
+        assert token_set_similarity(tokenize("roux panda"), tokenize("panda roux")) == 1.0
+        assert token_set_similarity(tokenize("pandas roux"), tokenize("panda roux")) == 1.0
+
+    def test_numbers_must_match_exactly(self):
+        assert token_set_similarity(tokenize("rtx 4080"), tokenize("rtx 4090")) == 0.0
+        assert token_set_similarity(tokenize("python 3"), tokenize("python")) == 0.0
+
+    def test_short_words_differing_by_one_letter_do_not_match(self):
+        assert token_set_similarity(tokenize("linus"), tokenize("linux")) == 0.0
+        assert token_set_similarity(tokenize("mario"), tokenize("maria")) == 0.0
+        assert token_set_similarity(tokenize("francs"), tokenize("france")) == 0.0
+
+    def test_typo_in_long_word_matches(self):
+        assert token_set_similarity(tokenize("geforse"), tokenize("geforce")) == 1.0
+
+    def test_extra_word_scores_lower(self):
+        assert token_set_similarity(tokenize("geforce rtx 4090"), tokenize("rtx 4090")) == pytest.approx(0.8)
+        assert token_set_similarity(tokenize("panda"), tokenize("panda roux")) < 0.8
+
+
+def test_index_fuzzy_match_and_persistence(tmp_path):
+    index = FactAliasIndex(str(tmp_path / "aliases.json"))
+    index.load(["panda roux", "rtx 4090"])
+    assert index.fuzzy_match("pandas roux") == "panda roux"
+    assert index.fuzzy_match("rtx 4080") is None
+    index.load(["linux", "mario kart", "france"])
+    assert index.fuzzy_match("linus") is None
+    assert index.fuzzy_match("maria kart") is None
+    assert index.fuzzy_match("francs") is None
+    index.load(["panda roux", "rtx 4090"])
+
+    index.add_alias("la 4090", "rtx 4090")
+    index.record_title("fr", "GeForce 40", "rtx 4090")
+    index.save()
+
+    other = FactAliasIndex(str(tmp_path / "aliases.json"))
+    other.load([])
+    assert other.resolve("la 4090") == "rtx 4090"
+    assert other.for_title("fr", "GeForce_40") == "rtx 4090"
+
+
+def test_workers_saving_keep_each_other_aliases(tmp_path):
+    """Deux workers sur le même fichier : aucun n'efface les ajouts de l'autre."""
+    first = FactAliasIndex(str(tmp_path / "aliases.json"))
+    second = FactAliasIndex(str(tmp_path / "aliases.json"))
+    first.load(["rtx 4090"])
+    second.load(["panda roux"])
+
+    first.add_alias("la 4090", "rtx 4090")
+    first.record_title("fr", "GeForce 40", "rtx 4090")
+    first.save()
+    second.add_alias("panda rouge", "panda roux")
+    second.save()
+
+    reloaded = FactAliasIndex(str(tmp_path / "aliases.json"))
+    reloaded.load([])
+    assert reloaded.resolve("la 4090") == "rtx 4090"
+    assert reloaded.resolve("panda rouge") == "panda roux"
+    assert reloaded.for_title("fr", "GeForce_40") == "rtx 4090"
+    assert second.resolve("la 4090") == "rtx 4090"  # Ajout de l'autre worker servi après save
+    assert list(tmp_path.iterdir()) == [tmp_path / "aliases.json"]
+
+    first.clear()
+    second.save()  # Rien de nouveau : ne ressuscite pas les alias vidés
+    reloaded.load([])
+    assert reloaded.aliases == {} and second.aliases == {}
+
+
+@pytest.fixture
+def facts(tmp_path, monkeypatch):
+    """Cache de faits isolé + Wikipedia simulé (compte les appels)."""
+    calls = []
+
+    async def fake_fetch(topic):
+        calls.append(topic)
+        return GPU_FACT, "fr", "GeForce_40"
+
+    monkeypatch.setattr(cache_manager, "CACHE_FILE", tmp_path / "facts.json")
+    monkeypatch.setattr(cache_manager, "_fact_cache", {})
+    monkeypatch.setattr(cache_manager, "_cache_loaded", True)
+    monkeypatch.setattr(cache_manager, "_aliases", FactAliasIndex(str(tmp_path / "aliases.json")))
+    monkeypatch.setattr(cache_manager, "fetch_wiki_summary_fr_en", fake_fetch)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_same_article_shares_canonical_entry(facts):
+    assert await cache_manager.get_cached_or_fetch("rtx 4090") == GPU_FACT
+    assert await cache_manager.get_cached_or_fetch("nvidia 4090") == GPU_FACT
+
+    assert list(cache_manager._fact_cache) == ["rtx 4090"]
+    assert cache_manager._aliases.resolve("nvidia 4090") == "rtx 4090"
+
+    # Alias connu : plus aucun appel réseau
+    assert await cache_manager.get_cached_or_fetch("C'est quoi la nvidia 4090 ?") == GPU_FACT
+    assert facts == ["rtx 4090", "nvidia 4090"]
+
+
+@pytest.mark.asyncio
+async def test_near_miss_served_without_network(facts):
+    await cache_manager.get_cached_or_fetch("geforce rtx 4090")
+    assert await cache_manager.get_cached_or_fetch("rtx 4090 geforce") == GPU_FACT
+    assert await cache_manager.get_cached_or_fetch("geforse rtx 4090") == GPU_FACT
+    assert facts == ["geforce rtx 4090"]
+
+
+@pytest.mark.asyncio
+async def test_near_miss_not_saved_as_alias(facts):
+    await cache_manager.get_cached_or_fetch("geforce rtx 4090")
+    assert await cache_manager.get_cached_or_fetch("geforse rtx 4090") == GPU_FACT
+    assert cache_manager._aliases.resolve("geforse rtx 4090") == "geforse rtx 4090"
@@ -0,0 +1,207 @@
+"""Tests du format unique GameRecord dans GAME_CACHE."""
+
+import pytest
+
+import core.commands.game_command as game_command
+from core.cache import GlobalGameCache, SqliteGameCache
+from core.game_record import FIELDS, SUMMARY_MAX_CHARS, GameRecord
+
+RAW = {
+    "name": "Hades",
+    "slug": "hades",
+    "summary": "Roguelike dans les Enfers.",
+    "release_year": "2020",
+    "platforms": ["PC", "Nintendo Switch"],
+    "developers": ["Supergiant Games"],
+    "metacritic": 93,
+    "tags": ["roguelike"] * 20,
+    "stores": [{"store": {"name": "Steam"}}],
+    "background_image": "https://example.com/hades.jpg",
+}
+
+
+class TestGameRecord:
+    """Tests du record typé."""
+
+    def test_projection_drops_unused_fields(self):
+        record = GameRecord.from_dict(RAW)
+        assert not hasattr(record, "__dict__")
+        assert "tags" not in record and record.get("tags") is None
+        assert record["platforms"] == ("PC", "Nintendo Switch")
+        assert record.get("publishers", []) == ()
+        assert set(record.to_dict()) == set(FIELDS)
+
+    def test_coerce_legacy_formats(self):
+        from_fetcher = GameRecord.coerce(RAW)
+        from_command = GameRecord.coerce({"data": RAW, "hit_count": 7})
+        assert from_fetcher.name == from_command.name == "Hades"
+        assert from_fetcher.hit_count == 0
+        assert from_command.hit_count == 7
+        assert GameRecord.coerce(None) is None
+        assert GameRecord.coerce(from_command) is from_command
+
+    def test_hit_count_outside_payload(self):
+        record = GameRecord.from_dict(RAW)
+        assert record.record_hit() == 1
+        assert "hit_count" not in record.to_dict()
+        assert record.to_state()["hit_count"] == 1
+
+
+class TestCacheRoundTrip:
+    """GameRecord survit aux persistances du cache."""
+
+    def test_json_file(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+        cache = GlobalGameCache(cache_file=path)
+        record = GameRecord.from_dict(RAW, hit_count=3)
+        cache.set("gamedata:hades", record)
+        assert GlobalGameCache(cache_file=path).get("gamedata:hades") == record
+
+    def test_snapshot_entries(self):
+        cache = GlobalGameCache()
+        cache.set("gamedata:hades", GameRecord.from_dict(RAW))
+        other = GlobalGameCache()
+        assert other.import_entries(cache.export_entries()) == 1
+        assert isinstance(other.get("gamedata:hades"), GameRecord)
+
+    def test_sqlite(self, tmp_path):
+        cache = SqliteGameCache(str(tmp_path / "cache.sqlite3"))
+        record = GameRecord.from_dict(RAW, hit_count=2)
+        cache.set("gamedata:hades", record)
+        assert cache.get("gamedata:hades") == record
+
+
+class _Channel:
+    name = "serda"
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content):
+        self.sent.append(content)
+
+
+class _Author:
+    name = "viewer"
+
+
+class _Message:
+    def __init__(self):
+        self.author = _Author()
+        self.channel = _Channel()
+
+
+@pytest.mark.asyncio
+async def test_gameinfo_reads_entry_cached_by_fetcher(monkeypatch, sample_config):
+    """Régression : une entrée au format fetch_game_data ne fait plus planter !gameinfo."""
+    cache = GlobalGameCache()
+    cache.set("gamedata:hades", dict(RAW))  # Ancien format brut (warmup)
+    monkeypatch.setattr(game_command, "GAME_CACHE", cache)
+    monkeypatch.setattr(game_command, "_detect_english", lambda text: False)
+
+    message = _Message()
+    await game_command.handle_game_command(message, sample_config, "Hades", None)
+
+    assert message.channel.sent and "Hades" in message.channel.sent[0]
+    stored = cache.get("gamedata:hades")
+    assert isinstance(stored, GameRecord) and stored.hit_count == 1
+
+
+class TestCompactProjection:
+    """Projection compacte : summary tronqué, strings internées, zlib à froid."""
+
+    def test_summary_truncated_at_cache_time(self):
+        long_raw = dict(RAW, summary="Une phrase assez longue pour le test. " * 200)
+        record = GameRecord.from_dict(long_raw)
+        assert len(record.summary) <= SUMMARY_MAX_CHARS
+        assert record.summary.endswith(".")
+
+    def test_repeated_names_interned(self):
+        first = GameRecord.from_dict(dict(RAW, platforms=["".join(["P", "C"])]))
+        second = GameRecord.from_dict(dict(RAW, platforms=["".join(["P", "C"])]))
+        assert first.platforms[0] is second.platforms[0]
+
+    def test_compact_and_thaw(self):
+        record = GameRecord.from_dict(dict(RAW, summary="Roguelike dans les Enfers. " * 12))
+        summary = record.summary
+        assert record.compact() and record.is_compact
+        assert record.summary == summary
+        assert record.to_state() == GameRecord.from_dict(dict(RAW, summary=summary)).to_state()
+        record.record_hit()
+        assert not record.is_compact
+
+    def test_cache_compacts_only_cold_entries(self):
+        cache = GlobalGameCache()
+        cold = GameRecord.from_dict(dict(RAW, summary="Ancien jeu. " * 30))
+        hot = GameRecord.from_dict(dict(RAW, summary="Jeu du moment. " * 30))
+        cache.set("gamedata:cold", cold)
+        cache.set("gamedata:hot", hot)
+        cache._cache["gamedata:cold"]["timestamp"] -= 3600
+        assert cache.compact_cold(1800) == 1
+        assert cold.is_compact and not hot.is_compact
+
+
+@pytest.mark.asyncio
+async def test_summary_translated_once(monkeypatch, sample_config):
+    calls = []
+
+    class FakeTranslator:
+        def translate(self, text, source, target):
+            calls.append(text)
+            return "Un roguelike dans les Enfers."
+
+    cache = GlobalGameCache()
+    cache.set("gamedata:hades", GameRecord.from_dict(dict(RAW, summary="A rogue-like dungeon crawler where you play as the son of Hades.")))
+    monkeypatch.setattr(game_command, "GAME_CACHE", cache)
+    monkeypatch.setattr(game_command, "Translator", FakeTranslator)
+
+    for _ in range(2):
+        message = _Message()
+        await game_command.handle_game_command(message, sample_config, "Hades", None)
+        assert message.channel.sent[-1] == "📝 Un roguelike dans les Enfers."
+
+    assert len(calls) == 1
+    assert cache.get("gamedata:hades").summary_lang == "fr"
+
+
+@pytest.mark.asyncio
+async def test_gameinfo_lines_rendered_once(monkeypatch, sample_config):
+    """Cache hit : seuls @user et le suffixe sont refaits, pas le rendu."""
+    renders = []
+    render = game_command._render_game_lines
+
+    def counting_render(data, debug):
+        renders.append(data["name"])
+        return render(data, debug)
+
+    cache = GlobalGameCache()
+    cache.set("gamedata:hades", GameRecord.from_dict(dict(RAW, summary_lang="fr")))
+    monkeypatch.setattr(game_command, "GAME_CACHE", cache)
+    monkeypatch.setattr(game_command, "_render_game_lines", counting_render)
+
+    sent = []
+    for user in ("alice", "bob"):
+        message = _Message()
+        message.author.name = user
+        await game_command.handle_game_command(message, sample_config, "Hades", None)
+        sent.append(message.channel.sent[0])
+
+    assert renders == ["Hades"]
+    assert sent[0].startswith("@alice 🎮 Hades (2020)") and sent[0].endswith(f"({sample_config['bot']['cooldown']}s)")
+    assert sent[1].startswith("@bob 🎮 Hades (2020)") and "2× demandé" in sent[1]
+
+    monkeypatch.setattr(game_command, "FORMAT_VERSION", game_command.FORMAT_VERSION + 1)
+    await game_command.handle_game_command(_Message(), sample_config, "Hades", None)
+    assert renders == ["Hades", "Hades"]
+
+
+def test_rendered_lines_invalidated_and_persisted(tmp_path):
+    record = GameRecord.from_dict(RAW)
+    record.set_rendered("fr", 1, ("🎮 Hades (2020)", "📝 Roguelike."))
+    path = str(tmp_path / "cache.json")
+    GlobalGameCache(cache_file=path).set("gamedata:hades", record)
+    assert GlobalGameCache(cache_file=path).get("gamedata:hades").rendered("fr", 1) == ("🎮 Hades (2020)", "📝 Roguelike.")
+    assert record.rendered("en", 1) is None
+
+    record.summary = "Nouveau résumé."
+    assert record.rendered("fr", 1) is None
@@ -0,0 +1,189 @@
+"""Tests du client Helix partagé (hors ligne, httpx.MockTransport)."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import src.utils.helix_client as helix_client
+from src.utils.helix_client import HelixClient, bot_helix, get_helix_client, moderator_helix
+from src.utils.twitch_api_sender import TwitchAPISender
+from src.utils.twitch_automod import TwitchAutoMod
+
+
+@pytest.fixture
+def helix(monkeypatch):
+    """Transport Helix simulé : ``routes`` = liste de réponses servies dans l'ordre."""
+    requests = []
+    routes = []
+    sleeps = []
+
+    def handler(request):
+        requests.append(request)
+        response = routes.pop(0) if routes else httpx.Response(200, json={"data": []})
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(helix_client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(helix_client, "_clients", {})
+    monkeypatch.setattr(helix_client.asyncio, "sleep", fake_sleep)
+    return requests, routes, sleeps
+
+
+def test_one_client_per_token():
+    twitch = {"client_id": "cid", "token": "oauth:irc", "bot_user_token": "bot", "client_secret": "s"}
+    assert moderator_helix(twitch) is get_helix_client("cid", "irc")
+    assert moderator_helix(twitch).token == "irc"
+    assert bot_helix(twitch) is not moderator_helix(twitch)
+    assert bot_helix(twitch).client_secret == "s"
+    assert bot_helix({"client_id": "cid"}) is None
+
+
+@pytest.mark.asyncio
+async def test_shared_http_client_and_budget_headers(helix):
+    requests, routes, _ = helix
+    routes.append(httpx.Response(200, json={"data": []}, headers={"Ratelimit-Remaining": "799", "Ratelimit-Reset": "1700000000"}))
+    client = HelixClient("cid", "oauth:tok")
+    shared = helix_client._http
+
+    response = await client.request("GET", "/users", params={"login": "serda"})
+    await client.request("GET", "/users", params={"login": "elserda"})
+
+    assert response.status_code == 200
+    assert helix_client._http is shared
+    assert requests[0].headers["Authorization"] == "Bearer tok"
+    assert requests[0].headers["Client-Id"] == "cid"
+    assert str(requests[0].url) == "https://api.twitch.tv/helix/users?login=serda"
+    assert client.reset_at == 1700000000
+
+
+@pytest.mark.asyncio
+async def test_waits_for_reset_when_budget_exhausted(helix):
+    _, _, sleeps = helix
+    client = HelixClient("cid", "tok")
+    client.remaining, client.reset_at = 0, time.time() + 2
+
+    await client.request("GET", "/channels")
+
+    assert len(sleeps) == 1 and 1.5 < sleeps[0] <= 2 + helix_client.RESET_JITTER
+    assert client.stats["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_429_waits_for_reset_then_retries(helix):
+    requests, routes, sleeps = helix
+    reset = str(int(time.time()) + 3)
+    routes.append(httpx.Response(429, headers={"Ratelimit-Remaining": "0", "Ratelimit-Reset": reset}))
+
+    response = await HelixClient("cid", "tok").request("GET", "/channels")
+
+    assert response.status_code == 200
+    assert len(requests) == 2
+    assert len(sleeps) == 1 and sleeps[0] > 1
+
+
+@pytest.mark.asyncio
+async def test_server_errors_retried_with_jitter_then_given_up(helix):
+    requests, routes, sleeps = helix
+    routes.extend([httpx.Response(503), httpx.ConnectError("reset"), httpx.Response(502), httpx.Response(500)])
+
+    response = await HelixClient("cid", "tok").request("GET", "/users")
+
+    assert response.status_code == 500
+    assert len(requests) == helix_client.MAX_RETRIES + 1
+    assert all(0 <= delay <= helix_client.BACKOFF_BASE * 2 ** i for i, delay in enumerate(sleeps))
+
+
+@pytest.mark.asyncio
+async def test_post_not_replayed_after_read_timeout_or_5xx(helix):
+    requests, routes, _ = helix
+    client = HelixClient("cid", "tok")
+
+    routes.append(httpx.ReadTimeout("slow"))
+    assert await client.request("POST", "/chat/messages", json={"message": "hi"}) is None
+    routes.append(httpx.Response(503))
+    assert (await client.request("POST", "/chat/messages", json={"message": "hi"})).status_code == 503
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_post_retried_when_not_sent_or_opted_in(helix):
+    requests, routes, _ = helix
+    client = HelixClient("cid", "tok")
+
+    routes.append(httpx.ConnectError("refused"))
+    assert (await client.request("POST", "/chat/messages", json={})).status_code == 200
+    routes.append(httpx.Response(503))
+    assert (await client.request("POST", "/moderation/bans", json={}, retry=True)).status_code == 200
+    assert len(requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_network_failure_returns_none(helix):
+    _, routes, _ = helix
+    routes.extend([httpx.ConnectError("down")] * (helix_client.MAX_RETRIES + 1))
+    assert await HelixClient("cid", "tok").request("GET", "/users") is None
+
+
+@pytest.mark.asyncio
+async def test_401_refreshes_token_once_for_concurrent_requests(helix):
+    requests, routes, _ = helix
+    refreshes = []
+
+    def handler(request):
+        if request.url.host == "id.twitch.tv":
+            refreshes.append(dict(httpx.QueryParams(request.content.decode())))
+            return httpx.Response(200, json={"access_token": "new", "refresh_token": "r2"})
+        requests.append(request)
+        if request.headers["Authorization"] == "Bearer old":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"data": []})
+
+    helix_client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = HelixClient("cid", "old", refresh_token="r1", client_secret="secret")
+
+    responses = await asyncio.gather(*(client.request("GET", "/users") for _ in range(3)))
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert len(refreshes) == 1
+    assert refreshes[0]["grant_type"] == "refresh_token" and refreshes[0]["refresh_token"] == "r1"
+    assert (client.token, client.refresh_token) == ("new", "r2")
+
+
+@pytest.mark.asyncio
+async def test_401_without_refresh_token_is_returned(helix):
+    _, routes, _ = helix
+    routes.append(httpx.Response(401))
+    response = await HelixClient("cid", "tok").request("GET", "/users")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_api_sender_goes_through_helix(helix):
+    requests, routes, _ = helix
+    routes.append(httpx.Response(200, json={"data": [{"is_sent": True}]}))
+    routes.append(httpx.Response(200, json={"data": [{"is_sent": False, "drop_reason": {"code": "msg_duplicate"}}]}))
+    sender = TwitchAPISender(HelixClient("cid", "tok"), broadcaster_id="42", sender_id="7")
+
+    assert await sender.send_message("salut") is True
+    assert await sender.send_message("salut") is False
+    assert requests[0].url.path == "/helix/chat/messages"
+
+
+@pytest.mark.asyncio
+async def test_automod_sends_ids_as_query_params(helix):
+    requests, routes, _ = helix
+    routes.append(httpx.Response(200, json={"data": [{"id": "t1", "text": "spam"}]}))
+    automod = TwitchAutoMod(HelixClient("cid", "tok"), broadcaster_id="42", moderator_id="7")
+
+    term = await automod.add_blocked_term("spam")
+
+    assert term["id"] == "t1"
+    assert requests[0].url.params["broadcaster_id"] == "42"
+    assert requests[0].url.params["moderator_id"] == "7"
+    assert requests[0].content == b'{"text":"spam"}'
@@ -0,0 +1,130 @@
+"""Tests du cache de durées HowLongToBeat."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+import core.commands.api.hltb as hltb
+from core.commands.api.hltb import PlaytimeService
+from core.game_record import GameRecord
+
+
+class FakeEntry:
+    game_name = "Hades"
+    main_story = 22.4
+    main_extra = 45.0
+    completionist = 95.2
+    all_styles = 40.0
+
+
+class FakeHLTB:
+    def __init__(self):
+        self.searches = []
+
+    async def async_search(self, name):
+        self.searches.append(name)
+        await asyncio.sleep(0.01)
+        return [FakeEntry()] if "hades" in name.lower() else []
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    async def fake_fetch(game_name, config, cache_only=False):
+        if "hades" in game_name.lower():
+            return GameRecord.from_dict({"name": "Hades", "slug": "hades"})
+        return None
+
+    monkeypatch.setattr(hltb, "fetch_game_data", fake_fetch)
+    svc = PlaytimeService(cache_file=str(tmp_path / "hltb.json"))
+    svc._hltb = FakeHLTB()
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_canonical_key_shared_and_coalesced(service, sample_config):
+    results = await asyncio.gather(
+        service.get("hades", sample_config), service.get("HADES ", sample_config), service.get("Hades", sample_config)
+    )
+    assert all(r["main_story"] == "22h" for r in results)
+    assert service._hltb.searches == ["Hades"]
+    assert service.lookup_cached("hades")["data"]["completionist"] == "95h"
+
+
+@pytest.mark.asyncio
+async def test_cache_persisted_across_instances(service, sample_config):
+    await service.get("Hades", sample_config)
+    other = PlaytimeService(cache_file=service.cache_file)
+    other._hltb = FakeHLTB()
+    result = await other.get("hades", sample_config)
+    assert result["game_name"] == "Hades"
+    assert other._hltb.searches == []
+
+
+@pytest.mark.asyncio
+async def test_not_found_cached_short(service, sample_config):
+    assert await service.get("Jeu inconnu", sample_config) is None
+    assert await service.get("jeu inconnu", sample_config) is None
+    assert service.searches == 1
+    entry = service._load()["jeu inconnu"]
+    entry["timestamp"] -= hltb.NOT_FOUND_TTL + 1
+    assert service.lookup_cached("jeu inconnu") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_saves_keep_every_entry(service, tmp_path):
+    await asyncio.gather(*(service._search(f"hades {i}", f"Hades {i}") for i in range(8)))
+
+    other = PlaytimeService(cache_file=service.cache_file)
+    assert len(other._load()) == 8
+    assert [path.name for path in tmp_path.iterdir()] == ["hltb.json"]  # Aucun .tmp orphelin
+
+
+def test_older_snapshot_does_not_overwrite_newer(service):
+    service._load()["a"] = {"data": None, "timestamp": time.time()}
+    old = service._snapshot()
+    service._load()["b"] = {"data": None, "timestamp": time.time()}
+    service._write(*service._snapshot())
+    service._write(*old)
+
+    assert set(PlaytimeService(cache_file=service.cache_file)._load()) == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_query_aliases_persisted(service, sample_config, monkeypatch):
+    """Requête déjà résolue : ni fetch_game_data ni HLTB après redémarrage."""
+    await service.get("HADES 1", sample_config)  # Résolue vers la clé « hades »
+
+    async def no_fetch(game_name, config, cache_only=False):
+        raise AssertionError("fetch_game_data ne doit pas être appelé")
+
+    monkeypatch.setattr(hltb, "fetch_game_data", no_fetch)
+    other = PlaytimeService(cache_file=service.cache_file)
+    other._hltb = FakeHLTB()
+    assert (await other.get("hades 1", sample_config))["game_name"] == "Hades"
+    assert other._hltb.searches == []
+
+
+def test_expired_entries_purged_and_cache_capped(service, monkeypatch):
+    monkeypatch.setattr(hltb, "MAX_ENTRIES", 10)
+    now = time.time()
+    entries = service._load()
+    entries["old"] = {"data": {"game_name": "Old"}, "timestamp": now - hltb.PLAYTIME_TTL - 1}
+    entries["missing"] = {"data": None, "timestamp": now - hltb.NOT_FOUND_TTL - 1}
+    for i in range(12):
+        entries[f"game {i}"] = {"data": {"game_name": f"Game {i}"}, "timestamp": now - 100 + i}
+    service._aliases.update({"old game": "old", "game 11!": "game 11"})
+
+    service._write(*service._snapshot())
+
+    with open(service.cache_file, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert set(saved["entries"]) == {f"game {i}" for i in range(3, 12)}  # 90 % des plus récentes
+    assert saved["aliases"] == {"game 11!": "game 11"}
+
+
+def test_legacy_file_format_loaded(tmp_path):
+    path = tmp_path / "hltb.json"
+    path.write_text(json.dumps({"hades": {"data": {"game_name": "Hades"}, "timestamp": time.time()}}), encoding="utf-8")
+    assert PlaytimeService(cache_file=str(path))._cached("hades")["data"]["game_name"] == "Hades"
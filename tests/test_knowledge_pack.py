@@ -0,0 +1,186 @@
+"""Tests du pack de connaissances mmap (jeux + faits)."""
+
+import importlib.util
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+import src.utils.cache_manager as cache_manager
+from core.commands.api import game_data_fetcher
+from src.core.commands import ask_command  # Lecture des faits par !ask
+from src.core.commands.cache_commands import handle_cacheclear_command
+from core.game_record import GameRecord
+from core.knowledge_pack import KIND_JSON, KIND_TEXT, KnowledgePack, write_pack
+
+HADES = GameRecord.from_dict({"name": "Hades", "slug": "hades", "release_year": "2020", "summary": "Rogue-like.", "summary_lang": "fr"})
+FACT = "Le panda roux est un petit mammifère arboricole d'Asie."
+
+
+def _entries(fact=FACT):
+    return {
+        "gamedata:hades": (KIND_JSON, json.dumps(HADES.to_state()).encode()),
+        "fact:panda roux": (KIND_TEXT, fact.encode()),
+        "alias:pandas roux": (KIND_TEXT, b"panda roux"),
+        "fact:élan": (KIND_TEXT, "Grand cervidé des forêts boréales.".encode()),
+    }
+
+
+@pytest.fixture
+def pack(tmp_path):
+    path = str(tmp_path / "knowledge.pack")
+    write_pack(path, _entries())
+    pack = KnowledgePack(path)
+    assert pack.open()
+    yield pack
+    pack.close()
+
+
+def test_lookup_sorted_index(pack):
+    assert pack.count == 4
+    assert list(pack.keys()) == sorted(pack.keys(), key=lambda k: k.encode())
+    assert pack.get("fact:élan").startswith("Grand cervidé")
+    assert pack.get("fact:absent") is None
+    assert pack.game("gamedata:hades") == HADES
+
+
+def test_fact_follows_alias(pack):
+    assert pack.fact("pandas roux") == FACT
+    assert pack.fact("panda") is None
+
+
+def test_missing_pack(tmp_path):
+    pack = KnowledgePack(str(tmp_path / "absent.pack"))
+    assert not pack.open()
+    assert pack.get("fact:panda roux") is None
+
+
+def test_atomic_swap_remapped(pack):
+    write_pack(pack.path, _entries(fact="Nouveau texte sur le panda roux."))
+    assert pack.fact("panda roux") == FACT  # Ancien mapping encore valide
+    pack._checked_at = 0.0  # Forcer la vérification périodique
+    assert pack.fact("panda roux") == "Nouveau texte sur le panda roux."
+
+
+@pytest.mark.asyncio
+async def test_game_served_from_pack(pack, monkeypatch, sample_config):
+    monkeypatch.setattr(game_data_fetcher, "knowledge_pack", pack)
+    monkeypatch.setattr(game_data_fetcher.GAME_CACHE, "get", lambda key: None)
+    monkeypatch.setattr(game_data_fetcher.GAME_CACHE, "set", lambda *args, **kwargs: None)
+    record = await game_data_fetcher.fetch_game_data("Hades", sample_config, cache_only=True)
+    assert record is not None and record.summary_lang == "fr"
+
+
+@pytest.mark.asyncio
+async def test_facts_served_without_parsing_json(pack, tmp_path, monkeypatch):
+    facts_file = tmp_path / "facts.json"
+    facts_file.write_text("{pas du json", encoding="utf-8")  # Ne doit pas être lu
+    monkeypatch.setattr(cache_manager, "knowledge_pack", pack)
+    monkeypatch.setattr(cache_manager, "CACHE_FILE", facts_file)
+    monkeypatch.setattr(cache_manager, "_cache_loaded", False)
+    monkeypatch.setattr(cache_manager, "_use_pack", True)
+    monkeypatch.setattr(cache_manager, "_fact_cache", {})
+
+    cache_manager.load_cache()
+    assert await cache_manager.get_cached_or_fetch("C'est quoi le panda roux ?") == FACT
+    assert cache_manager._cache_loaded is False
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content):
+        self.sent.append(content)
+
+
+class FakeAuthor:
+    name = "admin"
+
+
+class FakeMessage:
+    author = FakeAuthor()
+
+    def __init__(self):
+        self.channel = FakeChannel()
+
+
+@pytest.mark.asyncio
+async def test_cacheclear_stops_serving_pack_facts_until_rebuild(pack, tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_manager, "knowledge_pack", pack)
+    monkeypatch.setattr(cache_manager, "CACHE_FILE", tmp_path / "facts.json")
+    monkeypatch.setattr(cache_manager, "PACK_CLEARED_FILE", tmp_path / "knowledge_pack.cleared")
+    monkeypatch.setattr(cache_manager, "_aliases", cache_manager.FactAliasIndex(str(tmp_path / "aliases.json")))
+    monkeypatch.setattr(cache_manager, "_cache_loaded", False)
+    monkeypatch.setattr(cache_manager, "_use_pack", True)
+    monkeypatch.setattr(cache_manager, "_pack_cleared_build", None)
+    monkeypatch.setattr(cache_manager, "_fact_cache", {})
+    monkeypatch.setattr(cache_manager, "is_factual_question", lambda query: False)  # Pas de Wikipedia
+    config = {"bot": {"devs": ["admin"]}}
+
+    assert await ask_command.get_cached_or_fetch("panda roux") == FACT
+    await handle_cacheclear_command(FakeMessage(), config)
+    assert await ask_command.get_cached_or_fetch("panda roux") is None
+
+    # Redémarrage : le vidage tient toujours
+    monkeypatch.setattr(cache_manager, "_pack_cleared_build", None)
+    monkeypatch.setattr(cache_manager, "_cache_loaded", False)
+    cache_manager.load_cache()
+    assert await ask_command.get_cached_or_fetch("panda roux") is None
+
+    # Nouveau build : le pack est de nouveau servi
+    write_pack(pack.path, _entries())
+    pack._checked_at = 0.0  # Forcer la vérification périodique
+    assert await ask_command.get_cached_or_fetch("panda roux") == FACT
+
+
+def test_fact_cache_and_game_fetcher_share_the_pack():
+    assert cache_manager.knowledge_pack is game_data_fetcher.knowledge_pack
+
+
+def test_expired_pack_game_not_served(tmp_path):
+    path = str(tmp_path / "old.pack")
+    state = dict(HADES.to_state(), expires_at=time.time() - 1)
+    write_pack(path, {"gamedata:hades": (KIND_JSON, json.dumps(state).encode())})
+    pack = KnowledgePack(path)
+    assert pack.open()
+    assert pack.game("gamedata:hades") is None
+    pack.close()
+
+
+@pytest.mark.asyncio
+async def test_pack_game_cached_no_longer_than_pack_validity(tmp_path, monkeypatch, sample_config):
+    path = str(tmp_path / "soon.pack")
+    state = dict(HADES.to_state(), expires_at=time.time() + 60)
+    write_pack(path, {"gamedata:hades": (KIND_JSON, json.dumps(state).encode())})
+    pack = KnowledgePack(path)
+    pack.open()
+    ttls = []
+    monkeypatch.setattr(game_data_fetcher, "knowledge_pack", pack)
+    monkeypatch.setattr(game_data_fetcher.GAME_CACHE, "get", lambda key: None)
+    monkeypatch.setattr(game_data_fetcher.GAME_CACHE, "set", lambda key, data, ttl=None: ttls.append(ttl))
+
+    assert await game_data_fetcher.fetch_game_data("Hades", sample_config, cache_only=True) is not None
+    assert ttls and ttls[0] <= 60
+    pack.close()
+
+
+def test_builder_skips_expired_and_short_ttl_games(tmp_path):
+    spec = importlib.util.spec_from_file_location(
+        "build_knowledge_pack", Path(__file__).parent.parent / "scripts" / "build_knowledge_pack.py"
+    )
+    builder = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(builder)
+    now = time.time()
+    old_game = {"name": "Hades", "release_year": "2020"}
+    games_json = tmp_path / "games.json"
+    games_json.write_text(json.dumps({
+        "gamedata:hades": {"data": old_game, "timestamp": now, "ttl": 7200},
+        "gamedata:expired": {"data": old_game, "timestamp": now - 8000, "ttl": 7200},
+        "gamedata:igdb web": {"data": old_game, "timestamp": now, "ttl": 1800},  # Repli scraping
+    }), encoding="utf-8")
+
+    games, skipped = builder.load_games(str(games_json), "")
+
+    assert list(games) == ["gamedata:hades"] and skipped == 2
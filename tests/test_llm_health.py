@@ -0,0 +1,99 @@
+"""Tests du circuit breaker et du health monitor LLM."""
+
+import pytest
+
+import utils.model_utils as model_utils
+from utils.llm_health import CLOSED, HALF_OPEN, OPEN, EndpointBreaker, LLMHealthMonitor, llm_health, models_url
+
+
+class TestEndpointBreaker:
+    """Tests des transitions closed → open → half_open."""
+
+    def test_opens_after_threshold(self):
+        """Le circuit s'ouvre après N échecs consécutifs."""
+        breaker = EndpointBreaker("http://x", failures_threshold=3, retry_delay=5)
+        assert breaker.record_failure(now=0) is False
+        assert breaker.record_failure(now=0) is False
+        assert breaker.record_failure(now=0) is True
+        assert breaker.state == OPEN
+        assert breaker.allow_request(now=1) is False
+        assert breaker.retry_in(now=1) == pytest.approx(4)
+
+    def test_half_open_then_close(self):
+        """Backoff expiré → half_open, un succès referme."""
+        breaker = EndpointBreaker("http://x", failures_threshold=1, retry_delay=5)
+        breaker.record_failure(now=0)
+        assert breaker.allow_request(now=5) is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.record_success() is True
+        assert breaker.state == CLOSED
+        assert breaker.consecutive_failures == 0
+
+    def test_backoff_grows_and_is_capped(self):
+        """Chaque réouverture double le délai, plafonné à backoff_max."""
+        breaker = EndpointBreaker("http://x", failures_threshold=1, retry_delay=5, backoff_multiplier=2, backoff_max=12)
+        delays = []
+        now = 0.0
+        for _ in range(3):
+            breaker.record_failure(now=now)
+            delays.append(breaker.retry_at - now)
+            now = breaker.retry_at
+            breaker.allow_request(now=now)  # → half_open
+        assert delays == [5, 10, 12]
+
+
+class TestLLMHealthMonitor:
+    """Tests du registre de breakers et des notifications."""
+
+    def test_models_url(self):
+        """L'endpoint chat est converti en endpoint models."""
+        assert models_url("http://h:1234/v1/chat/completions") == "http://h:1234/v1/models"
+
+    def test_configure_reads_rate_limiting(self):
+        """Seuil et backoff viennent de rate_limiting.*."""
+        monitor = LLMHealthMonitor()
+        monitor.configure({"rate_limiting": {"health_check_failures_threshold": 2, "llm_retry_delay": 7}})
+        breaker = monitor.breaker("http://x")
+        assert breaker.failures_threshold == 2
+        assert breaker.retry_delay == 7
+
+    def test_listener_notified_on_change(self):
+        """Les abonnés reçoivent les changements de disponibilité."""
+        monitor = LLMHealthMonitor()
+        monitor.configure({"rate_limiting": {"health_check_failures_threshold": 1}})
+        events = []
+        monitor.add_listener(lambda endpoint, ok: events.append((endpoint, ok)))
+        monitor.record_failure("http://x")
+        monitor.record_failure("http://x")  # Déjà ouvert → pas de doublon
+        monitor.record_success("http://x")
+        assert events == [("http://x", False), ("http://x", True)]
+
+    @pytest.mark.asyncio
+    async def test_probe_unreachable_endpoint(self):
+        """Un endpoint injoignable compte comme un échec."""
+        monitor = LLMHealthMonitor()
+        monitor.configure({"rate_limiting": {"health_check_failures_threshold": 1, "health_check_timeout": 0.5}})
+        assert await monitor.probe("http://127.0.0.1:9/v1/chat/completions") is False
+        assert monitor.is_available("http://127.0.0.1:9/v1/chat/completions") is False
+
+
+class TestCallModelUsesBreaker:
+    """call_model ne contacte pas un endpoint dont le circuit est ouvert."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_local(self, monkeypatch):
+        endpoint = "http://breaker-open/v1/chat/completions"
+        calls = []
+
+        async def local(*args, **kwargs):
+            calls.append(1)
+            return "local"
+
+        monkeypatch.setattr(model_utils, "try_endpoint", local)
+        breaker = llm_health.breaker(endpoint)
+        for _ in range(breaker.failures_threshold):
+            llm_health.record_failure(endpoint)
+
+        result = await model_utils.call_model("salut", {"bot": {"model_endpoint": endpoint}, "openai": {}})
+        assert result is None
+        assert not calls
@@ -1,6 +1,11 @@
 """Tests for model_utils module."""
 
-from utils.model_utils import estimate_tokens
+import asyncio
+
+import pytest
+
+import utils.model_utils as model_utils
+from utils.model_utils import LatencyHistogram, estimate_tokens, get_hedge_delay, get_latency_histogram
 
 
 class TestEstimateTokens:
@@ -29,3 +34,178 @@ class TestEstimateTokens:
         assert estimated == len(text) // 4
         assert estimated > 0
 
+
+class TestLatencyHistogram:
+    """Tests de l'histogramme de latence par endpoint."""
+
+    def test_empty_percentile(self):
+        """Pas d'échantillon → None."""
+        assert LatencyHistogram().percentile(95) is None
+
+    def test_p95(self):
+        """p95 nearest-rank sur 100 valeurs."""
+        histogram = LatencyHistogram()
+        for i in range(1, 101):
+            histogram.record(i / 100)
+        assert histogram.percentile(95) == pytest.approx(0.95)
+
+    def test_window_is_bounded(self):
+        """Seules les dernières mesures comptent."""
+        histogram = LatencyHistogram(max_samples=10)
+        for _ in range(50):
+            histogram.record(5.0)
+        for _ in range(10):
+            histogram.record(0.1)
+        assert len(histogram) == 10
+        assert histogram.percentile(95) == pytest.approx(0.1)
+
+
+class TestHedgeDelay:
+    """Tests du délai de hedge adaptatif."""
+
+    CONFIG = {"bot": {"llm": {"hedging": {"first_token_budget": 2.0, "min_delay": 0.3, "min_samples": 5}}}}
+
+    def test_budget_until_enough_samples(self):
+        """Budget configuré tant que l'historique est trop court."""
+        get_latency_histogram("http://hedge-a").record(0.1)
+        assert get_hedge_delay("http://hedge-a", self.CONFIG) == 2.0
+
+    def test_delay_follows_p95_with_bounds(self):
+        """Délai = p95 du TTFT, borné par [min_delay, budget]."""
+        fast = get_latency_histogram("http://hedge-fast")
+        slow = get_latency_histogram("http://hedge-slow")
+        mid = get_latency_histogram("http://hedge-mid")
+        for _ in range(10):
+            fast.record(0.01)
+            slow.record(9.0)
+            mid.record(0.8)
+        assert get_hedge_delay("http://hedge-fast", self.CONFIG) == 0.3
+        assert get_hedge_delay("http://hedge-slow", self.CONFIG) == 2.0
+        assert get_hedge_delay("http://hedge-mid", self.CONFIG) == pytest.approx(0.8)
+
+
+class TestHedgedCall:
+    """Tests de la course LM Studio ↔ OpenAI."""
+
+    CONFIG = {
+        "bot": {
+            "model_endpoint": "http://hedge-race/v1/chat/completions",
+            "llm": {"hedging": {"first_token_budget": 0.05, "min_delay": 0.01}},
+        },
+        "openai": {"api_key": "sk-test"},
+    }
+
+    @pytest.mark.asyncio
+    async def test_fallback_wins_and_local_is_cancelled(self, monkeypatch):
+        """Local muet après le délai → OpenAI gagne, local annulé."""
+        cancelled = asyncio.Event()
+
+        async def slow_local(*args, **kwargs):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "local"
+
+        async def fast_openai(*args, **kwargs):
+            return "openai"
+
+        monkeypatch.setattr(model_utils, "try_endpoint", slow_local)
+        monkeypatch.setattr(model_utils, "try_openai_fallback", fast_openai)
+
+        result = await model_utils.call_model("salut", self.CONFIG)
+        await asyncio.sleep(0)
+        assert result == "openai"
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_first_token_prevents_hedge(self, monkeypatch):
+        """1er token reçu à temps → pas d'appel OpenAI."""
+        calls = []
+
+        async def streaming_local(*args, first_token=None, **kwargs):
+            first_token.set()
+            await asyncio.sleep(0.1)
+            return "local"
+
+        async def openai(*args, **kwargs):
+            calls.append(1)
+            return "openai"
+
+        monkeypatch.setattr(model_utils, "try_endpoint", streaming_local)
+        monkeypatch.setattr(model_utils, "try_openai_fallback", openai)
+
+        assert await model_utils.call_model("salut", self.CONFIG) == "local"
+        assert not calls
+
+    @pytest.mark.asyncio
+    async def test_repeated_hedges_keep_delay(self, monkeypatch):
+        """Hedges gagnés à répétition → le délai ne s'effondre pas vers min_delay."""
+        url = "http://hedge-censored/v1/chat/completions"
+        histogram = LatencyHistogram(max_samples=10)
+        for _ in range(10):
+            histogram.record(0.05)
+        monkeypatch.setitem(model_utils._latency_histograms, url, histogram)
+        config = {
+            **self.CONFIG,
+            "bot": {"model_endpoint": url, "llm": {"hedging": {"first_token_budget": 0.2, "min_delay": 0.01, "min_samples": 5}}},
+        }
+        calls = []
+
+        async def flaky_local(*args, first_token=None, **kwargs):
+            calls.append(1)
+            if len(calls) % 2:
+                # Requête facile : 1er token immédiat (TTFT enregistré comme _read_stream)
+                histogram.record(0.001)
+                first_token.set()
+                return "local"
+            await asyncio.sleep(5)
+            return "local"
+
+        async def openai(*args, **kwargs):
+            return "openai"
+
+        monkeypatch.setattr(model_utils, "try_endpoint", flaky_local)
+        monkeypatch.setattr(model_utils, "try_openai_fallback", openai)
+
+        for _ in range(20):
+            await model_utils.call_model("salut", config)
+
+        assert get_hedge_delay(url, config) >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_caller_cancelled_before_hedge_cancels_local(self, monkeypatch):
+        """Appelant annulé pendant l'attente du 1er token → local annulé aussi."""
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def slow_local(*args, **kwargs):
+            started.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "local"
+
+        monkeypatch.setattr(model_utils, "try_endpoint", slow_local)
+        config = {**self.CONFIG, "bot": {**self.CONFIG["bot"], "llm": {"hedging": {"first_token_budget": 5.0}}}}
+
+        caller = asyncio.create_task(model_utils.call_model("salut", config))
+        await asyncio.wait_for(started.wait(), timeout=1)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        assert cancelled.is_set()
+
+
+class TestStreamModel:
+    """Tests du streaming (même cascade que call_model)."""
+
+    @pytest.mark.asyncio
+    async def test_no_llm_yields_nothing(self):
+        """Aucun LLM joignable → aucun morceau."""
+        config = {"bot": {"model_endpoint": "http://127.0.0.1:9/v1/chat/completions", "model_timeout": 1}, "openai": {}}
+        chunks = [chunk async for chunk in model_utils.stream_model("salut", config)]
+        assert chunks == []
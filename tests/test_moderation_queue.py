@@ -0,0 +1,116 @@
+"""Tests de la file de modération Helix (hors ligne, httpx.MockTransport)."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import src.utils.helix_client as helix_client
+from src.utils.helix_client import HelixClient
+from src.utils.moderation_queue import ModerationQueue
+
+
+@pytest.fixture
+def bans(monkeypatch):
+    """Endpoint /moderation/bans simulé : enregistre les actions et la concurrence max."""
+    state = {"actions": [], "active": 0, "max_active": 0, "delay": 0.02, "already": set()}
+
+    async def handler(request):
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        await asyncio.sleep(state["delay"])
+        state["active"] -= 1
+        data = json.loads(request.content)["data"]
+        state["actions"].append((dict(request.url.params), data))
+        if data["user_id"] in state["already"]:
+            return httpx.Response(400, json={"message": "The user specified in the user_id field is already banned."})
+        return httpx.Response(200, json={"data": [data]})
+
+    monkeypatch.setattr(helix_client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return state
+
+
+async def resolve(login):
+    return f"id-{login}"
+
+
+def make_queue(**kwargs):
+    return ModerationQueue(HelixClient("cid", "tok"), "42", "7", resolve, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_raid_deduplicated_and_parallel(bans):
+    queue = make_queue(concurrency=4, rate=1000, burst=100)
+    for _ in range(3):  # Chaque bot envoie 3 messages
+        for i in range(20):
+            queue.submit(f"bot{i}", duration=60)
+    await queue.join()
+
+    assert len(bans["actions"]) == 20
+    assert 1 < bans["max_active"] <= 4
+    assert queue.stats["done"] == 20 and queue.stats["deduplicated"] == 40
+    assert queue.last_wave["actions"] == 20 and queue.last_wave["per_second"] > 0
+    params, data = bans["actions"][0]
+    assert params == {"broadcaster_id": "42", "moderator_id": "7"}
+    assert data["duration"] == 60 and data["user_id"].startswith("id-bot")
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_ban_replaces_pending_timeout(bans):
+    queue = make_queue(concurrency=1, rate=1000, burst=100)
+    queue.submit("first")
+    queue.submit("spammer", user_id="99", duration=60)
+    queue.submit("spammer", duration=None, reason="raid")  # Ban avant le départ du timeout
+    queue.submit("spammer", duration=30)  # Plus faible : ignoré
+    await queue.join()
+
+    actions = {data["user_id"]: data for _, data in bans["actions"]}
+    assert actions["99"] == {"user_id": "99", "reason": "raid"}
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_recent_target_ignored_unless_stronger(bans):
+    queue = make_queue(rate=1000, burst=100)
+    queue.submit("spammer")
+    await queue.join()
+    assert queue.submit("spammer") is False
+    assert queue.submit("spammer", duration=None) is True  # Sanction plus forte : repart
+    await queue.join()
+
+    assert [data.get("duration") for _, data in bans["actions"]] == [60, None]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_budget_applies(bans):
+    bans["delay"] = 0
+    queue = make_queue(concurrency=8, rate=100, burst=1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i in range(6):
+        queue.submit(f"bot{i}")
+    await queue.join()
+
+    assert loop.time() - start >= 0.045  # 5 jetons à 10 ms après la rafale
+    assert len(bans["actions"]) == 6
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_already_banned_counts_as_done_and_unknown_login_fails(bans):
+    bans["already"].add("id-old")
+
+    async def resolve_some(login):
+        return None if login == "ghost" else f"id-{login}"
+
+    queue = ModerationQueue(HelixClient("cid", "tok"), "42", "7", resolve_some, rate=1000, burst=100)
+    queue.submit("old")
+    queue.submit("ghost")
+    await queue.join()
+
+    assert queue.stats["done"] == 1 and queue.stats["failed"] == 1
+    assert len(bans["actions"]) == 1
+    await queue.close()
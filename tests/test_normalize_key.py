@@ -0,0 +1,35 @@
+"""Golden test de normalize_key : mêmes clés que l'ancienne version (dynamic_facts.json)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils.cache_manager import is_factual_question, normalize_key
+
+GOLDEN = json.loads((Path(__file__).parent / "fixtures" / "normalize_key_golden.json").read_text(encoding="utf-8"))
+
+
+def test_keys_match_golden():
+    mismatches = [(query, key, normalize_key(query)) for query, key, _ in GOLDEN if normalize_key(query) != key]
+    assert mismatches == []
+
+
+def test_factual_detection_matches_golden():
+    assert [is_factual_question(key) for _, key, _ in GOLDEN] == [factual for _, _, factual in GOLDEN]
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("c'est quoi qui est python", "python"),      # Préfixes enchaînés dans l'ordre
+    ("qui est c'est quoi python", "c'est quoi python"),  # Pas de retour en arrière
+    ("explique moi parle de docker", "docker"),
+])
+def test_prefix_order_preserved(query, expected):
+    assert normalize_key(query) == expected
+
+
+def test_memoized():
+    normalize_key.cache_clear()
+    normalize_key("C'est quoi Python ?")
+    normalize_key("C'est quoi Python ?")
+    assert normalize_key.cache_info().hits == 1
@@ -1,6 +1,16 @@
 """Tests for prompt_loader module."""
 
-from prompts.prompt_loader import load_system_prompt, make_prompt
+import json
+
+from prompts.prompt_loader import (
+    PROMPT_TEMPLATE_VERSION,
+    build_messages,
+    build_prefixed_messages,
+    get_prefix_fingerprint,
+    get_prompt_prefix,
+    load_system_prompt,
+    make_prompt,
+)
 
 
 class TestPromptLoader:
@@ -48,3 +58,47 @@ class TestPromptLoader:
         prompt = make_prompt('reactor', 'LUL', 'viewer', 'Valorant', 'Ranked')
         assert 'Valorant' in prompt or 'LUL' in prompt
 
+
+class TestPromptPrefix:
+    """Tests du préfixe canonique (réutilisation KV-cache)."""
+
+    def test_prefix_is_same_object(self):
+        """Le préfixe est construit une seule fois et réutilisé."""
+        assert get_prompt_prefix("chill") is get_prompt_prefix("chill")
+        assert get_prompt_prefix("ask", True) is get_prompt_prefix("ask", True)
+        assert get_prompt_prefix("trad") is get_prompt_prefix("chill")
+
+    def test_prefix_is_immutable(self):
+        """Le préfixe ne peut pas être modifié par un appelant."""
+        prefix = get_prompt_prefix("ask")
+        try:
+            prefix[0]["content"] = "hack"  # type: ignore[index]
+            raise AssertionError("prefix should be read-only")
+        except TypeError:
+            pass
+
+    def test_only_user_turn_varies(self):
+        """Deux requêtes ne diffèrent que par le dernier message."""
+        a = build_prefixed_messages("chill", "salut")
+        b = build_prefixed_messages("chill", "gg")
+        assert a[:-1] == b[:-1]
+        assert a[-1] == {"role": "user", "content": "salut"}
+        assert b[-1] == {"role": "user", "content": "gg"}
+
+    def test_serialized_prefix_is_byte_stable(self):
+        """La sérialisation JSON du préfixe est identique entre appels."""
+        first = json.dumps(build_prefixed_messages("ask", "x")[:-1], ensure_ascii=False)
+        second = json.dumps(build_prefixed_messages("ask", "y")[:-1], ensure_ascii=False)
+        assert first.encode("utf-8") == second.encode("utf-8")
+
+    def test_build_messages_shares_prefix(self):
+        """build_messages et try_endpoint envoient le même préfixe."""
+        messages = build_messages("chill", "salut")["messages"]
+        assert messages[:-1] == build_prefixed_messages("chill", "salut")[:-1]
+
+    def test_version_and_fingerprint(self):
+        """Le template est versionné et chaque préfixe a son empreinte."""
+        assert PROMPT_TEMPLATE_VERSION
+        assert get_prefix_fingerprint("chill") == get_prefix_fingerprint("chill")
+        assert get_prefix_fingerprint("chill") != get_prefix_fingerprint("ask")
+        assert get_prefix_fingerprint("ask") != get_prefix_fingerprint("ask", True)
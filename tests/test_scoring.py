@@ -0,0 +1,58 @@
+"""Tests du moteur de scoring RAWG/Steam (golden : scores de l'ancien calcul)."""
+
+import json
+import random
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import pytest
+
+from core.commands.api.game_data_fetcher import _extract_year_from_query
+from core.commands.api.scoring import QueryFeatures, _matching_ratio, name_ratio, score_candidates, score_result
+
+GOLDEN = json.loads((Path(__file__).parent / "fixtures" / "scoring_golden.json").read_text(encoding="utf-8"))
+CASES = GOLDEN["cases"]
+CANDIDATES = GOLDEN["candidates"]
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["query"] for case in CASES])
+def test_scores_match_golden(case):
+    assert _extract_year_from_query(case["query"]) == case["user_year"]
+    features = QueryFeatures(case["query"], case["user_year"])
+
+    assert score_candidates(features, CANDIDATES) == case["rawg"]
+    assert [score_result(features, c, "RAWG") for c in CANDIDATES] == case["result_rawg"]
+    assert [score_result(features, c, "Steam") for c in CANDIDATES] == case["result_steam"]
+
+
+def test_best_candidate_is_expected_game():
+    by_query = {case["query"]: case["rawg"] for case in CASES}
+    best = {q: CANDIDATES[max(range(len(s)), key=s.__getitem__)]["name"] for q, s in by_query.items()}
+    assert best["hades 2"] == "Hades II"
+    assert best["Cyberpunk 2077"] == "Cyberpunk 2077"
+    assert best["witcher 3"] == "The Witcher 3: Wild Hunt"
+
+
+def test_query_features_precomputed():
+    features = QueryFeatures("Hades 2", 2)
+    assert features.text == "hades 2"
+    assert len(features.contextual) == 1
+    assert features.sequel_markers == (" 2", ":2") and features.roman == "II"
+    assert QueryFeatures("Cyberpunk 2077", 2077).sequel_markers == ()
+
+
+def test_name_ratio_memoized():
+    name_ratio.cache_clear()
+    name_ratio("hades", "hades ii")
+    name_ratio("hades", "hades ii")
+    assert name_ratio.cache_info().hits == 1
+    assert name_ratio("", "") == 1.0
+
+
+def test_matching_ratio_equals_sequence_matcher():
+    rng = random.Random(42)
+    alphabet = "ades ii2:3xv"
+    for _ in range(2000):
+        a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+        b = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert _matching_ratio(a, b) == SequenceMatcher(None, a, b).ratio(), (a, b)
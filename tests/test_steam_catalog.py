@@ -0,0 +1,198 @@
+"""Tests du catalogue Steam local et du batcher appdetails (hors ligne)."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+from core.commands.api import steam_api
+from core.commands.api.steam_catalog import AppDetailsBatcher, SteamCatalog, normalize_name
+
+FIXTURE = Path(__file__).parent / "fixtures" / "steam_applist.json"
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = SteamCatalog(str(tmp_path / "steam.sqlite3"))
+    catalog.import_file(str(FIXTURE))
+    return catalog
+
+
+class TestSteamCatalog:
+    """Résolution nom → AppID sans réseau."""
+
+    def test_normalize_name(self):
+        assert normalize_name("The Witcher® 3: Wild Hunt") == "the witcher 3 wild hunt"
+        assert normalize_name("Pokémon™") == "pokemon"
+
+    def test_import_skips_empty_names(self, catalog):
+        assert catalog.count() == 10
+
+    def test_exact_match_preferred(self, catalog):
+        assert catalog.resolve("hades") == (1145360, "Hades")
+        assert catalog.resolve("Elden Ring") == (1245620, "ELDEN RING")
+
+    def test_prefix_match_shortest(self, catalog):
+        assert catalog.resolve("the witcher 3") == (292030, "The Witcher® 3: Wild Hunt")
+        assert catalog.resolve("vampire") == (1794680, "Vampire Survivors")
+        assert catalog.resolve("minecraft") is None
+
+    def test_typo_resolved_locally(self, catalog):
+        assert catalog.resolve("hollow knigt") == (367520, "Hollow Knight")
+        assert catalog.resolve("stardew valey") == (413150, "Stardew Valley")
+        assert catalog.resolve("hollow mountain") is None
+
+    def test_non_game_apps_ignored(self, catalog):
+        catalog.import_apps([
+            {"appid": 2000, "name": "Celeste Farewell", "type": "game"},
+            {"appid": 1000, "name": "Celeste Soundtrack", "type": "music"},
+            {"appid": 1001, "name": "Dead Cells - Bad Seed", "type": "dlc"},
+            {"appid": 1002, "name": "Dead Cells Bad Seed Server", "type": "tool"},
+        ])
+        assert catalog.resolve("celeste soundtrack") is None
+        assert catalog.resolve("dead cells bad seed") is None
+        assert catalog.resolve("celeste farewell") == (2000, "Celeste Farewell")
+        assert catalog.resolve("hades") == (1145360, "Hades")  # Sans type (GetAppList v2) : gardé
+
+    def test_old_index_gets_type_column(self, tmp_path):
+        db = tmp_path / "old.sqlite3"
+        with sqlite3.connect(db) as conn:
+            conn.execute("CREATE TABLE apps (appid INTEGER PRIMARY KEY, name TEXT NOT NULL, norm TEXT NOT NULL, last_modified INTEGER)")
+            conn.execute("INSERT INTO apps VALUES (367520, 'Hollow Knight', 'hollow knight', NULL)")
+        assert SteamCatalog(str(db)).resolve("hollow knight") == (367520, "Hollow Knight")
+
+    def test_missing_db_not_created(self, tmp_path):
+        catalog = SteamCatalog(str(tmp_path / "absent.sqlite3"))
+        assert catalog.resolve("hades") is None
+        assert not (tmp_path / "absent.sqlite3").exists()
+
+    def test_delta_import_upserts(self, catalog):
+        catalog.import_apps([{"appid": 1145360, "name": "Hades (2020)", "last_modified": 1700000000}])
+        assert catalog.count() == 10
+        assert catalog.resolve("hades 2020") == (1145360, "Hades (2020)")
+
+
+class TestAppDetailsBatcher:
+    """Regroupement des appdetails concurrents."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_deduplicated(self):
+        calls = []
+
+        async def fetch(appids, filters):
+            calls.append(list(appids))
+            await asyncio.sleep(0)
+            return {str(a): {"success": True, "data": {"name": f"App {a}"}} for a in appids}
+
+        batcher = AppDetailsBatcher(fetch=fetch, window=0.01)
+        results = await asyncio.gather(batcher.get(1), batcher.get(1), batcher.get(2))
+
+        assert [r["name"] for r in results] == ["App 1", "App 1", "App 2"]
+        assert sorted(calls) == [[1], [2]]  # Sans filters : 1 AppID par requête
+
+    @pytest.mark.asyncio
+    async def test_filters_group_into_one_request(self):
+        calls = []
+
+        async def fetch(appids, filters):
+            calls.append((list(appids), filters))
+            return {str(a): {"success": a != 3, "data": {"price_overview": {"final": a}}} for a in appids}
+
+        batcher = AppDetailsBatcher(filters="price_overview", fetch=fetch, window=0.01)
+        results = await asyncio.gather(*(batcher.get(a) for a in (1, 2, 3)))
+
+        assert calls == [([1, 2, 3], "price_overview")]
+        assert results[2] is None
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_resolves_none(self):
+        async def fetch(appids, filters):
+            raise RuntimeError("HTTP 429")
+
+        batcher = AppDetailsBatcher(fetch=fetch, window=0.0)
+        assert await batcher.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_steam_lookup_without_search_request(catalog, monkeypatch):
+    """Nom résolu localement : seul appdetails est appelé."""
+    async def fetch(appids, filters):
+        return {"367520": {"success": True, "data": {"name": "Hollow Knight", "developers": ["Team Cherry"]}}}
+
+    async def no_search(game_name):
+        raise AssertionError("storesearch ne doit pas être appelé")
+
+    monkeypatch.setattr(steam_api, "steam_catalog", catalog)
+    monkeypatch.setattr(steam_api, "appdetails_batcher", AppDetailsBatcher(fetch=fetch, window=0.0))
+    monkeypatch.setattr(steam_api, "_search_app_id", no_search)
+
+    data = await steam_api.fetch_game_from_steam("hollow knight")
+    assert data["name"] == "Hollow Knight" and data["steam_appid"] == 367520
+
+
+@pytest.mark.asyncio
+async def test_local_miss_falls_back_to_storesearch(catalog, monkeypatch):
+    """Faute dans le 1er mot, introuvable localement → storesearch."""
+    searched = []
+
+    async def fetch(appids, filters):
+        return {"367520": {"success": True, "data": {"name": "Hollow Knight"}}}
+
+    async def search(game_name):
+        searched.append(game_name)
+        return 367520
+
+    monkeypatch.setattr(steam_api, "steam_catalog", catalog)
+    monkeypatch.setattr(steam_api, "appdetails_batcher", AppDetailsBatcher(fetch=fetch, window=0.0))
+    monkeypatch.setattr(steam_api, "_search_app_id", search)
+
+    data = await steam_api.fetch_game_from_steam("holow knight")
+    assert searched == ["holow knight"] and data["steam_appid"] == 367520
+
+
+@pytest.mark.asyncio
+async def test_delta_refresh_paginates(catalog):
+    """Refresh IStoreService : if_modified_since + pagination last_appid."""
+    seen = []
+
+    def handler(request):
+        params = dict(request.url.params)
+        seen.append((params["if_modified_since"], params["last_appid"]))
+        if params["last_appid"] == "0":
+            body = {"response": {"apps": [{"appid": 10, "name": "New Game"}], "have_more_results": True, "last_appid": 10}}
+        else:
+            body = {"response": {"apps": [{"appid": 20, "name": "Other Game"}]}}
+        return httpx.Response(200, json=body)
+
+    catalog.web_api_key = "key"
+    since = catalog._meta("updated_at")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await catalog.refresh(client) == 2
+
+    assert seen == [(since, "0"), (since, "10")]
+    assert catalog.resolve("new game") == (10, "New Game")
+
+
+@pytest.mark.asyncio
+async def test_full_refresh_parsed_off_loop(catalog, monkeypatch):
+    """Liste complète (sans clé Web API) : décodée dans un thread, pas sur la boucle."""
+    loop_thread = threading.get_ident()
+    parsed_in = []
+    real_loads = json.loads
+
+    def loads(data, *args, **kwargs):
+        parsed_in.append(threading.get_ident())
+        return real_loads(data, *args, **kwargs)
+
+    monkeypatch.setattr("core.commands.api.steam_catalog.json.loads", loads)
+    body = {"applist": {"apps": [{"appid": 30, "name": "Full List Game"}]}}
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert await catalog.refresh(client) == 1
+
+    assert parsed_in and loop_thread not in parsed_in
+    assert catalog.resolve("full list game") == (30, "Full List Game")
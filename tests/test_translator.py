@@ -143,3 +143,17 @@ class TestTranslationChecks:
     def test_should_not_translate_for_non_dev(self, temp_translator):
         """Test that non-devs are not translated."""
         assert not temp_translator.should_translate("random_user", "Hello this is a message")
+
+
+class TestLazyGoogleTranslator:
+    """Les GoogleTranslator sont créés au premier usage puis réutilisés."""
+
+    def test_no_translator_at_init(self, temp_translator):
+        """Aucun traducteur construit au démarrage."""
+        assert temp_translator._google_translators == {}
+
+    def test_translator_reused(self, temp_translator):
+        """Même paire de langues → même instance."""
+        first = temp_translator._google('en', 'fr')
+        assert temp_translator._google('en', 'fr') is first
+        assert temp_translator._google('fr', 'en') is not first
@@ -0,0 +1,106 @@
+"""Tests du resolver login → User ID (hors ligne, httpx.MockTransport)."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+import src.utils.helix_client as helix_client
+from src.utils.helix_client import HelixClient
+from src.utils.user_id_resolver import BATCH_MAX, UserIdResolver
+
+
+@pytest.fixture
+def users(monkeypatch):
+    """Endpoint /users simulé : chaque login existe sauf ceux qui commencent par "ghost"."""
+    calls = []
+
+    async def handler(request):
+        logins = request.url.params.get_list("login")
+        calls.append(logins)
+        await asyncio.sleep(0.01)
+        data = [{"id": f"id-{login}", "login": login} for login in logins if not login.startswith("ghost")]
+        return httpx.Response(200, json={"data": data})
+
+    monkeypatch.setattr(helix_client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return calls
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    resolver = UserIdResolver(str(tmp_path / "user_ids.json"), batch_window=0.01)
+    resolver.helix = HelixClient("cid", "tok")
+    return resolver
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_batched_and_coalesced(users, resolver):
+    logins = ["Serda", "serda", "@serda", "alice", "bob", "ghost_user"]
+    ids = await asyncio.gather(*(resolver.resolve(login) for login in logins))
+
+    assert ids == ["id-serda", "id-serda", "id-serda", "id-alice", "id-bob", None]
+    assert users == [["serda", "alice", "bob", "ghost_user"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_capped_at_100_logins(users, resolver):
+    logins = [f"user{i}" for i in range(BATCH_MAX * 2 + 5)]
+    ids = await resolver.resolve_many(logins)
+
+    assert len(ids) == len(logins) and all(ids.values())
+    assert sorted(len(batch) for batch in users) == [5, BATCH_MAX, BATCH_MAX]
+
+
+@pytest.mark.asyncio
+async def test_cache_persisted_and_reused(users, resolver, tmp_path):
+    await resolver.resolve_many(["alice", "bob"])
+    await resolver.drain()  # Écriture disque après la réponse aux appelants
+    assert json.loads((tmp_path / "user_ids.json").read_text())["alice"][0] == "id-alice"
+
+    reloaded = UserIdResolver(str(tmp_path / "user_ids.json"))
+    assert await reloaded.resolve("Alice") == "id-alice"
+    assert len(users) == 1
+    assert reloaded.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_remembered_ids_skip_the_api(users, resolver):
+    resolver.remember("Carol", "555")
+    assert await resolver.resolve("carol") == "555"
+    assert users == []
+
+
+@pytest.mark.asyncio
+async def test_api_failure_resolves_none_and_retries_later(monkeypatch, resolver):
+    monkeypatch.setattr(helix_client, "MAX_RETRIES", 0)
+    monkeypatch.setattr(
+        helix_client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(401)))
+    )
+    assert await resolver.resolve("alice") is None
+    assert resolver.cached("alice") is None
+    assert resolver._waiting == {}
+
+
+def test_save_drops_expired_entries_and_caps_the_map(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.utils.user_id_resolver.USER_ID_TTL", 100)
+    resolver = UserIdResolver(str(tmp_path / "user_ids.json"), max_entries=4)
+    resolver._loaded = True
+    resolver._ids = {"expired": ("1", time.time() - 200)}
+    for i in range(6):
+        resolver._ids[f"user{i}"] = (str(i), time.time() - 50 + i)
+    resolver._dirty = True
+
+    resolver.save()
+
+    assert set(json.loads((tmp_path / "user_ids.json").read_text())) == {"user3", "user4", "user5"}
+    assert [path.name for path in tmp_path.iterdir()] == ["user_ids.json"]  # Aucun .tmp orphelin
+
+
+def test_remember_keeps_map_bounded(tmp_path):
+    resolver = UserIdResolver(str(tmp_path / "user_ids.json"), max_entries=10)
+    for i in range(50):
+        resolver.remember(f"user{i}", str(i))
+    assert len(resolver._ids) <= 10
+    assert resolver.cached("user49") == "49"
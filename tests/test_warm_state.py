@@ -0,0 +1,115 @@
+"""Tests du snapshot / restore de l'état chaud (warm restart)."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from core.cache import GlobalGameCache
+from src.chat.channel_context import ChannelContext
+from utils.llm_health import OPEN, LLMHealthMonitor
+from utils.warm_state import WarmStateSnapshotter, capture, decode, encode, load_snapshot, restore, save_snapshot
+
+CONFIG = {"bot": {"channel": "serda", "cooldown": 30}, "rate_limiting": {"max_idle_time": 600}}
+
+
+def _channels():
+    return {"serda": ChannelContext("serda", CONFIG)}
+
+
+def _health():
+    monitor = LLMHealthMonitor()
+    monitor.configure({"rate_limiting": {"health_check_failures_threshold": 1, "llm_retry_delay": 120}})
+    return monitor
+
+
+class TestEncoding:
+    """Tests du format binaire."""
+
+    def test_roundtrip(self):
+        state = {"saved_at": 1.0, "channels": {"serda": {"cooldowns": {"a": 2.0}}}}
+        assert decode(encode(state)) == state
+
+    def test_rejects_foreign_or_corrupt(self, tmp_path):
+        """Un fichier d'un autre format est ignoré (boot à froid, pas de crash)."""
+        assert decode(b"garbage") is None
+        assert decode(encode({})[:-4]) is None
+        path = tmp_path / "warm.bin"
+        path.write_bytes(b"SBWS\x01not-zlib")
+        assert load_snapshot(str(path)) is None
+        assert load_snapshot(str(tmp_path / "missing.bin")) is None
+
+
+class TestRestore:
+    """Un redémarrage retrouve l'état encore valide, et seulement lui."""
+
+    def test_full_roundtrip(self, tmp_path):
+        cache, health, channels = GlobalGameCache(), _health(), _channels()
+        cache.set("gamedata:hades", {"data": {"name": "Hades"}}, ttl=3600)
+        ctx = channels["serda"]
+        ctx.mark_cooldown("alice")
+        ctx.conversation_manager.add_message("alice", "user", "salut")
+        health.record_failure("http://llm")
+
+        path = str(tmp_path / "warm.bin")
+        save_snapshot(path, capture(channels, cache, health))
+
+        new_cache, new_health, new_channels = GlobalGameCache(), _health(), _channels()
+        counts = restore(load_snapshot(path), new_channels, new_cache, new_health)
+
+        assert counts == {"game_cache": 1, "conversations": 1, "cooldowns": 1, "llm_health": 1}
+        assert new_cache.get("gamedata:hades") == {"data": {"name": "Hades"}}
+        new_ctx = new_channels["serda"]
+        assert new_ctx.cooldown_remaining("alice", datetime.now()) > 0
+        assert new_ctx.conversation_manager.get("alice").messages[0]["content"] == "salut"
+        assert new_health.breaker("http://llm").state == OPEN
+
+    def test_expired_entries_dropped(self):
+        """TTL dépassés pendant l'arrêt : rien n'est restauré."""
+        long_ago = time.time() - 10_000
+        state = {
+            "game_cache": {"gamedata:old": {"data": 1, "timestamp": long_ago, "ttl": 3600}},
+            "llm_health": [{"endpoint": "http://llm", "state": OPEN, "retry_at": long_ago}],
+            "channels": {
+                "serda": {
+                    "cooldowns": {"alice": long_ago},
+                    "conversations": {"alice": {"messages": [], "last_activity": long_ago}},
+                },
+                "removed_channel": {"cooldowns": {"bob": time.time()}},
+            },
+        }
+        cache, health, channels = GlobalGameCache(), _health(), _channels()
+        counts = restore(state, channels, cache, health)
+        assert counts == {"game_cache": 0, "conversations": 0, "cooldowns": 0, "llm_health": 0}
+        assert health.breaker("http://llm").available
+
+    def test_capture_skips_finished_cooldowns(self):
+        channels = _channels()
+        channels["serda"].cooldowns["alice"] = datetime.now() - timedelta(seconds=60)
+        state = capture(channels, GlobalGameCache(), _health())
+        assert state["channels"]["serda"]["cooldowns"] == {}
+
+
+class TestSnapshotter:
+    """Écritures concurrentes du snapshot (thread périodique + save_now)."""
+
+    def test_older_capture_does_not_overwrite_newer(self, tmp_path):
+        path = tmp_path / "warm.bin"
+        captures = iter([{"saved_at": 1.0}, {"saved_at": 2.0}])
+        snapshotter = WarmStateSnapshotter(str(path), 60, lambda: next(captures))
+
+        old = snapshotter._take()
+        snapshotter.save_now()  # Capture plus récente (arrêt)
+        snapshotter._write(*old)  # Thread périodique en retard
+
+        assert load_snapshot(str(path))["saved_at"] == 2.0
+        assert [p.name for p in tmp_path.iterdir()] == ["warm.bin"]  # Aucun .tmp orphelin
+
+    def test_concurrent_writes_do_not_share_temp_file(self, tmp_path):
+        path = str(tmp_path / "warm.bin")
+        state = {"saved_at": 1.0, "channels": {f"c{i}": {"cooldowns": {}} for i in range(200)}}
+        threads = [threading.Thread(target=save_snapshot, args=(path, state)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert load_snapshot(path) == state
@@ -0,0 +1,142 @@
+"""Tests du service de warmup du cache jeux."""
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+import core.warmup as warmup
+from core.cache import GlobalGameCache, get_cache_key
+from core.warmup import RawgQuota, WarmupService
+
+
+@pytest.fixture
+def service(monkeypatch, tmp_path):
+    cache = GlobalGameCache()
+    monkeypatch.setattr(warmup, "GAME_CACHE", cache)
+    svc = WarmupService()
+    svc.configure({"warmup": {"concurrency": 2, "rawg_daily_budget": 100, "popularity_file": str(tmp_path / "pop.json")}})
+    svc.cache = cache
+    return svc
+
+
+def _fake_fetch(cache, calls, delay=0.01):
+    active = {"now": 0, "max": 0}
+
+    async def fetch(name, config, cache_only=False):
+        key = get_cache_key("gamedata", name)
+        if cache_only:
+            return cache.get(key)
+        calls.append(name)
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(delay)
+        active["now"] -= 1
+        data = {"name": name, "slug": name.lower().replace(" ", "-")}
+        cache.set(key, data)
+        return data
+
+    return fetch, active
+
+
+class TestRawgQuota:
+    """Tests du budget RAWG journalier."""
+
+    def test_budget_and_daily_reset(self):
+        quota = RawgQuota(daily_budget=4)
+        today = date.today()
+        assert quota.try_acquire(2, today) and quota.try_acquire(2, today)
+        assert not quota.try_acquire(2, today)
+        assert quota.try_acquire(2, today + timedelta(days=1))
+
+
+class TestWarm:
+    """Tests du préchargement."""
+
+    @pytest.mark.asyncio
+    async def test_dedup_skip_cached_and_bounded(self, service, monkeypatch):
+        calls = []
+        fetch, active = _fake_fetch(service.cache, calls)
+        monkeypatch.setattr(warmup, "fetch_game_data", fetch)
+        service.cache.set(get_cache_key("gamedata", "hades"), {"name": "Hades"})
+
+        result = await service.warm(["Hades", "Celeste", "celeste ", "Elden Ring", "Hollow Knight", "Dead Cells"])
+
+        assert result == {"warmed": 4, "queued": 4}
+        assert sorted(calls) == ["Celeste", "Dead Cells", "Elden Ring", "Hollow Knight"]
+        assert active["max"] <= 2
+        assert service.stats["already_cached"] == 1
+
+    @pytest.mark.asyncio
+    async def test_quota_stops_warmup(self, service, monkeypatch):
+        calls = []
+        fetch, _ = _fake_fetch(service.cache, calls)
+        monkeypatch.setattr(warmup, "fetch_game_data", fetch)
+        service.quota.daily_budget = 2 * warmup.RAWG_CALLS_PER_FETCH
+
+        await service.warm(["A", "B", "C", "D"])
+
+        assert len(calls) == 2
+        assert service.stats["skipped_quota"] == 2
+
+
+class TestSignals:
+    """Tests des sources de jeux à précharger."""
+
+    def test_top_games_from_requests(self, service):
+        for _ in range(3):
+            service.note_request("Hades")
+        service.note_request("Celeste")
+        assert service.top_games(2) == ["hades", "celeste"]
+        assert list(service.recent_mentions) == ["Hades", "Celeste"]
+
+    def test_popularity_persisted(self, service):
+        service.note_request("Hades")
+        service.save_popularity()
+        other = WarmupService()
+        other.configure(service.config)
+        other.load_popularity()
+        assert other.popularity["hades"] == 1
+
+    @pytest.mark.asyncio
+    async def test_category_change_triggers_stream_warmup(self, service, monkeypatch):
+        service.configure({**service.config, "twitch": {"client_id": "id", "app_access_token": "tok"}})
+        games = iter(["Hades", "Hades", "Just Chatting"])
+        warmed = []
+
+        async def channel_game(helix, broadcaster_id):
+            return next(games)
+
+        async def warm_stream_game(game):
+            warmed.append(game)
+
+        monkeypatch.setattr(warmup, "fetch_channel_game", channel_game)
+        monkeypatch.setattr(service, "warm_stream_game", warm_stream_game)
+        for _ in range(3):
+            await service.poll_categories([("serda", "42")])
+        await asyncio.gather(*service._warm_tasks)
+
+        assert warmed == ["Hades", "Just Chatting"]
+        assert service.current_games["serda"] == "Just Chatting"
+
+    @pytest.mark.asyncio
+    async def test_non_game_category_ignored(self, service, monkeypatch):
+        calls = []
+        fetch, _ = _fake_fetch(service.cache, calls)
+        monkeypatch.setattr(warmup, "fetch_game_data", fetch)
+        await service.warm_stream_game("Just Chatting")
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_stream_game_warms_series(self, service, monkeypatch):
+        calls = []
+        fetch, _ = _fake_fetch(service.cache, calls)
+
+        async def related(slug, config, limit=5):
+            assert slug == "hades"
+            return ["Hades II"]
+
+        monkeypatch.setattr(warmup, "fetch_game_data", fetch)
+        monkeypatch.setattr(warmup, "fetch_related_titles", related)
+        await service.warm_stream_game("Hades")
+        assert calls == ["Hades", "Hades II"]
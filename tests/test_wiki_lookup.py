@@ -0,0 +1,79 @@
+"""Tests des lookups Wikipedia FR/EN parallèles et du token bucket (hors ligne)."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import src.utils.cache_manager as cache_manager
+from src.utils.rate_limiter import AsyncTokenBucket
+
+EXTRACT = "Hollow Knight est un jeu vidéo de type metroidvania développé par Team Cherry."
+
+
+@pytest.fixture
+def wiki(monkeypatch):
+    """Client Wikipedia simulé ; ``pages`` = {host: extract} des langues qui trouvent."""
+    calls = []
+    pages = {}
+
+    async def handler(request):
+        host = request.url.host
+        calls.append((host, request.url.path))
+        await asyncio.sleep(0.05)  # Latence réseau simulée
+        if host not in pages:
+            return httpx.Response(404) if "summary" in request.url.path else httpx.Response(200, json=["q", []])
+        if request.url.path == "/w/api.php":
+            return httpx.Response(200, json=["q", ["Hollow Knight"], [""], [""]])
+        return httpx.Response(200, json={"title": "Hollow Knight", "extract": pages[host]})
+
+    monkeypatch.setattr(cache_manager, "_wiki_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(cache_manager, "_wiki_buckets", {})
+    return calls, pages
+
+
+@pytest.mark.asyncio
+async def test_fr_and_en_in_parallel_fr_preferred(wiki):
+    calls, pages = wiki
+    pages["fr.wikipedia.org"] = EXTRACT
+    pages["en.wikipedia.org"] = "Hollow Knight is a 2017 Metroidvania video game developed by Team Cherry."
+
+    start = time.perf_counter()
+    answer, lang, title = await cache_manager.fetch_wiki_summary_fr_en("hollow knight")
+    elapsed = time.perf_counter() - start
+
+    assert (answer, lang, title) == (EXTRACT, "fr", "Hollow_Knight")
+    assert {host for host, _ in calls} == {"fr.wikipedia.org", "en.wikipedia.org"}
+    assert elapsed < 0.19  # 2 allers-retours, pas 4 ni de sleep d'1s
+
+
+@pytest.mark.asyncio
+async def test_en_used_when_fr_misses(wiki):
+    calls, pages = wiki
+    pages["en.wikipedia.org"] = "Hollow Knight is a 2017 Metroidvania video game developed by Team Cherry."
+    answer, lang, _ = await cache_manager.fetch_wiki_summary_fr_en("hollow knight")
+    assert lang == "en" and answer.startswith("Hollow Knight is")
+
+
+@pytest.mark.asyncio
+async def test_nothing_found(wiki):
+    assert await cache_manager.fetch_wiki_summary_fr_en("zzzz") == (None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_serializes_concurrent_callers():
+    bucket = AsyncTokenBucket(rate=20.0, capacity=1)
+    start = time.perf_counter()
+    waits = await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+    elapsed = time.perf_counter() - start
+
+    assert waits[0] == 0.0
+    assert elapsed >= 0.14  # 3 jetons à 50 ms, pas tous réveillés en même temps
+    assert sorted(waits[1:]) == pytest.approx([0.05] * 3, abs=0.02)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_burst():
+    bucket = AsyncTokenBucket(rate=1.0, capacity=2)
+    assert [await bucket.acquire(), await bucket.acquire()] == [0.0, 0.0]
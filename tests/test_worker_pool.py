@@ -0,0 +1,239 @@
+"""Tests du pool de workers multi-process et du cache SQLite partagé."""
+
+import asyncio
+import pickle
+import queue
+import time
+from collections import Counter
+
+import pytest
+
+from core.cache import SqliteGameCache
+from core.warmup import warmup_service
+from src.chat.channel_context import channel_config
+from src.chat.worker_pool import (
+    POPULARITY,
+    RAW,
+    RELOAD,
+    ChatEvent,
+    ProxyMessage,
+    WorkerBot,
+    _worker_loop,
+    resolve_channel_ids,
+    shard_for,
+)
+from src.utils.translator import Translator
+from src.utils.twitch_automod import BlockedTermsMirror
+from utils.warm_state import load_snapshot, save_snapshot
+
+
+class TestSharding:
+    """Tests du dispatch ingestion → workers."""
+
+    def test_event_is_picklable(self):
+        """Les événements traversent une multiprocessing.Queue."""
+        event = ChatEvent("serda", "Alice", "!gameinfo hades", True, {"reply-parent-user-login": "bot"})
+        assert pickle.loads(pickle.dumps(event)) == event
+
+    def test_shard_is_stable_per_user(self):
+        """Un user tombe toujours sur le même worker (cooldowns cohérents)."""
+        first = ChatEvent("serda", "Alice", "a")
+        again = ChatEvent("serda", "alice", "b")
+        assert shard_for(first, 4) == shard_for(again, 4)
+
+    def test_shards_spread(self):
+        """Les users se répartissent sur plusieurs workers."""
+        shards = {shard_for(ChatEvent("serda", f"user{i}", "x"), 4) for i in range(50)}
+        assert len(shards) == 4
+
+
+class TestWorkerLoop:
+    """Un worker traite les événements et renvoie ses messages."""
+
+    @pytest.mark.asyncio
+    async def test_worker_replies_through_outbox(self, sample_config, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)  # Le Translator crée ses fichiers data/ dans le cwd
+        monkeypatch.setenv("LLM_MODE", "disabled")
+        monkeypatch.setattr("src.chat.worker_pool.load_cache", lambda reset=False: None)
+        inbox, outbox = queue.Queue(), queue.Queue()
+        inbox.put(ChatEvent("test_channel", "alice", "!donationserda"))
+        inbox.put(None)
+
+        await asyncio.wait_for(_worker_loop(0, sample_config, inbox, outbox), timeout=10)
+
+        kind, channel, content = outbox.get_nowait()
+        assert (kind, channel) == (RAW, "test_channel")
+        assert "ko-fi.com/test_user" in content
+
+    @pytest.mark.asyncio
+    async def test_list_change_broadcast_to_other_workers(self, sample_config, monkeypatch, tmp_path):
+        """!blocksite traité par un worker → rechargement demandé à tous les workers."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LLM_MODE", "disabled")
+        monkeypatch.setattr("src.chat.worker_pool.load_cache", lambda reset=False: None)
+        other = Translator()  # Liste d'un autre worker, chargée avant la commande
+        inbox, outbox = queue.Queue(), queue.Queue()
+        inbox.put(ChatEvent("test_channel", "test_channel", "!blocksite streamboo", True))
+        inbox.put(None)
+
+        await asyncio.wait_for(_worker_loop(0, sample_config, inbox, outbox), timeout=10)
+
+        messages = [outbox.get_nowait() for _ in range(outbox.qsize())]
+        assert (RELOAD, "", "translator") in messages
+        assert "streamboo" not in other.blocked_sites
+        other.reload()
+        assert other.is_spam_bot("spammer", "promo sur streamboo")
+
+
+class TestWorkerWarmState:
+    """Chaque worker sauvegarde et restaure l'état chaud de son shard."""
+
+    @pytest.mark.asyncio
+    async def test_worker_restores_and_saves_its_own_snapshot(self, sample_config, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LLM_MODE", "disabled")
+        monkeypatch.setattr("src.chat.worker_pool.load_cache", lambda reset=False: None)
+        sample_config["bot"]["snapshot_file"] = str(tmp_path / "warm.bin")
+        state = {"saved_at": time.time(), "channels": {"test_channel": {"cooldowns": {"alice": time.time() - 1}}}}
+        save_snapshot(str(tmp_path / "warm.bin.w1"), state)
+        inbox, outbox = queue.Queue(), queue.Queue()
+        inbox.put(None)
+
+        await asyncio.wait_for(_worker_loop(1, sample_config, inbox, outbox), timeout=10)
+
+        saved = load_snapshot(str(tmp_path / "warm.bin.w1"))
+        assert "alice" in saved["channels"]["test_channel"]["cooldowns"]
+        assert not (tmp_path / "warm.bin").exists() and not (tmp_path / "warm.bin.w0").exists()
+
+
+class TestWorkerPopularity:
+    """Seul le worker 0 fait le warmup : il compte les demandes de tous les shards."""
+
+    @pytest.mark.asyncio
+    async def test_other_worker_forwards_requests(self, sample_config, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LLM_MODE", "disabled")
+        monkeypatch.setattr("src.chat.worker_pool.load_cache", lambda reset=False: None)
+
+        async def fake_game_command(*args, **kwargs):
+            return None
+
+        monkeypatch.setattr("src.chat.twitch_bot.handle_game_command", fake_game_command)
+        monkeypatch.setattr(warmup_service, "popularity", Counter())
+        inbox, outbox = queue.Queue(), queue.Queue()
+        inbox.put(ChatEvent("test_channel", "alice", "!gameinfo Hades"))
+        inbox.put(None)
+
+        await asyncio.wait_for(_worker_loop(1, sample_config, inbox, outbox), timeout=10)
+
+        assert (POPULARITY, "", "Hades") in [outbox.get_nowait() for _ in range(outbox.qsize())]
+        assert warmup_service.popularity["hades"] == 0
+        assert warmup_service.forward is None
+
+    @pytest.mark.asyncio
+    async def test_worker_zero_counts_forwarded_requests(self, sample_config, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LLM_MODE", "disabled")
+        monkeypatch.setattr("src.chat.worker_pool.load_cache", lambda reset=False: None)
+        monkeypatch.setattr("src.chat.worker_pool.WorkerBot._start_warmup", lambda self: None)
+        monkeypatch.setattr(warmup_service, "popularity", Counter())
+        inbox, outbox = queue.Queue(), queue.Queue()
+        inbox.put((POPULARITY, "Hades"))
+        inbox.put((POPULARITY, "Hades"))
+        inbox.put(None)
+
+        await asyncio.wait_for(_worker_loop(0, sample_config, inbox, outbox), timeout=10)
+
+        assert warmup_service.popularity["hades"] == 2
+        assert "hades" in warmup_service.top_games()
+
+
+class TestSpamWithBlockedTerm:
+    """Le pré-filtre des mots bannis ne court-circuite pas la sanction des spam bots."""
+
+    @pytest.mark.asyncio
+    async def test_spam_bot_with_blocked_term_timed_out(self, sample_config, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LLM_MODE", "disabled")
+        outbox = queue.Queue()
+        bot = WorkerBot(sample_config, outbox)
+        bot.translator.blocked_sites.add("streamboo")
+        ctx = bot.get_context("test_channel")
+        ctx.blocked_terms = BlockedTermsMirror(None)
+        ctx.blocked_terms.by_text = {"streamboo": {"id": "1", "text": "streamboo"}}
+        submitted = []
+
+        class FakeModeration:
+            def submit(self, login, user_id=None, duration=60, reason=""):
+                submitted.append((login, user_id, duration))
+                return True
+
+        ctx.moderation = FakeModeration()
+        event = ChatEvent("test_channel", "spammer", "viewers sur streamboo", False, {"user-id": "99"})
+
+        await bot.event_message(ProxyMessage(event, outbox))
+
+        assert submitted == [("spammer", "99", 60)]
+
+
+class TestChannelIds:
+    """broadcaster_id résolus par l'ingestion avant le lancement des workers."""
+
+    @pytest.mark.asyncio
+    async def test_missing_ids_written_in_worker_config(self, sample_config, monkeypatch):
+        sample_config["bot"]["channels"] = ["partner", "ghost"]
+        sample_config["twitch"].pop("broadcaster_id", None)
+        asked = []
+
+        class FakeResolver:
+            drained = False
+
+            def configure(self, config):
+                pass
+
+            async def drain(self):
+                self.drained = True
+
+            async def resolve_many(self, logins):
+                asked.extend(logins)
+                return {login: None if login == "ghost" else f"id-{login}" for login in logins}
+
+        resolver = FakeResolver()
+        monkeypatch.setattr("src.chat.worker_pool.user_id_resolver", resolver)
+
+        await resolve_channel_ids(sample_config)
+
+        assert resolver.drained  # Cache disque écrit avant le fork des workers
+
+        assert asked == ["test_channel", "partner", "ghost"]
+        assert channel_config(sample_config, "test_channel")["twitch"]["broadcaster_id"] == "id-test_channel"
+        assert channel_config(sample_config, "partner")["twitch"]["broadcaster_id"] == "id-partner"
+        assert "broadcaster_id" not in channel_config(sample_config, "ghost")["twitch"]
+
+
+class TestSqliteGameCache:
+    """Tests du cache de jeux partagé entre process."""
+
+    def test_shared_between_instances(self, tmp_path):
+        """Deux instances (deux process) voient les mêmes entrées."""
+        db = str(tmp_path / "games.sqlite3")
+        writer, reader = SqliteGameCache(db), SqliteGameCache(db)
+        writer.set("gamedata:hades", {"data": {"name": "Hades"}, "hit_count": 1})
+        assert reader.get("gamedata:hades") == {"data": {"name": "Hades"}, "hit_count": 1}
+
+    def test_iter_valid_feeds_warmup_top_games(self, tmp_path):
+        """hit_count écrits par tous les workers visibles par le warmup du worker 0."""
+        cache = SqliteGameCache(str(tmp_path / "games.sqlite3"))
+        cache.set("gamedata:hades", {"data": {"name": "Hades"}, "hit_count": 3})
+        cache.set("gamedata:celeste", {"data": {"name": "Celeste"}, "hit_count": 1}, ttl=1)
+        cache._conn().execute("UPDATE game_cache SET timestamp = timestamp - 10 WHERE key = 'gamedata:celeste'")
+        assert [key for key, _ in cache.iter_valid()] == ["gamedata:hades"]
+        assert cache.compact_cold(60) == 0 and cache.export_entries() == {}
+
+    def test_ttl_expiry(self, tmp_path):
+        """Une entrée expirée n'est plus servie."""
+        cache = SqliteGameCache(str(tmp_path / "games.sqlite3"))
+        cache.set("k", {"v": 1}, ttl=1)
+        cache._conn().execute("UPDATE game_cache SET timestamp = timestamp - 10")
+        assert cache.get("k") is None
+        assert cache.stats()["total_entries"] == 0